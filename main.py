@@ -17,6 +17,7 @@ import requests
 
 from src.config.settings import load_config, ConfigurationError
 from src.config.logging_config import setup_application_logging
+from src.config.executors import configure_executors, shutdown_executors
 from src.agent.livekit_agent import main as livekit_agent_main
 from src.memory.memory_manager import MemoryManager
 
@@ -50,13 +51,13 @@ class ServiceManager:
         # AI Provider (initialized implicitly by LiveKit Agent's LLM)
         self.logger.info("AI Provider will be initialized by LiveKit Agent's LLM.")
 
-        # Flask Web Server
-        self.logger.info("Starting Flask Web Server...")
-        from src.web.app import Live2DFlaskApp
+        # Web Server
+        self.logger.info(f"Starting Web Server ({config.flask.server})...")
+        from src.web.server import create_web_server
 
-        flask_app = Live2DFlaskApp()
-        flask_thread = threading.Thread(
-            target=flask_app.run,
+        web_app = create_web_server(config)
+        web_thread = threading.Thread(
+            target=web_app.run,
             kwargs={
                 "host": config.flask.host,
                 "port": config.flask.port,
@@ -64,7 +65,7 @@ class ServiceManager:
             },
             daemon=True,
         )
-        flask_thread.start()
+        web_thread.start()
 
         # LiveKit Agent
         self.logger.info("Starting LiveKit Agent...")
@@ -81,6 +82,12 @@ class ServiceManager:
         self.logger.info("Stopping application services...")
         self.shutdown_event.set()
 
+        # Push any queued memory writes before exiting
+        memory_manager = getattr(self, "memory_manager", None)
+        if memory_manager is not None:
+            await memory_manager.close()
+        shutdown_executors()
+
         # Stop services in reverse order
         for service in reversed(self.services):
             self.logger.info(f"Stopping {service}...")
@@ -184,6 +191,7 @@ async def main():
 
         # Set up logging based on configuration
         setup_application_logging(log_level=config.log_level, debug=config.debug)
+        configure_executors(config.executors)
 
         logger = logging.getLogger(__name__)
         logger.info("Anime AI Character system starting up...")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pack a Live2D model into a single bundle file.
+
+Collects a model3.json and every file it references into one versioned
+archive (see src/web/model_bundle.py for the format). The web server builds
+the same bundles on demand at /live2d/bundle/<model3.json path>; use this
+script to inspect a model's bundle or to ship it to a CDN.
+
+Usage:
+    python scripts/pack_live2d_model.py path/to/model.model3.json
+    python scripts/pack_live2d_model.py path/to/model.model3.json --quantize 3 -o model.l2db
+    python scripts/pack_live2d_model.py --list model.l2db
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.error_handling.exceptions import Live2DError, ValidationError  # noqa: E402
+from src.web.model_bundle import (  # noqa: E402
+    BUNDLE_SUFFIX,
+    MODEL_SUFFIX,
+    ModelBundler,
+    unpack_bundle,
+)
+from src.web.static_assets import StaticAssetStore  # noqa: E402
+
+
+def pack(model_file: str, output: str = "", quantize: Optional[int] = None) -> str:
+    """
+    Pack a model and write the bundle.
+
+    Args:
+        model_file: Path to the model3.json
+        output: Bundle path (default: next to the model, ``.l2db`` suffix)
+        quantize: Decimal places for motion curves (None = lossless)
+
+    Returns:
+        str: Path of the written bundle
+    """
+    model_file = os.path.abspath(model_file)
+    model_dir, model_name = os.path.split(model_file)
+    if not output:
+        output = os.path.join(model_dir, model_name[: -len(MODEL_SUFFIX)] + BUNDLE_SUFFIX)
+
+    # Referenced files must live under the model's directory
+    store = StaticAssetStore(model_dir, precompress=False, cache_bytes=0)
+    bundle = ModelBundler(store, quantize=quantize).build(model_name)
+
+    with open(output, "wb") as f:
+        f.write(bundle.data)
+
+    index = bundle.index
+    print(f"Output:    {output}")
+    print(f"Version:   {bundle.version}")
+    print(f"Files:     {len(index['files'])}")
+    print(f"Original:  {index['original_size']:,} bytes")
+    print(f"Bundle:    {len(bundle.data):,} bytes")
+    for encoding, body in bundle.encodings.items():
+        print(f"  {encoding}:    {len(body):,} bytes")
+    if index["missing"]:
+        print(f"⚠️  Missing referenced files: {', '.join(index['missing'])}")
+    return output
+
+
+def list_bundle(bundle_file: str) -> None:
+    """Print the index of a bundle file."""
+    with open(bundle_file, "rb") as f:
+        index, files = unpack_bundle(f.read())
+
+    print(f"Model:     {index['model']}")
+    print(f"Version:   {index['version']}")
+    print(f"Quantize:  {index['quantize'] if index['quantize'] is not None else 'off'}")
+    for entry in index["files"]:
+        print(f"  {entry['length']:>10,}  {entry['type']:<28} {entry['path']}")
+    if index["missing"]:
+        print(f"⚠️  Missing referenced files: {', '.join(index['missing'])}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Pack a Live2D model into one bundle")
+    parser.add_argument("path", help="model3.json to pack (or bundle with --list)")
+    parser.add_argument("-o", "--output", default="", help="Bundle file to write")
+    parser.add_argument(
+        "--quantize",
+        type=int,
+        default=None,
+        metavar="DECIMALS",
+        help="Round motion curve values to this many decimals",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="Show the contents of an existing bundle"
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.list:
+            list_bundle(args.path)
+        else:
+            pack(args.path, args.output, args.quantize)
+    except (Live2DError, ValidationError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
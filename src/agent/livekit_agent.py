@@ -12,7 +12,7 @@ import logging
 import time
 import random
 from datetime import datetime
-from typing import Optional, Any, Awaitable, Callable
+from typing import Optional, Any, AsyncIterator, Awaitable, Callable
 
 # --------------------------------------------------------------
 # LiveKit SDK / Agents
@@ -33,9 +33,19 @@ from livekit.plugins import openai, silero, deepgram
 # --------------------------------------------------------------
 # Project‑specific modules
 # --------------------------------------------------------------
-from src.config.settings import AppConfig, load_config
+from src.config.settings import AppConfig, ConfigurationError, load_config
+from src.config.executors import configure_executors
 from src.ai.provider_factory import ProviderFactory
-from src.memory.memory_manager import MemoryManager, ConversationMessage
+from src.ai.prompt_budget import PromptAssembler, PromptStats
+from src.ai.sentence_chunker import SentenceChunker
+from src.agent.warmup import (
+    get_startup_metrics,
+    is_llm_warm,
+    load_vad,
+    start_background_warmup,
+    warm_up_provider,
+)
+from src.memory.memory_manager import MemoryManager, ConversationMessage, MemoryContext
 from src.web.app import trigger_animation
 from src.web.animation_sync import (
     get_animation_synchronizer,
@@ -81,6 +91,22 @@ class AnimeAILLM(LLM):
         self.last_successful_response = time.time()
         self.connection_healthy = True
 
+        # background tasks animating streamed reply segments
+        self._segment_animators: set = set()
+        # background memory writes that don't block the reply
+        self._background_tasks: set = set()
+
+        # keeps each turn's prompt inside the model's context budget
+        self.prompt_assembler = PromptAssembler(
+            max_tokens=config.ai.prompt_max_tokens,
+            reserve_tokens=config.ai.prompt_reserve_tokens,
+            summary_tokens=config.ai.prompt_summary_tokens,
+            window_step=config.ai.prompt_window_step,
+        )
+        self.last_prompt_stats: Optional[PromptStats] = None
+        self._prompt_turns = 0
+        self._trimmed_prompt_turns = 0
+
     # ------------------------------------------------------------------
     # LiveKit entry point – must return an LLMStream
     # ------------------------------------------------------------------
@@ -119,6 +145,48 @@ class AnimeAILLM(LLM):
         self.logger.debug(f"Executing async task: {task.__name__}")
         return await task(*args, **kwargs)
 
+    def _spawn_background(self, coro: Awaitable[Any]) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it ends."""
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _store_user_message(self, message: ConversationMessage) -> None:
+        """Store the user utterance in memory, logging failures."""
+        try:
+            await self.memory_manager.store_conversation(message)
+        except Exception as e:
+            self.logger.warning(f"Memory store failed (user): {e}")
+
+    async def _fetch_memory_context(
+        self, user_id: str, current: ConversationMessage
+    ) -> Optional[MemoryContext]:
+        """
+        Retrieve memory context for a turn; None if the lookup fails.
+
+        The current utterance is already the last chat message, so it is
+        left out of the session history whether or not the concurrent
+        store has added it yet.
+        """
+        try:
+            memory_context = await self.memory_manager.get_user_context(
+                user_id, current.content
+            )
+        except Exception as e:
+            self.logger.warning(f"Memory lookup failed: {e}")
+            return None
+
+        if isinstance(memory_context, MemoryContext):
+            memory_context.conversation_history = [
+                msg for msg in memory_context.conversation_history if msg is not current
+            ]
+            self.logger.debug(
+                f"Memory context sources for {user_id}: "
+                f"{getattr(memory_context, 'sources', [])}"
+            )
+        return memory_context
+
     async def _process_chat_internal(
         self, chat_ctx: ChatContext, user_id: str
     ) -> "AnimeAILLMStream":
@@ -141,30 +209,19 @@ class AnimeAILLM(LLM):
                 )
 
             # --------------------------------------------------------------
-            # 2️⃣  Store the user utterance in the short‑term memory layer
+            # 2️⃣  Store the user utterance and 3️⃣ retrieve long‑term context
+            #     concurrently; the store runs off the critical path, the
+            #     lookup is bounded by the memory latency budget and never
+            #     includes the utterance itself
             # --------------------------------------------------------------
-            try:
-                await self.memory_manager.store_conversation(
-                    ConversationMessage(
-                        role="user",
-                        content=user_message,
-                        timestamp=datetime.now(),
-                        user_id=user_id,
-                    )
-                )
-            except Exception as e:
-                self.logger.warning(f"Memory store failed (user): {e}")
-
-            # --------------------------------------------------------------
-            # 3️⃣  Retrieve any long‑term context (optional)
-            # --------------------------------------------------------------
-            try:
-                memory_context = await self.memory_manager.get_user_context(
-                    user_id, user_message
-                )
-            except Exception as e:
-                self.logger.warning(f"Memory lookup failed: {e}")
-                memory_context = None
+            user_entry = ConversationMessage(
+                role="user",
+                content=user_message,
+                timestamp=datetime.now(),
+                user_id=user_id,
+            )
+            self._spawn_background(self._store_user_message(user_entry))
+            memory_context = await self._fetch_memory_context(user_id, user_entry)
 
             # --------------------------------------------------------------
             # 4️⃣  Convert LiveKit ChatMessage objects to the provider‑agnostic format
@@ -178,6 +235,18 @@ class AnimeAILLM(LLM):
                 for m in chat_ctx.messages
             ]
 
+            llm_messages, memory_context = self._fit_prompt(
+                llm_messages, memory_context, user_id
+            )
+            # --------------------------------------------------------------
+            # 4️⃣b Streaming path – hand sentence segments to TTS as they complete
+            #     (steps 6‑8 run in _relay_stream, segment by segment)
+            # --------------------------------------------------------------
+            if self.config.ai.stream_responses:
+                return await self._start_streaming_reply(
+                    llm_messages, memory_context, user_id, user_message
+                )
+
             # --------------------------------------------------------------
             # 5️⃣  Call the AI provider (30 s timeout)
             # --------------------------------------------------------------
@@ -252,6 +321,233 @@ class AnimeAILLM(LLM):
                 participant_id=user_id,
             ) from exc
 
+    def _fit_prompt(self, llm_messages: list, memory_context: Any, user_id: str):
+        """Fit history and memory into the prompt budget and record its size."""
+        prompt = self.prompt_assembler.assemble(
+            llm_messages, self.config.personality.personality_prompt, memory_context
+        )
+        stats = prompt.stats
+        self.last_prompt_stats = stats
+        self._prompt_turns += 1
+        if stats.dropped_messages or stats.dropped_memories:
+            self._trimmed_prompt_turns += 1
+
+        self.logger.debug(
+            f"Prompt for {user_id}: ~{stats.total_tokens} tokens "
+            f"(personality {stats.personality_tokens}, memory {stats.memory_tokens}, "
+            f"history {stats.history_tokens} in {stats.kept_messages} messages, "
+            f"{stats.dropped_messages} dropped)"
+        )
+        if stats.over_budget:
+            self.logger.warning(
+                f"Prompt for {user_id} exceeds budget: "
+                f"~{stats.total_tokens}/{stats.budget} tokens"
+            )
+        return prompt.messages, prompt.memory_context
+
+    def get_prompt_stats(self) -> dict:
+        """
+        Get prompt size statistics.
+
+        Returns:
+            dict: Last turn's prompt sizes and how many turns were trimmed
+        """
+        return {
+            "turns": self._prompt_turns,
+            "trimmed_turns": self._trimmed_prompt_turns,
+            "last": self.last_prompt_stats.to_dict() if self.last_prompt_stats else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Streaming reply – the first token is awaited here so provider errors
+    # still surface inside the fallback manager; the rest is relayed lazily
+    # ------------------------------------------------------------------
+    async def _start_streaming_reply(
+        self,
+        llm_messages: list,
+        memory_context: Any,
+        user_id: str,
+        user_message: str,
+    ) -> "AnimeAILLMStream":
+        chunks = self.ai_provider.stream_response(
+            llm_messages,
+            self.config.personality.personality_prompt,
+            memory_context,
+        )
+
+        try:
+            first_chunk = await asyncio.wait_for(chunks.__anext__(), timeout=30.0)
+        except StopAsyncIteration:
+            first_chunk = ""
+        except asyncio.TimeoutError as te:
+            await chunks.aclose()
+            raise AIProviderError(
+                "AI first token timeout",
+                provider=self.ai_provider.get_provider_name(),
+                details={"timeout": 30},
+            ) from te
+
+        self.consecutive_failures = 0
+        self.last_successful_response = time.time()
+        self.connection_healthy = True
+        await self.recovery_manager.record_success("livekit_llm")
+
+        return AnimeAILLMStream(
+            chunks=self._relay_stream(first_chunk, chunks, user_id, user_message)
+        )
+
+    async def _relay_stream(
+        self,
+        first_chunk: str,
+        chunks: AsyncIterator[str],
+        user_id: str,
+        user_message: str,
+    ) -> AsyncIterator[str]:
+        """
+        Re-cut provider chunks into sentence segments for TTS.
+
+        Each segment is yielded as soon as it is complete and handed to a
+        background worker that lays it onto the speech/mouth-sync timeline,
+        so generation, synthesis and animation overlap. The full reply is
+        stored once the stream ends; a reply cut short by a provider error is
+        spoken as far as it got but not stored as if it were complete.
+        """
+        chunker = SentenceChunker()
+        segments: asyncio.Queue = asyncio.Queue()
+        animator = asyncio.create_task(
+            self._animate_segments(segments, user_message)
+        )
+        self._segment_animators.add(animator)
+        animator.add_done_callback(self._segment_animators.discard)
+        parts = []
+        segment_index = 0
+        interrupted = False
+
+        async def provider_chunks():
+            if first_chunk:
+                yield first_chunk
+            async for chunk in chunks:
+                yield chunk
+
+        try:
+            try:
+                async for chunk in provider_chunks():
+                    parts.append(chunk)
+                    for segment in chunker.feed(chunk):
+                        segments.put_nowait((segment, segment_index, False))
+                        segment_index += 1
+                        yield segment if segment_index == 1 else " " + segment
+            except Exception as e:
+                interrupted = True
+                self.logger.warning(f"Reply stream interrupted for {user_id}: {e}")
+
+            tail = chunker.flush()
+            if tail:
+                segments.put_nowait((tail, segment_index, True))
+                yield tail if segment_index == 0 else " " + tail
+        finally:
+            # Sentinel: closes the segmented reply if the tail was already sent
+            segments.put_nowait(None)
+            # Stop the provider (and its pool worker) if the consumer bailed out
+            await chunks.aclose()
+
+        response = "".join(parts)
+        if not response:
+            return
+        if interrupted:
+            self.logger.warning(
+                f"Not storing truncated reply for {user_id} ({len(response)} chars)"
+            )
+            return
+
+        try:
+            await self.memory_manager.store_conversation(
+                ConversationMessage(
+                    role="assistant",
+                    content=response,
+                    timestamp=datetime.now(),
+                    user_id=user_id,
+                )
+            )
+        except Exception as e:
+            self.logger.warning(f"Memory store failed (assistant): {e}")
+
+        self.logger.info(
+            f"LLM streamed reply for {user_id} in {chunker.segments_emitted} "
+            f"segments: {response[:60]}..."
+        )
+
+    async def _animate_segments(
+        self, segments: asyncio.Queue, user_message: str
+    ) -> None:
+        """Animate queued reply segments in order until the end sentinel.
+
+        The segments share one speech timeline on the synchronizer, keyed by
+        the sequence ID returned for the first synchronized segment, so
+        replies streaming in other sessions never shift each other's offsets.
+        """
+        sequence_id: Optional[str] = None
+        finished = False
+        while True:
+            item = await segments.get()
+            if item is None:
+                break
+            segment, index, is_final = item
+            sequence_id = (
+                await self._animate_segment(
+                    segment, user_message, index, is_final, sequence_id
+                )
+                or sequence_id
+            )
+            finished = finished or is_final
+
+        if not finished and sequence_id:
+            try:
+                await self.animation_sync.finish_segment_sequence(sequence_id)
+            except Exception as e:
+                self.logger.warning(f"Segment sequence close failed: {e}")
+
+    async def _animate_segment(
+        self,
+        segment: str,
+        user_message: str,
+        index: int,
+        is_final: bool,
+        sequence_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """Synchronize one segment with TTS, falling back to a direct animation.
+
+        Returns:
+            Optional[str]: Sequence ID of the reply's timeline, or None if the
+            segment fell back to a direct animation
+        """
+        expression = self._analyze_response_sentiment(segment)
+        try:
+            seq_id = await asyncio.wait_for(
+                self.animation_sync.synchronize_segment_with_tts(
+                    text=segment,
+                    expression=expression,
+                    segment_index=index,
+                    is_final=is_final,
+                    tts_processing_delay=min(0.5, len(segment) / 200),
+                    sequence_id=sequence_id,
+                ),
+                timeout=5.0,
+            )
+            if seq_id:
+                return seq_id
+        except Exception as e:
+            self.logger.warning(f"Segment animation sync error: {e} – using direct animation")
+
+        try:
+            intensity = self._calculate_expression_intensity(segment, user_message)
+            await asyncio.wait_for(
+                trigger_animation(expression, intensity), timeout=3.0
+            )
+        except Exception as e:
+            self.logger.warning(f"Animation trigger failed: {e}")
+        return None
+
     # ------------------------------------------------------------------
     # Fallback‑only error handling – returns a cute anime‑style apology
     # ------------------------------------------------------------------
@@ -418,19 +714,59 @@ class AnimeAILLM(LLM):
 # 2️⃣  Stream object required by VoiceAgent
 # ----------------------------------------------------------------------
 class AnimeAILLMStream(LLMStream):
-    """Very small async iterator that yields a single string."""
+    """
+    Small async iterator over the assistant reply.
+
+    Wraps either a complete string (yielded once) or a live chunk stream
+    from the AI provider, which is forwarded piece by piece.
+    """
 
-    def __init__(self, content: str):
+    def __init__(
+        self, content: str = "", chunks: Optional[AsyncIterator[str]] = None
+    ):
         self._content = content
+        self._chunks = chunks
         self._sent = False
 
+    @property
+    def content(self) -> str:
+        """Reply text received so far (the full reply once exhausted)."""
+        return self._content
+
+    async def _run(self) -> None:
+        """No background task – chunks are pulled directly in ``__anext__``."""
+        return None
+
     def __aiter__(self):
         return self
 
     async def __anext__(self):
         if self._sent:
             raise StopAsyncIteration
+
+        if self._chunks is None:
+            self._sent = True
+            return self._content
+
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._sent = True
+            raise
+
+        self._content += chunk
+        return chunk
+
+    async def aclose(self) -> None:
+        """Stop the stream early, closing the underlying chunk stream."""
         self._sent = True
+        if self._chunks is not None and hasattr(self._chunks, "aclose"):
+            await self._chunks.aclose()
+
+    async def collect(self) -> str:
+        """Drain the stream and return the full reply text."""
+        async for _ in self:
+            pass
         return self._content
 
 
@@ -443,15 +779,19 @@ class AnimeAIAgent:
     def __init__(self, config: AppConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        configure_executors(config.executors)
         self.memory_manager = MemoryManager(config.memory)
         self.voice_assistant: Optional[VoiceAssistant] = None
+        self.llm: Optional[AnimeAILLM] = None
         self.room: Optional[rtc.Room] = None  # kept for chat handling
+        self._warmup_task: Optional[asyncio.Task] = None
 
     # --------------------------------------------------------------
     async def initialize(self) -> None:
         """Bring up the memory layer (Mem0, Redis, etc.)."""
         try:
-            mem0_ready = await self.memory_manager.initialize()
+            with get_startup_metrics().phase("memory_init"):
+                mem0_ready = await self.memory_manager.initialize()
             self.logger.info(
                 "Memory manager ready – %s",
                 "Mem0" if mem0_ready else "session‑only fallback",
@@ -460,6 +800,20 @@ class AnimeAIAgent:
             self.logger.error(f"Memory init failed: {exc}")
             raise
 
+    # --------------------------------------------------------------
+    async def shutdown(self) -> None:
+        """Flush queued memory writes and close provider connections before the job exits."""
+        try:
+            await self.memory_manager.close()
+        except Exception as exc:
+            self.logger.warning(f"Memory shutdown failed: {exc}")
+
+        if self.llm is not None:
+            try:
+                await self.llm.ai_provider.close()
+            except Exception as exc:
+                self.logger.warning(f"AI provider shutdown failed: {exc}")
+
     # --------------------------------------------------------------
     def _create_stt_provider(self) -> STT:
         name = self.config.agents.stt_provider.lower()
@@ -487,10 +841,11 @@ class AnimeAIAgent:
             stt = self._create_stt_provider()
             tts = self._create_tts_provider()
             llm = AnimeAILLM(self.config, self.memory_manager)
+            self.llm = llm
 
             self.voice_assistant = VoiceAgent(
                 instructions=self.config.personality.personality_prompt,
-                vad=silero.VAD.load(),
+                vad=load_vad(),
                 stt=stt,
                 tts=tts,
                 llm=llm,
@@ -574,7 +929,7 @@ class AnimeAIAgent:
         # ------------------------------------------------------------------
         try:
             response_stream = await self.voice_assistant.llm.chat(chat_ctx=ctx)
-            reply_text = await response_stream.__anext__()
+            reply_text = await response_stream.collect()
         except Exception as exc:
             self.logger.error(f"LLM chat failure for text message: {exc}")
             reply_text = "Sorry, I’m having trouble right now…"
@@ -602,7 +957,9 @@ class AnimeAIAgent:
         try:
             self.room = room  # keep a reference for chat handling
             await self.initialize()
-            voice_agent = self.create_voice_agent()
+            with get_startup_metrics().phase("voice_agent_create"):
+                voice_agent = self.create_voice_agent()
+            self._start_llm_warmup()
 
             # LiveKit event hooks
             room.on("participant_connected", self.handle_participant_connected)
@@ -619,11 +976,22 @@ class AnimeAIAgent:
             # Start processing audio for the whole room
             voice_agent.start(room)
 
-            self.logger.info("Anime AI Agent started")
+            self.logger.info(
+                f"Anime AI Agent started (startup phases: {get_startup_metrics().get_stats()['phases']})"
+            )
         except Exception as exc:
             self.logger.error(f"Failed to start agent: {exc}")
             raise
 
+    # --------------------------------------------------------------
+    def _start_llm_warmup(self) -> None:
+        """Warm the LLM in the background unless prewarm already did."""
+        if not self.config.ai.llm_warmup or is_llm_warm() or self.llm is None:
+            return
+        self._warmup_task = asyncio.ensure_future(
+            warm_up_provider(self.llm.ai_provider)
+        )
+
 
 # ----------------------------------------------------------------------
 # 4️⃣  LiveKit worker entry point
@@ -635,6 +1003,8 @@ async def entrypoint(ctx: JobContext) -> None:
         cfg = load_config()
         logger.info("Launching Anime AI Character agent…")
         agent = AnimeAIAgent(cfg)
+        if hasattr(ctx, "add_shutdown_callback"):
+            ctx.add_shutdown_callback(agent.shutdown)
         await agent.start_agent(ctx.room)
 
         # Keep the process alive until LiveKit stops the job
@@ -645,14 +1015,25 @@ async def entrypoint(ctx: JobContext) -> None:
 
 
 # ----------------------------------------------------------------------
-# 5️⃣  Pre‑warm – load the VAD model before any participant joins
+# 5️⃣  Pre‑warm – load the VAD and warm the LLM before any participant joins
 # ----------------------------------------------------------------------
 def prewarm(proc: JobProcess) -> None:
     """
     LiveKit calls this once per worker before any room is attached.
-    We simply load the Silero VAD into ``proc.userdata`` so the LLM can reuse it.
+    We load the Silero VAD into ``proc.userdata`` and start warming the LLM
+    in the background so the first conversation skips the model load.
     """
-    proc.userdata["vad"] = silero.VAD.load()
+    logger = logging.getLogger(__name__)
+    proc.userdata["vad"] = load_vad()
+
+    try:
+        cfg = load_config()
+    except ConfigurationError as exc:
+        logger.warning(f"Skipping LLM warmup: {exc}")
+        return
+
+    if cfg.ai.llm_warmup:
+        start_background_warmup()
 
 
 # ----------------------------------------------------------------------
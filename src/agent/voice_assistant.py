@@ -15,6 +15,7 @@ from livekit.agents.llm import ChatContext
 
 from src.config.settings import AppConfig
 from src.memory.memory_manager import MemoryManager, ConversationMessage
+from src.agent.warmup import load_vad
 
 
 class EnhancedVoiceAssistant:
@@ -201,12 +202,10 @@ class VoiceAssistantFactory:
         Returns:
             EnhancedVoiceAssistant: Configured voice assistant
         """
-        from livekit.plugins import silero
-
         # Create base VoiceAgent
         base_agent = VoiceAgent(
             instructions=config.personality.personality_prompt,
-            vad=silero.VAD.load(),
+            vad=load_vad(),
             stt=stt,
             llm=llm,
             tts=tts,
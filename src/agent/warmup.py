@@ -0,0 +1,155 @@
+"""
+Process warmup for LiveKit workers.
+Loads the Silero VAD once per process and warms the LLM before the first
+conversation, recording how long each startup phase takes.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from livekit.plugins import silero
+
+from src.ai.base_provider import AIProvider
+from src.ai.provider_factory import ProviderFactory
+
+logger = logging.getLogger(__name__)
+
+
+class StartupMetrics:
+    """Durations of the startup phases of this process."""
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.phases: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a startup phase. Failures are recorded and re-raised.
+
+        Args:
+            name: Phase name
+        """
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            with self._lock:
+                self.errors[name] = str(e)
+            raise
+        finally:
+            self.record(name, time.monotonic() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Record a phase duration measured elsewhere.
+
+        Args:
+            name: Phase name
+            seconds: Duration in seconds
+        """
+        with self._lock:
+            self.phases[name] = seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get startup metrics.
+
+        Returns:
+            Dict[str, Any]: Seconds per phase and any phase errors
+        """
+        with self._lock:
+            return {"phases": dict(self.phases), "errors": dict(self.errors)}
+
+
+# Per-process state
+_metrics = StartupMetrics()
+_vad: Optional[Any] = None
+_vad_lock = threading.Lock()
+_llm_warm = threading.Event()
+
+
+def get_startup_metrics() -> StartupMetrics:
+    """Get this process's startup metrics."""
+    return _metrics
+
+
+def load_vad() -> Any:
+    """
+    Load the Silero VAD, once per process.
+
+    Returns:
+        Any: The shared VAD instance
+    """
+    global _vad
+    with _vad_lock:
+        if _vad is None:
+            with _metrics.phase("vad_load"):
+                _vad = silero.VAD.load()
+    return _vad
+
+
+def is_llm_warm() -> bool:
+    """Whether an LLM warmup has completed in this process."""
+    return _llm_warm.is_set()
+
+
+async def warm_up_provider(provider: AIProvider) -> bool:
+    """
+    Warm up an AI provider and record each phase.
+
+    Args:
+        provider: Provider to warm up
+
+    Returns:
+        bool: True if the provider is warm, False if warmup failed
+    """
+    if _llm_warm.is_set():
+        return True
+
+    try:
+        with _metrics.phase("llm_warmup"):
+            timings = await provider.warmup()
+    except Exception as e:
+        logger.warning(f"LLM warmup failed: {e}")
+        return False
+
+    for phase, seconds in timings.items():
+        _metrics.record(f"llm_{phase}", seconds)
+    _llm_warm.set()
+    return True
+
+
+def start_background_warmup() -> threading.Thread:
+    """
+    Warm up the configured provider on a background thread.
+
+    Used from the synchronous prewarm hook so a slow model load does not
+    hold up worker registration.
+
+    Returns:
+        threading.Thread: The started daemon thread
+    """
+
+    async def _warm() -> None:
+        provider = ProviderFactory.create_provider()
+        try:
+            await warm_up_provider(provider)
+        finally:
+            await provider.close()
+
+    def _run() -> None:
+        try:
+            asyncio.run(_warm())
+        except Exception as e:
+            logger.warning(f"Background LLM warmup failed: {e}")
+
+    thread = threading.Thread(target=_run, name="miko-llm-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -8,6 +8,7 @@ from .ollama_provider import OllamaProvider
 from .gemini_provider import GeminiProvider
 from .provider_factory import ProviderFactory
 from .personality_processor import PersonalityProcessor, ProcessedResponse, Sentiment
+from .sentence_chunker import SentenceChunker
 
 __all__ = [
     "AIProvider",
@@ -18,4 +19,5 @@ __all__ = [
     "PersonalityProcessor",
     "ProcessedResponse",
     "Sentiment",
+    "SentenceChunker",
 ]
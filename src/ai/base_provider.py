@@ -3,11 +3,17 @@ Base AI Provider interface for the Anime AI Character system.
 Defines the contract that all AI providers must implement.
 """
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime
 
+from src.config.executors import LLM_POOL, get_executor
+from src.ai.single_flight import SingleFlight
+from src.ai.response_cache import ResponseCache
+
 
 @dataclass
 class Message:
@@ -52,11 +58,92 @@ class AIProvider(ABC):
         """Initialize the AI provider with configuration."""
         self.config = config
         self.personality_processor = None
+        # Identical prompts in flight at the same time share one request
+        self.single_flight = SingleFlight()
+        self.response_cache: Optional[ResponseCache] = None
 
     def set_personality_processor(self, processor):
         """Set the personality processor for this provider."""
         self.personality_processor = processor
 
+    def set_response_cache(self, cache: Optional[ResponseCache]):
+        """Set the response cache used for fallbacks and the optional fast path."""
+        self.response_cache = cache
+
+    def get_cached_response(
+        self,
+        messages: List[Message],
+        personality: str = None,
+        memory_context: Optional[MemoryContext] = None,
+        fast_path: bool = False,
+    ) -> Optional[str]:
+        """
+        Look up a cached reply for a prompt.
+
+        Args:
+            messages: Conversation messages
+            personality: Personality prompt
+            memory_context: Memory context included in the prompt
+            fast_path: Only answer if the cache allows answering before generating
+
+        Returns:
+            Optional[str]: Cached reply, or None
+        """
+        if self.response_cache is None or (
+            fast_path and not self.response_cache.fast_path
+        ):
+            return None
+        return self.response_cache.get(
+            self._cache_model_id(),
+            personality,
+            self._cache_prompt(messages),
+            user_id=self._cache_user_id(memory_context),
+        )
+
+    def cache_generated_response(
+        self,
+        messages: List[Message],
+        personality: str,
+        memory_context: Optional[MemoryContext],
+        response: str,
+    ) -> None:
+        """
+        Store a generated reply in the response cache.
+
+        Args:
+            messages: Conversation messages
+            personality: Personality prompt
+            memory_context: Memory context included in the prompt
+            response: Generated reply
+        """
+        if self.response_cache is not None:
+            self.response_cache.put(
+                self._cache_model_id(),
+                personality,
+                self._cache_prompt(messages),
+                response,
+                user_id=self._cache_user_id(memory_context),
+            )
+
+    def _cache_model_id(self) -> str:
+        return f"{self.get_provider_name()}:{self.config.get('model', '')}"
+
+    @staticmethod
+    def _cache_prompt(messages: List[Message]) -> List[Dict[str, str]]:
+        """Flatten the conversation into role/content pairs for cache keys."""
+        return [{"role": m.role, "content": m.content} for m in messages]
+
+    @staticmethod
+    def _cache_user_id(memory_context: Optional[MemoryContext]) -> Optional[str]:
+        """
+        User that cached replies are scoped to.
+
+        The formatted memory context changes every turn (it includes recent
+        history), so it is not part of the key; scoping by user keeps one
+        user's replies, which may draw on their memories, from another.
+        """
+        return getattr(memory_context, "user_id", None)
+
     @abstractmethod
     async def generate_response(
         self,
@@ -77,6 +164,73 @@ class AIProvider(ABC):
         """
         pass
 
+    async def stream_response(
+        self,
+        messages: List[Message],
+        personality: str = None,
+        memory_context: Optional[MemoryContext] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as text chunks while the provider is still generating.
+
+        Providers without a native streaming API yield the complete
+        ``generate_response`` result as a single chunk.
+
+        Args:
+            messages: List of conversation messages
+            personality: Personality prompt to inject (optional if processor is set)
+            memory_context: Memory context from previous conversations (optional)
+
+        Yields:
+            Response text chunks in generation order
+        """
+        yield await self.generate_response(messages, personality, memory_context)
+
+    async def _iterate_blocking(
+        self,
+        iterator_factory: Callable[[], Iterable[Any]],
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Drain a blocking SDK iterator on an LLM pool thread and yield its items.
+
+        Args:
+            iterator_factory: Callable returning the blocking iterator (called in the worker)
+            timeout: Maximum seconds to wait for each item (None waits forever)
+
+        Yields:
+            Items produced by the blocking iterator
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def _pump():
+            try:
+                for item in iterator_factory():
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+                return
+            loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+
+        get_executor(LLM_POOL).submit(_pump)
+
+        try:
+            while True:
+                item, error = await asyncio.wait_for(queue.get(), timeout=timeout)
+                if item is done:
+                    if error is not None:
+                        raise error
+                    break
+                yield item
+        finally:
+            # Tell the worker to stop pulling from the SDK if we bail out early
+            stop.set()
+
     async def generate_processed_response(
         self,
         messages: List[Message],
@@ -141,4 +295,26 @@ class AIProvider(ABC):
     @abstractmethod
     def supports_content_filtering(self) -> bool:
         """Return whether this provider supports content filtering."""
+        pass
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """
+        Get request coalescing statistics.
+
+        Returns:
+            Dict[str, Any]: Request, coalesced and in-flight counts
+        """
+        return self.single_flight.get_stats()
+
+    async def warmup(self) -> Dict[str, float]:
+        """
+        Prepare the backing model so the first real request is fast.
+
+        Returns:
+            Dict[str, float]: Seconds spent per warmup phase (empty if nothing to do)
+        """
+        return {}
+
+    async def close(self) -> None:
+        """Release network resources held by the provider."""
         pass
\ No newline at end of file
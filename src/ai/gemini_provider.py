@@ -7,18 +7,24 @@ import asyncio
 import logging
 import re
 import time
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, AsyncIterator, TYPE_CHECKING
 from .base_provider import AIProvider, Message
+from .hedging import HedgeStats, LatencyTracker, hedged
+from .key_pool import KeyPool, KeySlot
+from .single_flight import request_key
 
 if TYPE_CHECKING:
     from .base_provider import MemoryContext
 
 try:
     import google.generativeai as genai
+    from google.ai import generativelanguage as glm
     from google.generativeai.types import HarmCategory, HarmBlockThreshold
 except ImportError:
     genai = None
+    glm = None
 
+from src.config.executors import HEALTH_POOL, LLM_POOL, run_blocking
 from src.error_handling.exceptions import (
     AIProviderError,
     ContentFilterError,
@@ -30,6 +36,64 @@ from src.error_handling.logging_handler import get_content_filter_logger, get_er
 
 logger = logging.getLogger(__name__)
 
+# How long an invalid key is left out of the pool
+AUTH_ERROR_COOLDOWN = 3600.0
+
+
+class KeyBoundModel:
+    """
+    Gemini model whose requests are sent with one API key.
+
+    ``genai.GenerativeModel`` always uses the key set by the process-wide
+    ``genai.configure()``, so pooled keys send requests through their own
+    ``GenerativeServiceClient`` and get the SDK's response type back.
+    Only text prompts are supported, which is all this provider sends.
+    """
+
+    def __init__(self, model_name: str, api_key: str):
+        """
+        Initialize the model.
+
+        Args:
+            model_name: Gemini model name, with or without the ``models/`` prefix
+            api_key: API key every request is sent with
+        """
+        self.model_name = model_name if "/" in model_name else f"models/{model_name}"
+        self.client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+    def generate_content(
+        self,
+        contents: str,
+        safety_settings: Optional[Dict[Any, Any]] = None,
+        stream: bool = False,
+    ):
+        """
+        Generate a reply, like ``genai.GenerativeModel.generate_content``.
+
+        Args:
+            contents: Prompt text
+            safety_settings: Harm category to block threshold
+            stream: Return an iterator of partial responses
+
+        Returns:
+            genai.types.GenerateContentResponse: The (streamed) response
+        """
+        request = glm.GenerateContentRequest(
+            model=self.model_name,
+            contents=[glm.Content(role="user", parts=[glm.Part(text=contents)])],
+            safety_settings=[
+                glm.SafetySetting(category=int(category), threshold=int(threshold))
+                for category, threshold in (safety_settings or {}).items()
+            ],
+        )
+        if stream:
+            return genai.types.GenerateContentResponse.from_iterator(
+                self.client.stream_generate_content(request)
+            )
+        return genai.types.GenerateContentResponse.from_response(
+            self.client.generate_content(request)
+        )
+
 
 class GeminiProvider(AIProvider):
     """Gemini provider with content filtering and API key rotation."""
@@ -43,6 +107,14 @@ class GeminiProvider(AIProvider):
                 - api_keys: List of Gemini API keys for rotation
                 - model: Gemini model name (default: 'gemini-pro')
                 - current_key_index: Current key index (default: 0)
+                - requests_per_minute: Request quota of each key (default: 15)
+                - max_queue_wait: Seconds a request waits for key capacity (default: 10)
+                - rate_limit_cooldown: Seconds a key is rested after a rate
+                  limit error (default: 60)
+                - hedge_requests: Send a second request on another key when
+                  the first is slower than recent p95 latency (default: False)
+                - hedge_percentile: Latency percentile that triggers a hedge
+                  (default: 0.95)
         """
         super().__init__(config)
 
@@ -68,8 +140,23 @@ class GeminiProvider(AIProvider):
         self.content_filter_logger = get_content_filter_logger()
         self.error_logger = get_error_logger()
 
-        # Rate limiting tracking
-        self.rate_limit_reset_times: Dict[int, float] = {}
+        # Requests are spread over all keys, each with its own client and quota
+        self.key_pool = KeyPool(
+            self.api_keys,
+            self._create_model,
+            requests_per_minute=config.get("requests_per_minute", 15),
+            max_wait=config.get("max_queue_wait", 10.0),
+            provider="gemini",
+        )
+        self.rate_limit_cooldown = config.get("rate_limit_cooldown", 60.0)
+
+        # Tail-latency hedging across keys
+        self.hedge_requests = config.get("hedge_requests", False)
+        self.latency = LatencyTracker(percentile=config.get("hedge_percentile", 0.95))
+        self.hedge_stats = HedgeStats()
+
+        # Rate limiting tracking (shared with the key pool)
+        self.rate_limit_reset_times: Dict[int, float] = self.key_pool.cooldown_until
         self.consecutive_failures = 0
         self.last_successful_request = time.time()
 
@@ -92,6 +179,10 @@ class GeminiProvider(AIProvider):
 
         logger.info(f"Initialized GeminiProvider with {len(self.api_keys)} API keys")
 
+    def _create_model(self, api_key: str) -> "KeyBoundModel":
+        """Create a model whose requests use ``api_key``."""
+        return KeyBoundModel(self.model_name, api_key)
+
     def _configure_current_key(self):
         """Configure the current API key."""
         current_key = self.api_keys[self.current_key_index]
@@ -147,9 +238,18 @@ class GeminiProvider(AIProvider):
         return False
 
     def get_current_key_index(self) -> int:
-        """Get the current API key index."""
+        """Get the index of the API key used most recently."""
         return self.current_key_index
 
+    def get_key_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get API key pool statistics.
+
+        Returns:
+            Dict[str, Any]: Per-key capacity and usage, and queueing counters
+        """
+        return self.key_pool.get_stats()
+
     async def generate_response(
         self,
         messages: List[Message],
@@ -167,7 +267,13 @@ class GeminiProvider(AIProvider):
         Returns:
             Generated response string
         """
-        return await self.fallback_manager.execute_with_fallback(
+        cached = self.get_cached_response(
+            messages, personality, memory_context, fast_path=True
+        )
+        if cached:
+            return cached
+
+        result = await self.fallback_manager.execute_with_fallback(
             component="gemini_provider",
             primary_operation=self._generate_response_internal,
             operation_args=(messages, personality, memory_context),
@@ -175,16 +281,17 @@ class GeminiProvider(AIProvider):
                 "user_message": messages[-1].content if messages else "",
                 "retry_operation": self._generate_response_internal,
                 "max_retries": len(self.api_keys),
-                "cache_key": f"gemini:{hash(str(messages[-1].content if messages else ''))}",
+                "cached_response": lambda: self.get_cached_response(
+                    messages, personality, memory_context
+                ),
             },
-        ).then(
-            lambda result: (
-                result.result
-                if result.success
-                else self._handle_generation_failure(result)
-            )
         )
 
+        if result.success:
+            return result.result
+        else:
+            return self._handle_generation_failure(result)
+
     async def _generate_response_internal(
         self,
         messages: List[Message],
@@ -193,25 +300,14 @@ class GeminiProvider(AIProvider):
     ) -> str:
         """Internal response generation with error handling."""
         max_retries = len(self.api_keys)
-        original_key_index = self.current_key_index
+
+        # Build conversation context with memory
+        conversation_text = self._build_conversation_context(
+            messages, personality, memory_context
+        )
 
         for attempt in range(max_retries):
             try:
-                # Check if current key is rate limited
-                if self._is_key_rate_limited(self.current_key_index):
-                    if not await self.rotate_api_key():
-                        raise AIProviderError(
-                            "All Gemini API keys are rate limited",
-                            provider="gemini",
-                            is_rate_limit=True,
-                        )
-                    continue
-
-                # Build conversation context with memory
-                conversation_text = self._build_conversation_context(
-                    messages, personality, memory_context
-                )
-
                 # Generate response with timeout
                 response = await asyncio.wait_for(
                     self._make_api_request(conversation_text), timeout=30.0
@@ -223,9 +319,9 @@ class GeminiProvider(AIProvider):
                     self.last_successful_request = time.time()
                     await self.recovery_manager.record_success("gemini_provider")
 
-                    # Cache successful response
-                    cache_key = f"gemini:{hash(conversation_text)}"
-                    self.fallback_manager.cache_response(cache_key, response.text)
+                    self.cache_generated_response(
+                        messages, personality, memory_context, response.text
+                    )
 
                     return response.text
                 else:
@@ -241,6 +337,12 @@ class GeminiProvider(AIProvider):
                 )
                 await self._handle_api_error(error, attempt, max_retries)
 
+            except AIProviderError as e:
+                if e.is_rate_limit:
+                    # The key pool has no capacity left
+                    raise
+                await self._handle_api_error(e, attempt, max_retries)
+
             except Exception as e:
                 await self._handle_api_error(e, attempt, max_retries)
 
@@ -248,54 +350,200 @@ class GeminiProvider(AIProvider):
         raise AIProviderError(
             "Failed to generate response after trying all API keys",
             provider="gemini",
-            details={"attempts": max_retries, "original_key": original_key_index},
+            details={"attempts": max_retries},
+        )
+
+    async def stream_response(
+        self,
+        messages: List[Message],
+        personality: str = None,
+        memory_context: Optional["MemoryContext"] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream response text from Gemini as candidates are produced.
+
+        If the stream fails before producing any text (including safety
+        blocks), the regular ``generate_response`` path is used instead.
+        Failures after the first chunk end the stream early.
+
+        Args:
+            messages: Conversation history
+            personality: Personality prompt to inject (optional if processor handles it)
+            memory_context: Memory context from previous conversations (optional)
+
+        Yields:
+            Response text chunks
+        """
+        cached = self.get_cached_response(
+            messages, personality, memory_context, fast_path=True
+        )
+        if cached:
+            yield cached
+            return
+
+        conversation_text = self._build_conversation_context(
+            messages, personality, memory_context
+        )
+        chunks: List[str] = []
+
+        try:
+            async with self.key_pool.lease() as slot:
+                self.current_key_index = slot.index
+                model = self.key_pool.client_for(slot)
+                try:
+                    async for part in self._iterate_blocking(
+                        lambda: model.generate_content(
+                            conversation_text,
+                            safety_settings=self.safety_settings,
+                            stream=True,
+                        ),
+                        timeout=30.0,
+                    ):
+                        text = part.text
+                        if text:
+                            chunks.append(text)
+                            yield text
+                except Exception as e:
+                    self._cool_down_failed_key(slot.index, e)
+                    raise
+        except Exception as e:
+            if not chunks:
+                logger.warning(f"Gemini stream failed before first token: {e}")
+                yield await self.generate_response(
+                    messages, personality, memory_context
+                )
+                return
+
+            self.consecutive_failures += 1
+            await self.recovery_manager.record_error(
+                "gemini_provider",
+                AIProviderError(f"Gemini stream interrupted: {e}", provider="gemini"),
+            )
+            return
+
+        if not chunks:
+            yield await self.generate_response(messages, personality, memory_context)
+            return
+
+        self.consecutive_failures = 0
+        self.last_successful_request = time.time()
+        await self.recovery_manager.record_success("gemini_provider")
+
+        self.cache_generated_response(
+            messages, personality, memory_context, "".join(chunks)
         )
 
     async def _make_api_request(self, conversation_text: str):
-        """Make API request with proper error handling."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.model.generate_content(
-                conversation_text, safety_settings=self.safety_settings
-            ),
+        """Make API request on the key with the most spare capacity."""
+        key = request_key("gemini", self.model_name, conversation_text)
+        # Coalesced callers share one request and use no key capacity
+        return await self.single_flight.run(key, lambda: self._send_request(conversation_text))
+
+    async def _send_request(self, conversation_text: str):
+        """Send one generation request through the key pool, hedging if enabled."""
+        self.hedge_stats.requests += 1
+        async with self.key_pool.lease() as slot:
+            if not self.hedge_requests or len(self.api_keys) < 2:
+                return await self._send_on_key(slot, conversation_text)
+
+            response, hedge_won = await hedged(
+                self._send_on_key(slot, conversation_text),
+                lambda: self._send_hedge(conversation_text, slot.index),
+                self.latency.hedge_delay(),
+            )
+            if hedge_won:
+                self.hedge_stats.hedge_wins += 1
+            return response
+
+    async def _send_hedge(self, conversation_text: str, primary_index: int):
+        """Send a duplicate request on a different key, without queueing for one."""
+        async with self.key_pool.lease(exclude={primary_index}, max_wait=0) as slot:
+            self.hedge_stats.hedged += 1
+            logger.debug(f"Hedging slow Gemini request on key {slot.index}")
+            return await self._send_on_key(slot, conversation_text)
+
+    async def _send_on_key(self, slot: KeySlot, conversation_text: str):
+        """Send a generation request with a specific key and time it."""
+        self.current_key_index = slot.index
+        model = self.key_pool.client_for(slot)
+        started = time.monotonic()
+        try:
+            response = await run_blocking(
+                LLM_POOL,
+                lambda: model.generate_content(
+                    conversation_text, safety_settings=self.safety_settings
+                ),
+            )
+        except Exception as e:
+            self._cool_down_failed_key(slot.index, e)
+            raise
+        self.latency.record(time.monotonic() - started)
+        return response
+
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """
+        Get request latency and hedging statistics.
+
+        Returns:
+            Dict[str, Any]: Latency percentiles, hedge delay and hedge counters
+        """
+        stats = self.latency.get_stats()
+        stats.update(
+            requests=self.hedge_stats.requests,
+            hedged=self.hedge_stats.hedged,
+            hedge_wins=self.hedge_stats.hedge_wins,
+            hedging_enabled=self.hedge_requests,
         )
+        return stats
 
-    async def _handle_api_error(self, error: Exception, attempt: int, max_retries: int):
-        """Handle API errors with appropriate recovery strategies."""
+    @staticmethod
+    def _classify_error(error: Exception) -> str:
+        """Classify an API error as rate_limit, network, auth or generic."""
         error_msg = str(error).lower()
-
-        # Classify error type
         if any(
             term in error_msg for term in ["rate limit", "quota", "too many requests"]
         ):
-            await self._handle_rate_limit_error(attempt, max_retries)
-        elif any(term in error_msg for term in ["network", "connection", "timeout"]):
-            await self._handle_network_error(error, attempt, max_retries)
-        elif any(
+            return "rate_limit"
+        if any(term in error_msg for term in ["network", "connection", "timeout"]):
+            return "network"
+        if any(
             term in error_msg for term in ["authentication", "api key", "unauthorized"]
         ):
+            return "auth"
+        return "generic"
+
+    def _cool_down_failed_key(self, key_index: int, error: Exception) -> None:
+        """Take a key out of rotation if its error says it cannot be used now."""
+        kind = self._classify_error(error)
+        if kind == "rate_limit":
+            self.key_pool.cool_down(key_index, self.rate_limit_cooldown)
+        elif kind == "auth":
+            self.key_pool.cool_down(key_index, AUTH_ERROR_COOLDOWN, reason="rejected")
+
+    async def _handle_api_error(self, error: Exception, attempt: int, max_retries: int):
+        """Handle API errors with appropriate recovery strategies."""
+        kind = self._classify_error(error)
+
+        if kind == "rate_limit":
+            await self._handle_rate_limit_error(attempt, max_retries)
+        elif kind == "network":
+            await self._handle_network_error(error, attempt, max_retries)
+        elif kind == "auth":
             await self._handle_auth_error(error, attempt, max_retries)
         else:
             await self._handle_generic_error(error, attempt, max_retries)
 
     async def _handle_rate_limit_error(self, attempt: int, max_retries: int):
-        """Handle rate limit errors with key rotation."""
-        self.rate_limit_reset_times[self.current_key_index] = (
-            time.time() + 3600
-        )  # 1 hour cooldown
-
-        logger.warning(f"Rate limit hit on key {self.current_key_index}, rotating...")
-
-        if not await self.rotate_api_key():
-            if attempt < max_retries - 1:
-                # Wait before final attempt
-                await asyncio.sleep(min(2**attempt, 30))
-            raise AIProviderError(
-                "All Gemini API keys are rate limited",
-                provider="gemini",
-                is_rate_limit=True,
-            )
+        """Handle rate limit errors; the failed key is already cooling down."""
+        if self.key_pool.available_keys():
+            logger.warning("Gemini rate limit hit, retrying on another key")
+            return
+
+        raise AIProviderError(
+            "All Gemini API keys are rate limited",
+            provider="gemini",
+            is_rate_limit=True,
+        )
 
     async def _handle_network_error(
         self, error: Exception, attempt: int, max_retries: int
@@ -333,10 +581,8 @@ class GeminiProvider(AIProvider):
             auth_error, component="gemini_provider", operation="generate_response"
         )
 
-        # Try rotating key in case current key is invalid
-        if attempt < max_retries - 1:
-            await self.rotate_api_key()
-        else:
+        # The rejected key is cooling down; retry on another one
+        if attempt >= max_retries - 1 or not self.key_pool.available_keys():
             raise auth_error
 
     async def _handle_generic_error(
@@ -397,8 +643,7 @@ class GeminiProvider(AIProvider):
 
     def _is_key_rate_limited(self, key_index: int) -> bool:
         """Check if API key is currently rate limited."""
-        reset_time = self.rate_limit_reset_times.get(key_index, 0)
-        return time.time() < reset_time
+        return self.key_pool.is_cooling_down(key_index)
 
     def _build_conversation_context(
         self,
@@ -460,9 +705,8 @@ class GeminiProvider(AIProvider):
             # Use a simple prompt to test content safety
             test_prompt = f"Please respond to this message: {content}"
 
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
+            response = await run_blocking(
+                LLM_POOL,
                 lambda: self.model.generate_content(
                     test_prompt, safety_settings=self.safety_settings
                 ),
@@ -492,11 +736,8 @@ class GeminiProvider(AIProvider):
         """
         try:
             # Use a simple test prompt
-            loop = asyncio.get_event_loop()
             response = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None, lambda: self.model.generate_content("Hello")
-                ),
+                run_blocking(HEALTH_POOL, lambda: self.model.generate_content("Hello")),
                 timeout=10.0,
             )
 
@@ -0,0 +1,136 @@
+"""
+Hedged requests for AI providers.
+If a request has not answered within the recent p95 latency, a second copy
+is sent elsewhere and whichever answers first is used.
+"""
+
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class LatencyTracker:
+    """Rolling window of request latencies used to pick the hedge delay."""
+
+    def __init__(
+        self,
+        window: int = 200,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.2,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of recent latencies kept
+            percentile: Latency percentile after which a request is hedged
+            min_samples: Samples needed before the percentile is trusted
+            initial_delay: Hedge delay used until there are enough samples
+            min_delay: Lower bound for the hedge delay
+        """
+        self.percentile = min(max(percentile, 0.0), 1.0)
+        self.min_samples = max(1, min_samples)
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self._samples: deque = deque(maxlen=max(1, window))
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float:
+        """
+        Latency at quantile ``q`` of the window (nearest rank).
+
+        Returns:
+            float: Seconds, or 0.0 with no samples
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(q * len(ordered)))
+        return ordered[rank - 1]
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait before sending a hedge request."""
+        if len(self._samples) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, self.quantile(self.percentile))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get latency statistics.
+
+        Returns:
+            Dict[str, Any]: Sample count, p50/p95/p99 and current hedge delay
+        """
+        return {
+            "samples": len(self._samples),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "hedge_delay": self.hedge_delay(),
+        }
+
+
+@dataclass
+class HedgeStats:
+    """Counters describing hedging behaviour."""
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+
+async def hedged(
+    primary: Awaitable[Any],
+    start_hedge: Callable[[], Awaitable[Any]],
+    delay: float,
+) -> Tuple[Any, bool]:
+    """
+    Await ``primary``, racing it against a hedge if it is slow.
+
+    The hedge is started after ``delay`` seconds. The first successful result
+    wins and the other request is cancelled. If one request fails, the other
+    is still awaited; if both fail, the primary's error is raised.
+
+    Args:
+        primary: The original request
+        start_hedge: Starts the hedge request
+        delay: Seconds to wait before hedging
+
+    Returns:
+        Tuple[Any, bool]: The result and whether the hedge produced it
+    """
+    primary_task = asyncio.ensure_future(primary)
+    hedge_task = None
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done:
+            return primary_task.result(), False
+
+        hedge_task = asyncio.ensure_future(start_hedge())
+        pending = {primary_task, hedge_task}
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), task is hedge_task
+
+        # Both failed
+        return primary_task.result(), False
+    finally:
+        for task in (primary_task, hedge_task):
+            if task is None:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Don't leave a failed loser's exception unretrieved
+                task.exception()
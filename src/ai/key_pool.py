@@ -0,0 +1,277 @@
+"""
+API key pool for providers with per-key quotas.
+Each key gets its own client and a token bucket sized to its request quota;
+concurrent requests are spread across keys by remaining capacity.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Collection, Dict, List, Optional
+
+from src.error_handling.exceptions import AIProviderError
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens if available.
+
+        Args:
+            tokens: Tokens to take
+
+        Returns:
+            bool: True if the tokens were taken
+        """
+        self._refill()
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+    def time_until(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` are available (0 if they are now)."""
+        self._refill()
+        missing = tokens - self._tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+
+@dataclass
+class KeySlot:
+    """One API key with its client, quota and usage."""
+
+    index: int
+    api_key: str
+    bucket: TokenBucket
+    client: Any = None
+    in_flight: int = 0
+    requests: int = 0
+    cooldowns: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert slot usage to a dictionary (without the key)."""
+        return {
+            "index": self.index,
+            "tokens": round(self.bucket.tokens, 2),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "cooldowns": self.cooldowns,
+        }
+
+
+@dataclass
+class KeyPoolStats:
+    """Counters describing key pool behaviour."""
+
+    leases: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    exhausted: int = 0
+
+
+class KeyPool:
+    """
+    Dispatches requests across API keys.
+
+    A lease picks the usable key with the most spare capacity (bucket tokens
+    minus requests in flight), so concurrent requests land on different keys.
+    Keys that report a rate limit are cooled down until their reset time. When
+    no key has a token the lease waits for the earliest refill, up to
+    ``max_wait`` seconds.
+    """
+
+    def __init__(
+        self,
+        api_keys: List[str],
+        client_factory: Callable[[str], Any],
+        requests_per_minute: float = 15.0,
+        burst: Optional[float] = None,
+        max_wait: float = 10.0,
+        provider: str = "gemini",
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            api_keys: API keys, in configuration order
+            client_factory: Creates the client for a key on first use
+            requests_per_minute: Request quota of each key
+            burst: Requests a key may send back to back (default: one minute's quota)
+            max_wait: Longest a lease waits for capacity before failing
+            provider: Provider name reported in errors
+            clock: Monotonic time source for the buckets
+            wall_clock: Wall-clock time source for cooldown deadlines
+        """
+        if not api_keys:
+            raise ValueError("At least one API key is required")
+
+        rate = max(requests_per_minute, 0.0) / 60.0
+        capacity = burst if burst is not None else requests_per_minute
+        self.slots = [
+            KeySlot(index=i, api_key=key, bucket=TokenBucket(rate, capacity, clock))
+            for i, key in enumerate(api_keys)
+        ]
+        self.max_wait = max_wait
+        self.provider = provider
+        self.stats = KeyPoolStats()
+        # Wall-clock time each rate-limited key becomes usable again
+        self.cooldown_until: Dict[int, float] = {}
+
+        self._client_factory = client_factory
+        self._wall_clock = wall_clock
+
+    def is_cooling_down(self, index: int) -> bool:
+        """Whether a key is cooling down."""
+        reset_time = self.cooldown_until.get(index)
+        if reset_time is None:
+            return False
+        if self._wall_clock() >= reset_time:
+            del self.cooldown_until[index]
+            return False
+        return True
+
+    def cool_down(self, index: int, seconds: float, reason: str = "rate limited") -> None:
+        """
+        Stop using a key for a while, e.g. after it reported a rate limit.
+
+        Args:
+            index: Key index
+            seconds: Cooldown length
+            reason: Why the key is cooling down (for logs)
+        """
+        self.cooldown_until[index] = self._wall_clock() + seconds
+        self.slots[index].cooldowns += 1
+        logger.warning(f"API key {index} {reason}; cooling down for {seconds:.0f}s")
+
+    def available_keys(self) -> int:
+        """Number of keys not cooling down."""
+        return sum(1 for slot in self.slots if not self.is_cooling_down(slot.index))
+
+    def client_for(self, slot: KeySlot) -> Any:
+        """Get (creating on first use) the client bound to a key."""
+        if slot.client is None:
+            slot.client = self._client_factory(slot.api_key)
+        return slot.client
+
+    @asynccontextmanager
+    async def lease(
+        self, exclude: Collection[int] = (), max_wait: Optional[float] = None
+    ) -> AsyncIterator[KeySlot]:
+        """
+        Reserve a key for one request.
+
+        Args:
+            exclude: Key indexes not to use (e.g. the key a request is already on)
+            max_wait: Override for how long to wait for capacity
+
+        Yields:
+            KeySlot: The chosen key
+
+        Raises:
+            AIProviderError: If every key is cooling down or no capacity frees
+                up within ``max_wait``
+        """
+        slot = await self._acquire(
+            exclude, self.max_wait if max_wait is None else max_wait
+        )
+        slot.in_flight += 1
+        slot.requests += 1
+        self.stats.leases += 1
+        try:
+            yield slot
+        finally:
+            slot.in_flight -= 1
+
+    async def _acquire(self, exclude: Collection[int], max_wait: float) -> KeySlot:
+        waited = 0.0
+        while True:
+            usable = [
+                s
+                for s in self.slots
+                if s.index not in exclude and not self.is_cooling_down(s.index)
+            ]
+            if not usable:
+                self.stats.exhausted += 1
+                raise AIProviderError(
+                    "All API keys are rate limited",
+                    provider=self.provider,
+                    is_rate_limit=True,
+                )
+
+            # Most spare capacity first; configuration order breaks ties
+            for slot in sorted(usable, key=lambda s: s.in_flight - s.bucket.tokens):
+                if slot.bucket.try_acquire():
+                    if waited:
+                        self.stats.waits += 1
+                        self.stats.wait_seconds += waited
+                    return slot
+
+            delay = min(s.bucket.time_until() for s in usable)
+            if waited + delay > max_wait:
+                self.stats.exhausted += 1
+                raise AIProviderError(
+                    "API key quota exhausted",
+                    provider=self.provider,
+                    is_rate_limit=True,
+                    details={"retry_after": delay},
+                )
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict[str, Any]: Lease/wait counters and per-key usage
+        """
+        return {
+            "keys": len(self.slots),
+            "available_keys": self.available_keys(),
+            "leases": self.stats.leases,
+            "waits": self.stats.waits,
+            "wait_seconds": self.stats.wait_seconds,
+            "exhausted": self.stats.exhausted,
+            "per_key": [slot.to_dict() for slot in self.slots],
+        }
@@ -0,0 +1,199 @@
+"""
+Asyncio-native HTTP transport for the Ollama REST API.
+Keeps one pooled keep-alive aiohttp session per event loop so concurrent
+requests share connections instead of each occupying a worker thread.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from src.error_handling.exceptions import AIProviderError, NetworkError
+
+logger = logging.getLogger(__name__)
+
+
+class OllamaHTTPClient:
+    """
+    Minimal async client for Ollama's ``/api/chat`` and ``/api/tags``.
+
+    Responses use the same dict shapes as the ``ollama`` Python package, so
+    callers can switch transports without changing how results are read.
+    """
+
+    def __init__(
+        self,
+        host: str = "http://localhost:11434",
+        max_connections: int = 32,
+        keepalive_timeout: float = 60.0,
+        read_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the client. The HTTP session is created on first use.
+
+        Args:
+            host: Ollama server base URL
+            max_connections: Connection pool size
+            keepalive_timeout: Seconds an idle pooled connection stays open
+            read_timeout: Max seconds between received chunks (None = no limit)
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp library is required for OllamaHTTPClient")
+
+        self.host = host.rstrip("/")
+        self.max_connections = max(1, max_connections)
+        self.keepalive_timeout = keepalive_timeout
+        self.read_timeout = read_timeout
+
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def chat(
+        self, model: str, messages: List[Dict[str, str]], **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Run a non-streaming chat completion.
+
+        Args:
+            model: Model name
+            messages: Chat messages (``role``/``content`` dicts)
+            **options: Extra request fields (``options``, ``keep_alive``, ...)
+
+        Returns:
+            Dict[str, Any]: Ollama response with ``message.content``
+        """
+        payload = {"model": model, "messages": messages, "stream": False, **options}
+        return await self._request("POST", "/api/chat", payload)
+
+    async def stream_chat(
+        self, model: str, messages: List[Dict[str, str]], **options: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion as parsed NDJSON parts.
+
+        Args:
+            model: Model name
+            messages: Chat messages (``role``/``content`` dicts)
+            **options: Extra request fields (``options``, ``keep_alive``, ...)
+
+        Yields:
+            Dict[str, Any]: Response parts, the last one with ``done: true``
+        """
+        payload = {"model": model, "messages": messages, "stream": True, **options}
+        session = self._get_session()
+
+        try:
+            async with session.post(self.host + "/api/chat", json=payload) as response:
+                await self._raise_for_status(response)
+
+                buffer = b""
+                async for data in response.content.iter_any():
+                    buffer += data
+                    *lines, buffer = buffer.split(b"\n")
+                    for line in lines:
+                        part = self._parse_line(line)
+                        if part is not None:
+                            yield part
+
+                part = self._parse_line(buffer)
+                if part is not None:
+                    yield part
+        except aiohttp.ClientError as e:
+            raise self._network_error(e, "stream_chat") from e
+
+    async def list(self) -> Dict[str, Any]:
+        """
+        List locally available models.
+
+        Returns:
+            Dict[str, Any]: ``{"models": [{"name": ...}, ...]}``
+        """
+        return await self._request("GET", "/api/tags")
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the session for the running loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            # Sessions are bound to the loop they were created on
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=self.read_timeout),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _request(
+        self, method: str, path: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a request and decode the JSON response."""
+        session = self._get_session()
+        try:
+            async with session.request(
+                method, self.host + path, json=payload
+            ) as response:
+                await self._raise_for_status(response)
+                return await response.json(content_type=None)
+        except aiohttp.ClientError as e:
+            raise self._network_error(e, path) from e
+
+    async def _raise_for_status(self, response: "aiohttp.ClientResponse") -> None:
+        """Raise AIProviderError for non-2xx responses, keeping Ollama's message."""
+        if response.status < 400:
+            return
+
+        text = await response.text()
+        try:
+            message = json.loads(text).get("error", text)
+        except (ValueError, AttributeError):
+            message = text
+        raise AIProviderError(
+            f"Ollama HTTP {response.status}: {message}",
+            provider="ollama",
+            error_code=str(response.status),
+            details={"host": self.host},
+        )
+
+    def _network_error(self, error: Exception, operation: str) -> NetworkError:
+        return NetworkError(
+            f"Ollama connection error: {error}",
+            operation=operation,
+            endpoint=self.host,
+        )
+
+    @staticmethod
+    def _parse_line(line: bytes) -> Optional[Dict[str, Any]]:
+        """Parse one NDJSON line, raising on in-stream errors."""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            part = json.loads(line)
+        except ValueError:
+            logger.warning(f"Skipping malformed Ollama stream line: {line[:80]!r}")
+            return None
+        if "error" in part:
+            raise AIProviderError(
+                f"Ollama stream error: {part['error']}", provider="ollama"
+            )
+        return part
@@ -6,8 +6,12 @@ Provides unrestricted content processing with no filtering.
 import asyncio
 import logging
 import time
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, AsyncIterator, TYPE_CHECKING
 from .base_provider import AIProvider, Message
+from .ollama_http import OllamaHTTPClient
+from .prompt_budget import arrange_prompt
+from .single_flight import request_key
 
 if TYPE_CHECKING:
     from .base_provider import MemoryContext
@@ -17,6 +21,7 @@ try:
 except ImportError:
     ollama = None
 
+from src.config.executors import HEALTH_POOL, LLM_POOL, run_blocking
 from src.error_handling.exceptions import AIProviderError, NetworkError
 from src.error_handling.fallback_manager import get_fallback_manager, FallbackStrategy
 from src.error_handling.error_recovery import get_recovery_manager, RecoveryStrategy
@@ -25,6 +30,36 @@ from src.error_handling.logging_handler import get_error_logger
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PromptEvalStats:
+    """Prompt evaluation work reported by Ollama."""
+
+    requests: int = 0
+    prompt_tokens: int = 0
+    prompt_seconds: float = 0.0
+
+    def record(self, response: Any) -> None:
+        """Record the prompt evaluation counters of a final response part."""
+        count = response.get("prompt_eval_count")
+        if not isinstance(count, int):
+            return
+        duration = response.get("prompt_eval_duration")
+        self.requests += 1
+        self.prompt_tokens += count
+        self.prompt_seconds += duration / 1e9 if isinstance(duration, int) else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to a dictionary."""
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "prompt_seconds": self.prompt_seconds,
+            "avg_prompt_tokens": (
+                self.prompt_tokens / self.requests if self.requests else 0.0
+            ),
+        }
+
+
 class OllamaProvider(AIProvider):
     """Ollama provider for local LLM processing with no content restrictions."""
 
@@ -36,14 +71,31 @@ class OllamaProvider(AIProvider):
             config: Configuration dictionary containing:
                 - model: Ollama model name (default: 'llama3')
                 - host: Ollama server host (default: 'http://localhost:11434')
+                - transport: 'sdk' (ollama package on worker threads, default)
+                  or 'http' (pooled asyncio HTTP client)
+                - max_connections: HTTP connection pool size (default: 32)
+                - keep_alive: How long Ollama keeps the model loaded after a
+                  request, e.g. '30m' or -1 for forever (default: server setting)
+                - num_ctx: Context window to request; keeping it fixed avoids
+                  model reloads and prompt truncation (default: server setting)
+                - prompt_layout: 'stable' (personality first, memory context
+                  last, default) or 'legacy' (memory context first)
         """
         super().__init__(config)
 
-        if ollama is None:
-            raise ImportError("ollama library is required for OllamaProvider")
-
         self.model = config.get("model", "llama3")
         self.host = config.get("host", "http://localhost:11434")
+        self.transport = config.get("transport", "sdk")
+        self.keep_alive = config.get("keep_alive") or None
+        if isinstance(self.keep_alive, str) and self.keep_alive.lstrip("-").isdigit():
+            # Bare numbers are seconds; Ollama only accepts them as JSON numbers
+            self.keep_alive = int(self.keep_alive)
+        self.num_ctx = int(config.get("num_ctx") or 0)
+        self.prompt_layout = config.get("prompt_layout", "stable")
+        self.prompt_eval = PromptEvalStats()
+
+        if self.transport != "http" and ollama is None:
+            raise ImportError("ollama library is required for OllamaProvider")
 
         # Error handling components
         self.fallback_manager = get_fallback_manager()
@@ -56,7 +108,15 @@ class OllamaProvider(AIProvider):
         self.connection_timeout = 30.0
 
         # Configure ollama client
-        if self.host != "http://localhost:11434":
+        self.http_client: Optional[OllamaHTTPClient] = None
+        if self.transport == "http":
+            self.http_client = OllamaHTTPClient(
+                host=self.host,
+                max_connections=config.get("max_connections", 32),
+                read_timeout=self.connection_timeout,
+            )
+            self.client = None
+        elif self.host != "http://localhost:11434":
             self.client = ollama.Client(host=self.host)
         else:
             self.client = ollama
@@ -64,7 +124,9 @@ class OllamaProvider(AIProvider):
         # Register with error recovery system
         self._register_error_recovery()
 
-        logger.info(f"Initialized OllamaProvider with model: {self.model}")
+        logger.info(
+            f"Initialized OllamaProvider with model: {self.model} ({self.transport} transport)"
+        )
 
     async def generate_response(
         self,
@@ -83,6 +145,12 @@ class OllamaProvider(AIProvider):
         Returns:
             Generated response string
         """
+        cached = self.get_cached_response(
+            messages, personality, memory_context, fast_path=True
+        )
+        if cached:
+            return cached
+
         result = await self.fallback_manager.execute_with_fallback(
             component="ollama_provider",
             primary_operation=self._generate_response_internal,
@@ -91,7 +159,9 @@ class OllamaProvider(AIProvider):
                 "user_message": messages[-1].content if messages else "",
                 "retry_operation": self._generate_response_internal,
                 "max_retries": 3,
-                "cache_key": f"ollama:{hash(str(messages[-1].content if messages else ''))}",
+                "cached_response": lambda: self.get_cached_response(
+                    messages, personality, memory_context
+                ),
             },
         )
 
@@ -129,14 +199,15 @@ class OllamaProvider(AIProvider):
                     and "content" in response["message"]
                 ):
                     content = response["message"]["content"]
+                    self.prompt_eval.record(response)
                     if content:
                         self.consecutive_failures = 0
                         self.last_successful_request = time.time()
                         await self.recovery_manager.record_success("ollama_provider")
 
-                        # Cache successful response
-                        cache_key = f"ollama:{hash(str(ollama_messages))}"
-                        self.fallback_manager.cache_response(cache_key, content)
+                        self.cache_generated_response(
+                            messages, personality, memory_context, content
+                        )
 
                         return content
 
@@ -164,6 +235,74 @@ class OllamaProvider(AIProvider):
             details={"host": self.host, "model": self.model},
         )
 
+    async def stream_response(
+        self,
+        messages: List[Message],
+        personality: str = None,
+        memory_context: Optional["MemoryContext"] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream response tokens from Ollama as they are generated.
+
+        If the stream fails before producing any text, the regular
+        ``generate_response`` path (with retries and fallbacks) is used instead.
+        Failures after the first chunk end the stream early.
+
+        Args:
+            messages: Conversation history
+            personality: Personality prompt to inject (optional if processor handles it)
+            memory_context: Memory context from previous conversations (optional)
+
+        Yields:
+            Response text chunks
+        """
+        cached = self.get_cached_response(
+            messages, personality, memory_context, fast_path=True
+        )
+        if cached:
+            yield cached
+            return
+
+        ollama_messages = self._build_ollama_messages(
+            messages, personality, memory_context
+        )
+        chunks: List[str] = []
+
+        try:
+            async for part in self._stream_parts(ollama_messages):
+                if part.get("done"):
+                    self.prompt_eval.record(part)
+                content = (part.get("message") or {}).get("content", "")
+                if content:
+                    chunks.append(content)
+                    yield content
+        except Exception as e:
+            if not chunks:
+                logger.warning(f"Ollama stream failed before first token: {e}")
+                yield await self.generate_response(
+                    messages, personality, memory_context
+                )
+                return
+
+            self.consecutive_failures += 1
+            await self.recovery_manager.record_error(
+                "ollama_provider",
+                AIProviderError(f"Ollama stream interrupted: {e}", provider="ollama"),
+            )
+            return
+
+        if not chunks:
+            yield await self.generate_response(messages, personality, memory_context)
+            return
+
+        self.consecutive_failures = 0
+        self.last_successful_request = time.time()
+        await self.recovery_manager.record_success("ollama_provider")
+
+        self.cache_generated_response(
+            messages, personality, memory_context, "".join(chunks)
+        )
+
     def _build_ollama_messages(
         self,
         messages: List[Message],
@@ -171,36 +310,112 @@ class OllamaProvider(AIProvider):
         memory_context: Optional["MemoryContext"] = None,
     ) -> List[Dict[str, str]]:
         """Build Ollama message format."""
-        ollama_messages = []
-
-        # Add memory context as system message if available
+        # Memory context as a system message if available
+        context_message = None
         if memory_context and not self.personality_processor:
             context_content = memory_context.format_for_ai()
             if context_content:
-                ollama_messages.append(
-                    {
-                        "role": "system",
-                        "content": f"Context from previous conversations:\n{context_content}",
-                    }
-                )
+                context_message = {
+                    "role": "system",
+                    "content": f"Context from previous conversations:\n{context_content}",
+                }
 
-        # Add personality as system message if provided and no processor is handling it
+        # Personality as system message if provided and no processor is handling it
+        system_messages = []
         if personality and not self.personality_processor:
-            ollama_messages.append({"role": "system", "content": personality})
+            system_messages.append({"role": "system", "content": personality})
 
-        # Add conversation messages
-        for msg in messages:
-            ollama_messages.append({"role": msg.role, "content": msg.content})
+        conversation = [{"role": msg.role, "content": msg.content} for msg in messages]
 
-        return ollama_messages
+        return arrange_prompt(
+            system_messages, conversation, context_message, self.prompt_layout
+        )
 
-    async def _make_ollama_request(self, messages: List[Dict[str, str]]):
+    async def _make_ollama_request(
+        self, messages: List[Dict[str, str]], **options: Any
+    ):
         """Make Ollama API request with proper error handling."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, lambda: self.client.chat(model=self.model, messages=messages)
+        options = self._request_options(options)
+        key = request_key("ollama", self.model, messages, options)
+        return await self.single_flight.run(
+            key, lambda: self._send_chat(messages, options)
         )
 
+    async def _send_chat(self, messages: List[Dict[str, str]], options: Dict[str, Any]):
+        """Send one non-streaming chat request over the configured transport."""
+        if self.http_client is not None:
+            return await self.http_client.chat(
+                model=self.model, messages=messages, **options
+            )
+        return await run_blocking(
+            LLM_POOL,
+            lambda: self.client.chat(model=self.model, messages=messages, **options),
+        )
+
+    def _stream_parts(self, messages: List[Dict[str, str]]) -> AsyncIterator[Any]:
+        """Stream raw Ollama response parts over the configured transport."""
+        options = self._request_options({})
+        if self.http_client is not None:
+            return self.http_client.stream_chat(
+                model=self.model, messages=messages, **options
+            )
+        return self._iterate_blocking(
+            lambda: self.client.chat(
+                model=self.model, messages=messages, stream=True, **options
+            ),
+            timeout=self.connection_timeout,
+        )
+
+    def _request_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the configured keep_alive and context size to request options."""
+        if self.keep_alive is not None:
+            options.setdefault("keep_alive", self.keep_alive)
+        if self.num_ctx:
+            # A different num_ctx than the loaded model's makes Ollama reload it
+            model_options = dict(options.get("options") or {})
+            model_options.setdefault("num_ctx", self.num_ctx)
+            options["options"] = model_options
+        return options
+
+    def get_prompt_eval_stats(self) -> Dict[str, Any]:
+        """
+        Get prompt evaluation statistics reported by Ollama.
+
+        Tokens served from Ollama's prompt cache are not evaluated, so a
+        stable prompt prefix shows up as a low ``avg_prompt_tokens``.
+
+        Returns:
+            Dict[str, Any]: Request count and prompt tokens/seconds evaluated
+        """
+        return self.prompt_eval.to_dict()
+
+    async def warmup(self) -> Dict[str, float]:
+        """
+        Load the model into Ollama's memory and run a one-token generation.
+
+        Returns:
+            Dict[str, float]: Seconds spent per phase (``model_load``, ``first_generation``)
+        """
+        timings: Dict[str, float] = {}
+
+        # An empty message list makes Ollama load the model without generating
+        started = time.monotonic()
+        await self._make_ollama_request([])
+        timings["model_load"] = time.monotonic() - started
+
+        started = time.monotonic()
+        await self._make_ollama_request(
+            [{"role": "user", "content": "Hi"}], options={"num_predict": 1}
+        )
+        timings["first_generation"] = time.monotonic() - started
+
+        self.last_successful_request = time.time()
+        logger.info(
+            f"Warmed up Ollama model {self.model}: "
+            + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in timings.items())
+        )
+        return timings
+
     async def _handle_api_error(self, error: Exception, attempt: int, max_retries: int):
         """Handle API errors with appropriate recovery strategies."""
         self.consecutive_failures += 1
@@ -331,10 +546,11 @@ class OllamaProvider(AIProvider):
         """
         try:
             # Check server connection
-            loop = asyncio.get_event_loop()
-            models = await asyncio.wait_for(
-                loop.run_in_executor(None, lambda: self.client.list()), timeout=10.0
-            )
+            if self.http_client is not None:
+                list_models = self.http_client.list()
+            else:
+                list_models = run_blocking(HEALTH_POOL, lambda: self.client.list())
+            models = await asyncio.wait_for(list_models, timeout=10.0)
 
             # Check if our model is available
             if models and "models" in models:
@@ -356,6 +572,11 @@ class OllamaProvider(AIProvider):
             logger.error(f"Failed to connect to Ollama: {e}")
             return False
 
+    async def close(self) -> None:
+        """Close the pooled HTTP session, if any."""
+        if self.http_client is not None:
+            await self.http_client.close()
+
     def _register_error_recovery(self):
         """Register component with error recovery system."""
         self.recovery_manager.register_component(
@@ -11,6 +11,7 @@ from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 from enum import Enum
 from .base_provider import Message
+from .prompt_budget import arrange_prompt
 
 if TYPE_CHECKING:
     from .base_provider import MemoryContext
@@ -46,16 +47,24 @@ class ProcessedResponse:
 class PersonalityProcessor:
     """Handles personality injection and response processing for anime AI character."""
 
-    def __init__(self, personality_prompt: str, enable_content_filter: bool = True):
+    def __init__(
+        self,
+        personality_prompt: str,
+        enable_content_filter: bool = True,
+        prompt_layout: str = "stable",
+    ):
         """
         Initialize personality processor.
 
         Args:
             personality_prompt: Base personality prompt for the character
             enable_content_filter: Whether to enable content filtering
+            prompt_layout: "stable" (personality first, memory context last) or
+                "legacy" (memory context first)
         """
         self.personality_prompt = personality_prompt
         self.enable_content_filter = enable_content_filter
+        self.prompt_layout = prompt_layout
 
         # Anime-style language patterns
         self.anime_patterns = {
@@ -160,9 +169,8 @@ class PersonalityProcessor:
         Returns:
             Messages with personality system prompt and memory context injected
         """
-        processed_messages = []
-
-        # Add memory context as system message if available
+        # Memory context changes every turn; the layout decides where it goes
+        memory_message = None
         if memory_context:
             context_content = memory_context.format_for_ai()
             if context_content:
@@ -170,14 +178,11 @@ class PersonalityProcessor:
                     role="system",
                     content=f"Context from previous conversations:\n{context_content}",
                 )
-                processed_messages.append(memory_message)
 
-        # Add personality as system message
         personality_message = Message(role="system", content=self.personality_prompt)
-        processed_messages.append(personality_message)
-
-        # Add original messages
-        processed_messages.extend(messages)
+        processed_messages = arrange_prompt(
+            [personality_message], messages, memory_message, self.prompt_layout
+        )
 
         logger.debug(
             f"Injected personality prompt and memory context into {len(messages)} messages"
@@ -0,0 +1,315 @@
+"""
+Prompt size budgeting for AI providers.
+Fits the personality prompt, memory context and chat history into a token
+budget: the system prefix is kept intact, memories are trimmed to a share of
+the budget and the oldest turns are windowed out into a short summary.
+"""
+
+import dataclasses
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, TypeVar
+
+from src.ai.base_provider import Message
+
+# Rough per-message cost of role markers and separators in chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_HEADER = "Earlier in this conversation:"
+
+# "stable": personality, then history, then per-turn context before the last
+# user message, so consecutive turns share a prompt prefix the model server can
+# reuse from its KV cache. "legacy": per-turn context first.
+PROMPT_LAYOUTS = ("stable", "legacy")
+
+PromptMessage = TypeVar("PromptMessage")
+
+
+def _role(message: Any) -> str:
+    return message["role"] if isinstance(message, dict) else message.role
+
+
+def arrange_prompt(
+    system: Sequence[PromptMessage],
+    history: Sequence[PromptMessage],
+    context: Optional[PromptMessage] = None,
+    layout: str = "stable",
+) -> List[PromptMessage]:
+    """
+    Order system messages, per-turn context and history into a prompt.
+
+    Args:
+        system: Messages that are the same every turn (personality)
+        history: Conversation messages, oldest first
+        context: Message that changes every turn (memory context), if any
+        layout: "stable" or "legacy" (see ``PROMPT_LAYOUTS``)
+
+    Returns:
+        List: Messages in prompt order (Message objects or role/content dicts)
+    """
+    if context is None:
+        return [*system, *history]
+    if layout == "legacy":
+        return [context, *system, *history]
+
+    # Volatile context goes right before the newest user message
+    last_user = next(
+        (i for i in range(len(history) - 1, -1, -1) if _role(history[i]) == "user"),
+        len(history),
+    )
+    return [*system, *history[:last_user], context, *history[last_user:]]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the token count of a text.
+
+    Uses ~4 characters per token, which is close for English with both the
+    Llama and Gemini tokenizers and needs no model-specific vocabulary.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    if not text:
+        return 0
+    return (len(text) + 3) // 4
+
+
+def estimate_message_tokens(message: Message) -> int:
+    """Estimate the tokens a chat message takes, including overhead."""
+    return estimate_tokens(message.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class PromptStats:
+    """Size of one assembled prompt."""
+
+    budget: int
+    personality_tokens: int = 0
+    memory_tokens: int = 0
+    history_tokens: int = 0
+    summary_tokens: int = 0
+    kept_messages: int = 0
+    dropped_messages: int = 0
+    dropped_memories: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens of the whole prompt."""
+        return (
+            self.personality_tokens
+            + self.memory_tokens
+            + self.history_tokens
+            + self.summary_tokens
+        )
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the prompt still exceeds the budget (e.g. one huge message)."""
+        return bool(self.budget) and self.total_tokens > self.budget
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to a dictionary."""
+        data = dataclasses.asdict(self)
+        data["total_tokens"] = self.total_tokens
+        data["over_budget"] = self.over_budget
+        return data
+
+
+@dataclass
+class AssembledPrompt:
+    """Provider inputs that fit the budget."""
+
+    messages: List[Message]
+    memory_context: Any
+    stats: PromptStats
+
+
+class PromptAssembler:
+    """
+    Fits provider inputs into a token budget.
+
+    The personality prompt and leading system messages form a stable prefix
+    and are never cut. Memory context is limited to ``memory_share`` of the
+    budget by dropping its lowest-ranked memories. Chat history is windowed
+    from the newest turn backwards; the final ``min_recent_messages`` are
+    always kept and older turns that do not fit are replaced by a short
+    extractive summary of at most ``summary_tokens``. Turns are dropped in
+    blocks of ``window_step`` so the prompt prefix stays identical for
+    several turns instead of shifting on every one.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 4096,
+        reserve_tokens: int = 512,
+        memory_share: float = 0.25,
+        min_recent_messages: int = 2,
+        summary_tokens: int = 200,
+        window_step: int = 8,
+    ):
+        """
+        Initialize the assembler.
+
+        Args:
+            max_tokens: Context size to fit into (0 = unlimited)
+            reserve_tokens: Tokens left free for the reply
+            memory_share: Largest fraction of the budget memory context may use
+            min_recent_messages: Newest messages always sent
+            summary_tokens: Size of the summary of dropped turns (0 = no summary)
+            window_step: Messages are dropped in multiples of this, so the
+                window start (and the prompt prefix) only moves every few turns
+        """
+        self.max_tokens = max(0, max_tokens)
+        self.reserve_tokens = max(0, reserve_tokens)
+        self.memory_share = min(max(0.0, memory_share), 1.0)
+        self.min_recent_messages = max(1, min_recent_messages)
+        self.summary_tokens = max(0, summary_tokens)
+        self.window_step = max(1, window_step)
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def budget(self) -> int:
+        """Tokens available for the prompt (0 = unlimited)."""
+        if not self.max_tokens:
+            return 0
+        return max(1, self.max_tokens - self.reserve_tokens)
+
+    def assemble(
+        self,
+        messages: List[Message],
+        personality: Optional[str] = None,
+        memory_context: Any = None,
+    ) -> AssembledPrompt:
+        """
+        Fit a turn's prompt inputs into the budget.
+
+        Args:
+            messages: Conversation messages, oldest first
+            personality: Personality prompt
+            memory_context: Memory context for the turn
+
+        Returns:
+            AssembledPrompt: Messages and memory context to send, with sizes
+        """
+        budget = self.budget
+        stats = PromptStats(budget=budget)
+        stats.personality_tokens = estimate_tokens(personality or "")
+
+        # Leading system messages belong to the stable prefix
+        prefix_end = 0
+        while prefix_end < len(messages) and messages[prefix_end].role == "system":
+            prefix_end += 1
+        prefix, history = list(messages[:prefix_end]), list(messages[prefix_end:])
+        stats.personality_tokens += sum(estimate_message_tokens(m) for m in prefix)
+
+        if budget:
+            memory_context, stats.dropped_memories = self._trim_memory(
+                memory_context, int(budget * self.memory_share)
+            )
+        stats.memory_tokens = self._memory_tokens(memory_context)
+
+        if not budget:
+            kept, dropped = history, []
+        else:
+            remaining = budget - stats.personality_tokens - stats.memory_tokens
+            kept, dropped = self._window(history, remaining)
+
+        stats.kept_messages = len(kept)
+        stats.dropped_messages = len(dropped)
+        stats.history_tokens = sum(estimate_message_tokens(m) for m in kept)
+
+        summary = self._summarize(dropped)
+        if summary is not None:
+            prefix.append(summary)
+            stats.summary_tokens = estimate_message_tokens(summary)
+
+        if stats.dropped_messages or stats.dropped_memories:
+            self.logger.debug(
+                f"Prompt trimmed to {stats.total_tokens}/{budget} tokens: "
+                f"dropped {stats.dropped_messages} messages, "
+                f"{stats.dropped_memories} memories"
+            )
+
+        return AssembledPrompt(
+            messages=prefix + kept, memory_context=memory_context, stats=stats
+        )
+
+    def _window(self, history: List[Message], remaining: int):
+        """Keep the newest messages that fit; return (kept, dropped)."""
+        if sum(estimate_message_tokens(m) for m in history) <= remaining:
+            return history, []
+        # Something will be dropped, so leave room for its summary
+        if self.summary_tokens:
+            remaining -= self.summary_tokens + MESSAGE_OVERHEAD_TOKENS
+
+        start = len(history)
+        used = 0
+        while start > 0:
+            cost = estimate_message_tokens(history[start - 1])
+            protected = len(history) - start < self.min_recent_messages
+            if not protected and used + cost > remaining:
+                break
+            used += cost
+            start -= 1
+
+        # Round the cut up so the same turns stay dropped as the session grows
+        protected_start = max(0, len(history) - self.min_recent_messages)
+        start = min(-(-start // self.window_step) * self.window_step, protected_start)
+        start = max(start, 0)
+        return history[start:], history[:start]
+
+    def _summarize(self, dropped: List[Message]) -> Optional[Message]:
+        """Summarise dropped turns as a system message, preferring the newest."""
+        if not dropped or not self.summary_tokens:
+            return None
+
+        lines: List[str] = []
+        used = estimate_tokens(SUMMARY_HEADER)
+        for message in reversed(dropped):
+            if message.role == "system":
+                continue
+            speaker = "You" if message.role == "assistant" else "User"
+            text = " ".join(message.content.split())
+            if len(text) > 120:
+                text = text[:117].rstrip() + "..."
+            line = f"- {speaker}: {text}"
+            cost = estimate_tokens(line) + 1
+            if used + cost > self.summary_tokens:
+                break
+            lines.append(line)
+            used += cost
+
+        if not lines:
+            return None
+        lines.reverse()
+        return Message(role="system", content="\n".join([SUMMARY_HEADER, *lines]))
+
+    @staticmethod
+    def _memory_tokens(memory_context: Any) -> int:
+        formatter = getattr(memory_context, "format_for_ai", None)
+        if formatter is None:
+            return estimate_tokens(memory_context) if isinstance(memory_context, str) else 0
+        return estimate_tokens(formatter())
+
+    def _trim_memory(self, memory_context: Any, limit: int):
+        """Drop the lowest-ranked memories until the context fits ``limit``."""
+        memories = getattr(memory_context, "relevant_memories", None)
+        if (
+            not memories
+            or not dataclasses.is_dataclass(memory_context)
+            or self._memory_tokens(memory_context) <= limit
+        ):
+            return memory_context, 0
+
+        kept = list(memories)
+        trimmed = memory_context
+        while kept:
+            kept.pop()
+            trimmed = dataclasses.replace(memory_context, relevant_memories=list(kept))
+            if self._memory_tokens(trimmed) <= limit:
+                break
+        return trimmed, len(memories) - len(kept)
@@ -10,9 +10,13 @@ from .base_provider import AIProvider
 from .ollama_provider import OllamaProvider
 from .gemini_provider import GeminiProvider
 from .personality_processor import PersonalityProcessor
+from .response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Shared by every provider created in this process
+_response_cache: Optional[ResponseCache] = None
+
 
 class ProviderFactory:
     """Factory class for creating AI providers based on environment configuration."""
@@ -42,15 +46,49 @@ class ProviderFactory:
             provider.get_provider_name()
         )
         provider.set_personality_processor(personality_processor)
+        provider.set_response_cache(ProviderFactory.get_response_cache())
 
         return provider
 
+    @staticmethod
+    def get_response_cache() -> Optional[ResponseCache]:
+        """
+        Get the process-wide response cache, creating it from the environment.
+
+        Returns:
+            Optional[ResponseCache]: The cache, or None if RESPONSE_CACHE=false
+        """
+        global _response_cache
+        if os.getenv("RESPONSE_CACHE", "true").lower() != "true":
+            return None
+
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "1000")),
+                max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(4 * 1024 * 1024))),
+                ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+                similarity=float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0")),
+                fast_path=os.getenv("RESPONSE_CACHE_FAST_PATH", "false").lower()
+                == "true",
+                store_path=os.getenv("RESPONSE_CACHE_PATH", ""),
+                context_turns=int(os.getenv("RESPONSE_CACHE_CONTEXT_TURNS", "0")),
+            )
+        return _response_cache
+
     @staticmethod
     def _create_ollama_provider() -> OllamaProvider:
         """Create and configure Ollama provider."""
         config = {
             "model": os.getenv("OLLAMA_MODEL", "llama3"),
             "host": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+            "transport": os.getenv("OLLAMA_TRANSPORT", "sdk").lower(),
+            "max_connections": int(os.getenv("OLLAMA_MAX_CONNECTIONS", "32")),
+            "keep_alive": os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+            # Match the prompt budget unless set explicitly
+            "num_ctx": int(
+                os.getenv("OLLAMA_NUM_CTX") or os.getenv("PROMPT_MAX_TOKENS", "4096")
+            ),
+            "prompt_layout": os.getenv("PROMPT_LAYOUT", "stable").lower(),
         }
 
         logger.info(f"Creating Ollama provider with model: {config['model']}")
@@ -83,6 +121,12 @@ class ProviderFactory:
             "api_keys": api_keys,
             "model": os.getenv("GEMINI_MODEL", "gemini-pro"),
             "current_key_index": current_key_index,
+            "requests_per_minute": float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "15")),
+            "max_queue_wait": float(os.getenv("GEMINI_MAX_QUEUE_WAIT", "10")),
+            "rate_limit_cooldown": float(os.getenv("GEMINI_RATE_LIMIT_COOLDOWN", "60")),
+            "hedge_requests": os.getenv("GEMINI_HEDGE_REQUESTS", "false").lower()
+            == "true",
+            "hedge_percentile": float(os.getenv("GEMINI_HEDGE_PERCENTILE", "0.95")),
         }
 
         logger.info(f"Creating Gemini provider with {len(api_keys)} API keys")
@@ -108,6 +152,7 @@ class ProviderFactory:
                 {
                     "ollama_model": os.getenv("OLLAMA_MODEL", "llama3"),
                     "ollama_host": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+                    "ollama_transport": os.getenv("OLLAMA_TRANSPORT", "sdk").lower(),
                 }
             )
         else:
@@ -159,6 +204,10 @@ class ProviderFactory:
             if not host.startswith(("http://", "https://")):
                 errors.append("OLLAMA_HOST must be a valid HTTP/HTTPS URL")
 
+            transport = os.getenv("OLLAMA_TRANSPORT", "sdk").lower()
+            if transport not in ("sdk", "http"):
+                errors.append("OLLAMA_TRANSPORT must be 'sdk' or 'http'")
+
         else:
             # Validate Gemini configuration
             api_keys_str = os.getenv("GEMINI_API_KEYS")
@@ -220,4 +269,5 @@ class ProviderFactory:
         return PersonalityProcessor(
             personality_prompt=personality_prompt,
             enable_content_filter=enable_content_filter,
+            prompt_layout=os.getenv("PROMPT_LAYOUT", "stable").lower(),
         )
@@ -0,0 +1,402 @@
+"""
+Response cache for AI providers.
+Stores generated replies under a stable hash of the normalised final user
+utterance, the model, the personality, the user and a bounded window of the
+preceding conversation, with LRU + TTL eviction bounded by entry count and
+bytes. Can persist entries in SQLite and match paraphrased final user messages.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional, Sequence, Set, Tuple
+
+PromptMessages = Sequence[Mapping[str, str]]
+
+_WORD_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS response_cache (
+    key TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    utterance TEXT NOT NULL,
+    response TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise text so case, punctuation and spacing differences share a key.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        str: Lowercase word tokens joined by single spaces
+    """
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def _digest(*parts: Any) -> str:
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _CachedResponse:
+    """A cached reply and what is needed to match and evict it."""
+
+    response: str
+    stored_at: float
+    size: int
+    scope: str
+    tokens: FrozenSet[str]
+
+
+@dataclass
+class ResponseCacheMetrics:
+    """Counters describing response cache behaviour."""
+
+    hits: int = 0
+    similar_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of provider replies.
+
+    The exact key is a SHA-256 of the model, the personality, the user, the
+    prompt's system messages, the last ``context_turns`` conversation
+    messages before the final user message and that message itself, all
+    after normalisation. Keying on a bounded window rather than the whole
+    history is what lets an utterance repeated later in a conversation hit.
+    With ``similarity`` above zero, a miss falls back to entries that share
+    everything but the final user message and whose final user message has
+    a token Jaccard similarity of at least ``similarity`` with the new one.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 4 * 1024 * 1024,
+        ttl: float = 3600.0,
+        similarity: float = 0.0,
+        fast_path: bool = False,
+        store_path: str = "",
+        context_turns: int = 0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached replies held in memory
+            max_bytes: Maximum total UTF-8 size of replies held in memory
+            ttl: Seconds a reply stays valid (0 = forever)
+            similarity: Minimum Jaccard similarity for near-duplicate hits (0 = exact only)
+            fast_path: Whether providers may answer from the cache before generating
+            store_path: SQLite file for persistent entries (empty = memory only)
+            context_turns: Messages before the final user message that must
+                also match (0 = the utterance alone, per user)
+            clock: Wall-clock time source (persisted entries outlive the process)
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl = max(0.0, ttl)
+        self.similarity = min(max(0.0, similarity), 1.0)
+        self.fast_path = fast_path
+        self.context_turns = max(0, context_turns)
+        self.metrics = ResponseCacheMetrics()
+        self.logger = logging.getLogger(__name__)
+
+        self._clock = clock
+        self._entries: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._scopes: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if store_path:
+            self._open_store(store_path)
+
+    def get(
+        self,
+        model: str,
+        personality: Optional[str],
+        prompt: PromptMessages,
+        allow_similar: bool = True,
+        user_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Look up a cached reply.
+
+        Args:
+            model: Provider and model identifier
+            personality: Personality prompt (None if not used)
+            prompt: Prompt messages (``role``/``content`` mappings)
+            allow_similar: Whether near-duplicate matches may be returned
+            user_id: User the conversation is with (None = shared)
+
+        Returns:
+            Optional[str]: The cached reply, or None on a miss
+        """
+        key, scope, tokens = self._keys(model, personality, prompt, user_id)
+
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.metrics.hits += 1
+                return entry.response
+
+            response = self._load_from_store(key)
+            if response is not None:
+                self.metrics.store_hits += 1
+                return response
+
+            if allow_similar and self.similarity > 0 and tokens:
+                response = self._find_similar(scope, tokens)
+                if response is not None:
+                    self.metrics.similar_hits += 1
+                    return response
+
+            self.metrics.misses += 1
+            return None
+
+    def put(
+        self,
+        model: str,
+        personality: Optional[str],
+        prompt: PromptMessages,
+        response: str,
+        user_id: Optional[str] = None,
+    ) -> None:
+        """
+        Cache a reply.
+
+        Args:
+            model: Provider and model identifier
+            personality: Personality prompt (None if not used)
+            prompt: Prompt messages (``role``/``content`` mappings)
+            response: Reply to cache
+            user_id: User the conversation is with (None = shared)
+        """
+        if not response:
+            return
+
+        key, scope, tokens = self._keys(model, personality, prompt, user_id)
+        stored_at = self._clock()
+
+        with self._lock:
+            self._insert(key, _CachedResponse(response, stored_at, 0, scope, tokens))
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?)",
+                        (key, scope, " ".join(sorted(tokens)), response, stored_at),
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Failed to persist cached response: {e}")
+
+    def clear(self) -> None:
+        """Drop every cached reply, including persisted ones."""
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+            self._bytes = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM response_cache")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the persistent store."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Size, limits and hit/miss counters
+        """
+        with self._lock:
+            lookups = (
+                self.metrics.hits
+                + self.metrics.similar_hits
+                + self.metrics.store_hits
+                + self.metrics.misses
+            )
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "similarity": self.similarity,
+                "context_turns": self.context_turns,
+                "fast_path": self.fast_path,
+                "persistent": self._conn is not None,
+                "hits": self.metrics.hits,
+                "similar_hits": self.metrics.similar_hits,
+                "store_hits": self.metrics.store_hits,
+                "misses": self.metrics.misses,
+                "evictions": self.metrics.evictions,
+                "expirations": self.metrics.expirations,
+                "hit_rate": (lookups - self.metrics.misses) / lookups if lookups else 0.0,
+            }
+
+    def _keys(
+        self,
+        model: str,
+        personality: Optional[str],
+        prompt: PromptMessages,
+        user_id: Optional[str] = None,
+    ) -> Tuple[str, str, FrozenSet[str]]:
+        """Compute the exact key, the near-duplicate scope and the utterance tokens."""
+        normalized = [
+            (message.get("role", ""), normalize_text(message.get("content", "")))
+            for message in prompt
+        ]
+        personality_text = normalize_text(personality or "")
+
+        # The final user message is what paraphrases change
+        last_user = max(
+            (i for i, (role, _) in enumerate(normalized) if role == "user"),
+            default=None,
+        )
+        if last_user is None:
+            history, utterance, trailing = normalized, "", []
+        else:
+            history = normalized[:last_user]
+            utterance = normalized[last_user][1]
+            trailing = normalized[last_user + 1 :]
+
+        # Only a bounded window of the conversation goes into the key: the
+        # full history grows every turn, so it would never repeat
+        turns = [message for message in history if message[0] != "system"]
+        context = [
+            user_id or "",
+            [message for message in history if message[0] == "system"],
+            turns[len(turns) - self.context_turns :] if self.context_turns else [],
+            trailing,
+        ]
+
+        key = _digest(model, personality_text, context, utterance)
+        scope = _digest(model, personality_text, context)
+        return key, scope, frozenset(utterance.split())
+
+    def _live_entry(self, key: str) -> Optional[_CachedResponse]:
+        """Return an unexpired in-memory entry, dropping it if expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry.stored_at):
+            self._remove(key)
+            self.metrics.expirations += 1
+            return None
+        return entry
+
+    def _find_similar(self, scope: str, tokens: FrozenSet[str]) -> Optional[str]:
+        """Return the most similar in-scope reply above the threshold."""
+        best_key, best_score = None, self.similarity
+        for key in list(self._scopes.get(scope, ())):
+            entry = self._live_entry(key)
+            if entry is None or not entry.tokens:
+                continue
+            score = len(tokens & entry.tokens) / len(tokens | entry.tokens)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key].response
+
+    def _insert(self, key: str, entry: _CachedResponse) -> None:
+        """Add an entry, then evict least recently used ones over budget."""
+        if key in self._entries:
+            self._remove(key)
+
+        entry.size = len(entry.response.encode("utf-8"))
+        if entry.size > self.max_bytes:
+            return
+
+        self._entries[key] = entry
+        self._scopes.setdefault(entry.scope, set()).add(key)
+        self._bytes += entry.size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.metrics.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        keys = self._scopes.get(entry.scope)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scopes[entry.scope]
+
+    def _expired(self, stored_at: float) -> bool:
+        return bool(self.ttl) and self._clock() - stored_at > self.ttl
+
+    def _open_store(self, path: str) -> None:
+        """Open the SQLite store and drop expired rows."""
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            if self.ttl:
+                self._conn.execute(
+                    "DELETE FROM response_cache WHERE stored_at < ?",
+                    (self._clock() - self.ttl,),
+                )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Response cache store unavailable ({e}); using memory only")
+            self._conn = None
+
+    def _load_from_store(self, key: str) -> Optional[str]:
+        """Load an entry from the persistent store into memory."""
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT scope, utterance, response, stored_at FROM response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to read cached response: {e}")
+            return None
+
+        if row is None:
+            return None
+        scope, utterance, response, stored_at = row
+        if self._expired(stored_at):
+            return None
+
+        self._insert(
+            key,
+            _CachedResponse(response, stored_at, 0, scope, frozenset(utterance.split())),
+        )
+        return response
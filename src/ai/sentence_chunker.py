@@ -0,0 +1,126 @@
+"""
+Incremental sentence chunker for streamed AI responses.
+Cuts a token stream at sentence/clause boundaries so each segment can be
+sent to TTS and animated while the rest of the reply is still generating.
+"""
+
+import re
+from typing import List, Optional
+
+# Sentence terminators (ASCII and full-width), optionally followed by closing
+# quotes/brackets, and then whitespace. Requiring the trailing whitespace
+# avoids cutting inside "3.14" or an unfinished "..." still streaming in.
+_SENTENCE_END = re.compile(r"[.!?…。！？]+[\"'”’)\]]*(?=\s)")
+
+# Weaker clause boundaries, only used when a segment grows too long
+_CLAUSE_END = re.compile(r"[,;:—–]+(?=\s)")
+
+# Short tokens ending in "." that don't end a sentence
+_ABBREVIATIONS = {
+    "mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "etc.", "e.g.", "i.e.", "no.",
+}
+
+
+class SentenceChunker:
+    """
+    Accumulates streamed text and emits speakable segments.
+
+    A segment is released at the first sentence boundary once it holds at
+    least ``min_chars`` characters. If no sentence boundary appears before
+    ``max_chars``, the text is cut at the last clause boundary (or space)
+    instead, so TTS never waits on a run-on sentence.
+    """
+
+    def __init__(self, min_chars: int = 20, max_chars: int = 200):
+        """
+        Initialize the chunker.
+
+        Args:
+            min_chars: Minimum segment length; shorter sentences are merged forward
+            max_chars: Soft maximum segment length before clause-level cuts
+        """
+        self.min_chars = max(1, min_chars)
+        self.max_chars = max(self.min_chars, max_chars)
+        self._buffer = ""
+        self.segments_emitted = 0
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text and return any segments that are now complete.
+
+        Args:
+            text: Next chunk of the response
+
+        Returns:
+            List[str]: Completed segments, in order (possibly empty)
+        """
+        if not text:
+            return []
+
+        self._buffer += text
+        segments = []
+
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            segment = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:].lstrip()
+            if segment:
+                segments.append(segment)
+
+        self.segments_emitted += len(segments)
+        return segments
+
+    def flush(self) -> Optional[str]:
+        """
+        Return whatever text remains once the stream has ended.
+
+        Returns:
+            Optional[str]: Final segment, or None if nothing is buffered
+        """
+        segment = self._buffer.strip()
+        self._buffer = ""
+        if not segment:
+            return None
+        self.segments_emitted += 1
+        return segment
+
+    def reset(self) -> None:
+        """Discard buffered text and counters."""
+        self._buffer = ""
+        self.segments_emitted = 0
+
+    def _find_cut(self) -> Optional[int]:
+        """Find the end index of the next segment in the buffer, if any."""
+        for match in _SENTENCE_END.finditer(self._buffer):
+            end = match.end()
+            if end < self.min_chars:
+                continue
+            if self._is_abbreviation(match.start()):
+                continue
+            return end
+
+        if len(self._buffer) < self.max_chars:
+            return None
+
+        # Run-on text: cut at the last clause boundary, then the last space
+        window = self._buffer[: self.max_chars]
+        clause_ends = [
+            m.end()
+            for m in _CLAUSE_END.finditer(window)
+            if m.end() >= self.min_chars
+        ]
+        if clause_ends:
+            return clause_ends[-1]
+
+        space = window.rfind(" ", self.min_chars)
+        return space if space > 0 else self.max_chars
+
+    def _is_abbreviation(self, index: int) -> bool:
+        """Check whether the terminator at ``index`` closes a known abbreviation."""
+        if self._buffer[index] != ".":
+            return False
+        start = self._buffer.rfind(" ", 0, index) + 1
+        word = self._buffer[start : index + 1].lower()
+        return word in _ABBREVIATIONS
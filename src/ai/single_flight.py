@@ -0,0 +1,106 @@
+"""
+Request coalescing for AI providers.
+Concurrent callers sending an identical prompt share one in-flight provider
+request instead of each generating the same answer.
+"""
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+
+def request_key(*parts: Any) -> str:
+    """
+    Build a stable key for a fully built provider request.
+
+    Args:
+        *parts: JSON-serialisable request parts (model, messages, options, ...)
+
+    Returns:
+        str: SHA-256 hex digest of the parts
+    """
+    encoded = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters describing coalescing behaviour."""
+
+    requests: int = 0
+    coalesced: int = 0
+
+    @property
+    def coalesce_rate(self) -> float:
+        """Fraction of requests served by another caller's request."""
+        return self.coalesced / self.requests if self.requests else 0.0
+
+
+class SingleFlight:
+    """
+    Runs at most one request per key at a time.
+
+    Callers that arrive while a request with the same key is running await
+    that request's result. Each caller waits through ``asyncio.shield``, so a
+    caller timing out or being cancelled does not cancel the shared request
+    for the others, and a retry issued meanwhile attaches to it.
+    """
+
+    def __init__(self):
+        """Initialize with no requests in flight."""
+        self.stats = SingleFlightStats()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``factory()`` unless an identical request is already in flight.
+
+        Args:
+            key: Request key, usually from ``request_key``
+            factory: Starts the request when no identical one is running
+
+        Returns:
+            Any: The shared request's result
+        """
+        self.stats.requests += 1
+        task = self._inflight.get(key)
+
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.stats.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of distinct requests currently running."""
+        return sum(1 for task in self._inflight.values() if not task.done())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dict[str, Any]: Request, coalesced and in-flight counts
+        """
+        return {
+            "requests": self.stats.requests,
+            "coalesced": self.stats.coalesced,
+            "coalesce_rate": self.stats.coalesce_rate,
+            "in_flight": self.in_flight(),
+        }
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
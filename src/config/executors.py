@@ -0,0 +1,261 @@
+"""
+Named thread pools for blocking SDK calls.
+Each external dependency (memory, LLM, health checks) gets its own bounded
+executor, so a burst of slow calls to one cannot starve the others of threads.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Pool names used across the codebase
+MEMORY_POOL = "memory"
+LLM_POOL = "llm"
+HEALTH_POOL = "health"
+
+DEFAULT_POOL_SIZES: Dict[str, int] = {
+    MEMORY_POOL: 8,
+    LLM_POOL: 8,
+    HEALTH_POOL: 2,
+}
+
+
+@dataclass
+class ExecutorMetrics:
+    """Counters describing one pool's load."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    queued: int = 0  # Submitted but not yet picked up by a worker
+    active: int = 0  # Currently running on a worker
+    peak_queued: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    total_run: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """Mean seconds a call waited for a worker."""
+        started = self.completed + self.failed
+        return self.total_wait / started if started else 0.0
+
+    @property
+    def average_run(self) -> float:
+        """Mean seconds a call ran on a worker."""
+        started = self.completed + self.failed
+        return self.total_run / started if started else 0.0
+
+
+class InstrumentedExecutor:
+    """
+    A bounded ThreadPoolExecutor that records queue depth and wait times.
+
+    Calls go through ``loop.run_in_executor`` so they behave exactly like
+    ``run_in_executor(None, ...)`` apart from which threads run them.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Initialize the pool.
+
+        Args:
+            name: Pool name, used for thread names and stats
+            max_workers: Maximum worker threads
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.metrics = ExecutorMetrics()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"miko-{name}"
+        )
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[[], Any]) -> "asyncio.Future[Any]":
+        """
+        Schedule a blocking call on this pool.
+
+        Args:
+            func: Zero-argument callable to run on a worker thread
+
+        Returns:
+            asyncio.Future[Any]: Resolves to the callable's result
+        """
+        submitted_at = time.monotonic()
+        with self._lock:
+            self.metrics.submitted += 1
+            self.metrics.queued += 1
+            self.metrics.peak_queued = max(
+                self.metrics.peak_queued, self.metrics.queued
+            )
+
+        def _run() -> Any:
+            started_at = time.monotonic()
+            wait = started_at - submitted_at
+            with self._lock:
+                self.metrics.queued -= 1
+                self.metrics.active += 1
+                self.metrics.total_wait += wait
+                self.metrics.max_wait = max(self.metrics.max_wait, wait)
+
+            failed = False
+            try:
+                return func()
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self.metrics.active -= 1
+                    self.metrics.total_run += time.monotonic() - started_at
+                    if failed:
+                        self.metrics.failed += 1
+                    else:
+                        self.metrics.completed += 1
+
+        return asyncio.get_event_loop().run_in_executor(self._executor, _run)
+
+    async def run(self, func: Callable[[], Any]) -> Any:
+        """
+        Run a blocking call on this pool and await its result.
+
+        Args:
+            func: Zero-argument callable to run on a worker thread
+
+        Returns:
+            Any: The callable's result
+        """
+        return await self.submit(func)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict[str, Any]: Size, queue depth, wait and run times
+        """
+        with self._lock:
+            metrics = self.metrics
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": metrics.queued,
+                "peak_queue_depth": metrics.peak_queued,
+                "active": metrics.active,
+                "submitted": metrics.submitted,
+                "completed": metrics.completed,
+                "failed": metrics.failed,
+                "average_wait_ms": metrics.average_wait * 1000,
+                "max_wait_ms": metrics.max_wait * 1000,
+                "average_run_ms": metrics.average_run * 1000,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Shut the pool down.
+
+        Args:
+            wait: Block until running calls finish
+        """
+        self._executor.shutdown(wait=wait)
+
+
+# Global pool registry
+_pool_sizes: Dict[str, int] = dict(DEFAULT_POOL_SIZES)
+_pools: Dict[str, InstrumentedExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def configure_executors(config: Optional[Any] = None, **sizes: int) -> None:
+    """
+    Set pool sizes, replacing any pool already created with a different size.
+
+    Args:
+        config: ExecutorConfig from AppConfig (optional)
+        **sizes: Pool name to worker count overrides
+    """
+    if config is not None:
+        sizes = {
+            MEMORY_POOL: config.memory_workers,
+            LLM_POOL: config.llm_workers,
+            HEALTH_POOL: config.health_workers,
+            **sizes,
+        }
+
+    with _pools_lock:
+        for name, size in sizes.items():
+            size = max(1, int(size))
+            _pool_sizes[name] = size
+            pool = _pools.get(name)
+            if pool is not None and pool.max_workers != size:
+                # Running calls finish on the old threads
+                pool.shutdown(wait=False)
+                del _pools[name]
+
+    logger.info(
+        "Executor pools: "
+        + ", ".join(f"{name}={size}" for name, size in sorted(_pool_sizes.items()))
+    )
+
+
+def get_executor(name: str) -> InstrumentedExecutor:
+    """
+    Get the named pool, creating it on first use.
+
+    Args:
+        name: Pool name (``memory``, ``llm``, ``health`` or a custom name)
+
+    Returns:
+        InstrumentedExecutor: The pool
+    """
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = InstrumentedExecutor(name, _pool_sizes.get(name, 4))
+                _pools[name] = pool
+    return pool
+
+
+async def run_blocking(name: str, func: Callable[[], Any]) -> Any:
+    """
+    Run a blocking call on the named pool.
+
+    Args:
+        name: Pool name
+        func: Zero-argument callable
+
+    Returns:
+        Any: The callable's result
+    """
+    return await get_executor(name).run(func)
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get statistics for every pool created so far.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Stats keyed by pool name
+    """
+    return {name: pool.get_stats() for name, pool in list(_pools.items())}
+
+
+def shutdown_executors(wait: bool = False) -> None:
+    """
+    Shut down all pools. They are recreated on next use.
+
+    Args:
+        wait: Block until running calls finish
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=wait)
+        _pools.clear()
@@ -27,8 +27,18 @@ class AIConfig:
     use_ollama: bool = True
     ollama_model: str = "llama3"
     ollama_host: str = "http://localhost:11434"
+    ollama_transport: str = "sdk"  # "sdk" (ollama package) or "http" (pooled aiohttp)
+    ollama_keep_alive: str = "30m"  # How long Ollama keeps the model loaded between requests
+    llm_warmup: bool = True  # Load the model and run a tiny generation at worker start
     gemini_api_keys: List[str] = field(default_factory=list)
     gemini_current_key_index: int = 0
+    gemini_requests_per_minute: float = 15.0  # Request quota of each Gemini key
+    stream_responses: bool = True
+    prompt_max_tokens: int = 4096  # Context size prompts are fitted into; 0 = unlimited
+    prompt_reserve_tokens: int = 512  # Part of the context left free for the reply
+    prompt_summary_tokens: int = 200  # Summary of turns windowed out of the prompt; 0 = none
+    prompt_window_step: int = 8  # Old turns are dropped this many at a time to keep the prefix stable
+    prompt_layout: str = "stable"  # "stable" (memory context last) or "legacy" (memory context first)
 
 
 @dataclass
@@ -54,6 +64,20 @@ class MemoryConfig:
     mem0_host: str = "https://api.mem0.ai"
     mem0_collection: str = "anime_character"
     memory_history_limit: int = 20
+    memory_backend: str = "mem0"  # "mem0" (remote) or "local" (in-process vectors)
+    write_behind_enabled: bool = True
+    write_behind_batch_size: int = 10
+    write_behind_flush_interval: float = 2.0
+    session_store_path: str = ""  # SQLite file for durable session memory; empty = in-process only
+    session_hot_users: int = 1000  # Users kept in RAM per per-user map (LRU beyond this)
+    session_idle_ttl: float = 3600.0  # Seconds idle before a user's state is evicted; 0 = never
+    context_latency_budget: float = 1.5  # Seconds to wait for memory search per turn; 0 = no limit
+    search_cache_enabled: bool = True
+    search_cache_size: int = 512
+    search_cache_ttl: float = 60.0
+    prune_interval: float = 0.0  # Seconds between pruning runs over all users; 0 = off
+    prune_days_old: int = 30
+    prune_concurrency: int = 8
 
 
 @dataclass
@@ -72,6 +96,9 @@ class FlaskConfig:
     host: str = "0.0.0.0"
     port: int = 5000
     debug: bool = False
+    server: str = "aiohttp"
+    animation_transport: str = "auto"
+    animation_socket_path: str = ""
 
 
 @dataclass
@@ -82,6 +109,15 @@ class AgentsConfig:
     stt_provider: str = "openai"
 
 
+@dataclass
+class ExecutorConfig:
+    """Thread pool sizes for blocking SDK calls, one pool per dependency."""
+
+    memory_workers: int = 8
+    llm_workers: int = 8
+    health_workers: int = 2
+
+
 @dataclass
 class AppConfig:
     """Main application configuration."""
@@ -94,6 +130,7 @@ class AppConfig:
     live2d: Live2DConfig
     agents: AgentsConfig
     flask: FlaskConfig
+    executors: ExecutorConfig = field(default_factory=ExecutorConfig)
     debug: bool = False
     log_level: str = "INFO"
 
@@ -155,10 +192,23 @@ class ConfigManager:
                 use_ollama=os.getenv("USE_OLLAMA", "true").lower() == "true",
                 ollama_model=os.getenv("OLLAMA_MODEL", "llama3"),
                 ollama_host=os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+                ollama_transport=os.getenv("OLLAMA_TRANSPORT", "sdk").lower(),
+                ollama_keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+                llm_warmup=os.getenv("LLM_WARMUP", "true").lower() == "true",
                 gemini_api_keys=self._parse_gemini_keys(),
                 gemini_current_key_index=int(
                     os.getenv("GEMINI_CURRENT_KEY_INDEX", "0")
                 ),
+                gemini_requests_per_minute=float(
+                    os.getenv("GEMINI_REQUESTS_PER_MINUTE", "15")
+                ),
+                stream_responses=os.getenv("STREAM_RESPONSES", "true").lower()
+                == "true",
+                prompt_max_tokens=int(os.getenv("PROMPT_MAX_TOKENS", "4096")),
+                prompt_reserve_tokens=int(os.getenv("PROMPT_RESERVE_TOKENS", "512")),
+                prompt_summary_tokens=int(os.getenv("PROMPT_SUMMARY_TOKENS", "200")),
+                prompt_window_step=int(os.getenv("PROMPT_WINDOW_STEP", "8")),
+                prompt_layout=os.getenv("PROMPT_LAYOUT", "stable").lower(),
             )
 
             # Content filtering configuration
@@ -185,6 +235,28 @@ class ConfigManager:
                 mem0_host=os.getenv("MEM0_HOST", "https://api.mem0.ai"),
                 mem0_collection=os.getenv("MEM0_COLLECTION", "anime_character"),
                 memory_history_limit=int(os.getenv("MEMORY_HISTORY_LIMIT", "20")),
+                memory_backend=os.getenv("MEMORY_BACKEND", "mem0").lower(),
+                write_behind_enabled=os.getenv("MEMORY_WRITE_BEHIND", "true").lower()
+                == "true",
+                write_behind_batch_size=int(
+                    os.getenv("MEMORY_WRITE_BATCH_SIZE", "10")
+                ),
+                write_behind_flush_interval=float(
+                    os.getenv("MEMORY_WRITE_FLUSH_INTERVAL", "2.0")
+                ),
+                session_store_path=os.getenv("SESSION_STORE_PATH", ""),
+                session_hot_users=int(os.getenv("SESSION_HOT_USERS", "1000")),
+                session_idle_ttl=float(os.getenv("SESSION_IDLE_TTL", "3600")),
+                context_latency_budget=float(
+                    os.getenv("MEMORY_CONTEXT_BUDGET", "1.5")
+                ),
+                search_cache_enabled=os.getenv("MEMORY_SEARCH_CACHE", "true").lower()
+                == "true",
+                search_cache_size=int(os.getenv("MEMORY_SEARCH_CACHE_SIZE", "512")),
+                search_cache_ttl=float(os.getenv("MEMORY_SEARCH_CACHE_TTL", "60")),
+                prune_interval=float(os.getenv("MEMORY_PRUNE_INTERVAL", "0")),
+                prune_days_old=int(os.getenv("MEMORY_PRUNE_DAYS_OLD", "30")),
+                prune_concurrency=int(os.getenv("MEMORY_PRUNE_CONCURRENCY", "8")),
             )
 
             # Live2D configuration
@@ -207,6 +279,16 @@ class ConfigManager:
                 host=os.getenv("FLASK_HOST", "0.0.0.0"),
                 port=int(os.getenv("FLASK_PORT", "5000")),
                 debug=os.getenv("FLASK_DEBUG", "false").lower() == "true",
+                server=os.getenv("WEB_SERVER", "aiohttp").lower(),
+                animation_transport=os.getenv("ANIMATION_TRANSPORT", "auto").lower(),
+                animation_socket_path=os.getenv("ANIMATION_SOCKET_PATH", ""),
+            )
+
+            # Executor configuration
+            executor_config = ExecutorConfig(
+                memory_workers=int(os.getenv("EXECUTOR_MEMORY_WORKERS", "8")),
+                llm_workers=int(os.getenv("EXECUTOR_LLM_WORKERS", "8")),
+                health_workers=int(os.getenv("EXECUTOR_HEALTH_WORKERS", "2")),
             )
 
             # Main app configuration
@@ -219,6 +301,7 @@ class ConfigManager:
                 live2d=live2d_config,
                 agents=agents_config,
                 flask=flask_config,
+                executors=executor_config,
                 debug=os.getenv("DEBUG", "false").lower() == "true",
                 log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
             )
@@ -300,6 +383,44 @@ class ConfigManager:
         ):
             raise ConfigurationError("MEMORY_HISTORY_LIMIT must be greater than 0")
 
+        if self._config.ai.ollama_transport not in ("sdk", "http"):
+            self.logger.warning(
+                f"Invalid OLLAMA_TRANSPORT '{self._config.ai.ollama_transport}'. Using 'sdk' instead."
+            )
+            self._config.ai.ollama_transport = "sdk"
+
+        if self._config.ai.prompt_layout not in ("stable", "legacy"):
+            self.logger.warning(
+                f"Invalid PROMPT_LAYOUT '{self._config.ai.prompt_layout}'. Using 'stable' instead."
+            )
+            self._config.ai.prompt_layout = "stable"
+
+        if self._config.flask.server not in ("aiohttp", "flask"):
+            self.logger.warning(
+                f"Invalid WEB_SERVER '{self._config.flask.server}'. Using 'aiohttp' instead."
+            )
+            self._config.flask.server = "aiohttp"
+
+        if self._config.flask.animation_transport not in ("auto", "direct", "http", "unix"):
+            self.logger.warning(
+                f"Invalid ANIMATION_TRANSPORT '{self._config.flask.animation_transport}'. Using 'auto' instead."
+            )
+            self._config.flask.animation_transport = "auto"
+
+        if (
+            self._config.flask.animation_transport == "unix"
+            and not self._config.flask.animation_socket_path
+        ):
+            raise ConfigurationError(
+                "ANIMATION_SOCKET_PATH must be set when ANIMATION_TRANSPORT=unix"
+            )
+
+        if self._config.memory.memory_backend not in ("mem0", "local"):
+            self.logger.warning(
+                f"Invalid MEMORY_BACKEND '{self._config.memory.memory_backend}'. Using 'mem0' instead."
+            )
+            self._config.memory.memory_backend = "mem0"
+
         # Validate log level
         valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         if self._config.log_level not in valid_log_levels:
@@ -6,7 +6,9 @@ when primary functionality fails.
 """
 
 import asyncio
+import hashlib
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Callable, List, Union
 from dataclasses import dataclass
 from enum import Enum
@@ -56,7 +58,7 @@ class FallbackManager:
         self.logger = logging.getLogger(__name__)
         self._fallback_strategies: Dict[str, List[FallbackStrategy]] = {}
         self._fallback_handlers: Dict[FallbackStrategy, Callable] = {}
-        self._cached_responses: Dict[str, Any] = {}
+        self._cached_responses: "OrderedDict[str, Any]" = OrderedDict()
         self._max_cache_size = 100
 
         # Register default fallback handlers
@@ -262,15 +264,26 @@ class FallbackManager:
         operation_kwargs: Dict[str, Any],
     ) -> Any:
         """Return cached response if available."""
+        # Components with their own cache pass a lookup callable
+        lookup = context.get("cached_response")
+        if lookup is not None:
+            cached_result = lookup()
+            if cached_result:
+                self.logger.info(f"Using cached response for {component}")
+                return cached_result
+            raise error
+
         cache_key = context.get("cache_key")
         if not cache_key:
-            # Generate cache key from operation args
-            cache_key = (
-                f"{component}:{hash(str(operation_args) + str(operation_kwargs))}"
-            )
+            # Generate a stable cache key from operation args
+            digest = hashlib.sha256(
+                (str(operation_args) + str(operation_kwargs)).encode("utf-8")
+            ).hexdigest()
+            cache_key = f"{component}:{digest}"
 
         cached_result = self._cached_responses.get(cache_key)
         if cached_result:
+            self._cached_responses.move_to_end(cache_key)
             self.logger.info(f"Using cached response for {component}")
             return cached_result
 
@@ -416,13 +429,12 @@ class FallbackManager:
             key: Cache key
             response: Response to cache
         """
-        # Implement LRU-style cache management
-        if len(self._cached_responses) >= self._max_cache_size:
-            # Remove oldest entry
-            oldest_key = next(iter(self._cached_responses))
-            del self._cached_responses[oldest_key]
-
         self._cached_responses[key] = response
+        self._cached_responses.move_to_end(key)
+
+        # Evict least recently used entries
+        while len(self._cached_responses) > self._max_cache_size:
+            self._cached_responses.popitem(last=False)
         self.logger.debug(f"Cached response for key: {key}")
 
     def clear_cache(self):
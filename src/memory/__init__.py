@@ -6,5 +6,27 @@ from .memory_manager import (
     MemoryContext,
     MemoryError,
 )
+from .local_vector_store import LocalVectorMemory
+from .session_index import SessionMemoryIndex
+from .persistent_store import PersistentSessionStore
+from .user_state import BoundedUserState
+from .ring_buffer import MemorySnippet, RingBuffer, UserSessionMemory
+from .search_cache import MemorySearchCache
+from .pruning import MemoryPruner, PruneResult
 
-__all__ = ["MemoryManager", "ConversationMessage", "MemoryContext", "MemoryError"]
+__all__ = [
+    "MemoryManager",
+    "ConversationMessage",
+    "MemoryContext",
+    "MemoryError",
+    "LocalVectorMemory",
+    "SessionMemoryIndex",
+    "PersistentSessionStore",
+    "BoundedUserState",
+    "MemorySnippet",
+    "RingBuffer",
+    "UserSessionMemory",
+    "MemorySearchCache",
+    "MemoryPruner",
+    "PruneResult",
+]
@@ -0,0 +1,333 @@
+"""
+Local vector-similarity memory backend for Anime AI Character.
+Provides a Mem0-compatible client (add/search/get_all/delete/delete_all)
+backed by a per-user NumPy embedding matrix, so semantic recall works
+offline with no network hop.
+"""
+
+import logging
+import re
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional dependency – LocalVectorMemory refuses to start without it
+    np = None
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashedNGramEmbedder:
+    """
+    Deterministic text embedding from hashed word and character n-grams.
+
+    Words and character trigrams are hashed (CRC32, stable across processes)
+    into a fixed number of buckets with a sign bit, then L2-normalised.
+    Texts that share vocabulary or word stems end up close in cosine space.
+    """
+
+    def __init__(self, dimensions: int = 512, ngram_size: int = 3):
+        """
+        Initialize the embedder.
+
+        Args:
+            dimensions: Embedding vector size
+            ngram_size: Character n-gram length
+        """
+        if np is None:
+            raise ImportError(
+                "numpy is required for local vector memory. Install with: pip install numpy"
+            )
+        self.dimensions = dimensions
+        self.ngram_size = ngram_size
+
+    def _features(self, text: str) -> List[str]:
+        """Extract word and character n-gram features from text."""
+        features = []
+        for word in _WORD_PATTERN.findall(text.lower()):
+            features.append(f"w:{word}")
+            padded = f"<{word}>"
+            for i in range(max(1, len(padded) - self.ngram_size + 1)):
+                features.append(f"c:{padded[i:i + self.ngram_size]}")
+        return features
+
+    def embed(self, text: str) -> "np.ndarray":
+        """
+        Embed text into a unit vector.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            np.ndarray: float32 vector of length ``dimensions`` (zero if no features)
+        """
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in self._features(text):
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[hashed % self.dimensions] += sign
+
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+@dataclass
+class _UserVectors:
+    """Embedding matrix and records for one user."""
+
+    matrix: Any
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.records)
+
+
+class LocalVectorMemory:
+    """
+    In-process, Mem0-compatible memory client.
+
+    Each user owns a row-major float32 matrix of unit embeddings that grows
+    by doubling. Search is a single matrix-vector product followed by a
+    partial sort for the top-k rows. Deletes swap the last row into the
+    freed slot, so every operation stays O(1) apart from the search itself.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 512,
+        initial_capacity: int = 64,
+        embedder: Optional[HashedNGramEmbedder] = None,
+    ):
+        """
+        Initialize the local memory store.
+
+        Args:
+            dimensions: Embedding vector size
+            initial_capacity: Rows pre-allocated per user
+            embedder: Custom embedder (defaults to hashed n-grams)
+        """
+        if np is None:
+            raise ImportError(
+                "numpy is required for local vector memory. Install with: pip install numpy"
+            )
+
+        self.embedder = embedder or HashedNGramEmbedder(dimensions)
+        self.dimensions = self.embedder.dimensions
+        self.initial_capacity = max(1, initial_capacity)
+        self.logger = logging.getLogger(__name__)
+
+        self._users: Dict[str, _UserVectors] = {}
+        self._owners: Dict[str, str] = {}  # memory_id -> user_id
+        # Mem0 calls run on executor threads
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        messages: Any,
+        user_id: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Store one memory per message, mirroring ``Memory.add``.
+
+        Args:
+            messages: A string or a list of ``{"role", "content"}`` dicts
+            user_id: Owner of the memories
+            metadata: Metadata attached to every stored memory
+
+        Returns:
+            Dict[str, Any]: ``{"results": [{"id", "memory", "event"}, ...]}``
+        """
+        if isinstance(messages, str):
+            contents = [messages]
+        else:
+            contents = [
+                message.get("content", "") if isinstance(message, dict) else str(message)
+                for message in messages
+            ]
+
+        # Embed outside the lock; only the matrix update needs to be serialised
+        embedded = [
+            (content, self.embedder.embed(content)) for content in contents if content
+        ]
+
+        results = []
+        with self._lock:
+            store = self._users.get(user_id)
+            if store is None:
+                store = _UserVectors(
+                    matrix=np.zeros(
+                        (self.initial_capacity, self.dimensions), dtype=np.float32
+                    )
+                )
+                self._users[user_id] = store
+
+            for content, vector in embedded:
+                if store.size == store.matrix.shape[0]:
+                    grown = np.zeros(
+                        (store.matrix.shape[0] * 2, self.dimensions), dtype=np.float32
+                    )
+                    grown[: store.size] = store.matrix[: store.size]
+                    store.matrix = grown
+
+                memory_id = str(uuid.uuid4())
+                record = {
+                    "id": memory_id,
+                    "memory": content,
+                    "user_id": user_id,
+                    "metadata": dict(metadata or {}),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                }
+
+                row = store.size
+                store.matrix[row] = vector
+                store.records.append(record)
+                store.rows[memory_id] = row
+                self._owners[memory_id] = user_id
+                results.append({"id": memory_id, "memory": content, "event": "ADD"})
+
+        return {"results": results}
+
+    def search(
+        self, query: str, user_id: str, limit: int = 5, **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the memories most similar to a query, mirroring ``Memory.search``.
+
+        Args:
+            query: Search text
+            user_id: Owner of the memories
+            limit: Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Records with an added ``score``, best first
+        """
+        query_vector = self.embedder.embed(query)
+
+        with self._lock:
+            store = self._users.get(user_id)
+            if store is None or store.size == 0 or limit <= 0:
+                return []
+
+            scores = store.matrix[: store.size] @ query_vector
+            k = min(limit, store.size)
+            if k < store.size:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(store.size)
+            # Highest score first, newer rows first on ties
+            top = sorted(top, key=lambda row: (-scores[row], -row))
+
+            results = []
+            for row in top:
+                if scores[row] <= 0.0:
+                    continue
+                record = dict(store.records[row])
+                record["score"] = float(scores[row])
+                results.append(record)
+
+        return results
+
+    def get_all(self, user_id: str, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Return every memory for a user, mirroring ``Memory.get_all``.
+
+        Args:
+            user_id: Owner of the memories
+
+        Returns:
+            List[Dict[str, Any]]: Memory records
+        """
+        with self._lock:
+            store = self._users.get(user_id)
+            return [dict(record) for record in store.records] if store else []
+
+    def delete(self, memory_id: str, **kwargs) -> bool:
+        """
+        Delete a single memory, mirroring ``Memory.delete``.
+
+        Args:
+            memory_id: ID returned by ``add``
+
+        Returns:
+            bool: True if the memory existed
+        """
+        with self._lock:
+            user_id = self._owners.pop(memory_id, None)
+            if user_id is None:
+                return False
+
+            store = self._users[user_id]
+            row = store.rows.pop(memory_id)
+            last = store.size - 1
+            if row != last:
+                # Move the last row into the freed slot
+                store.matrix[row] = store.matrix[last]
+                moved = store.records[last]
+                store.records[row] = moved
+                store.rows[moved["id"]] = row
+            store.records.pop()
+
+            if not store.records:
+                del self._users[user_id]
+            return True
+
+    def batch_delete(self, memories: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """
+        Delete several memories, mirroring ``MemoryClient.batch_delete``.
+
+        Args:
+            memories: ``{"memory_id": ...}`` dicts
+
+        Returns:
+            Dict[str, Any]: ``{"message", "deleted"}``
+        """
+        deleted = sum(
+            1 for memory in memories if self.delete(memory_id=memory["memory_id"])
+        )
+        return {"message": f"{deleted} memories deleted", "deleted": deleted}
+
+    def delete_all(self, user_id: str, **kwargs) -> bool:
+        """
+        Delete every memory for a user, mirroring ``Memory.delete_all``.
+
+        Args:
+            user_id: Owner of the memories
+
+        Returns:
+            bool: True if the user had any memories
+        """
+        with self._lock:
+            store = self._users.pop(user_id, None)
+            if store is None:
+                return False
+            for memory_id in store.rows:
+                self._owners.pop(memory_id, None)
+            return True
+
+    def count(self, user_id: Optional[str] = None) -> int:
+        """
+        Count stored memories.
+
+        Args:
+            user_id: Restrict the count to one user (all users if None)
+
+        Returns:
+            int: Number of stored memories
+        """
+        with self._lock:
+            if user_id is not None:
+                store = self._users.get(user_id)
+                return store.size if store else 0
+            return sum(store.size for store in self._users.values())
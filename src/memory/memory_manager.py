@@ -5,9 +5,11 @@ Handles conversation history, user-specific memory isolation, and context retrie
 
 import logging
 import asyncio
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+import sqlite3
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Sequence, Tuple
+from dataclasses import dataclass, asdict, field
 import json
 
 try:
@@ -17,6 +19,15 @@ except ImportError:
     Memory = None
 
 from src.config.settings import MemoryConfig
+from src.memory.session_index import SessionMemoryIndex
+from src.memory.local_vector_store import LocalVectorMemory
+from src.memory.write_behind import PendingWrite, WriteBehindQueue
+from src.memory.persistent_store import PersistentSessionStore
+from src.memory.user_state import BoundedUserState
+from src.memory.ring_buffer import MemorySnippet, UserSessionMemory
+from src.memory.search_cache import MemorySearchCache
+from src.memory.pruning import MemoryPruner, PruneResult
+from src.config.executors import HEALTH_POOL, MEMORY_POOL, run_blocking
 from src.error_handling.exceptions import MemoryError, NetworkError
 from src.error_handling.fallback_manager import get_fallback_manager, FallbackStrategy
 from src.error_handling.error_recovery import get_recovery_manager, RecoveryStrategy
@@ -61,8 +72,10 @@ class MemoryContext:
 
     user_id: str
     relevant_memories: List[str]
-    conversation_history: List[ConversationMessage]
+    conversation_history: Sequence[ConversationMessage]
     personality_state: Dict[str, Any]
+    # Which sources contributed, e.g. "session_history", "mem0", "session_search"
+    sources: List[str] = field(default_factory=list)
 
     def format_for_ai(self) -> str:
         """Format memory context for AI prompt."""
@@ -107,8 +120,44 @@ class MemoryManager:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self._mem0_client: Optional[Any] = None
-        self._session_memory: Dict[str, List[ConversationMessage]] = {}
-        self._user_contexts: Dict[str, MemoryContext] = {}
+        self._session_store: Optional[PersistentSessionStore] = None
+        self._appends_since_compact: Dict[str, int] = {}
+        if getattr(config, "session_store_path", ""):
+            try:
+                self._session_store = PersistentSessionStore(config.session_store_path)
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning(
+                    f"Persistent session store unavailable ({e}), keeping session memory in-process"
+                )
+
+        # Per-user state is bounded by user count and idle time; evicted users
+        # reload from the session store when one is configured
+        max_users = getattr(config, "session_hot_users", 1000)
+        idle_ttl = getattr(config, "session_idle_ttl", 0.0)
+        self._session_memory = BoundedUserState(
+            max_users=max_users,
+            idle_ttl=idle_ttl,
+            loader=self._load_session,
+            on_evict=self._on_session_evicted,
+        )
+        self._personality_states = BoundedUserState(
+            max_users=max_users,
+            idle_ttl=idle_ttl,
+            loader=self._load_personality_state,
+            on_evict=self._spill_personality_state,
+        )
+        self._session_index = SessionMemoryIndex()
+        self._search_cache: Optional[MemorySearchCache] = None
+        if getattr(config, "search_cache_enabled", False):
+            self._search_cache = MemorySearchCache(
+                max_entries=config.search_cache_size, ttl=config.search_cache_ttl
+            )
+        self._write_queue: Optional[WriteBehindQueue] = None
+        self._pruner = MemoryPruner(
+            client_getter=lambda: self._mem0_client,
+            max_concurrency=getattr(config, "prune_concurrency", 8),
+            on_result=self._on_user_pruned,
+        )
         self._initialized = False
 
         # Error handling components
@@ -132,6 +181,9 @@ class MemoryManager:
             return self.mem0_available
 
         try:
+            if getattr(self.config, "memory_backend", "mem0") == "local":
+                return await self._initialize_local_backend()
+
             if not self.config.mem0_api_key:
                 self.logger.warning(
                     "No Mem0 API key provided, using session-only memory"
@@ -166,6 +218,14 @@ class MemoryManager:
                 self.last_successful_operation = datetime.now()
                 await self.recovery_manager.record_success("memory_manager")
                 self.logger.info("Mem0 client initialized successfully")
+
+                if getattr(self.config, "write_behind_enabled", False):
+                    self._write_queue = WriteBehindQueue(
+                        flush_func=self._flush_write_batch,
+                        max_batch_size=self.config.write_behind_batch_size,
+                        flush_interval=self.config.write_behind_flush_interval,
+                    )
+                self._start_pruning_job()
             else:
                 self.mem0_available = False
                 self.logger.warning(
@@ -183,6 +243,22 @@ class MemoryManager:
             self._register_error_recovery()
             return False
 
+    async def _initialize_local_backend(self) -> bool:
+        """Use the in-process vector store in place of the Mem0 client."""
+        try:
+            self._mem0_client = LocalVectorMemory()
+            self.mem0_available = True
+            self.last_successful_operation = datetime.now()
+            self.logger.info("Using local vector memory backend")
+            self._start_pruning_job()
+        except ImportError as e:
+            self.logger.error(f"{e}; using session-only memory")
+            self.mem0_available = False
+
+        self._initialized = True
+        self._register_error_recovery()
+        return self.mem0_available
+
     async def _initialize_mem0_client(self) -> bool:
         """Initialize Mem0 client with connection test."""
         try:
@@ -221,8 +297,8 @@ class MemoryManager:
 
         try:
             # Try a simple search to test connection
-            await asyncio.get_event_loop().run_in_executor(
-                None,
+            await run_blocking(
+                HEALTH_POOL,
                 lambda: self._mem0_client.search(
                     query="test", user_id="test_user", limit=1
                 ),
@@ -250,6 +326,15 @@ class MemoryManager:
         # Always store in session memory as backup
         self._store_in_session_memory(user_id, content, metadata)
 
+        # Write-behind: acknowledge now, push to Mem0 in a later batch. Mem0
+        # is unchanged until then, so cached searches stay valid; the flush
+        # invalidates them once the batch is written.
+        if self.mem0_available and self._write_queue is not None:
+            self._write_queue.enqueue(user_id, content, metadata)
+            return True
+
+        self._invalidate_search_cache(user_id)
+
         # Try Mem0 if available
         if self.mem0_available and self._mem0_client:
             result = await self.fallback_manager.execute_with_fallback(
@@ -293,8 +378,8 @@ class MemoryManager:
         """Add memory to Mem0 with error handling."""
         try:
             await asyncio.wait_for(
-                asyncio.get_event_loop().run_in_executor(
-                    None,
+                run_blocking(
+                    MEMORY_POOL,
                     lambda: self._mem0_client.add(
                         messages=[{"role": "user", "content": content}],
                         user_id=user_id,
@@ -325,27 +410,281 @@ class MemoryManager:
             )
             raise
 
+    async def _flush_write_batch(
+        self, user_id: str, batch: List[PendingWrite]
+    ) -> bool:
+        """
+        Write a batch of queued adds to Mem0 (write-behind flush callback).
+
+        Args:
+            user_id: User identifier
+            batch: Pending writes for the user, oldest first
+
+        Returns:
+            bool: True if Mem0 accepted the batch
+        """
+        result = await self.fallback_manager.execute_with_fallback(
+            component="memory_manager",
+            primary_operation=self._add_batch_to_mem0,
+            operation_args=(user_id, batch),
+            context={
+                "retry_operation": self._add_batch_to_mem0,
+                "max_retries": 3,
+                "user_id": user_id,
+            },
+        )
+
+        # Session-only / simplified fallbacks mean Mem0 never got the data
+        written = result.success and result.strategy_used in (
+            None,
+            FallbackStrategy.RETRY,
+        )
+        if written:
+            # Searches since the enqueue may have cached results without these
+            self._invalidate_search_cache(user_id)
+            self.consecutive_failures = 0
+            self.last_successful_operation = datetime.now()
+            await self.recovery_manager.record_success("memory_manager")
+            self.logger.debug(
+                f"Flushed {len(batch)} queued memories for user {user_id}"
+            )
+        else:
+            self.error_logger.log_fallback_usage(
+                component="memory_manager",
+                fallback_strategy="session_only",
+                original_error=result.error,
+                fallback_success=True,
+            )
+        return written
+
+    async def _add_batch_to_mem0(
+        self, user_id: str, batch: List[PendingWrite]
+    ) -> bool:
+        """Add a batch of memories to Mem0 in a single call."""
+        messages = []
+        for item in batch:
+            role = item.metadata.get("role")
+            messages.append(
+                {
+                    "role": role if role in ("user", "assistant") else "user",
+                    "content": item.content,
+                }
+            )
+
+        # Keep metadata shared by every item; per-item values live in the content
+        shared_metadata = dict(batch[0].metadata)
+        for item in batch[1:]:
+            for key in list(shared_metadata):
+                if item.metadata.get(key) != shared_metadata[key]:
+                    del shared_metadata[key]
+        shared_metadata["batch_size"] = len(batch)
+        shared_metadata["first_timestamp"] = batch[0].metadata.get("timestamp")
+        shared_metadata["last_timestamp"] = batch[-1].metadata.get("timestamp")
+
+        try:
+            await asyncio.wait_for(
+                run_blocking(
+                    MEMORY_POOL,
+                    lambda: self._mem0_client.add(
+                        messages=messages,
+                        user_id=user_id,
+                        metadata=shared_metadata,
+                    ),
+                ),
+                timeout=10.0,
+            )
+            return True
+
+        except asyncio.TimeoutError:
+            raise NetworkError(
+                "Mem0 batch add operation timeout",
+                operation="add_memory",
+                endpoint="mem0_api",
+                is_timeout=True,
+            )
+        except Exception as e:
+            self.consecutive_failures += 1
+            await self.recovery_manager.record_error(
+                "memory_manager",
+                MemoryError(
+                    f"Failed to add memory batch to Mem0: {e}",
+                    operation="add_memory",
+                    user_id=user_id,
+                    is_mem0_error=True,
+                ),
+            )
+            raise
+
+    async def flush_pending_writes(self, user_id: Optional[str] = None) -> bool:
+        """
+        Push queued memory writes to Mem0 now.
+
+        Args:
+            user_id: Only flush this user's writes (all users if None)
+
+        Returns:
+            bool: True if everything pending was written (or nothing was queued)
+        """
+        if self._write_queue is None:
+            return True
+        if user_id is not None:
+            return await self._write_queue.flush_user(user_id)
+        return await self._write_queue.flush()
+
+    async def close(self) -> None:
+        """Flush queued writes, stop background work and close the session store."""
+        await self._pruner.stop()
+
+        if self._write_queue is not None:
+            flushed = await self._write_queue.close()
+            if not flushed:
+                self.logger.warning("Some queued memories could not be written on shutdown")
+            self._write_queue = None
+
+        if self._session_store is not None:
+            for user_id, state in self._personality_states.items():
+                self._spill_personality_state(user_id, state, "shutdown")
+            self._session_store.close()
+            self._session_store = None
+
+    def get_write_queue_stats(self) -> Dict[str, Any]:
+        """
+        Get write-behind queue metrics.
+
+        Returns:
+            Dict[str, Any]: Queue depth and flush latency metrics (empty if disabled)
+        """
+        if self._write_queue is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._write_queue.get_stats()}
+
     def _store_in_session_memory(
         self, user_id: str, content: str, metadata: Optional[Dict[str, Any]] = None
     ):
         """Store memory in session as backup."""
-        if user_id not in self._session_memory:
-            self._session_memory[user_id] = []
-
-        # Create a simple memory entry for session storage
-        memory_entry = {
-            "content": content,
-            "timestamp": datetime.now(),
-            "metadata": metadata or {},
-        }
+        snippet = MemorySnippet(
+            id=self._session_index.add(user_id, content),
+            content=content,
+            timestamp=datetime.now(),
+            metadata=metadata,
+        )
 
-        self._session_memory[user_id].append(memory_entry)
+        evicted = self._session_entries(user_id).add_snippet(snippet)
+        if evicted is not None:
+            self._session_index.remove(user_id, evicted.id)
+        self._persist_session_entry(user_id, "snippet", snippet.to_dict())
 
-        # Prune if too many entries
-        if len(self._session_memory[user_id]) > self.config.memory_history_limit * 2:
-            self._session_memory[user_id] = self._session_memory[user_id][
-                -self.config.memory_history_limit :
-            ]
+    def _new_session(self) -> UserSessionMemory:
+        """Create empty session memory sized to the history limit."""
+        return UserSessionMemory(max(1, self.config.memory_history_limit))
+
+    def _session_entries(
+        self, user_id: str, create: bool = True
+    ) -> Optional[UserSessionMemory]:
+        """
+        Get a user's in-memory session, loading it from disk if needed.
+
+        Args:
+            user_id: User identifier
+            create: Create an empty session if the user has none
+
+        Returns:
+            Optional[UserSessionMemory]: Session memory, or None if absent and not created
+        """
+        session = self._session_memory.get_or_load(user_id)
+        if session is None and create:
+            session = self._new_session()
+            self._session_memory[user_id] = session
+        return session
+
+    def _load_session(self, user_id: str) -> Optional[UserSessionMemory]:
+        """Rebuild a user's session memory from the persistent store."""
+        if self._session_store is None:
+            return None
+
+        limit = self.config.memory_history_limit
+        try:
+            messages = self._session_store.load(user_id, limit=limit, kind="message")
+            snippets = self._session_store.load(user_id, limit=limit, kind="snippet")
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to load session memory for {user_id}: {e}")
+            return None
+
+        session = self._new_session()
+        for row in messages + snippets:
+            payload = row["payload"]
+            try:
+                if row["kind"] == "message":
+                    session.add_message(ConversationMessage.from_dict(payload))
+                else:
+                    session.add_snippet(
+                        MemorySnippet(
+                            id=self._session_index.add(user_id, payload["content"]),
+                            content=payload["content"],
+                            timestamp=datetime.fromisoformat(payload["timestamp"]),
+                            metadata=payload.get("metadata"),
+                        )
+                    )
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.warning(f"Skipping unreadable session entry for {user_id}: {e}")
+
+        if not session.entry_count:
+            return None
+
+        self.logger.debug(
+            f"Loaded {session.entry_count} session entries for user {user_id}"
+        )
+        return session
+
+    def _on_session_evicted(
+        self, user_id: str, session: UserSessionMemory, reason: str
+    ) -> None:
+        """Unindex an evicted user; entries are already on disk if a store exists."""
+        self._session_index.remove_user(user_id)
+        self._appends_since_compact.pop(user_id, None)
+        self.logger.debug(f"Evicted session memory for user {user_id} ({reason})")
+
+    def _load_personality_state(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Reload a spilled personality state from the persistent store."""
+        if self._session_store is None:
+            return None
+
+        try:
+            return self._session_store.get_state(user_id, "personality")
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to load personality state for {user_id}: {e}")
+            return None
+
+    def _spill_personality_state(
+        self, user_id: str, state: Dict[str, Any], reason: str
+    ) -> None:
+        """Save an evicted personality state to the persistent store."""
+        if self._session_store is None or not state:
+            return
+
+        try:
+            self._session_store.put_state(user_id, "personality", state)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to spill personality state for {user_id}: {e}")
+
+    def _persist_session_entry(
+        self, user_id: str, kind: str, payload: Dict[str, Any]
+    ) -> None:
+        """Append an entry to the persistent store and compact periodically."""
+        if self._session_store is None:
+            return
+
+        try:
+            self._session_store.append(user_id, kind, payload)
+
+            # Compact once per history_limit appends to keep the log bounded
+            appended = self._appends_since_compact.get(user_id, 0) + 1
+            if appended >= self.config.memory_history_limit:
+                self._session_store.compact(user_id, self.config.memory_history_limit)
+                appended = 0
+            self._appends_since_compact[user_id] = appended
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to persist session entry for {user_id}: {e}")
 
     async def search_memories(
         self, user_id: str, query: str, limit: int = 5
@@ -364,8 +703,27 @@ class MemoryManager:
         if not self._initialized:
             await self.initialize()
 
-        # Try Mem0 first if available
+        memories, _ = await self._search_with_source(user_id, query, limit)
+        return memories
+
+    async def _search_with_source(
+        self, user_id: str, query: str, limit: int
+    ) -> Tuple[List[str], str]:
+        """
+        Search long-term memory, falling back to session memory.
+
+        Returns:
+            Tuple[List[str], str]: Memories and the source that produced them
+        """
         if self.mem0_available and self._mem0_client:
+            cache = self._search_cache
+            if cache is not None:
+                cached = cache.get(user_id, query, limit)
+                if cached is not None:
+                    return cached, self._long_term_source
+                generation = cache.generation(user_id)
+            started = time.monotonic()
+
             result = await self.fallback_manager.execute_with_fallback(
                 component="memory_manager",
                 primary_operation=self._search_memories_in_mem0,
@@ -377,17 +735,62 @@ class MemoryManager:
                 },
             )
 
-            if result.success:
+            # Session-only / simplified fallbacks carry no search results
+            if result.success and result.strategy_used in (
+                None,
+                FallbackStrategy.RETRY,
+            ):
+                if cache is not None:
+                    cache.put(
+                        user_id,
+                        query,
+                        limit,
+                        result.result,
+                        cost=time.monotonic() - started,
+                        generation=generation,
+                    )
                 self.consecutive_failures = 0
                 self.last_successful_operation = datetime.now()
                 await self.recovery_manager.record_success("memory_manager")
-                return result.result
-            else:
-                # Fall back to session memory search
-                return self._search_session_memories(user_id, query, limit)
-        else:
-            # Session-only mode
-            return self._search_session_memories(user_id, query, limit)
+                return result.result, self._long_term_source
+
+        # Session-only mode, or Mem0 failed
+        return self._search_session_memories(user_id, query, limit), "session_search"
+
+    @property
+    def _long_term_source(self) -> str:
+        """Source name reported for long-term memory results."""
+        if getattr(self.config, "memory_backend", "mem0") == "local":
+            return "local_vectors"
+        return "mem0"
+
+    async def _search_within_budget(
+        self, user_id: str, query: str, limit: int, latency_budget: float
+    ) -> Tuple[List[str], str]:
+        """
+        Search memories, switching to session memory if the budget runs out.
+
+        Args:
+            user_id: User identifier
+            query: Search query
+            limit: Maximum number of memories to return
+            latency_budget: Seconds to wait for long-term memory (0 = no limit)
+
+        Returns:
+            Tuple[List[str], str]: Memories and the source that produced them
+        """
+        search = self._search_with_source(user_id, query, limit)
+        if latency_budget <= 0:
+            return await search
+
+        try:
+            return await asyncio.wait_for(search, timeout=latency_budget)
+        except asyncio.TimeoutError:
+            self.logger.info(
+                f"Memory search for user {user_id} exceeded {latency_budget:.2f}s "
+                "budget, using session memory"
+            )
+            return self._search_session_memories(user_id, query, limit), "session_search"
 
     async def _search_memories_in_mem0(
         self, user_id: str, query: str, limit: int
@@ -395,8 +798,8 @@ class MemoryManager:
         """Search memories in Mem0 with error handling."""
         try:
             results = await asyncio.wait_for(
-                asyncio.get_event_loop().run_in_executor(
-                    None,
+                run_blocking(
+                    MEMORY_POOL,
                     lambda: self._mem0_client.search(
                         query=query, user_id=user_id, limit=limit
                     ),
@@ -434,23 +837,29 @@ class MemoryManager:
             )
             raise
 
+    def _invalidate_search_cache(self, user_id: str) -> None:
+        """Drop cached search results for a user whose memories changed."""
+        if self._search_cache is not None:
+            self._search_cache.invalidate_user(user_id)
+
+    def get_search_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get memory search cache metrics.
+
+        Returns:
+            Dict[str, Any]: Hit ratio and saved latency metrics (empty if disabled)
+        """
+        if self._search_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._search_cache.get_stats()}
+
     def _search_session_memories(
         self, user_id: str, query: str, limit: int
     ) -> List[str]:
-        """Search memories in session storage as fallback."""
-        if user_id not in self._session_memory:
-            return []
-
-        memories = []
-        query_lower = query.lower()
-
-        # Simple keyword-based search in session memory
-        for entry in reversed(self._session_memory[user_id]):  # Most recent first
-            content = entry["content"].lower()
-            if any(word in content for word in query_lower.split()):
-                memories.append(entry["content"])
-                if len(memories) >= limit:
-                    break
+        """Search memories in session storage as fallback (BM25-ranked)."""
+        # Make sure a cold user's entries are loaded (and indexed) first
+        self._session_entries(user_id, create=False)
+        memories = self._session_index.search(user_id, query, limit)
 
         self.logger.debug(f"Found {len(memories)} session memories for user {user_id}")
         return memories
@@ -465,14 +874,10 @@ class MemoryManager:
         Returns:
             bool: True if stored successfully
         """
-        # Always store in session memory for immediate access
-        if message.user_id not in self._session_memory:
-            self._session_memory[message.user_id] = []
-
-        self._session_memory[message.user_id].append(message)
-
-        # Prune session memory if it gets too long
-        await self._prune_session_memory(message.user_id)
+        # Always store in session memory for immediate access; the ring
+        # buffer drops the oldest message once the history limit is reached
+        self._session_entries(message.user_id).add_message(message)
+        self._persist_session_entry(message.user_id, "message", message.to_dict())
 
         # Store in Mem0 if available
         if message.role in ["user", "assistant"]:
@@ -491,14 +896,23 @@ class MemoryManager:
         return True
 
     async def get_user_context(
-        self, user_id: str, query: Optional[str] = None
+        self,
+        user_id: str,
+        query: Optional[str] = None,
+        latency_budget: Optional[float] = None,
     ) -> MemoryContext:
         """
         Get comprehensive context for a user including memories and recent conversation.
 
+        The long-term memory search is bounded by a latency budget; if it runs
+        over, the context is returned with ranked session-memory results
+        instead. ``MemoryContext.sources`` lists what contributed.
+
         Args:
             user_id: User identifier
             query: Optional query to search for relevant memories
+            latency_budget: Seconds to wait for long-term memory
+                (defaults to ``config.context_latency_budget``; 0 = no limit)
 
         Returns:
             MemoryContext: User's memory context
@@ -506,32 +920,41 @@ class MemoryManager:
         if not self._initialized:
             await self.initialize()
 
-        # Get recent conversation history from session memory
-        conversation_history = self._session_memory.get(user_id, [])
+        if latency_budget is None:
+            latency_budget = getattr(self.config, "context_latency_budget", 0.0)
+
+        sources: List[str] = []
+
+        # Snapshot the session history: background stores keep appending to
+        # the ring buffer while the context is formatted and cache-keyed
+        session = self._session_entries(user_id, create=False)
+        conversation_history = list(session.messages) if session is not None else []
+        if conversation_history:
+            sources.append("session_history")
 
         # Search for relevant memories if query provided
         relevant_memories = []
         if query:
-            relevant_memories = await self.search_memories(user_id, query)
+            relevant_memories, source = await self._search_within_budget(
+                user_id, query, 5, latency_budget
+            )
+            if relevant_memories:
+                sources.append(source)
 
-        # Get or create personality state
-        existing_context = self._user_contexts.get(user_id)
-        personality_state = (
-            existing_context.personality_state if existing_context else {}
-        )
+        # Only the personality state is kept between calls; history and
+        # memories are rebuilt each time
+        personality_state = self._personality_states.get_or_load(user_id) or {}
+        if personality_state:
+            sources.append("personality_state")
 
-        context = MemoryContext(
+        return MemoryContext(
             user_id=user_id,
             relevant_memories=relevant_memories,
             conversation_history=conversation_history,
             personality_state=personality_state,
+            sources=sources,
         )
 
-        # Cache context for future use
-        self._user_contexts[user_id] = context
-
-        return context
-
     async def update_personality_state(
         self, user_id: str, state_updates: Dict[str, Any]
     ) -> None:
@@ -542,47 +965,49 @@ class MemoryManager:
             user_id: User identifier
             state_updates: Dictionary of state updates
         """
-        if user_id not in self._user_contexts:
-            self._user_contexts[user_id] = MemoryContext(
-                user_id=user_id,
-                relevant_memories=[],
-                conversation_history=[],
-                personality_state={},
-            )
+        personality_state = self._personality_states.get_or_load(user_id)
+        if personality_state is None:
+            personality_state = {}
+            self._personality_states[user_id] = personality_state
 
-        self._user_contexts[user_id].personality_state.update(state_updates)
+        personality_state.update(state_updates)
 
         # Store personality updates in Mem0 if available
         if state_updates:
             content = f"Personality update: {json.dumps(state_updates)}"
             await self.add_memory(user_id, content, {"type": "personality_state"})
 
-    async def _prune_session_memory(self, user_id: str) -> None:
+    async def prune_old_memories(self, user_id: str, days_old: int = 30) -> int:
         """
-        Prune session memory to stay within limits.
+        Prune old memories for a user (Mem0 only).
 
         Args:
             user_id: User identifier
+            days_old: Remove memories older than this many days
+
+        Returns:
+            int: Number of memories removed
         """
-        if user_id not in self._session_memory:
-            return
+        if not self._mem0_client:
+            return 0
 
-        messages = self._session_memory[user_id]
-        limit = self.config.memory_history_limit
+        try:
+            result = await self._pruner.prune_user(user_id, days_old)
+        except Exception as e:
+            self.logger.error(f"Failed to prune memories for user {user_id}: {e}")
+            return 0
 
-        if len(messages) > limit:
-            # Keep the most recent messages
-            self._session_memory[user_id] = messages[-limit:]
-            self.logger.debug(
-                f"Pruned session memory for user {user_id} to {limit} messages"
-            )
+        self.logger.info(
+            f"Pruned {result.deleted} old memories for user {user_id} "
+            f"({result.scanned} scanned, {result.failed} failed, {result.duration:.2f}s)"
+        )
+        return result.deleted
 
-    async def prune_old_memories(self, user_id: str, days_old: int = 30) -> int:
+    async def prune_all_users(self, days_old: int = 30) -> int:
         """
-        Prune old memories for a user (Mem0 only).
+        Prune old memories for every known user.
 
         Args:
-            user_id: User identifier
             days_old: Remove memories older than this many days
 
         Returns:
@@ -591,55 +1016,44 @@ class MemoryManager:
         if not self._mem0_client:
             return 0
 
-        try:
-            # Get all memories for user
-            all_memories = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: self._mem0_client.get_all(user_id=user_id)
-            )
+        results = await self._pruner.prune_all(self._known_user_ids(), days_old)
+        return sum(result.deleted for result in results)
+
+    def _known_user_ids(self) -> List[str]:
+        """Users with session memory in RAM or in the persistent store."""
+        user_ids = set(self._session_memory)
+        if self._session_store is not None:
+            try:
+                user_ids.update(self._session_store.list_users())
+            except sqlite3.Error as e:
+                self.logger.warning(f"Failed to list stored users: {e}")
+        return sorted(user_ids)
+
+    def _start_pruning_job(self) -> None:
+        """Start the periodic pruning job if an interval is configured."""
+        interval = getattr(self.config, "prune_interval", 0.0)
+        if interval <= 0:
+            return
 
-            cutoff_date = datetime.now() - timedelta(days=days_old)
-            removed_count = 0
-
-            for memory in all_memories:
-                if isinstance(memory, dict) and "created_at" in memory:
-                    try:
-                        # Handle both timezone-aware and naive datetime strings
-                        created_at_str = memory["created_at"]
-                        if created_at_str.endswith("Z"):
-                            created_at_str = created_at_str.replace("Z", "+00:00")
-
-                        created_at = datetime.fromisoformat(created_at_str)
-
-                        # Make cutoff_date timezone-aware if created_at is timezone-aware
-                        if created_at.tzinfo is not None and cutoff_date.tzinfo is None:
-                            from datetime import timezone
-
-                            cutoff_date = cutoff_date.replace(tzinfo=timezone.utc)
-                        elif (
-                            created_at.tzinfo is None and cutoff_date.tzinfo is not None
-                        ):
-                            cutoff_date = cutoff_date.replace(tzinfo=None)
-
-                        if created_at < cutoff_date and "id" in memory:
-                            await asyncio.get_event_loop().run_in_executor(
-                                None,
-                                lambda mem_id=memory["id"]: self._mem0_client.delete(
-                                    memory_id=mem_id
-                                ),
-                            )
-                            removed_count += 1
-                    except (ValueError, TypeError) as e:
-                        self.logger.warning(
-                            f"Failed to parse created_at for memory {memory.get('id', 'unknown')}: {e}"
-                        )
-                        continue
+        self._pruner.start(
+            users_provider=self._known_user_ids,
+            interval=interval,
+            days_old=self.config.prune_days_old,
+        )
 
-            self.logger.info(f"Pruned {removed_count} old memories for user {user_id}")
-            return removed_count
+    def _on_user_pruned(self, result: PruneResult) -> None:
+        """Invalidate cached searches for a user whose memories were pruned."""
+        if result.deleted:
+            self._invalidate_search_cache(result.user_id)
 
-        except Exception as e:
-            self.logger.error(f"Failed to prune memories for user {user_id}: {e}")
-            return 0
+    def get_pruning_stats(self) -> Dict[str, Any]:
+        """
+        Get memory pruning metrics.
+
+        Returns:
+            Dict[str, Any]: Progress, totals and throughput of pruning runs
+        """
+        return self._pruner.get_stats()
 
     async def delete_user_memories(self, user_id: str) -> bool:
         """
@@ -655,14 +1069,24 @@ class MemoryManager:
             # Clear session memory
             if user_id in self._session_memory:
                 del self._session_memory[user_id]
+            self._appends_since_compact.pop(user_id, None)
+            if self._session_store is not None:
+                self._session_store.delete_user(user_id)
+            self._session_index.remove_user(user_id)
+
+            if user_id in self._personality_states:
+                del self._personality_states[user_id]
+
+            self._invalidate_search_cache(user_id)
 
-            if user_id in self._user_contexts:
-                del self._user_contexts[user_id]
+            # Drop queued writes so they don't land after delete_all
+            if self._write_queue is not None:
+                self._write_queue.discard(user_id)
 
             # Clear Mem0 memories if available
             if self._mem0_client:
-                await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: self._mem0_client.delete_all(user_id=user_id)
+                await run_blocking(
+                    MEMORY_POOL, lambda: self._mem0_client.delete_all(user_id=user_id)
                 )
 
             self.logger.info(f"Deleted all memories for user {user_id}")
@@ -687,14 +1111,22 @@ class MemoryManager:
             "mem0_available": self._mem0_client is not None,
             "initialized": self._initialized,
         }
+        stats["session_state"] = self._session_memory.get_stats()
+        stats["personality_state"] = self._personality_states.get_stats()
+        if self._session_store is not None:
+            stats["persistent_store"] = self._session_store.get_stats()
 
         user_stats = {}
-        for user_id, messages in self._session_memory.items():
+        for user_id, session in self._session_memory.items():
+            timestamps = [
+                stream[-1].timestamp
+                for stream in (session.messages, session.snippets)
+                if stream
+            ]
             user_stats[user_id] = {
-                "message_count": len(messages),
-                "last_activity": (
-                    messages[-1].timestamp.isoformat() if messages else None
-                ),
+                "message_count": len(session.messages),
+                "snippet_count": len(session.snippets),
+                "last_activity": max(timestamps).isoformat() if timestamps else None,
             }
 
         stats["users"] = user_stats
@@ -742,10 +1174,14 @@ class MemoryManager:
 
             # Check session memory health
             total_session_entries = sum(
-                len(messages) for messages in self._session_memory.values()
+                session.entry_count for session in self._session_memory.values()
             )
             health["session_memory_entries"] = total_session_entries
             health["session_memory_users"] = len(self._session_memory)
+            health["session_index_entries"] = self._session_index.entry_count()
+            health["write_queue"] = self.get_write_queue_stats()
+            health["search_cache"] = self.get_search_cache_stats()
+            health["pruning"] = self.get_pruning_stats()
 
             # Determine overall status
             if health["errors"] and not health["mem0_available"]:
@@ -0,0 +1,265 @@
+"""
+Durable on-disk session memory for Anime AI Character.
+Stores session messages and memory snippets in SQLite (WAL mode, memory-mapped
+reads) so fallback memory survives restarts and is shared by worker processes.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class PersistentSessionStore:
+    """
+    Append-only per-user session log backed by SQLite in WAL mode.
+
+    Rows are only ever appended, loaded lazily per user, and compacted to a
+    fixed number of most recent rows per user and kind. WAL mode lets several
+    worker processes read while one writes; readers go through mmap.
+    """
+
+    def __init__(self, path: str, mmap_size: int = 64 * 1024 * 1024):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file path
+            mmap_size: Bytes of the database file to memory-map for reads
+        """
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Accessed from the event loop and executor threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=5.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS session_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_session_log_user
+                ON session_log (user_id, kind, id);
+            CREATE TABLE IF NOT EXISTS user_state (
+                user_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (user_id, name)
+            );
+            """
+        )
+
+    def append(self, user_id: str, kind: str, payload: Dict[str, Any]) -> int:
+        """
+        Append one entry to a user's log.
+
+        Args:
+            user_id: User identifier
+            kind: Entry stream, e.g. ``"message"`` or ``"snippet"``
+            payload: JSON-serialisable entry data
+
+        Returns:
+            int: Row ID of the new entry
+        """
+        data = json.dumps(payload, default=str)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO session_log (user_id, kind, payload, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (user_id, kind, data, time.time()),
+            )
+            return cursor.lastrowid
+
+    def load(
+        self, user_id: str, limit: int, kind: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Load a user's most recent entries, oldest first.
+
+        Args:
+            user_id: User identifier
+            limit: Maximum number of entries
+            kind: Only load this stream (all streams if None)
+
+        Returns:
+            List[Dict[str, Any]]: ``{"kind", "payload"}`` rows in append order
+        """
+        if kind is None:
+            query = (
+                "SELECT kind, payload FROM session_log WHERE user_id = ? "
+                "ORDER BY id DESC LIMIT ?"
+            )
+            params = (user_id, limit)
+        else:
+            query = (
+                "SELECT kind, payload FROM session_log WHERE user_id = ? AND kind = ? "
+                "ORDER BY id DESC LIMIT ?"
+            )
+            params = (user_id, kind, limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        entries = []
+        for row_kind, payload in reversed(rows):
+            try:
+                entries.append({"kind": row_kind, "payload": json.loads(payload)})
+            except ValueError:
+                self.logger.warning(f"Skipping corrupt session entry for {user_id}")
+        return entries
+
+    def compact(self, user_id: str, keep: int) -> int:
+        """
+        Delete all but the ``keep`` most recent entries of each stream for a user.
+
+        Args:
+            user_id: User identifier
+            keep: Entries to keep per stream
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            kinds = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT DISTINCT kind FROM session_log WHERE user_id = ?",
+                    (user_id,),
+                )
+            ]
+            for kind in kinds:
+                cursor = self._conn.execute(
+                    "DELETE FROM session_log WHERE user_id = ? AND kind = ? AND id <= ("
+                    "  SELECT id FROM session_log WHERE user_id = ? AND kind = ? "
+                    "  ORDER BY id DESC LIMIT 1 OFFSET ?"
+                    ")",
+                    (user_id, kind, user_id, kind, keep),
+                )
+                removed += cursor.rowcount
+        return removed
+
+    def put_state(self, user_id: str, name: str, payload: Dict[str, Any]) -> None:
+        """
+        Save (replace) a named piece of per-user state.
+
+        Args:
+            user_id: User identifier
+            name: State name, e.g. ``"personality"``
+            payload: JSON-serialisable state
+        """
+        data = json.dumps(payload, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO user_state (user_id, name, payload, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (user_id, name, data, time.time()),
+            )
+
+    def get_state(self, user_id: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a named piece of per-user state.
+
+        Args:
+            user_id: User identifier
+            name: State name
+
+        Returns:
+            Optional[Dict[str, Any]]: The saved state, or None if there is none
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM user_state WHERE user_id = ? AND name = ?",
+                (user_id, name),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            self.logger.warning(f"Skipping corrupt {name} state for {user_id}")
+            return None
+
+    def delete_user(self, user_id: str) -> int:
+        """
+        Delete every entry and saved state for a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            int: Number of log entries removed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM session_log WHERE user_id = ?", (user_id,)
+            )
+            self._conn.execute("DELETE FROM user_state WHERE user_id = ?", (user_id,))
+            return cursor.rowcount
+
+    def has_user(self, user_id: str) -> bool:
+        """
+        Check whether a user has any stored entries.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            bool: True if at least one entry exists
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM session_log WHERE user_id = ? LIMIT 1", (user_id,)
+            ).fetchone()
+        return row is not None
+
+    def list_users(self) -> List[str]:
+        """
+        List users with stored entries.
+
+        Returns:
+            List[str]: User identifiers
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT user_id FROM session_log"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dict[str, Any]: Path, user count and entry count
+        """
+        with self._lock:
+            users, entries = self._conn.execute(
+                "SELECT COUNT(DISTINCT user_id), COUNT(*) FROM session_log"
+            ).fetchone()
+        return {"path": self.path, "users": users, "entries": entries}
+
+    def close(self) -> None:
+        """Checkpoint the WAL and close the database."""
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                self.logger.debug(f"WAL checkpoint failed: {e}")
+            self._conn.close()
@@ -0,0 +1,353 @@
+"""
+Pruning engine for long-term memories.
+Finds expired memories with a single timestamp-parsing pass and deletes them
+with bounded concurrency, or in batches when the memory client supports
+batch deletes. Can run periodically across all known users.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config.executors import MEMORY_POOL, run_blocking
+
+
+def created_at_epoch(value: Any) -> Optional[float]:
+    """
+    Convert a memory's ``created_at`` value to POSIX seconds.
+
+    Naive timestamps are read as local time, like ``datetime.now()``.
+
+    Args:
+        value: ISO-8601 string (``Z`` suffix allowed), datetime or number
+
+    Returns:
+        Optional[float]: Seconds since the epoch, or None if unparseable
+    """
+    try:
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            text = value[:-1] + "+00:00" if value.endswith("Z") else value
+            value = datetime.fromisoformat(text)
+        if isinstance(value, datetime):
+            return value.timestamp()
+    except (ValueError, TypeError, OverflowError):
+        pass
+    return None
+
+
+def find_expired(
+    memories: Iterable[Dict[str, Any]], cutoff: float
+) -> Tuple[List[str], int]:
+    """
+    Select memories created before a cutoff.
+
+    Args:
+        memories: Memory records with ``id`` and ``created_at``
+        cutoff: POSIX seconds; older memories are expired
+
+    Returns:
+        Tuple[List[str], int]: Expired memory IDs and the number of unparseable records
+    """
+    expired: List[str] = []
+    unparseable = 0
+    for memory in memories:
+        if not isinstance(memory, dict) or "id" not in memory:
+            continue
+        created = created_at_epoch(memory.get("created_at"))
+        if created is None:
+            unparseable += 1
+        elif created < cutoff:
+            expired.append(memory["id"])
+    return expired, unparseable
+
+
+@dataclass
+class PruneResult:
+    """Outcome of pruning one user's memories."""
+
+    user_id: str
+    scanned: int = 0
+    expired: int = 0
+    deleted: int = 0
+    failed: int = 0
+    unparseable: int = 0
+    duration: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Deleted memories per second."""
+        return self.deleted / self.duration if self.duration > 0 else 0.0
+
+
+@dataclass
+class PruningMetrics:
+    """Counters describing pruning behaviour."""
+
+    runs: int = 0
+    users_pruned: int = 0
+    memories_scanned: int = 0
+    memories_deleted: int = 0
+    delete_failures: int = 0
+    total_duration: float = 0.0
+    last_run_duration: float = 0.0
+    # Progress of the run in flight (or the last one)
+    users_total: int = 0
+    users_done: int = 0
+    running: bool = False
+
+    @property
+    def throughput(self) -> float:
+        """Deleted memories per second across all runs."""
+        return (
+            self.memories_deleted / self.total_duration if self.total_duration > 0 else 0.0
+        )
+
+
+BlockingRunner = Callable[[Callable[[], Any]], Awaitable[Any]]
+
+
+class MemoryPruner:
+    """
+    Deletes memories older than a cutoff for one or many users.
+
+    Deletes run through ``max_concurrency`` workers. If the client class
+    defines ``batch_delete`` (Mem0's platform client and LocalVectorMemory
+    do), IDs are deleted ``batch_size`` at a time instead.
+    """
+
+    def __init__(
+        self,
+        client_getter: Callable[[], Any],
+        max_concurrency: int = 8,
+        batch_size: int = 100,
+        run_blocking: Optional[BlockingRunner] = None,
+        on_result: Optional[Callable[[PruneResult], None]] = None,
+    ):
+        """
+        Initialize the pruner.
+
+        Args:
+            client_getter: Returns the current memory client (or None)
+            max_concurrency: Delete calls in flight at once
+            batch_size: IDs per batch delete call
+            run_blocking: Runs a blocking client call off the event loop
+                (default: the shared memory pool)
+            on_result: Called with each user's PruneResult
+        """
+        self.client_getter = client_getter
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.run_blocking = run_blocking or self._run_in_executor
+        self.on_result = on_result
+        self.logger = logging.getLogger(__name__)
+        self.metrics = PruningMetrics()
+
+        self._job_task: Optional[asyncio.Task] = None
+
+    async def prune_user(self, user_id: str, days_old: int = 30) -> PruneResult:
+        """
+        Delete one user's memories older than ``days_old`` days.
+
+        Args:
+            user_id: User identifier
+            days_old: Age in days beyond which memories are deleted
+
+        Returns:
+            PruneResult: Scan and delete counts
+        """
+        result = PruneResult(user_id=user_id)
+        client = self.client_getter()
+        if client is None:
+            return result
+
+        started = time.monotonic()
+        memories = await self.run_blocking(lambda: client.get_all(user_id=user_id))
+        if isinstance(memories, dict):
+            memories = memories.get("results", [])
+        memories = memories or []
+
+        cutoff = time.time() - days_old * 86400
+        expired, result.unparseable = find_expired(memories, cutoff)
+        result.scanned = len(memories)
+        result.expired = len(expired)
+        if result.unparseable:
+            self.logger.warning(
+                f"Skipped {result.unparseable} memories with unparseable created_at for {user_id}"
+            )
+
+        if expired:
+            if self._supports_batch_delete(client):
+                result.deleted = await self._delete_batched(client, expired)
+            else:
+                result.deleted = await self._delete_each(client, expired)
+        result.failed = result.expired - result.deleted
+        result.duration = time.monotonic() - started
+
+        self.metrics.users_pruned += 1
+        self.metrics.memories_scanned += result.scanned
+        self.metrics.memories_deleted += result.deleted
+        self.metrics.delete_failures += result.failed
+        self.metrics.total_duration += result.duration
+        if self.on_result is not None:
+            self.on_result(result)
+        return result
+
+    async def prune_all(
+        self, user_ids: Iterable[str], days_old: int = 30
+    ) -> List[PruneResult]:
+        """
+        Prune every given user, one user at a time.
+
+        Args:
+            user_ids: Users to prune
+            days_old: Age in days beyond which memories are deleted
+
+        Returns:
+            List[PruneResult]: One result per user that was pruned without error
+        """
+        users = list(user_ids)
+        started = time.monotonic()
+        self.metrics.runs += 1
+        self.metrics.users_total = len(users)
+        self.metrics.users_done = 0
+        self.metrics.running = True
+
+        results = []
+        try:
+            for user_id in users:
+                try:
+                    results.append(await self.prune_user(user_id, days_old))
+                except Exception as e:
+                    self.logger.error(f"Failed to prune memories for user {user_id}: {e}")
+                self.metrics.users_done += 1
+        finally:
+            self.metrics.running = False
+            self.metrics.last_run_duration = time.monotonic() - started
+
+        deleted = sum(result.deleted for result in results)
+        self.logger.info(
+            f"Pruned {deleted} memories across {len(results)} users "
+            f"in {self.metrics.last_run_duration:.1f}s"
+        )
+        return results
+
+    def start(
+        self,
+        users_provider: Callable[[], Iterable[str]],
+        interval: float,
+        days_old: int = 30,
+    ) -> None:
+        """
+        Start pruning all users periodically.
+
+        Args:
+            users_provider: Returns the user IDs to prune on each run
+            interval: Seconds between runs
+            days_old: Age in days beyond which memories are deleted
+        """
+        if self._job_task is None or self._job_task.done():
+            self._job_task = asyncio.ensure_future(
+                self._job_loop(users_provider, max(1.0, interval), days_old)
+            )
+
+    async def stop(self) -> None:
+        """Stop the periodic job."""
+        if self._job_task is not None:
+            self._job_task.cancel()
+            try:
+                await self._job_task
+            except asyncio.CancelledError:
+                pass
+            self._job_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pruning metrics.
+
+        Returns:
+            Dict[str, Any]: Progress, totals and throughput
+        """
+        return {
+            "job_running": self._job_task is not None and not self._job_task.done(),
+            "run_in_progress": self.metrics.running,
+            "progress": f"{self.metrics.users_done}/{self.metrics.users_total}",
+            "runs": self.metrics.runs,
+            "users_pruned": self.metrics.users_pruned,
+            "memories_scanned": self.metrics.memories_scanned,
+            "memories_deleted": self.metrics.memories_deleted,
+            "delete_failures": self.metrics.delete_failures,
+            "last_run_duration": self.metrics.last_run_duration,
+            "throughput": self.metrics.throughput,
+        }
+
+    async def _job_loop(
+        self,
+        users_provider: Callable[[], Iterable[str]],
+        interval: float,
+        days_old: int,
+    ) -> None:
+        """Run prune_all on a fixed interval."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.prune_all(users_provider(), days_old)
+            except Exception as e:
+                self.logger.error(f"Scheduled memory pruning failed: {e}")
+
+    @staticmethod
+    def _supports_batch_delete(client: Any) -> bool:
+        # Look on the class so mocks don't claim support for everything
+        return callable(getattr(type(client), "batch_delete", None))
+
+    async def _delete_each(self, client: Any, memory_ids: List[str]) -> int:
+        """Delete memories one per call through a bounded worker pool."""
+
+        async def delete(memory_id: str) -> int:
+            await self.run_blocking(lambda: client.delete(memory_id=memory_id))
+            return 1
+
+        return await self._run_workers(memory_ids, delete)
+
+    async def _delete_batched(self, client: Any, memory_ids: List[str]) -> int:
+        """Delete memories ``batch_size`` IDs per call."""
+        batches = [
+            memory_ids[i : i + self.batch_size]
+            for i in range(0, len(memory_ids), self.batch_size)
+        ]
+
+        async def delete(batch: List[str]) -> int:
+            payload = [{"memory_id": memory_id} for memory_id in batch]
+            await self.run_blocking(lambda: client.batch_delete(payload))
+            return len(batch)
+
+        return await self._run_workers(batches, delete)
+
+    async def _run_workers(
+        self, items: List[Any], operation: Callable[[Any], Awaitable[int]]
+    ) -> int:
+        """Apply an operation to every item with at most max_concurrency in flight."""
+        pending = iter(items)
+        done = 0
+
+        async def worker() -> None:
+            nonlocal done
+            for item in pending:
+                try:
+                    count = await operation(item)
+                except Exception as e:
+                    self.logger.warning(f"Memory delete failed: {e}")
+                    continue
+                done += count
+
+        workers = min(self.max_concurrency, len(items))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return done
+
+    @staticmethod
+    async def _run_in_executor(func: Callable[[], Any]) -> Any:
+        return await run_blocking(MEMORY_POOL, func)
@@ -0,0 +1,226 @@
+"""
+Fixed-capacity ring buffers for per-user session memory.
+Appends and evictions are O(1), and "last N" reads are views over the
+buffer instead of list copies.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Generic, Iterable, Iterator, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class RingView(Generic[T]):
+    """
+    Read-only, zero-copy window over consecutive items of a RingBuffer.
+
+    Items are addressed by their append sequence number, so a view keeps
+    pointing at the same items while newer ones are appended; reading an
+    item that has since been overwritten raises IndexError.
+    """
+
+    __slots__ = ("_buffer", "_first", "_length")
+
+    def __init__(self, buffer: "RingBuffer[T]", first: int, length: int):
+        self._buffer = buffer
+        self._first = first
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[T]:
+        for seq in range(self._first, self._first + self._length):
+            yield self._buffer._at(seq)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, "RingView[T]"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return RingView(self._buffer, self._first + start, max(0, stop - start))
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("view index out of range")
+        return self._buffer._at(self._first + index)
+
+    def __repr__(self) -> str:
+        return f"RingView({list(self)!r})"
+
+
+class RingBuffer(Generic[T]):
+    """
+    Fixed-capacity FIFO buffer that overwrites its oldest item when full.
+
+    Supports ``len()``, iteration (oldest first), integer indexing with
+    negative indices, and slicing, which returns a zero-copy RingView.
+    """
+
+    __slots__ = ("capacity", "_items", "_appended")
+
+    def __init__(self, capacity: int, items: Iterable[T] = ()):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Maximum number of items held
+            items: Initial items, oldest first (only the newest ``capacity`` are kept)
+        """
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be at least 1")
+        self.capacity = capacity
+        self._items: list = [None] * capacity
+        self._appended = 0
+        for item in items:
+            self.append(item)
+
+    def append(self, item: T) -> Optional[T]:
+        """
+        Append an item, evicting the oldest one if the buffer is full.
+
+        Args:
+            item: Item to append
+
+        Returns:
+            Optional[T]: The evicted item, or None if nothing was evicted
+        """
+        slot = self._appended % self.capacity
+        evicted = self._items[slot] if self._appended >= self.capacity else None
+        self._items[slot] = item
+        self._appended += 1
+        return evicted
+
+    def last(self, n: int) -> RingView[T]:
+        """
+        Get a zero-copy view of the ``n`` most recent items, oldest first.
+
+        Args:
+            n: Number of items
+
+        Returns:
+            RingView[T]: View over at most ``n`` items
+        """
+        length = max(0, min(n, len(self)))
+        return RingView(self, self._appended - length, length)
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self._items = [None] * self.capacity
+        self._appended = 0
+
+    @property
+    def total_appended(self) -> int:
+        """Number of items ever appended."""
+        return self._appended
+
+    def __len__(self) -> int:
+        return min(self._appended, self.capacity)
+
+    def __bool__(self) -> bool:
+        return self._appended > 0
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.last(self.capacity))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, RingView[T]]:
+        return self.last(self.capacity)[index]
+
+    def __repr__(self) -> str:
+        return f"RingBuffer(capacity={self.capacity}, items={list(self)!r})"
+
+    def _at(self, seq: int) -> T:
+        """Get an item by its append sequence number."""
+        if not self._appended - len(self) <= seq < self._appended:
+            raise IndexError("ring buffer item has been overwritten")
+        return self._items[seq % self.capacity]
+
+
+class MemorySnippet:
+    """A memory stored in session memory as a search fallback."""
+
+    __slots__ = ("id", "content", "timestamp", "metadata")
+
+    def __init__(
+        self,
+        id: int,
+        content: str,
+        timestamp: datetime,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.id = id
+        self.content = content
+        self.timestamp = timestamp
+        self.metadata = metadata or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for storage."""
+        return {
+            "content": self.content,
+            "timestamp": self.timestamp.isoformat(),
+            "metadata": self.metadata,
+        }
+
+    def __repr__(self) -> str:
+        return f"MemorySnippet(id={self.id!r}, content={self.content!r})"
+
+
+class UserSessionMemory:
+    """
+    One user's session memory: conversation messages and memory snippets
+    held in separate fixed-capacity ring buffers.
+
+    ``len()``, iteration and indexing cover the conversation messages.
+    """
+
+    __slots__ = ("messages", "snippets")
+
+    def __init__(self, message_capacity: int, snippet_capacity: Optional[int] = None):
+        """
+        Initialize empty session memory.
+
+        Args:
+            message_capacity: Conversation messages kept
+            snippet_capacity: Memory snippets kept (defaults to message_capacity)
+        """
+        self.messages: RingBuffer = RingBuffer(message_capacity)
+        self.snippets: RingBuffer = RingBuffer(snippet_capacity or message_capacity)
+
+    def add_message(self, message: Any) -> Optional[Any]:
+        """
+        Append a conversation message.
+
+        Args:
+            message: Conversation message
+
+        Returns:
+            Optional[Any]: The message evicted to make room, if any
+        """
+        return self.messages.append(message)
+
+    def add_snippet(self, snippet: MemorySnippet) -> Optional[MemorySnippet]:
+        """
+        Append a memory snippet.
+
+        Args:
+            snippet: Memory snippet
+
+        Returns:
+            Optional[MemorySnippet]: The snippet evicted to make room, if any
+        """
+        return self.snippets.append(snippet)
+
+    @property
+    def entry_count(self) -> int:
+        """Messages plus snippets held."""
+        return len(self.messages) + len(self.snippets)
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.messages)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return self.messages[index]
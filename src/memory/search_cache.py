@@ -0,0 +1,217 @@
+"""
+Result cache for long-term memory search.
+Repeated or near-identical queries from the same user (voice retries,
+rephrasings that normalise to the same words) are answered without a
+round trip to Mem0, until the user's memories change or the entry expires.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.memory.session_index import tokenize
+
+CacheKey = Tuple[str, str, int]
+
+
+@dataclass
+class _CachedResult:
+    """Cached search results and what they cost to fetch."""
+
+    memories: List[str]
+    stored_at: float
+    cost: float
+
+
+@dataclass
+class SearchCacheMetrics:
+    """Counters describing search cache behaviour."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    stale_puts: int = 0
+    saved_latency: float = 0.0
+
+
+class MemorySearchCache:
+    """
+    Per-user LRU + TTL cache of memory search results.
+
+    Keys are ``(user_id, normalised query, limit)``. Each user has a
+    generation counter that ``invalidate_user`` bumps; results fetched under
+    an older generation are dropped on ``put``, so a search that races a
+    write can't re-cache stale results.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached queries across all users
+            ttl: Seconds a cached result stays valid
+            clock: Monotonic time source
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = max(0.0, ttl)
+        self.metrics = SearchCacheMetrics()
+
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, _CachedResult]" = OrderedDict()
+        self._user_keys: Dict[str, Set[CacheKey]] = {}
+        self._generations: Dict[str, int] = {}
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Normalise a query so trivially different phrasings share a key.
+
+        Args:
+            query: Raw query text
+
+        Returns:
+            str: Lowercase word tokens joined by single spaces
+        """
+        return " ".join(tokenize(query))
+
+    def generation(self, user_id: str) -> int:
+        """
+        Get a user's current cache generation; pass it back to ``put``.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            int: Generation counter
+        """
+        return self._generations.get(user_id, 0)
+
+    def get(self, user_id: str, query: str, limit: int) -> Optional[List[str]]:
+        """
+        Look up cached results.
+
+        Args:
+            user_id: User identifier
+            query: Search query
+            limit: Result limit the search was made with
+
+        Returns:
+            Optional[List[str]]: A copy of the cached memories, or None on a miss
+        """
+        key = (user_id, self.normalize_query(query), limit)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.metrics.misses += 1
+            return None
+
+        if self.ttl and self._clock() - entry.stored_at > self.ttl:
+            self._remove(key)
+            self.metrics.expirations += 1
+            self.metrics.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.metrics.hits += 1
+        self.metrics.saved_latency += entry.cost
+        return list(entry.memories)
+
+    def put(
+        self,
+        user_id: str,
+        query: str,
+        limit: int,
+        memories: List[str],
+        cost: float = 0.0,
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Cache search results.
+
+        Args:
+            user_id: User identifier
+            query: Search query
+            limit: Result limit the search was made with
+            memories: Results to cache
+            cost: Seconds the search took (credited as saved on each hit)
+            generation: Generation read before searching; stale results are dropped
+
+        Returns:
+            bool: True if the results were cached
+        """
+        if generation is not None and generation != self.generation(user_id):
+            self.metrics.stale_puts += 1
+            return False
+
+        key = (user_id, self.normalize_query(query), limit)
+        self._entries[key] = _CachedResult(list(memories), self._clock(), cost)
+        self._entries.move_to_end(key)
+        self._user_keys.setdefault(user_id, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.metrics.evictions += 1
+        return True
+
+    def invalidate_user(self, user_id: str) -> int:
+        """
+        Drop a user's cached results after their memories change.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            int: Number of entries dropped
+        """
+        self._generations[user_id] = self.generation(user_id) + 1
+        keys = self._user_keys.pop(user_id, set())
+        for key in keys:
+            self._entries.pop(key, None)
+        if keys:
+            self.metrics.invalidations += 1
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        for user_id in list(self._user_keys):
+            self.invalidate_user(user_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Size, hit ratio and saved latency figures
+        """
+        lookups = self.metrics.hits + self.metrics.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.metrics.hits,
+            "misses": self.metrics.misses,
+            "hit_ratio": self.metrics.hits / lookups if lookups else 0.0,
+            "saved_latency": self.metrics.saved_latency,
+            "evictions": self.metrics.evictions,
+            "expirations": self.metrics.expirations,
+            "invalidations": self.metrics.invalidations,
+            "stale_puts": self.metrics.stale_puts,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove one entry and its per-user bookkeeping."""
+        self._entries.pop(key, None)
+        user_keys = self._user_keys.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[key[0]]
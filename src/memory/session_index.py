@@ -0,0 +1,215 @@
+"""
+Inverted index for session-memory search.
+Keeps a per-user token -> posting list index over session memory entries so
+fallback recall (when Mem0 is unavailable) is ranked with BM25 and only
+touches entries that share a term with the query.
+"""
+
+import heapq
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List[str]: Tokens in order of appearance
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass
+class _UserIndex:
+    """Index state for a single user."""
+
+    # token -> {entry_id: term frequency}
+    postings: Dict[str, Dict[int, int]] = field(default_factory=dict)
+    # entry_id -> (document length, content)
+    documents: Dict[int, Tuple[int, str]] = field(default_factory=dict)
+    total_length: int = 0
+
+
+class SessionMemoryIndex:
+    """
+    Per-user incremental inverted index with BM25 ranking.
+
+    Entry IDs are assigned from a single increasing counter, so a higher ID
+    always means a more recent entry; ties in score are broken by recency.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize the index.
+
+        Args:
+            k1: BM25 term-frequency saturation parameter
+            b: BM25 document-length normalization parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self._users: Dict[str, _UserIndex] = {}
+        self._next_id = 0
+
+    def add(self, user_id: str, content: str) -> int:
+        """
+        Index a memory entry for a user.
+
+        Args:
+            user_id: User identifier
+            content: Entry text
+
+        Returns:
+            int: ID assigned to the entry
+        """
+        entry_id = self._next_id
+        self._next_id += 1
+
+        index = self._users.setdefault(user_id, _UserIndex())
+        tokens = tokenize(content)
+
+        frequencies: Dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+
+        for token, count in frequencies.items():
+            index.postings.setdefault(token, {})[entry_id] = count
+
+        index.documents[entry_id] = (len(tokens), content)
+        index.total_length += len(tokens)
+        return entry_id
+
+    def remove(self, user_id: str, entry_id: int) -> bool:
+        """
+        Remove an entry from a user's index.
+
+        Args:
+            user_id: User identifier
+            entry_id: ID returned by ``add``
+
+        Returns:
+            bool: True if the entry was indexed and has been removed
+        """
+        index = self._users.get(user_id)
+        if index is None or entry_id not in index.documents:
+            return False
+
+        length, content = index.documents.pop(entry_id)
+        index.total_length -= length
+
+        for token in set(tokenize(content)):
+            posting = index.postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(entry_id, None)
+            if not posting:
+                del index.postings[token]
+
+        if not index.documents:
+            del self._users[user_id]
+        return True
+
+    def remove_user(self, user_id: str) -> None:
+        """
+        Drop every indexed entry for a user.
+
+        Args:
+            user_id: User identifier
+        """
+        self._users.pop(user_id, None)
+
+    def search(self, user_id: str, query: str, limit: int = 5) -> List[str]:
+        """
+        Return the best-matching entries for a query.
+
+        Args:
+            user_id: User identifier
+            query: Search query
+            limit: Maximum number of results
+
+        Returns:
+            List[str]: Entry contents ranked by BM25 score, most recent first on ties
+        """
+        return [content for _, content in self.search_with_scores(user_id, query, limit)]
+
+    def search_with_scores(
+        self, user_id: str, query: str, limit: int = 5
+    ) -> List[Tuple[float, str]]:
+        """
+        Return the best-matching entries for a query along with their scores.
+
+        Args:
+            user_id: User identifier
+            query: Search query
+            limit: Maximum number of results
+
+        Returns:
+            List[Tuple[float, str]]: (score, content) pairs, best first
+        """
+        index = self._users.get(user_id)
+        if index is None or limit <= 0:
+            return []
+
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return []
+
+        doc_count = len(index.documents)
+        avg_length = index.total_length / doc_count if doc_count else 0.0
+        scores: Dict[int, float] = {}
+
+        for term in query_terms:
+            posting = index.postings.get(term)
+            if not posting:
+                continue
+
+            df = len(posting)
+            idf = math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+
+            for entry_id, tf in posting.items():
+                length = index.documents[entry_id][0]
+                norm = self.k1 * (
+                    1.0 - self.b + self.b * (length / avg_length if avg_length else 1.0)
+                )
+                scores[entry_id] = scores.get(entry_id, 0.0) + idf * (
+                    tf * (self.k1 + 1.0) / (tf + norm)
+                )
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(score, index.documents[entry_id][1]) for entry_id, score in best]
+
+    def entry_count(self, user_id: Optional[str] = None) -> int:
+        """
+        Count indexed entries.
+
+        Args:
+            user_id: Restrict the count to one user (all users if None)
+
+        Returns:
+            int: Number of indexed entries
+        """
+        if user_id is not None:
+            index = self._users.get(user_id)
+            return len(index.documents) if index else 0
+        return sum(len(index.documents) for index in self._users.values())
+
+    def term_count(self, user_id: str) -> int:
+        """
+        Count distinct indexed terms for a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            int: Number of distinct terms
+        """
+        index = self._users.get(user_id)
+        return len(index.postings) if index else 0
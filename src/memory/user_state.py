@@ -0,0 +1,225 @@
+"""
+Bounded per-user state for Anime AI Character.
+Keeps per-user maps from growing with every participant a long-running worker
+has ever seen: entries are evicted least recently used first once a capacity
+is reached, and after an idle timeout.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+EVICT_CAPACITY = "capacity"
+EVICT_IDLE = "idle"
+
+Loader = Callable[[str], Optional[Any]]
+EvictCallback = Callable[[str, Any, str], None]
+
+
+class _Slot:
+    """A stored value and when it was last used."""
+
+    __slots__ = ("value", "last_access")
+
+    def __init__(self, value: Any, last_access: float):
+        self.value = value
+        self.last_access = last_access
+
+
+@dataclass
+class UserStateMetrics:
+    """Counters describing bounded state behaviour."""
+
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    spill_errors: int = 0
+
+
+class BoundedUserState(MutableMapping):
+    """
+    Per-user mapping with LRU capacity and idle-timeout eviction.
+
+    Reads and writes refresh a user's recency. When more than ``max_users``
+    users are held, the least recently used one is evicted; users idle for
+    longer than ``idle_ttl`` seconds are expired lazily on the next access.
+    Evicted values are handed to ``on_evict`` (e.g. to spill them to disk),
+    and ``get_or_load`` brings them back through ``loader``.
+
+    Membership tests, ``items()`` and ``values()`` do not refresh recency,
+    so stats and health checks don't keep idle users alive.
+    """
+
+    def __init__(
+        self,
+        max_users: int = 1000,
+        idle_ttl: float = 0.0,
+        loader: Optional[Loader] = None,
+        on_evict: Optional[EvictCallback] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the container.
+
+        Args:
+            max_users: Maximum number of users held at once
+            idle_ttl: Seconds without access before a user expires (0 disables)
+            loader: Returns a user's value on a miss, or None if there is none
+            on_evict: Called with ``(user_id, value, reason)`` for evicted users
+            clock: Monotonic time source
+        """
+        self.max_users = max(1, max_users)
+        self.idle_ttl = max(0.0, idle_ttl)
+        self.loader = loader
+        self.on_evict = on_evict
+        self.metrics = UserStateMetrics()
+        self.logger = logging.getLogger(__name__)
+
+        self._clock = clock
+        self._data: "OrderedDict[str, _Slot]" = OrderedDict()
+
+    def __getitem__(self, user_id: str) -> Any:
+        self.expire_idle()
+        slot = self._data.get(user_id)
+        if slot is None:
+            self.metrics.misses += 1
+            raise KeyError(user_id)
+
+        self.metrics.hits += 1
+        self._touch(user_id, slot)
+        return slot.value
+
+    def __setitem__(self, user_id: str, value: Any) -> None:
+        self.expire_idle()
+        slot = self._data.get(user_id)
+        if slot is None:
+            self._data[user_id] = _Slot(value, self._clock())
+            self._evict_over_capacity()
+        else:
+            slot.value = value
+            self._touch(user_id, slot)
+
+    def __delitem__(self, user_id: str) -> None:
+        # Explicit removal is not an eviction: nothing is spilled
+        del self._data[user_id]
+
+    def __contains__(self, user_id: object) -> bool:
+        slot = self._data.get(user_id)
+        return slot is not None and not self._is_expired(slot, self._clock())
+
+    def __iter__(self) -> Iterator[str]:
+        self.expire_idle()
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """Snapshot of ``(user_id, value)`` pairs, least recently used first."""
+        self.expire_idle()
+        return [(user_id, slot.value) for user_id, slot in self._data.items()]
+
+    def values(self) -> List[Any]:
+        """Snapshot of values, least recently used first."""
+        self.expire_idle()
+        return [slot.value for slot in self._data.values()]
+
+    def get_or_load(self, user_id: str) -> Optional[Any]:
+        """
+        Get a user's value, loading it with ``loader`` on a miss.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Optional[Any]: The value, or None if absent and nothing was loaded
+        """
+        try:
+            return self[user_id]
+        except KeyError:
+            pass
+
+        if self.loader is None:
+            return None
+
+        value = self.loader(user_id)
+        if value is None:
+            return None
+
+        self.metrics.loads += 1
+        self[user_id] = value
+        return value
+
+    def expire_idle(self) -> int:
+        """
+        Evict users idle for longer than ``idle_ttl``.
+
+        Returns:
+            int: Number of users expired
+        """
+        if not self.idle_ttl or not self._data:
+            return 0
+
+        now = self._clock()
+        expired = 0
+        # Oldest access first, so stop at the first user still within the TTL
+        while self._data:
+            user_id, slot = next(iter(self._data.items()))
+            if not self._is_expired(slot, now):
+                break
+            del self._data[user_id]
+            self.metrics.expirations += 1
+            self._spill(user_id, slot.value, EVICT_IDLE)
+            expired += 1
+        return expired
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get occupancy and eviction counters.
+
+        Returns:
+            Dict[str, Any]: Size, limits, hit/miss and eviction counts
+        """
+        lookups = self.metrics.hits + self.metrics.misses
+        return {
+            "users": len(self._data),
+            "max_users": self.max_users,
+            "idle_ttl": self.idle_ttl,
+            "hits": self.metrics.hits,
+            "misses": self.metrics.misses,
+            "hit_rate": self.metrics.hits / lookups if lookups else 0.0,
+            "loads": self.metrics.loads,
+            "evictions": self.metrics.evictions,
+            "expirations": self.metrics.expirations,
+            "spill_errors": self.metrics.spill_errors,
+        }
+
+    def _touch(self, user_id: str, slot: _Slot) -> None:
+        """Mark a user as most recently used."""
+        slot.last_access = self._clock()
+        self._data.move_to_end(user_id)
+
+    def _is_expired(self, slot: _Slot, now: float) -> bool:
+        return bool(self.idle_ttl) and now - slot.last_access > self.idle_ttl
+
+    def _evict_over_capacity(self) -> None:
+        """Evict least recently used users until within capacity."""
+        while len(self._data) > self.max_users:
+            user_id, slot = self._data.popitem(last=False)
+            self.metrics.evictions += 1
+            self._spill(user_id, slot.value, EVICT_CAPACITY)
+
+    def _spill(self, user_id: str, value: Any, reason: str) -> None:
+        """Hand an evicted value to the eviction callback."""
+        if self.on_evict is None:
+            return
+        try:
+            self.on_evict(user_id, value, reason)
+        except Exception as e:
+            self.metrics.spill_errors += 1
+            self.logger.warning(f"Failed to spill state for user {user_id}: {e}")
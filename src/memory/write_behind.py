@@ -0,0 +1,244 @@
+"""
+Write-behind queue for remote memory writes.
+Acknowledges memory adds immediately and pushes them to Mem0 in per-user
+batches in the background, so chat turns never wait on a remote write.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class PendingWrite:
+    """A memory add waiting to be flushed."""
+
+    content: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class WriteBehindMetrics:
+    """Counters describing write-behind queue behaviour."""
+
+    enqueued: int = 0
+    flushed_items: int = 0
+    flushed_batches: int = 0
+    failed_items: int = 0
+    failed_batches: int = 0
+    max_depth: int = 0
+    last_flush_latency: float = 0.0
+    total_flush_latency: float = 0.0
+    max_item_wait: float = 0.0
+
+    @property
+    def average_flush_latency(self) -> float:
+        batches = self.flushed_batches + self.failed_batches
+        return self.total_flush_latency / batches if batches else 0.0
+
+
+FlushFunc = Callable[[str, List[PendingWrite]], Awaitable[bool]]
+
+
+class WriteBehindQueue:
+    """
+    Per-user coalescing queue with size and time based flushing.
+
+    Adds are grouped per user. A user's batch is flushed as soon as it
+    reaches ``max_batch_size`` items; everything else is flushed by a
+    background timer every ``flush_interval`` seconds, and on ``close()``.
+    Batches for the same user are flushed one at a time, in order.
+    """
+
+    def __init__(
+        self,
+        flush_func: FlushFunc,
+        max_batch_size: int = 10,
+        flush_interval: float = 2.0,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            flush_func: Coroutine that writes one user's batch; returns True on success
+            max_batch_size: Pending items per user that trigger an immediate flush
+            flush_interval: Seconds between background flushes
+        """
+        self.flush_func = flush_func
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = max(0.01, flush_interval)
+        self.logger = logging.getLogger(__name__)
+        self.metrics = WriteBehindMetrics()
+
+        self._pending: Dict[str, List[PendingWrite]] = {}
+        self._user_locks: Dict[str, asyncio.Lock] = {}
+        self._flush_tasks: set = set()
+        self._timer_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def depth(self) -> int:
+        """Number of writes waiting to be flushed."""
+        return sum(len(items) for items in self._pending.values())
+
+    def enqueue(
+        self, user_id: str, content: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Queue a memory add without waiting for it to be written.
+
+        Args:
+            user_id: User identifier
+            content: Memory content
+            metadata: Metadata to store with the memory
+        """
+        if self._closed:
+            raise RuntimeError("Write-behind queue is closed")
+
+        items = self._pending.setdefault(user_id, [])
+        items.append(PendingWrite(content=content, metadata=dict(metadata or {})))
+
+        self.metrics.enqueued += 1
+        self.metrics.max_depth = max(self.metrics.max_depth, self.depth)
+
+        if len(items) >= self.max_batch_size:
+            self._spawn(self.flush_user(user_id))
+        self._ensure_timer()
+
+    async def flush_user(self, user_id: str) -> bool:
+        """
+        Flush all pending writes for one user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            bool: True if every batch was written successfully
+        """
+        lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+        success = True
+
+        async with lock:
+            while self._pending.get(user_id):
+                batch = self._pending[user_id][: self.max_batch_size]
+                del self._pending[user_id][: len(batch)]
+                success = await self._write_batch(user_id, batch) and success
+
+            self._pending.pop(user_id, None)
+
+        return success
+
+    def discard(self, user_id: str) -> int:
+        """
+        Drop a user's pending writes without flushing them.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            int: Number of writes dropped
+        """
+        return len(self._pending.pop(user_id, []))
+
+    async def flush(self) -> bool:
+        """
+        Flush pending writes for every user.
+
+        Returns:
+            bool: True if every batch was written successfully
+        """
+        results = await asyncio.gather(
+            *(self.flush_user(user_id) for user_id in list(self._pending))
+        )
+        # Wait for size-triggered flushes that were already running
+        if self._flush_tasks:
+            task_results = await asyncio.gather(
+                *list(self._flush_tasks), return_exceptions=True
+            )
+            results = list(results) + [r is True for r in task_results]
+        return all(results)
+
+    async def close(self) -> bool:
+        """
+        Stop the background timer and flush everything still pending.
+
+        Returns:
+            bool: True if the final flush succeeded
+        """
+        self._closed = True
+        if self._timer_task:
+            self._timer_task.cancel()
+            try:
+                await self._timer_task
+            except asyncio.CancelledError:
+                pass
+            self._timer_task = None
+        return await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue metrics.
+
+        Returns:
+            Dict[str, Any]: Depth, throughput and latency figures
+        """
+        return {
+            "depth": self.depth,
+            "pending_users": len(self._pending),
+            "max_depth": self.metrics.max_depth,
+            "enqueued": self.metrics.enqueued,
+            "flushed_items": self.metrics.flushed_items,
+            "flushed_batches": self.metrics.flushed_batches,
+            "failed_items": self.metrics.failed_items,
+            "failed_batches": self.metrics.failed_batches,
+            "last_flush_latency": self.metrics.last_flush_latency,
+            "average_flush_latency": self.metrics.average_flush_latency,
+            "max_item_wait": self.metrics.max_item_wait,
+        }
+
+    async def _write_batch(self, user_id: str, batch: List[PendingWrite]) -> bool:
+        """Write one batch and record its metrics."""
+        started = time.monotonic()
+        try:
+            success = bool(await self.flush_func(user_id, batch))
+        except Exception as e:
+            self.logger.warning(f"Write-behind flush failed for {user_id}: {e}")
+            success = False
+
+        finished = time.monotonic()
+        latency = finished - started
+        self.metrics.last_flush_latency = latency
+        self.metrics.total_flush_latency += latency
+        self.metrics.max_item_wait = max(
+            self.metrics.max_item_wait, finished - batch[0].enqueued_at
+        )
+
+        if success:
+            self.metrics.flushed_batches += 1
+            self.metrics.flushed_items += len(batch)
+        else:
+            self.metrics.failed_batches += 1
+            self.metrics.failed_items += len(batch)
+        return success
+
+    def _spawn(self, coro: Awaitable[Any]) -> None:
+        """Run a flush in the background, keeping a reference until it ends."""
+        task = asyncio.ensure_future(coro)
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def _ensure_timer(self) -> None:
+        """Start the periodic flush loop if it isn't running."""
+        if self._timer_task is None or self._timer_task.done():
+            self._timer_task = asyncio.ensure_future(self._timer_loop())
+
+    async def _timer_loop(self) -> None:
+        """Flush on a fixed interval until nothing is pending."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if not self._pending:
+                break
@@ -1,6 +1,13 @@
 # Web server and Live2D integration module
 
 from .app import Live2DFlaskApp, create_app
+from .async_app import Live2DWebApp, create_async_app
 from .server import main as run_server
 
-__all__ = ["Live2DFlaskApp", "create_app", "run_server"]
+__all__ = [
+    "Live2DFlaskApp",
+    "create_app",
+    "Live2DWebApp",
+    "create_async_app",
+    "run_server",
+]
@@ -69,6 +69,16 @@ class AnimationSequence:
     priority: AnimationPriority = AnimationPriority.NORMAL
 
 
+@dataclass
+class SegmentTimeline:
+    """Speech timeline of one streamed reply spoken segment by segment."""
+
+    sequence_id: str
+    base_expression: str
+    expression: str
+    speech_end: Optional[float] = None
+
+
 class AnimationSynchronizer:
     """
     Advanced animation synchronization system.
@@ -106,6 +116,10 @@ class AnimationSynchronizer:
         # Active sequences
         self.active_sequences: Dict[str, AnimationSequence] = {}
 
+        # Speech timelines of streamed replies spoken sentence by sentence,
+        # keyed by sequence ID so concurrent replies never share offsets
+        self.segment_timelines: Dict[str, SegmentTimeline] = {}
+
         # Performance tracking
         self.sync_accuracy_samples: List[float] = []
         self.max_accuracy_samples = 50
@@ -195,6 +209,219 @@ class AnimationSynchronizer:
             self.logger.error(f"Failed to synchronize TTS animation: {e}")
             raise
 
+    async def synchronize_segment_with_tts(
+        self,
+        text: str,
+        expression: str = "speak",
+        segment_index: int = 0,
+        is_final: bool = False,
+        audio_duration: Optional[float] = None,
+        tts_processing_delay: float = 0.2,
+        sequence_id: Optional[str] = None,
+    ) -> str:
+        """
+        Synchronize animation with one TTS segment of a streamed reply.
+
+        Segments of the same reply share a sequence ID and are laid out on a
+        speech timeline: each segment starts when its audio is ready or when
+        the previous segment finishes speaking, whichever is later. Every
+        segment gets its own mouth sync start/stop events sized to its own
+        duration; the final segment returns to the pre-reply expression.
+
+        Args:
+            text: Segment text being spoken
+            expression: Expression for this segment
+            segment_index: Position of the segment in the reply
+            is_final: Whether this is the last segment of the reply
+            audio_duration: Expected segment audio duration (estimated if None)
+            tts_processing_delay: Expected TTS processing delay for this segment
+            sequence_id: Sequence ID returned for the reply's earlier segments
+                (None or an unknown ID starts a new reply)
+
+        Returns:
+            str: Sequence ID shared by all segments of the reply
+        """
+        try:
+            now = time.time()
+
+            timeline = self.segment_timelines.get(sequence_id) if sequence_id else None
+            if timeline is None:
+                timeline = SegmentTimeline(
+                    sequence_id=str(uuid.uuid4()),
+                    base_expression=self.current_expression,
+                    expression=self.current_expression,
+                )
+                self.segment_timelines[timeline.sequence_id] = timeline
+
+            sequence_id = timeline.sequence_id
+
+            if audio_duration is None:
+                audio_duration = self._estimate_segment_duration(text)
+
+            speech_start = now + tts_processing_delay
+            if timeline.speech_end is not None:
+                speech_start = max(speech_start, timeline.speech_end)
+            speech_end = speech_start + audio_duration
+            timeline.speech_end = speech_end
+
+            steps = []
+
+            # Step 1: Switch expression only when the segment's mood changes
+            if expression != timeline.expression:
+                steps.append(
+                    AnimationEvent(
+                        event_type=AnimationEventType.EXPRESSION_CHANGE,
+                        timestamp=max(now, speech_start - 0.1),
+                        data={
+                            "expression": expression,
+                            "intensity": 0.7,
+                            "duration": self.transition_duration,
+                            "transition_type": "smooth",
+                            "segment_index": segment_index,
+                        },
+                        sequence_id=sequence_id,
+                        duration=self.transition_duration,
+                        priority=AnimationPriority.HIGH.value,
+                    )
+                )
+                timeline.expression = expression
+
+            # Step 2/3: Mouth sync for exactly this segment's audio
+            steps.append(
+                AnimationEvent(
+                    event_type=AnimationEventType.MOUTH_SYNC_START,
+                    timestamp=speech_start,
+                    data={
+                        "text": text,
+                        "audio_duration": audio_duration,
+                        "segment_index": segment_index,
+                        "sync_config": asdict(self.mouth_sync_config),
+                    },
+                    sequence_id=sequence_id,
+                    duration=audio_duration,
+                    priority=AnimationPriority.CRITICAL.value,
+                )
+            )
+            stop_data: Dict[str, Any] = {
+                "segment_index": segment_index,
+                "is_final": is_final,
+            }
+            if is_final:
+                stop_data["return_to_expression"] = timeline.base_expression
+            steps.append(
+                AnimationEvent(
+                    event_type=AnimationEventType.MOUTH_SYNC_STOP,
+                    timestamp=speech_end,
+                    data=stop_data,
+                    sequence_id=sequence_id,
+                    priority=AnimationPriority.HIGH.value,
+                )
+            )
+
+            # Step 4: Return to the pre-reply expression after the last segment
+            if is_final:
+                steps.extend(self._segment_finish_steps(timeline, speech_end))
+
+            sequence = self.active_sequences.get(sequence_id)
+            if sequence is None:
+                sequence = AnimationSequence(
+                    sequence_id=sequence_id,
+                    steps=[],
+                    total_duration=0.0,
+                    priority=AnimationPriority.HIGH,
+                )
+                self.active_sequences[sequence_id] = sequence
+            sequence.steps.extend(steps)
+            sequence.total_duration = speech_end - now + (
+                self.transition_duration if is_final else 0.0
+            )
+
+            for step in steps:
+                await self.websocket_manager.queue_animation(step)
+
+            if segment_index == 0:
+                self.audio_start_time = speech_start
+            self.audio_duration = speech_end - (self.audio_start_time or speech_start)
+
+            if is_final:
+                del self.segment_timelines[sequence_id]
+
+            self.logger.info(
+                f"TTS segment {segment_index} synchronized: {sequence_id} "
+                f"({audio_duration:.2f}s{', final' if is_final else ''})"
+            )
+
+            return sequence_id
+
+        except Exception as e:
+            self.logger.error(f"Failed to synchronize TTS segment: {e}")
+            raise
+
+    async def finish_segment_sequence(
+        self, sequence_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Close a segmented reply when its last segment was already sent.
+
+        Queues the return to the pre-reply expression once the scheduled
+        speech ends. Does nothing if the reply is not in progress.
+
+        Args:
+            sequence_id: Sequence ID returned for the reply's segments
+
+        Returns:
+            Optional[str]: Sequence ID that was closed, or None
+        """
+        if not sequence_id:
+            return None
+        timeline = self.segment_timelines.pop(sequence_id, None)
+        if timeline is None:
+            return None
+
+        speech_end = timeline.speech_end or time.time()
+        steps = self._segment_finish_steps(timeline, speech_end)
+
+        sequence = self.active_sequences.get(sequence_id)
+        if sequence is not None:
+            sequence.steps.extend(steps)
+
+        for step in steps:
+            await self.websocket_manager.queue_animation(step)
+
+        return sequence_id
+
+    def _segment_finish_steps(
+        self, timeline: SegmentTimeline, speech_end: float
+    ) -> List[AnimationEvent]:
+        """
+        Build the closing events for a segmented reply.
+
+        Args:
+            timeline: Speech timeline of the reply
+            speech_end: Time at which the last segment stops speaking
+
+        Returns:
+            List[AnimationEvent]: Expression reset event, if one is needed
+        """
+        if timeline.expression == timeline.base_expression:
+            return []
+
+        return [
+            AnimationEvent(
+                event_type=AnimationEventType.EXPRESSION_CHANGE,
+                timestamp=speech_end + 0.2,
+                data={
+                    "expression": timeline.base_expression,
+                    "intensity": 0.6,
+                    "duration": self.transition_duration,
+                    "transition_type": "smooth",
+                },
+                sequence_id=timeline.sequence_id,
+                duration=self.transition_duration,
+                priority=AnimationPriority.NORMAL.value,
+            )
+        ]
+
     async def _create_tts_animation_sequence(
         self,
         sequence_id: str,
@@ -361,6 +588,90 @@ class AnimationSynchronizer:
             self.logger.error(f"Failed to trigger expression change: {e}")
             raise
 
+    async def queue_expression_sequence(self, steps: List[Dict[str, Any]]) -> str:
+        """
+        Queue a scripted series of expression changes as one sequence.
+
+        Args:
+            steps: Expression steps, each with ``expression``, ``intensity``,
+                ``duration``, ``priority`` (AnimationPriority) and ``offset``
+                (seconds after the start of the sequence)
+
+        Steps are queued in offset order; step ``i`` of ``steps`` gets the
+        sequence ID ``"<sequence_id>:i"`` whatever its position in time.
+
+        Returns:
+            str: Animation sequence ID
+        """
+        sequence_id = str(uuid.uuid4())
+
+        try:
+            start_time = time.time()
+            previous_expression = self.target_expression
+            events = []
+
+            ordered = sorted(enumerate(steps), key=lambda item: item[1]["offset"])
+            for index, step in ordered:
+                transition = None
+                if step["expression"] != previous_expression:
+                    transition = ExpressionTransition(
+                        from_expression=previous_expression,
+                        to_expression=step["expression"],
+                        duration=step["duration"],
+                        easing_type="easeInOut",
+                    )
+                previous_expression = step["expression"]
+
+                events.append(
+                    AnimationEvent(
+                        event_type=AnimationEventType.EXPRESSION_CHANGE,
+                        timestamp=start_time + step["offset"],
+                        data={
+                            "expression": step["expression"],
+                            "intensity": step["intensity"],
+                            "duration": step["duration"],
+                            "transition": asdict(transition) if transition else None,
+                            "interrupt_current": False,
+                        },
+                        # Per-step ID (numbered in request order) so a
+                        # completion only ends its own step
+                        sequence_id=f"{sequence_id}:{index}",
+                        duration=step["duration"],
+                        priority=step["priority"].value,
+                    )
+                )
+
+            total_duration = max(s["offset"] + s["duration"] for s in steps)
+            self.active_sequences[sequence_id] = AnimationSequence(
+                sequence_id=sequence_id,
+                steps=events,
+                total_duration=total_duration,
+                priority=max((s["priority"] for s in steps), key=lambda p: p.value),
+            )
+
+            # Queue every step in one go so the sequence is never half-queued
+            await self.websocket_manager.queue_animations(events)
+
+            # Update state
+            self.target_expression = previous_expression
+            if not self.is_transitioning:
+                self.is_transitioning = True
+                asyncio.create_task(
+                    self._complete_expression_transition(sequence_id, total_duration)
+                )
+
+            self.logger.info(
+                f"Expression sequence queued: {sequence_id} "
+                f"({len(events)} steps, {total_duration:.2f}s)"
+            )
+
+            return sequence_id
+
+        except Exception as e:
+            self.active_sequences.pop(sequence_id, None)
+            self.logger.error(f"Failed to queue expression sequence: {e}")
+            raise
+
     async def _complete_expression_transition(
         self, sequence_id: str, duration: float
     ) -> None:
@@ -535,6 +846,22 @@ class AnimationSynchronizer:
         # Add minimum duration and processing overhead
         return max(1.0, duration + 0.5)
 
+    def _estimate_segment_duration(self, text: str) -> float:
+        """
+        Estimate audio duration of a single speech segment.
+
+        Unlike ``_estimate_audio_duration`` this skips the per-utterance
+        overhead, which would otherwise be paid again for every sentence.
+
+        Args:
+            text: Segment text
+
+        Returns:
+            float: Estimated duration in seconds
+        """
+        words = len(text) / 5
+        return max(0.3, (words / 150) * 60)
+
     async def _handle_mouth_sync_start(self, event: AnimationEvent) -> None:
         """Handle mouth sync start event."""
         self.is_speaking = True
@@ -612,6 +939,12 @@ class AnimationSynchronizer:
             del self.active_sequences[sequence_id]
             self.logger.debug(f"Cleaned up expired sequence: {sequence_id}")
 
+        # Drop segment timelines of replies that were never closed
+        for sequence_id, timeline in list(self.segment_timelines.items()):
+            speech_end = timeline.speech_end
+            if speech_end is not None and current_time - speech_end > 5.0:
+                del self.segment_timelines[sequence_id]
+
 
 # Global animation synchronizer instance
 animation_synchronizer: Optional[AnimationSynchronizer] = None
@@ -0,0 +1,590 @@
+"""
+Transports for sending animation commands from the agent to the web server.
+
+- ``direct``: the web server runs in this process; commands are dispatched
+  onto its WebSocket event loop without going through HTTP.
+- ``http``: POST to ``/animate`` over a pooled keep-alive session.
+- ``unix``: newline-delimited JSON over a Unix socket served by the web
+  server, for agent and web server running as separate local processes.
+- ``auto``: ``direct`` when an in-process server is registered, otherwise
+  ``unix`` if a socket path is configured, otherwise ``http``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from src.config.settings import get_settings
+from src.error_handling.exceptions import Live2DError, NetworkError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ANIMATION_TRANSPORTS = ("auto", "direct", "http", "unix")
+
+
+@dataclass
+class AnimationCommand:
+    """One expression change requested by the agent."""
+
+    expression: str
+    intensity: float = 0.7
+    duration: float = 2.0
+    priority: str = "normal"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the command to a JSON-serialisable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "AnimationCommand":
+        """
+        Build a command from request data.
+
+        Args:
+            data: Decoded JSON object
+
+        Returns:
+            AnimationCommand: Parsed command
+
+        Raises:
+            ValidationError: If fields are missing or have the wrong type
+        """
+        if not isinstance(data, dict):
+            raise ValidationError("Animation command must be a JSON object")
+        if not data.get("expression"):
+            raise ValidationError("Missing required animation parameter: expression")
+        try:
+            return cls(
+                expression=str(data["expression"]),
+                intensity=float(data.get("intensity", 0.7)),
+                duration=float(data.get("duration", 2.0)),
+                priority=data.get("priority") or "normal",
+            )
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid parameter type or value: {e}")
+
+
+# Handles a command in the web server and returns the /animate result dict
+AnimationDispatcher = Callable[[AnimationCommand], Awaitable[Dict[str, Any]]]
+
+# Dispatcher and event loop of the web server running in this process
+_local_server: Optional[Tuple[AnimationDispatcher, asyncio.AbstractEventLoop]] = None
+
+
+def register_local_animation_server(
+    dispatch: AnimationDispatcher, loop: asyncio.AbstractEventLoop
+) -> None:
+    """
+    Make the in-process web server reachable by the direct transport.
+
+    Args:
+        dispatch: Coroutine function handling one command
+        loop: Event loop the dispatcher must run on (the WebSocket loop)
+    """
+    global _local_server
+    _local_server = (dispatch, loop)
+    logger.info("In-process animation server registered")
+
+
+def unregister_local_animation_server() -> None:
+    """Forget the in-process web server (e.g. when it shuts down)."""
+    global _local_server
+    _local_server = None
+
+
+def has_local_animation_server() -> bool:
+    """Whether an in-process web server is registered and its loop is open."""
+    return _local_server is not None and not _local_server[1].is_closed()
+
+
+def _abort_transport(
+    transport: asyncio.BaseTransport, loop: asyncio.AbstractEventLoop
+) -> None:
+    """
+    Abort a transport whose event loop is no longer running.
+
+    Args:
+        transport: Transport to abort
+        loop: Event loop that owns the transport
+    """
+    try:
+        transport.abort()
+    except RuntimeError:
+        # abort() hands connection_lost to the owning loop, which fails once
+        # that loop is closed; run it here so the socket is released now
+        if loop.is_closed() and getattr(transport, "_sock", None) is not None:
+            transport._call_connection_lost(None)
+
+
+def _close_writer(
+    writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop
+) -> None:
+    """
+    Close a stream writer from outside the event loop it was created on.
+
+    Args:
+        writer: Writer to close
+        loop: Event loop the writer was created on
+    """
+    if loop.is_running():
+        loop.call_soon_threadsafe(writer.close)
+    else:
+        _abort_transport(writer.transport, loop)
+
+
+def _close_session(
+    session: "aiohttp.ClientSession", loop: asyncio.AbstractEventLoop
+) -> None:
+    """
+    Close a client session from outside the event loop it was created on.
+
+    Args:
+        session: Session to close
+        loop: Event loop the session was created on
+    """
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+
+    # The loop will not run the async close; aiohttp skips closing pooled
+    # connections once their loop is closed, so abort them directly
+    connector = session.connector
+    transports = [
+        proto.transport
+        for conns in connector._conns.values()
+        for proto, _ in conns
+        if proto.transport is not None
+    ]
+    connector._close()
+    for transport in transports:
+        _abort_transport(transport, loop)
+
+
+class AnimationTransport:
+    """Base class for animation transports."""
+
+    name = "base"
+
+    async def send(self, command: AnimationCommand) -> bool:
+        """
+        Deliver a command to the web server.
+
+        Args:
+            command: Command to send
+
+        Returns:
+            bool: True if the web server accepted the command
+
+        Raises:
+            ValidationError: If the web server rejected the parameters
+            NetworkError: If the web server could not be reached
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release pooled connections."""
+
+
+class DirectAnimationTransport(AnimationTransport):
+    """Dispatches commands to the web server in this process."""
+
+    name = "direct"
+
+    def __init__(self, timeout: float = 5.0):
+        """
+        Initialize the transport.
+
+        Args:
+            timeout: Seconds to wait for the web server's event loop
+        """
+        self.timeout = timeout
+
+    async def send(self, command: AnimationCommand) -> bool:
+        if not has_local_animation_server():
+            raise Live2DError(
+                "No in-process animation server is running",
+                operation="trigger_animation",
+                animation_type=command.expression,
+            )
+
+        dispatch, loop = _local_server
+        if loop is asyncio.get_running_loop():
+            result = await dispatch(command)
+        else:
+            # One hop onto the WebSocket loop
+            future = asyncio.run_coroutine_threadsafe(dispatch(command), loop)
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.wrap_future(future), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                future.cancel()
+                raise Live2DError(
+                    "In-process animation dispatch timed out",
+                    operation="trigger_animation",
+                    animation_type=command.expression,
+                )
+        return bool(result.get("success"))
+
+
+class HTTPAnimationTransport(AnimationTransport):
+    """POSTs commands to ``/animate`` over a pooled keep-alive session."""
+
+    name = "http"
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 4,
+        keepalive_timeout: float = 60.0,
+        max_retries: int = 3,
+    ):
+        """
+        Initialize the transport. The HTTP session is created on first use.
+
+        Args:
+            base_url: Web server base URL
+            max_connections: Connection pool size
+            keepalive_timeout: Seconds an idle pooled connection stays open
+            max_retries: Attempts per command on timeouts and server errors
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp library is required for HTTPAnimationTransport")
+
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max(1, max_connections)
+        self.keepalive_timeout = keepalive_timeout
+        self.max_retries = max(1, max_retries)
+
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the session for the running loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            if self._session is not None and not self._session.closed:
+                _close_session(self._session, self._session_loop)
+            # Sessions are bound to the loop they were created on
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    async def send(self, command: AnimationCommand) -> bool:
+        url = f"{self.base_url}/animate"
+
+        for attempt in range(self.max_retries):
+            last_attempt = attempt == self.max_retries - 1
+            # Increase timeout on retries
+            timeout = aiohttp.ClientTimeout(total=5.0 + attempt * 2)
+            try:
+                session = self._get_session()
+                async with session.post(
+                    url, json=command.to_dict(), timeout=timeout
+                ) as response:
+                    if response.status == 200:
+                        logger.info(
+                            f"Animation triggered successfully: {command.expression}"
+                        )
+                        return True
+                    elif response.status == 400:
+                        # Client error - don't retry
+                        response_text = await response.text()
+                        raise ValidationError(
+                            f"Invalid animation parameters: {response_text}"
+                        )
+                    elif response.status >= 500:
+                        if last_attempt:
+                            raise NetworkError(
+                                f"Animation server error: {response.status}",
+                                operation="trigger_animation",
+                                endpoint=self.base_url,
+                                status_code=response.status,
+                            )
+                        wait_time = 2**attempt
+                        logger.warning(
+                            f"Server error {response.status}, retrying in {wait_time}s"
+                        )
+                        await asyncio.sleep(wait_time)
+                    else:
+                        logger.warning(
+                            f"Animation trigger failed with status {response.status}"
+                        )
+                        return False
+
+            except asyncio.TimeoutError:
+                if last_attempt:
+                    raise NetworkError(
+                        "Animation trigger timeout after all retries",
+                        operation="trigger_animation",
+                        endpoint=self.base_url,
+                        is_timeout=True,
+                    )
+                logger.warning(
+                    f"Animation trigger timeout, attempt {attempt + 1}/{self.max_retries}"
+                )
+                await asyncio.sleep(1.0)
+            except aiohttp.ClientError as e:
+                if last_attempt:
+                    raise NetworkError(
+                        f"Animation trigger client error: {e}",
+                        operation="trigger_animation",
+                        endpoint=self.base_url,
+                    )
+                logger.warning(f"Animation trigger client error: {e}, retrying...")
+                await asyncio.sleep(1.0)
+
+        return False
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            if self._session_loop is asyncio.get_running_loop():
+                await self._session.close()
+            else:
+                _close_session(self._session, self._session_loop)
+        self._session = None
+        self._session_loop = None
+
+
+class UnixSocketAnimationTransport(AnimationTransport):
+    """
+    Sends commands over a persistent Unix socket connection.
+
+    Each request is one JSON line and is answered by one JSON line with at
+    least a ``success`` field. Requests on a connection are sent one at a
+    time; a broken connection is reopened once per command.
+    """
+
+    name = "unix"
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        """
+        Initialize the transport. The connection is opened on first use.
+
+        Args:
+            path: Socket path served by ``AnimationIPCServer``
+            timeout: Seconds to wait for a reply
+        """
+        self.path = path
+        self.timeout = timeout
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _lock_for_loop(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Streams and locks are bound to the loop they were created on
+            if self._writer is not None:
+                _close_writer(self._writer, self._loop)
+            self._reader = self._writer = None
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def send(self, command: AnimationCommand) -> bool:
+        async with self._lock_for_loop():
+            for attempt in range(2):
+                try:
+                    reply = await asyncio.wait_for(
+                        self._request(command), timeout=self.timeout
+                    )
+                    break
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                    await self._disconnect()
+                    if attempt == 0 and not isinstance(e, asyncio.TimeoutError):
+                        continue
+                    raise NetworkError(
+                        f"Animation socket error: {e or type(e).__name__}",
+                        operation="trigger_animation",
+                        endpoint=self.path,
+                        is_timeout=isinstance(e, asyncio.TimeoutError),
+                    )
+
+        if reply.get("error_type") == "validation":
+            raise ValidationError(f"Invalid animation parameters: {reply.get('error')}")
+        if reply.get("success"):
+            logger.info(f"Animation triggered successfully: {command.expression}")
+        return bool(reply.get("success"))
+
+    async def _request(self, command: AnimationCommand) -> Dict[str, Any]:
+        if self._writer is None or self._writer.is_closing():
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._writer.write(json.dumps(command.to_dict()).encode() + b"\n")
+        await self._writer.drain()
+        line = await self._reader.readuntil(b"\n")
+        return json.loads(line)
+
+    async def _disconnect(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None and self._loop is not asyncio.get_running_loop():
+            _close_writer(writer, self._loop)
+        elif writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def close(self) -> None:
+        await self._disconnect()
+
+
+class AutoAnimationTransport(AnimationTransport):
+    """Uses the direct transport whenever an in-process server is registered."""
+
+    name = "auto"
+
+    def __init__(self, direct: DirectAnimationTransport, remote: AnimationTransport):
+        """
+        Initialize the transport.
+
+        Args:
+            direct: Transport used when the web server is in this process
+            remote: Transport used otherwise
+        """
+        self.direct = direct
+        self.remote = remote
+
+    async def send(self, command: AnimationCommand) -> bool:
+        if has_local_animation_server():
+            return await self.direct.send(command)
+        return await self.remote.send(command)
+
+    async def close(self) -> None:
+        await self.remote.close()
+
+
+class AnimationIPCServer:
+    """Serves ``UnixSocketAnimationTransport`` clients in the web server."""
+
+    def __init__(self, path: str, dispatch: AnimationDispatcher):
+        """
+        Initialize the server.
+
+        Args:
+            path: Socket path to listen on
+            dispatch: Coroutine function handling one command
+        """
+        self.path = path
+        self.dispatch = dispatch
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening, replacing a stale socket file."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle_client, self.path)
+        logger.info(f"Animation IPC server listening on {self.path}")
+
+    async def stop(self) -> None:
+        """Stop listening and remove the socket file."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self._handle_line(line)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_line(self, line: bytes) -> Dict[str, Any]:
+        try:
+            command = AnimationCommand.from_dict(json.loads(line))
+        except ValueError:
+            return {"success": False, "error": "Invalid JSON", "error_type": "validation"}
+        except ValidationError as e:
+            return {"success": False, "error": str(e), "error_type": "validation"}
+
+        try:
+            result = await self.dispatch(command)
+        except Exception as e:
+            logger.error(f"Animation IPC dispatch failed: {e}")
+            return {"success": False, "error": "Animation system error"}
+        return {
+            "success": bool(result.get("success")),
+            "sequence_id": result.get("sequence_id"),
+            "error": result.get("error"),
+        }
+
+
+_animation_transport: Optional[AnimationTransport] = None
+
+
+def create_animation_transport(
+    kind: Optional[str] = None, socket_path: Optional[str] = None
+) -> AnimationTransport:
+    """
+    Create a transport from configuration.
+
+    Args:
+        kind: One of ``ANIMATION_TRANSPORTS`` (default: ANIMATION_TRANSPORT)
+        socket_path: Unix socket path (default: ANIMATION_SOCKET_PATH)
+
+    Returns:
+        AnimationTransport: Configured transport
+    """
+    settings = get_settings()
+    kind = kind or settings.flask.animation_transport
+    if socket_path is None:
+        socket_path = settings.flask.animation_socket_path
+
+    if kind == "direct":
+        return DirectAnimationTransport()
+    if kind == "unix" or (kind == "auto" and socket_path):
+        if not socket_path:
+            raise ValueError("ANIMATION_SOCKET_PATH is required for the unix transport")
+        remote: AnimationTransport = UnixSocketAnimationTransport(socket_path)
+    else:
+        remote = HTTPAnimationTransport(
+            f"http://{settings.flask.host}:{settings.flask.port}"
+        )
+
+    if kind == "auto":
+        return AutoAnimationTransport(DirectAnimationTransport(), remote)
+    return remote
+
+
+def get_animation_transport() -> AnimationTransport:
+    """
+    Get global animation transport instance.
+
+    Returns:
+        AnimationTransport: Global transport
+    """
+    global _animation_transport
+    if _animation_transport is None:
+        _animation_transport = create_animation_transport()
+    return _animation_transport
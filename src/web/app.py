@@ -12,25 +12,40 @@ import os
 import logging
 import asyncio
 import glob
-import aiohttp
+import json
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 import threading
 import time
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from livekit import api
 
 from src.config.settings import get_settings
+from src.config.executors import get_executor_stats
 from src.web.websocket_manager import (
     get_websocket_manager,
     AnimationEvent,
     AnimationEventType,
 )
 from src.web.animation_sync import get_animation_synchronizer, AnimationPriority
+from src.web.animation_transport import (
+    AnimationCommand,
+    AnimationIPCServer,
+    get_animation_transport,
+    register_local_animation_server,
+    unregister_local_animation_server,
+)
+from src.web.model_bundle import BUNDLE_CONTENT_TYPE, get_model_bundler
+from src.web.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    get_static_assets,
+    negotiate_encoding,
+)
 from src.error_handling.exceptions import (
     Live2DError,
-    NetworkError,
     ValidationError,
     LiveKitError,
 )
@@ -42,11 +57,61 @@ from src.error_handling.logging_handler import get_error_logger
 logger = logging.getLogger(__name__)
 
 
-class Live2DFlaskApp:
-    """Flask application for Live2D model serving and animation control."""
+def _coerce_priority(priority: Any) -> AnimationPriority:
+    """Map a priority name or number to AnimationPriority (NORMAL if unknown)."""
+    if isinstance(priority, AnimationPriority):
+        return priority
+    if isinstance(priority, str):
+        try:
+            return AnimationPriority[priority.upper()]
+        except KeyError:
+            logger.warning(f"Unknown priority string '{priority}', defaulting to NORMAL")
+    elif isinstance(priority, (int, float)):
+        # Map numeric priority to enum by value if possible
+        try:
+            return AnimationPriority(int(priority))
+        except Exception:
+            logger.warning(f"Numeric priority '{priority}' not valid, defaulting to NORMAL")
+    else:
+        logger.warning(f"Unrecognized priority type {type(priority)}, defaulting to NORMAL")
+    return AnimationPriority.NORMAL
+
+
+# Content types for /animate/batch bodies sent as one command per line
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def decode_ndjson_line(line: bytes, line_number: int) -> Optional[Any]:
+    """
+    Decode one line of an NDJSON animation batch.
+
+    Args:
+        line: Raw line, with or without the trailing newline
+        line_number: 1-based line number for error messages
+
+    Returns:
+        Optional[Any]: Decoded value, or None for a blank line
+
+    Raises:
+        ValidationError: If the line is not valid JSON
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise ValidationError(f"Invalid JSON on line {line_number}: {e}")
+
+
+class Live2DAppCore:
+    """
+    Animation state and request handling shared by the web servers.
+
+    Subclasses bind these handlers to an HTTP framework (Flask or aiohttp).
+    """
 
     def __init__(self):
-        self.app = Flask(__name__, template_folder="templates", static_folder="static")
         self.settings = get_settings()
 
         # Error handling components
@@ -64,8 +129,12 @@ class Live2DFlaskApp:
         # WebSocket and synchronization components
         self.websocket_manager = get_websocket_manager()
         self.animation_sync = get_animation_synchronizer()
-        self.websocket_thread: Optional[threading.Thread] = None
         self.websocket_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.ipc_server: Optional[AnimationIPCServer] = None
+
+        # Content-hashed, precompressed static files
+        self.static_assets = get_static_assets()
+        self.model_bundler = get_model_bundler()
 
         # Health tracking
         self.consecutive_failures = 0
@@ -74,13 +143,12 @@ class Live2DFlaskApp:
 
         # Resolve Live2D model URL
         self.resolved_model_url = self._resolve_live2d_model_url()
+        self.model_bundle_url = self._resolve_live2d_bundle_url()
 
-        # Register routes and error recovery once
-        self._setup_routes()
-        self._register_error_recovery()
-        # Separate animation routes are set up in their own method
-        # to keep route registration organized.
-        self._setup_animation_routes()
+    @property
+    def websocket_active(self) -> bool:
+        """Whether the WebSocket animation loop is running."""
+        return self.websocket_loop is not None and not self.websocket_loop.is_closed()
 
     def _resolve_live2d_model_url(self) -> Optional[str]:
         """Resolve the Live2D model URL based on the LIVE2D_MODEL_CONFIG_PATH environment variable."""
@@ -92,146 +160,213 @@ class Live2DFlaskApp:
             # Flask serves files from the 'static' folder at the '/static/' URL prefix.
             # So, if LIVE2D_MODEL_CONFIG_PATH is 'models/miara_pro_en/runtime/miara_pro_t03.model3.json',
             # the URL will be '/static/models/miara_pro_en/runtime/miara_pro_t03.model3.json'.
-            resolved_url = f"/static/{live2d_model_config_path.replace(os.sep, '/')}"
+            # Versioned so the model directory is cached as one immutable set
+            resolved_url = self.static_assets.asset_url(
+                live2d_model_config_path.replace(os.sep, "/")
+            )
             logger.info(f"Resolved Live2D model URL from ENV: {resolved_url}")
             return resolved_url
         else:
             logger.warning("LIVE2D_MODEL_CONFIG_PATH environment variable not set. Live2D model will not be loaded.")
             return None
 
-    def _setup_routes(self):
-        """Set up Flask routes for the application."""
+    def _resolve_live2d_bundle_url(self) -> Optional[str]:
+        """Resolve the versioned bundle URL for the model (None if disabled)."""
+        live2d_model_config_path = os.getenv("LIVE2D_MODEL_CONFIG_PATH")
+        if not live2d_model_config_path:
+            return None
+        if os.getenv("LIVE2D_MODEL_BUNDLE", "true").lower() != "true":
+            return None
+        return self.model_bundler.bundle_url(
+            live2d_model_config_path.replace(os.sep, "/")
+        )
 
-        @self.app.route("/")
-        def index():
-            """Main web interface with Live2D canvas."""
-            return render_template(
-                "index.html",
-                livekit_url=self.settings.livekit.url,
-                model_url=self.resolved_model_url,
-            )
+    def _build_model_bundle_response(
+        self,
+        model_path: str,
+        query: Mapping[str, str],
+        request_headers: Mapping[str, str],
+    ) -> Tuple[int, bytes, Dict[str, str]]:
+        """
+        Build the response to a model bundle request.
 
-        @self.app.route("/animate", methods=["POST"])
-        def animate():
-            """API endpoint for triggering Live2D expressions with comprehensive error handling."""
-            try:
-                # Parse request data and add extra debug logging for troubleshooting
-                logger.debug(f"Received /animate request content-type: {request.content_type}")
-                logger.debug(f"Raw request data: {request.data}")
+        Args:
+            model_path: model3.json path relative to the static directory
+            query: Query parameters (``v`` version, ``quantize`` decimals)
+            request_headers: Request headers
 
-                # Validate and parse request data
-                data = request.get_json(force=True, silent=True)
-                logger.debug(f"Parsed JSON data for /animate: {data}")
+        Returns:
+            Tuple[int, bytes, Dict[str, str]]: Status, body and headers
 
-                if data is None:
-                    raise ValidationError("No JSON data provided")
+        Raises:
+            ValidationError: If the path or options are invalid
+            Live2DError: If the model does not exist
+        """
+        quantize = query.get("quantize")
+        if quantize not in (None, ""):
+            try:
+                quantize = int(quantize)
+            except ValueError:
+                raise ValidationError(f"Invalid quantize value: {quantize!r}")
+        else:
+            quantize = None
 
-                expression = data.get("expression")
-                intensity = data.get("intensity")
-                duration = data.get("duration")
-                priority = data.get("priority")
-                sync_with_audio = data.get("sync_with_audio", False)
+        bundle = self.model_bundler.build(model_path, quantize)
+        encoding = negotiate_encoding(
+            bundle.encodings, request_headers.get("Accept-Encoding")
+        )
+        headers = {
+            "Content-Type": BUNDLE_CONTENT_TYPE,
+            "ETag": bundle.etag_for(encoding),
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL
+            if query.get("v") == bundle.version
+            else REVALIDATE_CACHE_CONTROL,
+        }
+        if bundle.encodings:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        current = [bundle.etag_for(e) for e in [None, *bundle.encodings]]
+        if etag_matches(current, request_headers.get("If-None-Match")):
+            return 304, b"", headers
+        body = bundle.encodings[encoding] if encoding else bundle.data
+        return 200, body, headers
+
+    def _parse_animation_request(self, data: Any) -> Dict[str, Any]:
+        """
+        Validate an /animate request body.
 
-                # Explicitly check presence of required fields (allow zero values where valid)
-                required_fields = ["expression", "intensity", "duration"]
-                missing = [f for f in required_fields if f not in data or data.get(f) is None]
+        Args:
+            data: Decoded JSON body
 
-                # Priority is optional; default to NORMAL if missing
-                if priority is None:
-                    logger.debug("Priority not provided in /animate request; defaulting to 'normal'")
-                    priority = "normal"
+        Returns:
+            Dict[str, Any]: Keyword arguments for _execute_animation_with_fallback
 
-                if missing:
-                    raise ValidationError(f"Missing required animation parameters: {missing}")
+        Raises:
+            ValidationError: If the body is missing or invalid
+        """
+        if data is None:
+            raise ValidationError("No JSON data provided")
+        if not isinstance(data, dict):
+            raise ValidationError("Animation request must be a JSON object")
+
+        expression = data.get("expression")
+        intensity = data.get("intensity")
+        duration = data.get("duration")
+        priority = data.get("priority")
+        sync_with_audio = data.get("sync_with_audio", False)
+
+        # Explicitly check presence of required fields (allow zero values where valid)
+        required_fields = ["expression", "intensity", "duration"]
+        missing = [f for f in required_fields if f not in data or data.get(f) is None]
+
+        # Priority is optional; default to NORMAL if missing
+        if priority is None:
+            logger.debug("Priority not provided in /animate request; defaulting to 'normal'")
+            priority = "normal"
+
+        if missing:
+            raise ValidationError(f"Missing required animation parameters: {missing}")
+
+        # Ensure correct types and coerce priority (accept strings or numeric values)
+        try:
+            intensity = float(intensity)
+            duration = float(duration)
+            priority = _coerce_priority(priority)
+        except (ValueError, KeyError) as e:
+            raise ValidationError(f"Invalid parameter type or value: {e}")
 
-                # Ensure correct types and coerce priority (accept strings or numeric values)
-                try:
-                    intensity = float(intensity)
-                    duration = float(duration)
-
-                    # Coerce priority
-                    if isinstance(priority, str):
-                        try:
-                            priority = AnimationPriority[priority.upper()]
-                        except KeyError:
-                            logger.warning(f"Unknown priority string '{priority}', defaulting to NORMAL")
-                            priority = AnimationPriority.NORMAL
-                    elif isinstance(priority, (int, float)):
-                        # Map numeric priority to enum by value if possible
-                        try:
-                            priority = AnimationPriority(int(priority))
-                        except Exception:
-                            logger.warning(f"Numeric priority '{priority}' not valid, defaulting to NORMAL")
-                            priority = AnimationPriority.NORMAL
-                    else:
-                        logger.warning(f"Unrecognized priority type {type(priority)}, defaulting to NORMAL")
-                        priority = AnimationPriority.NORMAL
-
-                except (ValueError, KeyError) as e:
-                    raise ValidationError(f"Invalid parameter type or value: {e}")
+        return {
+            "expression": expression,
+            "intensity": intensity,
+            "duration": duration,
+            "priority": priority,
+            "sync_with_audio": sync_with_audio,
+        }
 
-                # Execute animation with fallback
-                # Run the async animation execution safely from sync context.
-                result = self._run_coro_sync(
-                    self._execute_animation_with_fallback(
-                        expression, intensity, duration, priority, sync_with_audio
-                    )
-                )
+    def _parse_animation_batch(self, items: Any) -> List[Dict[str, Any]]:
+        """
+        Validate every command of an /animate/batch request in one pass.
 
-                if result["success"]:
-                    self.consecutive_failures = 0
-                    self.last_successful_request = time.time()
-                    return jsonify(result)
-                else:
-                    return jsonify(result), 500
+        Each command takes the /animate fields plus an optional ``offset``:
+        seconds after the start of the batch. Without it, a command starts
+        when the previous one ends.
 
-            except ValidationError as e:
-                return jsonify({"error": str(e), "error_type": "validation"}), 400
-            except Exception as e:
-                self.consecutive_failures += 1
-                logger.exception("Error in animate endpoint:")  # Added for debugging
-                self.error_logger.log_error(
-                    e, component="web_server", operation="animate"
-                )
-                return jsonify({"error": "Internal server error"}), 500
+        Args:
+            items: Decoded commands
 
-    def _run_coro_sync(self, coro):
-        """Run coroutine from sync context safely, handling existing event loop.
+        Returns:
+            List[Dict[str, Any]]: Steps for queue_expression_sequence, in
+            request order
 
-        This helper will detect if there's an already running event loop
-        (for example when using the Flask dev server with reloader tools)
-        and will run the coroutine in a new temporary loop in a thread if
-        necessary. Otherwise it will use asyncio.run.
+        Raises:
+            ValidationError: If the batch is empty, too large, or any command
+                is invalid; ``details["results"]`` then holds the per-item
+                results
         """
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
-
-        if loop and loop.is_running():
-            # Running loop exists; schedule work in a new thread to avoid
-            # "asyncio.run() cannot be called from a running event loop" errors.
-            result_holder = {}
+        if not isinstance(items, list):
+            raise ValidationError("Animation batch must be a JSON array or NDJSON")
+        if not items:
+            raise ValidationError("Animation batch is empty")
+        max_batch = self.websocket_manager.max_queue_size
+        if len(items) > max_batch:
+            raise ValidationError(
+                f"Animation batch has {len(items)} commands (maximum {max_batch})"
+            )
 
-            def _thread_target():
+        steps: List[Dict[str, Any]] = []
+        results: List[Dict[str, Any]] = []
+        next_offset = 0.0
+        for index, item in enumerate(items):
+            try:
+                params = self._parse_animation_request(item)
+                offset = item.get("offset")
+                if offset is None:
+                    offset = next_offset
                 try:
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    result_holder["result"] = new_loop.run_until_complete(coro)
-                    new_loop.close()
-                except Exception as thread_exc:
-                    result_holder["error"] = thread_exc
+                    offset = float(offset)
+                except (TypeError, ValueError):
+                    raise ValidationError(f"Invalid offset: {offset!r}")
+                if offset < 0 or params["duration"] <= 0:
+                    raise ValidationError("offset must be >= 0 and duration > 0")
+            except ValidationError as e:
+                results.append({"index": index, "success": False, "error": str(e)})
+                continue
 
-            t = threading.Thread(target=_thread_target)
-            t.start()
-            t.join()
+            next_offset = offset + params["duration"]
+            step = {
+                "expression": params["expression"],
+                "intensity": params["intensity"],
+                "duration": params["duration"],
+                "priority": params["priority"],
+                "offset": offset,
+            }
+            steps.append(step)
+            results.append(self._batch_step_result(index, step))
 
-            if "error" in result_holder:
-                raise result_holder["error"]
+        if len(steps) < len(items):
+            raise ValidationError(
+                f"{len(items) - len(steps)} of {len(items)} animation commands are invalid",
+                details={"results": results},
+            )
+        return steps
+
+    @staticmethod
+    def _batch_step_result(index: int, step: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-item result for a valid /animate/batch command."""
+        return {
+            "index": index,
+            "success": True,
+            "expression": step["expression"],
+            "offset": step["offset"],
+        }
 
-            return result_holder.get("result")
-        else:
-            return asyncio.run(coro)
+    def _record_animation_result(self, result: Dict[str, Any]) -> None:
+        """Update health tracking after an animation request."""
+        if result["success"]:
+            self.consecutive_failures = 0
+            self.last_successful_request = time.time()
 
     async def _execute_animation_with_fallback(
         self,
@@ -256,18 +391,13 @@ class Live2DFlaskApp:
             sequence_id = None
             if self.websocket_loop and not self.websocket_loop.is_closed():
                 try:
-                    # Schedule animation in the WebSocket event loop
-                    future = asyncio.run_coroutine_threadsafe(
+                    sequence_id = await self._run_on_websocket_loop(
                         self.animation_sync.trigger_expression_change(
                             expression=expression,
                             intensity=intensity,
                             duration=duration,
                             priority=priority,
-                        ),
-                        self.websocket_loop,
-                    )
-                    sequence_id = await asyncio.wait_for(
-                        asyncio.wrap_future(future), timeout=5.0
+                        )
                     )
 
                     self.websocket_healthy = True
@@ -320,6 +450,100 @@ class Live2DFlaskApp:
                 "animation": self.current_animation,
             }
 
+    async def _execute_animation_batch(
+        self, steps: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Queue validated batch steps as one sequence, with static fallback."""
+        last_step = max(steps, key=lambda step: step["offset"])
+        results = [
+            self._batch_step_result(index, step) for index, step in enumerate(steps)
+        ]
+        total_duration = max(step["offset"] + step["duration"] for step in steps)
+
+        try:
+            # The batch ends on its last step
+            self.current_animation = {
+                "expression": last_step["expression"],
+                "intensity": last_step["intensity"],
+                "duration": last_step["duration"],
+                "timestamp": datetime.now(),
+                "sync_with_audio": False,
+            }
+
+            sequence_id = None
+            if self.websocket_active:
+                try:
+                    sequence_id = await self._run_on_websocket_loop(
+                        self.animation_sync.queue_expression_sequence(steps)
+                    )
+                    self.websocket_healthy = True
+                except Exception as sync_error:
+                    logger.warning(f"WebSocket batch sync failed: {sync_error}")
+                    self.websocket_healthy = False
+                    raise Live2DError(
+                        f"WebSocket batch sync failed: {sync_error}",
+                        operation="trigger_animation_batch",
+                        animation_type=last_step["expression"],
+                    )
+            else:
+                logger.info("WebSocket not available, using static animation")
+                self.websocket_healthy = False
+
+            logger.info(
+                f"Animation batch triggered: {len(steps)} commands ({total_duration:.2f}s)"
+            )
+
+            result = {
+                "success": True,
+                "animation": self.current_animation,
+                "sequence_id": sequence_id,
+                "websocket_active": self.websocket_active,
+                "websocket_healthy": self.websocket_healthy,
+            }
+
+        except Live2DError as e:
+            result = await self._handle_animation_fallback(
+                last_step["expression"], last_step["intensity"], e
+            )
+        except Exception as e:
+            self.error_logger.log_error(
+                e, component="web_server", operation="execute_animation_batch"
+            )
+            result = {
+                "success": False,
+                "error": "Animation system error",
+                "fallback_used": True,
+                "animation": self.current_animation,
+            }
+
+        result["count"] = len(steps)
+        result["total_duration"] = total_duration
+        result["results"] = results
+        return result
+
+    async def _run_on_websocket_loop(self, coro, timeout: float = 5.0) -> Any:
+        """Await a coroutine on the WebSocket event loop."""
+        if asyncio.get_running_loop() is self.websocket_loop:
+            # Already on the WebSocket loop (in-process dispatch)
+            return await asyncio.wait_for(coro, timeout=timeout)
+        # Schedule the coroutine in the WebSocket event loop
+        future = asyncio.run_coroutine_threadsafe(coro, self.websocket_loop)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+
+    async def _dispatch_animation_command(
+        self, command: AnimationCommand
+    ) -> Dict[str, Any]:
+        """Handle a command from the in-process or Unix socket transport."""
+        result = await self._execute_animation_with_fallback(
+            command.expression,
+            command.intensity,
+            command.duration,
+            _coerce_priority(command.priority),
+            False,
+        )
+        self._record_animation_result(result)
+        return result
+
     async def _handle_animation_fallback(
         self, expression: str, intensity: float, original_error: Exception
     ) -> Dict[str, Any]:
@@ -353,6 +577,343 @@ class Live2DFlaskApp:
                 "fallback_error": str(fallback_error),
             }
 
+    def _generate_token(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate a LiveKit access token for a /token request.
+
+        Args:
+            data: Request body with optional ``room`` and ``participant``
+
+        Returns:
+            Dict[str, Any]: Token, room, participant, LiveKit URL and lifetime
+
+        Raises:
+            ValidationError: If LiveKit credentials are not configured
+            LiveKitError: If the token could not be generated
+        """
+        room_name = data.get("room", "anime-character-room")
+        participant_name = data.get("participant", f"user-{datetime.now().timestamp()}")
+
+        # Validate LiveKit configuration
+        if not self.settings.livekit.api_key or not self.settings.livekit.api_secret:
+            raise ValidationError("LiveKit API credentials not configured")
+
+        # Generate LiveKit access token with error handling
+        try:
+            token = api.AccessToken(
+                api_key=self.settings.livekit.api_key,
+                api_secret=self.settings.livekit.api_secret,
+            )
+
+            # Set token permissions
+            token.with_identity(participant_name)
+            token.with_name(participant_name)
+            token.with_grants(
+                api.VideoGrants(
+                    room_join=True,
+                    room=room_name,
+                    can_publish=True,
+                    can_subscribe=True,
+                )
+            )
+
+            # Set token expiration (5 minutes)
+            token.with_ttl(timedelta(minutes=5))
+
+            jwt_token = token.to_jwt()
+
+        except Exception as token_error:
+            raise LiveKitError(
+                f"Failed to generate LiveKit token: {token_error}",
+                operation="generate_token",
+                room_name=room_name,
+                participant_id=participant_name,
+            )
+
+        logger.info(
+            f"Generated token for participant: {participant_name} in room: {room_name}"
+        )
+
+        return {
+            "token": jwt_token,
+            "room": room_name,
+            "participant": participant_name,
+            "url": self.settings.livekit.url,
+            "expires_in": 300,  # 5 minutes in seconds
+        }
+
+    def _build_health_status(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Collect component health for /health.
+
+        Returns:
+            Tuple[Dict[str, Any], int]: Health report and HTTP status code
+        """
+        try:
+            health_status = {
+                "status": "healthy",
+                "timestamp": datetime.now().isoformat(),
+                "version": "1.0.0",
+                "components": {
+                    "web_server": {
+                        "status": "healthy",
+                        "consecutive_failures": self.consecutive_failures,
+                        "last_successful_request": datetime.fromtimestamp(
+                            self.last_successful_request
+                        ).isoformat(),
+                    },
+                    "websocket": {
+                        "status": "healthy" if self.websocket_healthy else "degraded",
+                        "active": self.websocket_active,
+                        "connected_clients": (
+                            self.websocket_manager.get_connection_count()
+                            if hasattr(self.websocket_manager, "get_connection_count")
+                            else 0
+                        ),
+                    },
+                    "animation_sync": {
+                        "status": "healthy",
+                        "active_sequences": (
+                            len(self.animation_sync.active_sequences)
+                            if hasattr(self.animation_sync, "active_sequences")
+                            else 0
+                        ),
+                    },
+                },
+            }
+
+            # Determine overall status
+            if self.consecutive_failures > 5:
+                health_status["status"] = "degraded"
+            elif not self.websocket_healthy:
+                health_status["status"] = "degraded"
+
+            # Add error recovery stats if available
+            try:
+                recovery_stats = self.recovery_manager.get_recovery_stats()
+                health_status["error_recovery"] = recovery_stats
+            except Exception:
+                pass
+
+            # Thread pools used for blocking SDK calls in this process
+            health_status["executors"] = get_executor_stats()
+
+            status_code = 200 if health_status["status"] == "healthy" else 503
+            return health_status, status_code
+
+        except Exception as e:
+            logger.error(f"Health check error: {e}")
+            return (
+                {
+                    "status": "unhealthy",
+                    "error": str(e),
+                    "timestamp": datetime.now().isoformat(),
+                },
+                503,
+            )
+
+    @staticmethod
+    def _animation_types_info() -> Dict[str, Any]:
+        """Describe AnimationEvent and AnimationEventType for debugging."""
+        event_info = {
+            "class_name": AnimationEvent.__name__,
+            "doc": AnimationEvent.__doc__,
+            "fields": list(AnimationEvent.__annotations__.keys())
+        }
+        event_type_info = {
+            "class_name": AnimationEventType.__name__,
+            "doc": AnimationEventType.__doc__,
+            "members": [member.name for member in AnimationEventType]
+        }
+        return {
+            "AnimationEvent": event_info,
+            "AnimationEventType": event_type_info
+        }
+
+    async def _get_sync_state(self):
+        """Get current synchronization state."""
+        return self.animation_sync.get_animation_state()
+
+    def _register_error_recovery(self):
+        """Register web server components with error recovery system."""
+        self.recovery_manager.register_component(
+            component_name="web_server",
+            recovery_strategies=[
+                RecoveryStrategy.RESTART_SERVICE,
+                RecoveryStrategy.CLEAR_STATE,
+                RecoveryStrategy.WAIT_AND_RETRY,
+            ],
+            health_check_func=self._web_server_health_check,
+        )
+
+        # Register fallback strategies
+        self.fallback_manager.register_fallback_chain(
+            component="live2d_animation",
+            strategies=[
+                FallbackStrategy.RETRY,
+                FallbackStrategy.STATIC_FALLBACK,
+                FallbackStrategy.ERROR_MESSAGE,
+            ],
+        )
+
+        self.fallback_manager.register_fallback_chain(
+            component="animation_trigger",
+            strategies=[FallbackStrategy.RETRY, FallbackStrategy.STATIC_FALLBACK],
+        )
+
+    async def _web_server_health_check(self) -> bool:
+        """Health check for web server."""
+        try:
+            # Check if Flask app is responsive
+            return (
+                self.consecutive_failures < 10
+                and time.time() - self.last_successful_request < 300
+            )
+        except Exception:
+            return False
+
+
+class Live2DFlaskApp(Live2DAppCore):
+    """Flask application for Live2D model serving and animation control."""
+
+    def __init__(self):
+        # /static is served by serve_static, not Flask's built-in static route
+        self.app = Flask(__name__, template_folder="templates", static_folder=None)
+        super().__init__()
+        self.app.jinja_env.globals["static_url"] = self.static_assets.asset_url
+        self.websocket_thread: Optional[threading.Thread] = None
+
+        # Register routes and error recovery once
+        self._setup_routes()
+        self._register_error_recovery()
+        # Separate animation routes are set up in their own method
+        # to keep route registration organized.
+        self._setup_animation_routes()
+
+    def _setup_routes(self):
+        """Set up Flask routes for the application."""
+
+        @self.app.route("/")
+        def index():
+            """Main web interface with Live2D canvas."""
+            return render_template(
+                "index.html",
+                livekit_url=self.settings.livekit.url,
+                model_url=self.resolved_model_url,
+                model_bundle_url=self.model_bundle_url,
+            )
+
+        @self.app.route("/animate", methods=["POST"])
+        def animate():
+            """API endpoint for triggering Live2D expressions with comprehensive error handling."""
+            try:
+                # Parse request data and add extra debug logging for troubleshooting
+                logger.debug(f"Received /animate request content-type: {request.content_type}")
+                logger.debug(f"Raw request data: {request.data}")
+
+                # Validate and parse request data
+                data = request.get_json(force=True, silent=True)
+                logger.debug(f"Parsed JSON data for /animate: {data}")
+                params = self._parse_animation_request(data)
+
+                # Execute animation with fallback
+                # Run the async animation execution safely from sync context.
+                result = self._run_coro_sync(
+                    self._execute_animation_with_fallback(**params)
+                )
+
+                self._record_animation_result(result)
+                if result["success"]:
+                    return jsonify(result)
+                else:
+                    return jsonify(result), 500
+
+            except ValidationError as e:
+                return jsonify({"error": str(e), "error_type": "validation"}), 400
+            except Exception as e:
+                self.consecutive_failures += 1
+                logger.exception("Error in animate endpoint:")  # Added for debugging
+                self.error_logger.log_error(
+                    e, component="web_server", operation="animate"
+                )
+                return jsonify({"error": "Internal server error"}), 500
+
+        @self.app.route("/animate/batch", methods=["POST"])
+        def animate_batch():
+            """Queue many animation commands (JSON array or NDJSON) as one sequence."""
+            try:
+                if request.mimetype in NDJSON_CONTENT_TYPES:
+                    items = []
+                    lines = request.get_data().splitlines()
+                    for line_number, line in enumerate(lines, start=1):
+                        item = decode_ndjson_line(line, line_number)
+                        if item is not None:
+                            items.append(item)
+                else:
+                    items = request.get_json(force=True, silent=True)
+                    if items is None:
+                        raise ValidationError("No JSON data provided")
+                steps = self._parse_animation_batch(items)
+
+                result = self._run_coro_sync(self._execute_animation_batch(steps))
+
+                self._record_animation_result(result)
+                if result["success"]:
+                    return jsonify(result)
+                else:
+                    return jsonify(result), 500
+
+            except ValidationError as e:
+                response = {"error": str(e), "error_type": "validation"}
+                if "results" in e.details:
+                    response["results"] = e.details["results"]
+                return jsonify(response), 400
+            except Exception as e:
+                self.consecutive_failures += 1
+                logger.exception("Error in animate batch endpoint:")
+                self.error_logger.log_error(
+                    e, component="web_server", operation="animate_batch"
+                )
+                return jsonify({"error": "Internal server error"}), 500
+
+    def _run_coro_sync(self, coro):
+        """Run coroutine from sync context safely, handling existing event loop.
+
+        This helper will detect if there's an already running event loop
+        (for example when using the Flask dev server with reloader tools)
+        and will run the coroutine in a new temporary loop in a thread if
+        necessary. Otherwise it will use asyncio.run.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop and loop.is_running():
+            # Running loop exists; schedule work in a new thread to avoid
+            # "asyncio.run() cannot be called from a running event loop" errors.
+            result_holder = {}
+
+            def _thread_target():
+                try:
+                    new_loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(new_loop)
+                    result_holder["result"] = new_loop.run_until_complete(coro)
+                    new_loop.close()
+                except Exception as thread_exc:
+                    result_holder["error"] = thread_exc
+
+            t = threading.Thread(target=_thread_target)
+            t.start()
+            t.join()
+
+            if "error" in result_holder:
+                raise result_holder["error"]
+
+            return result_holder.get("result")
+        else:
+            return asyncio.run(coro)
+
     def _setup_animation_routes(self):
         """Setup animation-related routes."""
         @self.app.route("/animate/status")
@@ -500,67 +1061,7 @@ class Live2DFlaskApp:
                 data = request.get_json(force=True, silent=True)
                 if data is None:
                     return jsonify({"error": "No JSON data provided"}), 400
-
-                room_name = data.get("room", "anime-character-room")
-                participant_name = data.get(
-                    "participant", f"user-{datetime.now().timestamp()}"
-                )
-
-                # Validate LiveKit configuration
-                if (
-                    not self.settings.livekit.api_key
-                    or not self.settings.livekit.api_secret
-                ):
-                    raise ValidationError("LiveKit API credentials not configured")
-
-                # Generate LiveKit access token with error handling
-                try:
-                    token = api.AccessToken(
-                        api_key=self.settings.livekit.api_key,
-                        api_secret=self.settings.livekit.api_secret,
-                    )
-
-                    # Set token permissions
-                    token.with_identity(participant_name)
-                    token.with_name(participant_name)
-                    token.with_grants(
-                        api.VideoGrants(
-                            room_join=True,
-                            room=room_name,
-                            can_publish=True,
-                            can_subscribe=True,
-                        )
-                    )
-
-                    # Set token expiration (1 hour)
-                                        # Set token expiration (5 minutes)
-                    token.with_ttl(timedelta(minutes=5))
-
-                    jwt_token = token.to_jwt()
-
-                    jwt_token = token.to_jwt()
-
-                except Exception as token_error:
-                    raise LiveKitError(
-                        f"Failed to generate LiveKit token: {token_error}",
-                        operation="generate_token",
-                        room_name=room_name,
-                        participant_id=participant_name,
-                    )
-
-                logger.info(
-                    f"Generated token for participant: {participant_name} in room: {room_name}"
-                )
-
-                return jsonify(
-                    {
-                        "token": jwt_token,
-                        "room": room_name,
-                        "participant": participant_name,
-                        "url": self.settings.livekit.url,
-                        "expires_in": 300,  # 5 minutes in seconds
-                    }
-                )
+                return jsonify(self._generate_token(data))
 
             except ValidationError as e:
                 return jsonify({"error": str(e), "error_type": "validation"}), 400
@@ -584,81 +1085,72 @@ class Live2DFlaskApp:
         def serve_static(filename):
             """Serve static files for Live2D models and assets."""
             try:
-                static_dir = os.path.join(os.path.dirname(__file__), "static")
-                return send_from_directory(static_dir, filename)
+                resolved = self.static_assets.resolve(filename)
+                if resolved is None:
+                    return jsonify({"error": "File not found"}), 404
+                asset, immutable = resolved
+
+                # Ranges are served from the uncompressed file
+                encoding = None
+                if request.range is None:
+                    encoding = self.static_assets.select_encoding(
+                        asset, request.headers.get("Accept-Encoding")
+                    )
+                headers = self.static_assets.response_headers(asset, immutable, encoding)
+                if self.static_assets.matches_etag(
+                    asset, request.headers.get("If-None-Match")
+                ):
+                    return Response(status=304, headers=headers)
+                if encoding:
+                    return Response(asset.encodings[encoding], headers=headers)
+
+                body = self.static_assets.read(asset)
+                if body is not None:
+                    response = Response(body, headers=headers)
+                    return response.make_conditional(
+                        request, accept_ranges=True, complete_length=len(body)
+                    )
+
+                # Large files: Range support and wsgi.file_wrapper (sendfile)
+                response = send_file(
+                    asset.file_path,
+                    mimetype=asset.content_type,
+                    etag=asset.digest,
+                    max_age=None,
+                    conditional=True,
+                )
+                response.headers["Cache-Control"] = headers["Cache-Control"]
+                if "Vary" in headers:
+                    response.headers["Vary"] = headers["Vary"]
+                return response
             except Exception as e:
                 logger.error(f"Static file serving error: {e}")
                 return jsonify({"error": "File not found"}), 404
 
-        @self.app.route("/health")
-        def health_check():
-            """Comprehensive health check endpoint."""
+        @self.app.route("/live2d/bundle/<path:model_path>")
+        def serve_model_bundle(model_path):
+            """Serve a Live2D model and all its files as one bundle."""
             try:
-                health_status = {
-                    "status": "healthy",
-                    "timestamp": datetime.now().isoformat(),
-                    "version": "1.0.0",
-                    "components": {
-                        "web_server": {
-                            "status": "healthy",
-                            "consecutive_failures": self.consecutive_failures,
-                            "last_successful_request": datetime.fromtimestamp(
-                                self.last_successful_request
-                            ).isoformat(),
-                        },
-                        "websocket": {
-                            "status": (
-                                "healthy" if self.websocket_healthy else "degraded"
-                            ),
-                            "active": self.websocket_loop is not None
-                            and not self.websocket_loop.is_closed(),
-                            "connected_clients": (
-                                self.websocket_manager.get_connection_count()
-                                if hasattr(
-                                    self.websocket_manager, "get_connection_count"
-                                )
-                                else 0
-                            ),
-                        },
-                        "animation_sync": {
-                            "status": "healthy",
-                            "active_sequences": (
-                                len(self.animation_sync.active_sequences)
-                                if hasattr(self.animation_sync, "active_sequences")
-                                else 0
-                            ),
-                        },
-                    },
-                }
-
-                # Determine overall status
-                if self.consecutive_failures > 5:
-                    health_status["status"] = "degraded"
-                elif not self.websocket_healthy:
-                    health_status["status"] = "degraded"
-
-                # Add error recovery stats if available
-                try:
-                    recovery_stats = self.recovery_manager.get_recovery_stats()
-                    health_status["error_recovery"] = recovery_stats
-                except Exception:
-                    pass
-
-                status_code = 200 if health_status["status"] == "healthy" else 503
-                return jsonify(health_status), status_code
-
+                status, body, headers = self._build_model_bundle_response(
+                    model_path, request.args, request.headers
+                )
+                return Response(body, status=status, headers=headers)
+            except ValidationError as e:
+                return jsonify({"error": str(e), "error_type": "validation"}), 400
+            except Live2DError:
+                return jsonify({"error": "Model not found"}), 404
             except Exception as e:
-                logger.error(f"Health check error: {e}")
-                return (
-                    jsonify(
-                        {
-                            "status": "unhealthy",
-                            "error": str(e),
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                    ),
-                    503,
+                logger.error(f"Model bundle error: {e}")
+                self.error_logger.log_error(
+                    e, component="web_server", operation="model_bundle"
                 )
+                return jsonify({"error": "Internal server error"}), 500
+
+        @self.app.route("/health")
+        def health_check():
+            """Comprehensive health check endpoint."""
+            health_status, status_code = self._build_health_status()
+            return jsonify(health_status), status_code
 
         # Error handlers
         @self.app.errorhandler(404)
@@ -675,25 +1167,15 @@ class Live2DFlaskApp:
         @self.app.route("/debug/animation_types")
         def animation_types_info():
             """Return information about AnimationEvent and AnimationEventType."""
-            event_info = {
-                "class_name": AnimationEvent.__name__,
-                "doc": AnimationEvent.__doc__,
-                "fields": list(AnimationEvent.__annotations__.keys())
-            }
-            event_type_info = {
-                "class_name": AnimationEventType.__name__,
-                "doc": AnimationEventType.__doc__,
-                "members": [member.name for member in AnimationEventType]
-            }
-            return jsonify({
-                "AnimationEvent": event_info,
-                "AnimationEventType": event_type_info
-            })
+            return jsonify(self._animation_types_info())
 
     def run(self, host="0.0.0.0", port=5000, debug=False, enable_websocket=True):
         """Run the Flask application with optional WebSocket server."""
         logger.info(f"Starting Flask server on {host}:{port}")
 
+        # Hash and precompress static assets before the first page load
+        self.static_assets.scan()
+
         # Start WebSocket server in background thread if enabled
         if enable_websocket:
             self._start_websocket_server()
@@ -728,12 +1210,24 @@ class Live2DFlaskApp:
 
                 logger.info(f"WebSocket server started on {ws_host}:{ws_port}")
 
+                # Let agents in this process skip HTTP, and others use the socket
+                register_local_animation_server(
+                    self._dispatch_animation_command, self.websocket_loop
+                )
+                socket_path = self.settings.flask.animation_socket_path
+                if socket_path:
+                    self.ipc_server = AnimationIPCServer(
+                        socket_path, self._dispatch_animation_command
+                    )
+                    self.websocket_loop.run_until_complete(self.ipc_server.start())
+
                 # Keep the loop running
                 self.websocket_loop.run_forever()
 
             except Exception as e:
                 logger.error(f"WebSocket server error: {e}")
             finally:
+                unregister_local_animation_server()
                 if self.websocket_loop:
                     self.websocket_loop.close()
 
@@ -747,6 +1241,12 @@ class Live2DFlaskApp:
         """Stop WebSocket server."""
         if self.websocket_loop and not self.websocket_loop.is_closed():
             try:
+                unregister_local_animation_server()
+                if self.ipc_server:
+                    asyncio.run_coroutine_threadsafe(
+                        self.ipc_server.stop(), self.websocket_loop
+                    )
+
                 # Schedule server stop
                 asyncio.run_coroutine_threadsafe(
                     self.websocket_manager.stop_server(), self.websocket_loop
@@ -764,48 +1264,6 @@ class Live2DFlaskApp:
             except Exception as e:
                 logger.error(f"Error stopping WebSocket server: {e}")
 
-    async def _get_sync_state(self):
-        """Get current synchronization state."""
-        return self.animation_sync.get_animation_state()
-
-    def _register_error_recovery(self):
-        """Register web server components with error recovery system."""
-        self.recovery_manager.register_component(
-            component_name="web_server",
-            recovery_strategies=[
-                RecoveryStrategy.RESTART_SERVICE,
-                RecoveryStrategy.CLEAR_STATE,
-                RecoveryStrategy.WAIT_AND_RETRY,
-            ],
-            health_check_func=self._web_server_health_check,
-        )
-
-        # Register fallback strategies
-        self.fallback_manager.register_fallback_chain(
-            component="live2d_animation",
-            strategies=[
-                FallbackStrategy.RETRY,
-                FallbackStrategy.STATIC_FALLBACK,
-                FallbackStrategy.ERROR_MESSAGE,
-            ],
-        )
-
-        self.fallback_manager.register_fallback_chain(
-            component="animation_trigger",
-            strategies=[FallbackStrategy.RETRY, FallbackStrategy.STATIC_FALLBACK],
-        )
-
-    async def _web_server_health_check(self) -> bool:
-        """Health check for web server."""
-        try:
-            # Check if Flask app is responsive
-            return (
-                self.consecutive_failures < 10
-                and time.time() - self.last_successful_request < 300
-            )
-        except Exception:
-            return False
-
     def get_app(self):
         """Get the Flask application instance for testing."""
         return self.app
@@ -821,10 +1279,11 @@ async def trigger_animation(
     expression: str, intensity: float = 0.7, duration: float = 2.0
 ) -> bool:
     """
-    Trigger Live2D animation via HTTP API call with comprehensive error handling.
+    Trigger Live2D animation with comprehensive error handling.
 
     This function is used by the LiveKit agent to trigger animations
-    based on AI response sentiment.
+    based on AI response sentiment. The command is sent in-process, over
+    HTTP or over a Unix socket depending on ANIMATION_TRANSPORT.
 
     Args:
         expression: Animation expression ('happy', 'sad', 'angry', 'neutral', etc.)
@@ -865,100 +1324,11 @@ async def trigger_animation(
 async def _trigger_animation_internal(
     expression: str, intensity: float, duration: float
 ) -> bool:
-    """Internal animation trigger with error handling."""
-    max_retries = 3
-
-    for attempt in range(max_retries):
-        try:
-            # Get Flask server configuration
-            settings = get_settings()
-            flask_url = f"http://{settings.flask.host}:{settings.flask.port}"
-
-            # Prepare animation data
-            animation_data = {
-                "expression": expression,
-                "intensity": intensity,
-                "duration": duration,
-            }
-
-            # Make async HTTP request to Flask animation endpoint
-            timeout = aiohttp.ClientTimeout(
-                total=5.0 + attempt * 2
-            )  # Increase timeout on retries
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{flask_url}/animate", json=animation_data, timeout=timeout
-                ) as response:
-                    if response.status == 200:
-                        logger.info(f"Animation triggered successfully: {expression}")
-                        return True
-                    elif response.status == 400:
-                        # Client error - don't retry
-                        response_text = await response.text()
-                        raise ValidationError(
-                            f"Invalid animation parameters: {response_text}"
-                        )
-                    elif response.status >= 500:
-                        # Server error - retry
-                        if attempt < max_retries - 1:
-                            wait_time = 2**attempt
-                            logger.warning(
-                                f"Server error {response.status}, retrying in {wait_time}s"
-                            )
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            raise NetworkError(
-                                f"Animation server error: {response.status}",
-                                operation="trigger_animation",
-                                endpoint=flask_url,
-                                status_code=response.status,
-                            )
-                    else:
-                        logger.warning(
-                            f"Animation trigger failed with status {response.status}"
-                        )
-                        return False
-
-        except asyncio.TimeoutError:
-            if attempt < max_retries - 1:
-                logger.warning(
-                    f"Animation trigger timeout, attempt {attempt + 1}/{max_retries}"
-                )
-                await asyncio.sleep(1.0)
-                continue
-            else:
-                raise NetworkError(
-                    "Animation trigger timeout after all retries",
-                    operation="trigger_animation",
-                    endpoint=f"http://{settings.flask.host}:{settings.flask.port}",
-                    is_timeout=True,
-                )
-        except aiohttp.ClientError as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"Animation trigger client error: {e}, retrying...")
-                await asyncio.sleep(1.0)
-                continue
-            else:
-                raise NetworkError(
-                    f"Animation trigger client error: {e}",
-                    operation="trigger_animation",
-                    endpoint=f"http://{settings.flask.host}:{settings.flask.port}",
-                )
-        except Exception as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"Animation trigger error: {e}, retrying...")
-                await asyncio.sleep(1.0)
-                continue
-            else:
-                raise Live2DError(
-                    f"Failed to trigger animation: {e}",
-                    operation="trigger_animation",
-                    animation_type=expression,
-                )
-
-    return False
+    """Send the animation command over the configured transport."""
+    transport = get_animation_transport()
+    return await transport.send(
+        AnimationCommand(expression=expression, intensity=intensity, duration=duration)
+    )
 
 
 if __name__ == "__main__":
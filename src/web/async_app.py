@@ -0,0 +1,556 @@
+"""
+Async web server for Live2D model serving and animation control.
+
+Serves the same routes as the Flask app, plus the animation WebSocket at
+``/ws``, from one aiohttp application. Requests are handled on the event
+loop that runs WebSocketAnimationManager, so animation calls are awaited
+directly instead of being bridged across threads and temporary loops.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from aiohttp import WSMsgType, hdrs, web
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from src.error_handling.exceptions import Live2DError, LiveKitError, ValidationError
+from src.web.animation_transport import (
+    AnimationIPCServer,
+    register_local_animation_server,
+    unregister_local_animation_server,
+)
+from src.web.app import NDJSON_CONTENT_TYPES, Live2DAppCore, decode_ndjson_line
+from src.web.static_assets import StaticAsset
+
+logger = logging.getLogger(__name__)
+
+WEB_DIR = os.path.dirname(os.path.realpath(__file__))
+TEMPLATE_DIR = os.path.join(WEB_DIR, "templates")
+
+# Animation WebSocket endpoint, served on the HTTP port
+WEBSOCKET_PATH = "/ws"
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode values that json.dumps does not handle natively."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_response(data: Any, status: int = 200) -> web.Response:
+    """Build a JSON response, encoding datetimes and enums."""
+    return web.json_response(
+        data, status=status, dumps=lambda d: json.dumps(d, default=_json_default)
+    )
+
+
+async def read_json(request: web.Request) -> Any:
+    """Decode a JSON body regardless of content type (None if missing or invalid)."""
+    body = await request.read()
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _without_range(request: web.BaseRequest) -> Dict[str, str]:
+    """Request headers minus Range and If-Range."""
+    return {
+        name: value
+        for name, value in request.headers.items()
+        if name.lower() not in ("range", "if-range")
+    }
+
+
+async def read_ndjson(request: web.Request, limit: int) -> List[Any]:
+    """
+    Decode an NDJSON body as it streams in.
+
+    Reading stops after ``limit + 1`` values so an oversized batch is
+    rejected without buffering the rest of the body.
+
+    Raises:
+        ValidationError: If a line is not valid JSON
+    """
+    items: List[Any] = []
+    line_number = 0
+    async for line in request.content:
+        line_number += 1
+        item = decode_ndjson_line(line, line_number)
+        if item is None:
+            continue
+        items.append(item)
+        if len(items) > limit:
+            break
+    return items
+
+
+class AssetFileResponse(web.FileResponse):
+    """
+    FileResponse (Range requests, sendfile) that keeps the asset's ETag.
+
+    FileResponse derives its ETag from mtime and size; this keeps the
+    content-hash ETag used by every other static response.
+    """
+
+    def __init__(
+        self, asset: StaticAsset, headers: Dict[str, str], ignore_range: bool = False
+    ):
+        """
+        Initialize the response.
+
+        Args:
+            asset: Asset to send
+            headers: Response headers
+            ignore_range: Send the whole file even if a Range was requested
+        """
+        super().__init__(asset.file_path, headers=headers)
+        self._asset_etag = asset.digest
+        self._ignore_range = ignore_range
+
+    async def prepare(self, request: web.BaseRequest):
+        if self._ignore_range:
+            request = request.clone(headers=_without_range(request))
+        return await super().prepare(request)
+
+    @property
+    def etag(self):
+        return web.StreamResponse.etag.fget(self)
+
+    @etag.setter
+    def etag(self, value) -> None:
+        web.StreamResponse.etag.fset(self, self._asset_etag)
+
+
+class AiohttpWebSocketAdapter:
+    """Gives an aiohttp WebSocket the interface WebSocketAnimationManager uses."""
+
+    def __init__(self, ws: web.WebSocketResponse, remote_address: Tuple[str, int]):
+        """
+        Initialize the adapter.
+
+        Args:
+            ws: Prepared aiohttp WebSocket
+            remote_address: Client (host, port)
+        """
+        self._ws = ws
+        self.remote_address = remote_address
+
+    async def send(self, message: str) -> None:
+        """Send a text message."""
+        await self._ws.send_str(message)
+
+    async def close(self) -> None:
+        """Close the connection."""
+        await self._ws.close()
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._messages()
+
+    async def _messages(self) -> AsyncIterator[str]:
+        async for msg in self._ws:
+            if msg.type == WSMsgType.TEXT:
+                yield msg.data
+            elif msg.type == WSMsgType.ERROR:
+                break
+
+
+@web.middleware
+async def error_middleware(request: web.Request, handler) -> web.StreamResponse:
+    """Return JSON bodies for 404s and unhandled errors, like the Flask app."""
+    try:
+        return await handler(request)
+    except web.HTTPNotFound:
+        if request.path.startswith("/static/"):
+            return json_response({"error": "File not found"}, 404)
+        return json_response({"error": "Not found"}, 404)
+    except web.HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Internal server error: {e}")
+        return json_response({"error": "Internal server error"}, 500)
+
+
+class Live2DWebApp(Live2DAppCore):
+    """aiohttp application for Live2D model serving and animation control."""
+
+    def __init__(self, enable_websocket: bool = True):
+        """
+        Initialize the application.
+
+        Args:
+            enable_websocket: Serve the animation WebSocket and run its
+                background tasks on the server's event loop
+        """
+        super().__init__()
+        self.enable_websocket = enable_websocket
+        self.templates = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            autoescape=select_autoescape(["html"]),
+        )
+        self.templates.globals["static_url"] = self.static_assets.asset_url
+
+        self.app = web.Application(middlewares=[error_middleware])
+        self._setup_routes()
+        self.app.on_startup.append(self._on_startup)
+        self.app.on_cleanup.append(self._on_cleanup)
+
+    def _setup_routes(self) -> None:
+        """Register HTTP and WebSocket routes."""
+        router = self.app.router
+        router.add_get("/", self.index)
+        router.add_post("/animate", self.animate)
+        router.add_post("/animate/batch", self.animate_batch)
+        router.add_get("/animate/status", self.animation_status)
+        router.add_post("/animate/sync/tts", self.sync_with_tts)
+        router.add_post("/animate/sync/mouth", self.control_mouth_sync)
+        router.add_post("/token", self.generate_token)
+        router.add_get("/static/{filename:.+}", self.serve_static)
+        router.add_get("/live2d/bundle/{model_path:.+}", self.serve_model_bundle)
+        router.add_get("/health", self.health_check)
+        router.add_get("/debug/animation_types", self.animation_types_info)
+        router.add_get(WEBSOCKET_PATH, self.websocket_handler)
+
+    async def _on_startup(self, app: web.Application) -> None:
+        """Start animation processing on the server's event loop."""
+        self._register_error_recovery()
+
+        # Hash and precompress static assets before the first page load
+        await asyncio.get_running_loop().run_in_executor(None, self.static_assets.scan)
+
+        if not self.enable_websocket:
+            return
+
+        self.websocket_loop = asyncio.get_running_loop()
+        await self.websocket_manager.start_background_tasks()
+
+        # Let agents in this process skip HTTP, and others use the socket
+        register_local_animation_server(
+            self._dispatch_animation_command, self.websocket_loop
+        )
+        socket_path = self.settings.flask.animation_socket_path
+        if socket_path:
+            self.ipc_server = AnimationIPCServer(
+                socket_path, self._dispatch_animation_command
+            )
+            await self.ipc_server.start()
+
+    async def _on_cleanup(self, app: web.Application) -> None:
+        """Stop animation processing and close client connections."""
+        if not self.enable_websocket:
+            return
+
+        unregister_local_animation_server()
+        if self.ipc_server:
+            await self.ipc_server.stop()
+            self.ipc_server = None
+        await self.websocket_manager.stop_server()
+        self.websocket_loop = None
+
+    async def index(self, request: web.Request) -> web.Response:
+        """Main web interface with Live2D canvas."""
+        html = self.templates.get_template("index.html").render(
+            livekit_url=self.settings.livekit.url,
+            model_url=self.resolved_model_url,
+            model_bundle_url=self.model_bundle_url,
+            websocket_path=WEBSOCKET_PATH if self.enable_websocket else "",
+        )
+        return web.Response(text=html, content_type="text/html")
+
+    async def animate(self, request: web.Request) -> web.Response:
+        """API endpoint for triggering Live2D expressions."""
+        try:
+            params = self._parse_animation_request(await read_json(request))
+            result = await self._execute_animation_with_fallback(**params)
+
+            self._record_animation_result(result)
+            return json_response(result, 200 if result["success"] else 500)
+
+        except ValidationError as e:
+            return json_response({"error": str(e), "error_type": "validation"}, 400)
+        except Exception as e:
+            self.consecutive_failures += 1
+            logger.exception("Error in animate endpoint:")
+            self.error_logger.log_error(e, component="web_server", operation="animate")
+            return json_response({"error": "Internal server error"}, 500)
+
+    async def animate_batch(self, request: web.Request) -> web.Response:
+        """Queue many animation commands (JSON array or NDJSON) as one sequence."""
+        try:
+            if request.content_type in NDJSON_CONTENT_TYPES:
+                items = await read_ndjson(
+                    request, self.websocket_manager.max_queue_size
+                )
+            else:
+                items = await read_json(request)
+                if items is None:
+                    raise ValidationError("No JSON data provided")
+            steps = self._parse_animation_batch(items)
+            result = await self._execute_animation_batch(steps)
+
+            self._record_animation_result(result)
+            return json_response(result, 200 if result["success"] else 500)
+
+        except ValidationError as e:
+            response = {"error": str(e), "error_type": "validation"}
+            if "results" in e.details:
+                response["results"] = e.details["results"]
+            return json_response(response, 400)
+        except Exception as e:
+            self.consecutive_failures += 1
+            logger.exception("Error in animate batch endpoint:")
+            self.error_logger.log_error(
+                e, component="web_server", operation="animate_batch"
+            )
+            return json_response({"error": "Internal server error"}, 500)
+
+    async def animation_status(self, request: web.Request) -> web.Response:
+        """Get current animation status with sync information."""
+        sync_state: Dict[str, Any] = {}
+        if self.websocket_active:
+            try:
+                sync_state = await self._get_sync_state()
+            except Exception:
+                sync_state = {"error": "Failed to get sync state"}
+
+        return json_response(
+            {
+                "current_animation": self.current_animation,
+                "timestamp": self.current_animation["timestamp"].isoformat(),
+                "websocket_active": self.websocket_loop is not None,
+                "connected_clients": self.websocket_manager.get_connection_count(),
+                "sync_state": sync_state,
+            }
+        )
+
+    async def sync_with_tts(self, request: web.Request) -> web.Response:
+        """Synchronize animation with TTS audio."""
+        try:
+            data = await read_json(request)
+            if data is None:
+                return json_response({"error": "No JSON data provided"}, 400)
+
+            text = data.get("text", "")
+            expression = data.get("expression", "speak")
+            audio_duration = data.get("audio_duration")
+            tts_delay = float(data.get("tts_processing_delay", 0.2))
+
+            if not text:
+                return json_response({"error": "Text is required for TTS sync"}, 400)
+            if not self.websocket_active:
+                return json_response({"error": "WebSocket not active"}, 503)
+
+            try:
+                sequence_id = await asyncio.wait_for(
+                    self.animation_sync.synchronize_with_tts(
+                        text=text,
+                        expression=expression,
+                        audio_duration=audio_duration,
+                        tts_processing_delay=tts_delay,
+                    ),
+                    timeout=2.0,
+                )
+            except Exception as sync_error:
+                logger.error(f"TTS sync failed: {sync_error}")
+                return json_response({"error": f"TTS sync failed: {sync_error}"}, 500)
+
+            logger.info(f"TTS animation synchronized: {sequence_id}")
+
+            return json_response(
+                {
+                    "success": True,
+                    "sequence_id": sequence_id,
+                    "text_length": len(text),
+                    "estimated_duration": audio_duration
+                    or self.animation_sync._estimate_audio_duration(text),
+                }
+            )
+
+        except Exception as e:
+            logger.error(f"TTS sync error: {e}")
+            return json_response({"error": "Internal server error"}, 500)
+
+    async def control_mouth_sync(self, request: web.Request) -> web.Response:
+        """Control mouth synchronization."""
+        try:
+            data = await read_json(request)
+            if data is None:
+                return json_response({"error": "No JSON data provided"}, 400)
+
+            action = data.get("action", "start")  # 'start', 'stop' or 'update'
+            if not self.websocket_active:
+                return json_response({"error": "WebSocket not active"}, 503)
+
+            if action == "start":
+                operation = self.animation_sync.start_mouth_sync(
+                    duration=data.get("duration")
+                )
+            elif action == "stop":
+                operation = self.animation_sync.stop_mouth_sync()
+            elif action == "update":
+                operation = self.animation_sync.update_mouth_parameters(
+                    audio_level=data.get("audio_level", 0.0),
+                    frequency_data=data.get("frequency_data", []),
+                )
+            else:
+                return json_response({"error": f"Unknown action: {action}"}, 400)
+
+            try:
+                await asyncio.wait_for(operation, timeout=1.0)
+            except Exception as sync_error:
+                logger.error(f"Mouth sync control failed: {sync_error}")
+                return json_response(
+                    {"error": f"Mouth sync failed: {sync_error}"}, 500
+                )
+
+            return json_response(
+                {
+                    "success": True,
+                    "action": action,
+                    "is_speaking": self.animation_sync.is_speaking,
+                }
+            )
+
+        except Exception as e:
+            logger.error(f"Mouth sync control error: {e}")
+            return json_response({"error": "Internal server error"}, 500)
+
+    async def generate_token(self, request: web.Request) -> web.Response:
+        """Generate LiveKit token for client authentication."""
+        try:
+            data = await read_json(request)
+            if data is None:
+                return json_response({"error": "No JSON data provided"}, 400)
+            return json_response(self._generate_token(data))
+
+        except ValidationError as e:
+            return json_response({"error": str(e), "error_type": "validation"}, 400)
+        except LiveKitError as e:
+            self.error_logger.log_error(
+                e, component="web_server", operation="generate_token"
+            )
+            return json_response(
+                {"error": "Failed to generate token", "error_type": "livekit"}, 500
+            )
+        except Exception as e:
+            self.error_logger.log_error(
+                e, component="web_server", operation="generate_token"
+            )
+            return json_response({"error": "Internal server error"}, 500)
+
+    async def serve_static(self, request: web.Request) -> web.StreamResponse:
+        """Serve static files for Live2D models and assets."""
+        loop = asyncio.get_running_loop()
+        store = self.static_assets
+        resolved = await loop.run_in_executor(
+            None, store.resolve, request.match_info["filename"]
+        )
+        if resolved is None:
+            return json_response({"error": "File not found"}, 404)
+        asset, immutable = resolved
+
+        # Ranges are served from the uncompressed file; a stale If-Range
+        # means the client wants the whole current file
+        ranged = hdrs.RANGE in request.headers and request.headers.get(
+            hdrs.IF_RANGE, asset.etag
+        ) == asset.etag
+        encoding = None
+        if not ranged:
+            encoding = store.select_encoding(
+                asset, request.headers.get(hdrs.ACCEPT_ENCODING)
+            )
+        headers = store.response_headers(asset, immutable, encoding)
+        if store.matches_etag(asset, request.headers.get(hdrs.IF_NONE_MATCH)):
+            return web.Response(status=304, headers=headers)
+        if encoding:
+            return web.Response(body=asset.encodings[encoding], headers=headers)
+
+        if not ranged:
+            body = store.cached_body(asset)
+            if body is None:
+                body = await loop.run_in_executor(None, store.read, asset)
+            if body is not None:
+                return web.Response(body=body, headers=headers)
+
+        return AssetFileResponse(asset, headers, ignore_range=not ranged)
+
+    async def serve_model_bundle(self, request: web.Request) -> web.Response:
+        """Serve a Live2D model and all its files as one bundle."""
+        try:
+            # Packing reads and compresses files; keep it off the event loop
+            status, body, headers = await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._build_model_bundle_response,
+                request.match_info["model_path"],
+                request.query,
+                request.headers,
+            )
+            return web.Response(body=body, status=status, headers=headers)
+        except ValidationError as e:
+            return json_response({"error": str(e), "error_type": "validation"}, 400)
+        except Live2DError:
+            return json_response({"error": "Model not found"}, 404)
+        except Exception as e:
+            logger.error(f"Model bundle error: {e}")
+            self.error_logger.log_error(
+                e, component="web_server", operation="model_bundle"
+            )
+            return json_response({"error": "Internal server error"}, 500)
+
+    async def health_check(self, request: web.Request) -> web.Response:
+        """Comprehensive health check endpoint."""
+        health_status, status_code = self._build_health_status()
+        return json_response(health_status, status_code)
+
+    async def animation_types_info(self, request: web.Request) -> web.Response:
+        """Return information about AnimationEvent and AnimationEventType."""
+        return json_response(self._animation_types_info())
+
+    async def websocket_handler(self, request: web.Request) -> web.StreamResponse:
+        """Animation WebSocket, served by WebSocketAnimationManager."""
+        if not self.enable_websocket:
+            raise web.HTTPNotFound()
+
+        ws = web.WebSocketResponse(heartbeat=20.0, max_msg_size=10 * 1024 * 1024)
+        await ws.prepare(request)
+
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        remote_address = tuple(peer[:2]) if peer else (request.remote or "unknown", 0)
+        await self.websocket_manager.serve_client(AiohttpWebSocketAdapter(ws, remote_address))
+        return ws
+
+    def run(self, host="0.0.0.0", port=5000, debug=False, enable_websocket=True):
+        """Run the server until interrupted."""
+        logger.info(f"Starting async web server on {host}:{port}")
+        self.enable_websocket = enable_websocket
+        if debug:
+            logging.getLogger("aiohttp").setLevel(logging.DEBUG)
+
+        web.run_app(
+            self.app,
+            host=host,
+            port=port,
+            print=None,
+            # Signal handlers can only be installed from the main thread
+            handle_signals=threading.current_thread() is threading.main_thread(),
+        )
+
+    def get_app(self) -> web.Application:
+        """Get the aiohttp application instance for testing."""
+        return self.app
+
+
+def create_async_app(enable_websocket: bool = True) -> web.Application:
+    """Factory function to create the aiohttp application."""
+    return Live2DWebApp(enable_websocket=enable_websocket).get_app()
@@ -0,0 +1,431 @@
+"""
+Live2D model bundles.
+
+Packs a ``model3.json`` and every file it references (moc3, textures,
+physics, display info, pose, expressions, motions and their sounds) into
+one archive, so the browser loads a model with a single request instead of
+one per file.
+
+Bundle layout (little-endian)::
+
+    b"L2DB" | format version (uint32) | index length (uint32)
+    | index (UTF-8 JSON) | file data
+
+The index lists each file's path (relative to the model3.json), offset into
+the file data, length and content type. JSON files are minified, and motion
+curves can be quantized to a fixed number of decimals. The bundle version
+is a digest of the source files and packing options, so a bundle URL that
+carries it can be cached as immutable.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.error_handling.exceptions import Live2DError, ValidationError
+from src.web.static_assets import (
+    StaticAsset,
+    StaticAssetStore,
+    compress_variants,
+    get_static_assets,
+)
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_MAGIC = b"L2DB"
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_CONTENT_TYPE = "application/vnd.live2d-bundle"
+BUNDLE_URL_PREFIX = "/live2d/bundle/"
+BUNDLE_SUFFIX = ".l2db"
+MODEL_SUFFIX = ".model3.json"
+
+# Motion curve values rarely need more than 6 decimals
+MAX_QUANTIZE_DECIMALS = 6
+
+_HEADER = struct.Struct("<4sII")
+
+
+def model_file_references(model_settings: Dict[str, Any]) -> List[str]:
+    """
+    List the files a model3.json refers to.
+
+    Args:
+        model_settings: Decoded model3.json
+
+    Returns:
+        List[str]: Paths relative to the model3.json, in reference order
+            without duplicates
+    """
+    refs = model_settings.get("FileReferences") or {}
+    paths: List[str] = []
+
+    def add(path: Any) -> None:
+        if isinstance(path, str) and path and path not in paths:
+            paths.append(path)
+
+    for key in ("Moc", "Physics", "Pose", "DisplayInfo", "UserData"):
+        add(refs.get(key))
+    for texture in refs.get("Textures") or []:
+        add(texture)
+    for expression in refs.get("Expressions") or []:
+        if isinstance(expression, dict):
+            add(expression.get("File"))
+    for motions in (refs.get("Motions") or {}).values():
+        for motion in motions or []:
+            if isinstance(motion, dict):
+                add(motion.get("File"))
+                add(motion.get("Sound"))
+    return paths
+
+
+def quantize_motion(motion: Dict[str, Any], decimals: int) -> Dict[str, Any]:
+    """
+    Round the times and values of a motion3.json's curves.
+
+    Segment type identifiers are integers and are left unchanged by rounding.
+
+    Args:
+        motion: Decoded motion3.json
+        decimals: Decimal places to keep
+
+    Returns:
+        Dict[str, Any]: The motion with rounded curve segments
+    """
+    for curve in motion.get("Curves") or []:
+        segments = curve.get("Segments")
+        if isinstance(segments, list):
+            curve["Segments"] = [
+                _round_number(value, decimals) if isinstance(value, float) else value
+                for value in segments
+            ]
+    return motion
+
+
+def _round_number(value: float, decimals: int) -> Any:
+    """Round a float, collapsing whole numbers to int for shorter JSON."""
+    value = round(value, decimals)
+    return int(value) if value.is_integer() else value
+
+
+def minify_json(path: str, data: bytes, quantize: Optional[int] = None) -> bytes:
+    """
+    Re-encode a JSON file without whitespace, quantizing motion curves.
+
+    Args:
+        path: File path (motion3.json files are quantized)
+        data: Original file contents
+        quantize: Decimal places for motion curves (None = lossless)
+
+    Returns:
+        bytes: Minified JSON
+
+    Raises:
+        ValidationError: If the file is not valid JSON
+    """
+    try:
+        decoded = json.loads(data.decode("utf-8-sig"))
+    except ValueError as e:
+        raise ValidationError(f"Invalid JSON in {path}: {e}")
+    if quantize is not None and path.endswith(".motion3.json"):
+        decoded = quantize_motion(decoded, quantize)
+    return json.dumps(decoded, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def pack_bundle(
+    index: Dict[str, Any], files: List[Tuple[str, str, bytes]]
+) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Serialize a bundle.
+
+    Args:
+        index: Index fields other than ``files``
+        files: (path, content type, data) for each file
+
+    Returns:
+        Tuple[bytes, Dict[str, Any]]: The bundle and its complete index
+    """
+    entries = []
+    offset = 0
+    for path, content_type, data in files:
+        entries.append(
+            {"path": path, "offset": offset, "length": len(data), "type": content_type}
+        )
+        offset += len(data)
+
+    index = {**index, "files": entries}
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+    header = _HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, len(index_bytes))
+    return b"".join([header, index_bytes, *(data for _, _, data in files)]), index
+
+
+def unpack_bundle(bundle: bytes) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """
+    Split a bundle into its index and files.
+
+    Args:
+        bundle: Bundle bytes
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, bytes]]: Index and file contents by path
+
+    Raises:
+        ValidationError: If the data is not a supported bundle
+    """
+    if len(bundle) < _HEADER.size:
+        raise ValidationError("Truncated model bundle")
+    magic, version, index_length = _HEADER.unpack_from(bundle)
+    if magic != BUNDLE_MAGIC or version != BUNDLE_FORMAT_VERSION:
+        raise ValidationError("Not a supported model bundle")
+
+    data_start = _HEADER.size + index_length
+    index = json.loads(bundle[_HEADER.size : data_start].decode("utf-8"))
+    files = {}
+    for entry in index["files"]:
+        start = data_start + entry["offset"]
+        files[entry["path"]] = bundle[start : start + entry["length"]]
+    return index, files
+
+
+@dataclass
+class ModelBundle:
+    """A packed model bundle ready to serve."""
+
+    model_path: str
+    version: str
+    data: bytes
+    index: Dict[str, Any]
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag of the uncompressed bundle."""
+        return f'"{self.version}"'
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Strong ETag of the given representation (None = uncompressed)."""
+        return f'"{self.version}-{encoding}"' if encoding else self.etag
+
+
+class ModelBundler:
+    """
+    Builds model bundles from files in a StaticAssetStore.
+
+    Built bundles are kept in a small LRU keyed by version, so a bundle is
+    packed once per change to its model's files.
+    """
+
+    def __init__(
+        self,
+        store: StaticAssetStore,
+        quantize: Optional[int] = None,
+        max_bundles: int = 4,
+    ):
+        """
+        Initialize the bundler.
+
+        Args:
+            store: Store the model files are read through
+            quantize: Default decimal places for motion curves (None = lossless)
+            max_bundles: Built bundles kept in memory
+        """
+        self.store = store
+        self.quantize = self._check_quantize(quantize)
+        self.max_bundles = max(1, max_bundles)
+
+        self._bundles: "OrderedDict[str, ModelBundle]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, model_path: str, quantize: Optional[int] = None) -> ModelBundle:
+        """
+        Get the bundle for a model, packing it if its files changed.
+
+        Args:
+            model_path: model3.json path relative to the store root
+            quantize: Decimal places for motion curves (None = bundler default)
+
+        Returns:
+            ModelBundle: The current bundle
+
+        Raises:
+            ValidationError: If the path or options are invalid
+            Live2DError: If the model does not exist
+        """
+        quantize = self.quantize if quantize is None else self._check_quantize(quantize)
+        model_asset, sources, missing = self._resolve(model_path)
+        version = self._version(model_asset, sources, missing, quantize)
+
+        with self._lock:
+            bundle = self._bundles.get(version)
+            if bundle is not None:
+                self._bundles.move_to_end(version)
+                return bundle
+
+        start = time.perf_counter()
+        bundle = self._pack(model_asset, sources, missing, quantize, version)
+        logger.info(
+            f"Packed model bundle {model_path} ({len(sources) + 1} files, "
+            f"{len(bundle.data)} bytes) in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+
+        with self._lock:
+            self._bundles[version] = bundle
+            while len(self._bundles) > self.max_bundles:
+                self._bundles.popitem(last=False)
+        return bundle
+
+    def bundle_url(self, model_path: str) -> Optional[str]:
+        """
+        Build the versioned URL of a model's bundle.
+
+        Args:
+            model_path: model3.json path relative to the store root
+
+        Returns:
+            Optional[str]: ``/live2d/bundle/<path>?v=<version>``, or None if
+            the model cannot be bundled
+        """
+        try:
+            model_asset, sources, missing = self._resolve(model_path)
+        except (Live2DError, ValidationError) as e:
+            logger.warning(f"Model bundle unavailable for {model_path}: {e}")
+            return None
+        version = self._version(model_asset, sources, missing, self.quantize)
+        return f"{BUNDLE_URL_PREFIX}{model_asset.path}?v={version}"
+
+    @staticmethod
+    def _check_quantize(quantize: Optional[int]) -> Optional[int]:
+        """Validate a quantization setting."""
+        if quantize is None:
+            return None
+        if not 0 <= quantize <= MAX_QUANTIZE_DECIMALS:
+            raise ValidationError(
+                f"quantize must be between 0 and {MAX_QUANTIZE_DECIMALS} decimals"
+            )
+        return quantize
+
+    def _resolve(
+        self, model_path: str
+    ) -> Tuple[StaticAsset, List[Tuple[str, StaticAsset]], List[str]]:
+        """Resolve a model3.json and its references to indexed assets."""
+        if not model_path.endswith(MODEL_SUFFIX):
+            raise ValidationError(f"Model path must end with {MODEL_SUFFIX}")
+        resolved = self.store.resolve(model_path)
+        if resolved is None:
+            raise Live2DError(
+                "Model not found", operation="bundle_model", model_path=model_path
+            )
+        model_asset = resolved[0]
+
+        with open(model_asset.file_path, "rb") as f:
+            model_data = f.read()
+        try:
+            settings = json.loads(model_data.decode("utf-8-sig"))
+        except ValueError as e:
+            raise ValidationError(f"Invalid model3.json: {e}")
+
+        model_dir = posixpath.dirname(model_asset.path)
+        sources: List[Tuple[str, StaticAsset]] = []
+        missing: List[str] = []
+        for ref in model_file_references(settings):
+            target = posixpath.normpath(posixpath.join(model_dir, ref))
+            asset = self.store.resolve(target)
+            if asset is None:
+                missing.append(ref)
+            else:
+                sources.append((ref, asset[0]))
+
+        if missing:
+            logger.warning(f"Model {model_asset.path} references missing files: {missing}")
+        return model_asset, sources, missing
+
+    @staticmethod
+    def _version(
+        model_asset: StaticAsset,
+        sources: List[Tuple[str, StaticAsset]],
+        missing: List[str],
+        quantize: Optional[int],
+    ) -> str:
+        """Digest of everything that goes into a bundle."""
+        key = json.dumps(
+            [
+                BUNDLE_FORMAT_VERSION,
+                quantize,
+                model_asset.path,
+                model_asset.digest,
+                [(ref, asset.digest) for ref, asset in sources],
+                missing,
+            ]
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    def _pack(
+        self,
+        model_asset: StaticAsset,
+        sources: List[Tuple[str, StaticAsset]],
+        missing: List[str],
+        quantize: Optional[int],
+        version: str,
+    ) -> ModelBundle:
+        """Read, minify and pack a model's files."""
+        model_name = posixpath.basename(model_asset.path)
+        files = []
+        original_size = 0
+        for path, asset in [(model_name, model_asset), *sources]:
+            with open(asset.file_path, "rb") as f:
+                data = f.read()
+            original_size += len(data)
+            if path.lower().endswith(".json"):
+                data = minify_json(path, data, quantize)
+            files.append((path, asset.content_type, data))
+
+        index = {
+            "format": BUNDLE_FORMAT_VERSION,
+            "version": version,
+            "model": model_name,
+            "quantize": quantize,
+            "original_size": original_size,
+            "missing": missing,
+        }
+        data, index = pack_bundle(index, files)
+        return ModelBundle(
+            model_path=model_asset.path,
+            version=version,
+            data=data,
+            index=index,
+            encodings=compress_variants(data),
+        )
+
+
+def bundle_quantize_from_env() -> Optional[int]:
+    """Read LIVE2D_BUNDLE_QUANTIZE (empty = lossless)."""
+    value = os.getenv("LIVE2D_BUNDLE_QUANTIZE", "").strip()
+    return int(value) if value else None
+
+
+# Global model bundler instance
+_model_bundler: Optional[ModelBundler] = None
+
+
+def get_model_bundler() -> ModelBundler:
+    """
+    Get the global model bundler.
+
+    Returns:
+        ModelBundler: Bundler reading through the global static asset store
+    """
+    global _model_bundler
+    if _model_bundler is None:
+        _model_bundler = ModelBundler(
+            get_static_assets(), quantize=bundle_quantize_from_env()
+        )
+    return _model_bundler
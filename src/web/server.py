@@ -1,16 +1,19 @@
 #!/usr/bin/env python3
 """
-Flask server startup script for Live2D Anime AI Character.
+Web server startup script for Live2D Anime AI Character.
 
-This script starts the Flask web server with proper configuration
-and error handling for the Live2D model serving and animation API.
+This script starts the web server (aiohttp by default, Flask with
+WEB_SERVER=flask) with proper configuration and error handling for the
+Live2D model serving and animation API.
 """
 
 import logging
 import sys
 
 from src.config.settings import load_config, ConfigurationError
+from src.config.executors import configure_executors
 from src.web.app import Live2DFlaskApp
+from src.web.async_app import Live2DWebApp
 
 
 def setup_logging(log_level: str = "INFO"):
@@ -25,27 +28,45 @@ def setup_logging(log_level: str = "INFO"):
     )
 
 
+def create_web_server(config):
+    """
+    Create the web server selected by WEB_SERVER.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Live2DWebApp or Live2DFlaskApp: Server with a ``run(host, port, debug)`` method
+    """
+    if config.flask.server == "flask":
+        return Live2DFlaskApp()
+    return Live2DWebApp()
+
+
 def main():
-    """Main entry point for Flask server."""
+    """Main entry point for the web server."""
     try:
         # Load configuration
         config = load_config()
 
         # Set up logging
         setup_logging(config.log_level)
+        configure_executors(config.executors)
         logger = logging.getLogger(__name__)
 
-        logger.info("Starting Live2D Anime AI Character Flask Server")
+        logger.info(
+            f"Starting Live2D Anime AI Character web server ({config.flask.server})"
+        )
         logger.info(f"Configuration loaded: Debug={config.debug}")
         logger.info(f"LiveKit URL: {config.livekit.url}")
         logger.info(f"Live2D Model: {config.live2d.model_url}")
 
-        # Create Flask application
-        flask_app = Live2DFlaskApp()
+        # Create web application
+        web_app = create_web_server(config)
 
         # Start server
         logger.info(f"Starting server on {config.flask.host}:{config.flask.port}")
-        flask_app.run(
+        web_app.run(
             host=config.flask.host, port=config.flask.port, debug=config.flask.debug
         )
 
@@ -15,10 +15,96 @@ const loadScript = async (src) => {
     });
 };
 
+/**
+ * Live2D model bundle loader
+ *
+ * A bundle (served from /live2d/bundle/<model3.json path>) packs a model3.json
+ * and every file it references into one download:
+ *
+ *   "L2DB" | format version (uint32 LE) | index length (uint32 LE)
+ *   | index (UTF-8 JSON) | file data
+ *
+ * The index lists each file's path relative to the model3.json, its offset
+ * into the file data, its length and content type.
+ */
+const MODEL_BUNDLE_MAGIC = 'L2DB';
+const MODEL_BUNDLE_FORMAT_VERSION = 1;
+
+const parseModelBundle = (buffer) => {
+    const view = new DataView(buffer);
+    const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, 4));
+    if (magic !== MODEL_BUNDLE_MAGIC || view.getUint32(4, true) !== MODEL_BUNDLE_FORMAT_VERSION) {
+        throw new Error('Not a supported Live2D model bundle');
+    }
+
+    const indexLength = view.getUint32(8, true);
+    const index = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 12, indexLength)));
+    const dataStart = 12 + indexLength;
+
+    const files = {};
+    for (const entry of index.files) {
+        const start = dataStart + entry.offset;
+        files[entry.path] = {
+            type: entry.type,
+            data: buffer.slice(start, start + entry.length)
+        };
+    }
+    return { index, files };
+};
+
+/**
+ * Fetch a model bundle and turn it into model settings for
+ * PIXI.live2d.Live2DModel.from(). Bundled files are exposed as blob URLs;
+ * references missing from the bundle still resolve against modelUrl.
+ *
+ * Returns { settings, objectUrls } - motions load lazily from the blob URLs,
+ * so keep objectUrls alive until the model is replaced.
+ */
+const loadModelBundle = async (bundleUrl, modelUrl) => {
+    const response = await fetch(bundleUrl);
+    if (!response.ok) {
+        throw new Error(`Model bundle request failed: ${response.status}`);
+    }
+    const { index, files } = parseModelBundle(await response.arrayBuffer());
+
+    const objectUrls = {};
+    for (const [path, file] of Object.entries(files)) {
+        if (path !== index.model) {
+            objectUrls[path] = URL.createObjectURL(new Blob([file.data], { type: file.type }));
+        }
+    }
+
+    const settings = JSON.parse(new TextDecoder().decode(files[index.model].data));
+    const rewrite = (value) => {
+        if (typeof value === 'string') {
+            return objectUrls[value] || value;
+        }
+        if (Array.isArray(value)) {
+            return value.map(rewrite);
+        }
+        if (value && typeof value === 'object') {
+            return Object.fromEntries(
+                Object.entries(value).map(([key, item]) => [key, rewrite(item)])
+            );
+        }
+        return value;
+    };
+    settings.FileReferences = rewrite(settings.FileReferences || {});
+    // Relative paths (and the settings themselves) resolve against the model URL
+    settings.url = modelUrl;
+
+    if (index.missing && index.missing.length) {
+        console.warn('Model bundle is missing files:', index.missing);
+    }
+    return { settings, objectUrls: Object.values(objectUrls) };
+};
+
 class Live2DIntegration {
-    constructor(canvasId, modelUrl) {
+    constructor(canvasId, modelUrl, options = {}) {
         this.canvas = document.getElementById(canvasId);
         this.modelUrl = modelUrl;
+        this.bundleUrl = options.bundleUrl || null;
+        this.bundleObjectUrls = [];
         this.gl = null;
         this.app = null; // Pixi.js Application
         this.live2dModel = null; // Live2D model instance
@@ -103,8 +189,21 @@ class Live2DIntegration {
         try {
             console.log(`Loading Live2D model: ${modelUrl}`);
 
+            // Prefer the single-download bundle; fall back to individual files
+            let source = modelUrl;
+            if (this.bundleUrl) {
+                try {
+                    const bundle = await loadModelBundle(this.bundleUrl, modelUrl);
+                    source = bundle.settings;
+                    this.bundleObjectUrls.forEach((url) => URL.revokeObjectURL(url));
+                    this.bundleObjectUrls = bundle.objectUrls;
+                } catch (error) {
+                    console.warn('Model bundle unavailable, loading files individually:', error);
+                }
+            }
+
             // Load the Live2D model using Pixi-Live2D-Display
-            this.live2dModel = await PIXI.live2d.Live2DModel.from(modelUrl);
+            this.live2dModel = await PIXI.live2d.Live2DModel.from(source);
             this.app.stage.addChild(this.live2dModel);
 
             // Scale and position the model to fit the canvas
@@ -498,4 +597,5 @@ class Live2DIntegration {
 }
 
 // Export for use in other modules
-window.Live2DIntegration = Live2DIntegration;
\ No newline at end of file
+window.Live2DIntegration = Live2DIntegration;
+window.loadModelBundle = loadModelBundle;
\ No newline at end of file
@@ -55,9 +55,15 @@ class WebSocketAnimationClient {
      */
     getWebSocketUrl() {
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const host = window.location.hostname || '127.0.0.1';
-        const port = 8765;
-        const url = `${protocol}//${host}:${port}`;
+        let url;
+        if (window.ANIMATION_WS_PATH) {
+            // Async server: WebSocket shares the page's host and port
+            url = `${protocol}//${window.location.host}${window.ANIMATION_WS_PATH}`;
+        } else {
+            const host = window.location.hostname || '127.0.0.1';
+            const port = 8765;
+            url = `${protocol}//${host}:${port}`;
+        }
         console.log('Configured WebSocket URL:', url);
         return url;
     }
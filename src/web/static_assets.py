@@ -0,0 +1,507 @@
+"""
+Static asset store for the web servers.
+
+Indexes the files under ``src/web/static`` by content hash so they can be
+served with strong ETags and versioned URLs, precompresses text assets
+(gzip, plus brotli when the ``brotli`` package is installed) and keeps
+small hot files in an in-memory LRU.
+
+A versioned URL has the form ``/static/_v/<token>/<path>``, where the token
+is the digest of the directory holding the file. Relative references made
+from such a URL (a model3.json naming its moc3, textures and motions)
+resolve under the same token, so a whole Live2D model directory is cached
+as one immutable version. Requests whose token no longer matches still get
+the current file, but must revalidate it.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    # Optional dependency – only gzip variants are produced without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "static")
+STATIC_URL_PREFIX = "/static/"
+VERSION_SEGMENT = "_v"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Text formats worth precompressing (Live2D JSON plus the page's own assets)
+COMPRESSIBLE_SUFFIXES = frozenset({".json", ".js", ".css", ".html", ".svg", ".txt"})
+# Keep a compressed variant only if it saves at least this fraction
+MIN_COMPRESSION_SAVING = 0.1
+
+mimetypes.add_type("application/json", ".json")
+mimetypes.add_type("application/javascript", ".js")
+
+
+def compress_variants(data: bytes) -> Dict[str, bytes]:
+    """
+    Build the compressed variants of a body worth keeping.
+
+    Args:
+        data: Uncompressed body
+
+    Returns:
+        Dict[str, bytes]: Bodies keyed by Content-Encoding (``gzip``, ``br``)
+    """
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    limit = len(data) * (1 - MIN_COMPRESSION_SAVING)
+    return {name: body for name, body in variants.items() if len(body) <= limit}
+
+
+def negotiate_encoding(
+    available: Iterable[str], accept_encoding: Optional[str]
+) -> Optional[str]:
+    """
+    Pick the best available Content-Encoding for a request.
+
+    Args:
+        available: Encodings a body exists in
+        accept_encoding: The request's Accept-Encoding header
+
+    Returns:
+        Optional[str]: ``"br"``, ``"gzip"`` or None for the plain body
+    """
+    available = set(available)
+    if not available or not accept_encoding:
+        return None
+
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+
+    for encoding in ("br", "gzip"):
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
+
+
+def etag_matches(current: Iterable[str], if_none_match: Optional[str]) -> bool:
+    """
+    Check an If-None-Match header against the current ETags of a resource.
+
+    Args:
+        current: ETags of every representation of the resource
+        if_none_match: The request's If-None-Match header
+
+    Returns:
+        bool: True if the client's copy is current (send 304)
+    """
+    if not if_none_match:
+        return False
+    current = set(current)
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") in current:
+            return True
+    return False
+
+
+@dataclass
+class StaticAsset:
+    """An indexed static file."""
+
+    path: str
+    file_path: str
+    size: int
+    mtime_ns: int
+    digest: str
+    content_type: str
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag of the uncompressed file."""
+        return f'"{self.digest}"'
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Strong ETag of the given representation (None = uncompressed)."""
+        return f'"{self.digest}-{encoding}"' if encoding else self.etag
+
+
+@dataclass
+class StaticAssetMetrics:
+    """Counters describing static asset serving."""
+
+    cache_hits: int = 0
+    cache_misses: int = 0
+    evictions: int = 0
+    compressed_bytes_saved: int = 0
+
+
+class StaticAssetStore:
+    """
+    Content-hashed index of static files with precompression and an LRU.
+
+    Files are re-stat'ed on lookup, and a directory's files when a URL is
+    versioned with its token, so edits are picked up without a restart; an
+    edited file gets a new digest and its directories new version tokens.
+    """
+
+    def __init__(
+        self,
+        root: str = STATIC_DIR,
+        precompress: bool = True,
+        cache_bytes: int = 8 * 1024 * 1024,
+        cache_max_file_bytes: int = 256 * 1024,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory served under /static/
+            precompress: Whether to build gzip/brotli variants of text assets
+            cache_bytes: Maximum total size of files held in the LRU
+            cache_max_file_bytes: Largest file kept in the LRU (0 = no LRU)
+        """
+        self.root = os.path.realpath(root)
+        self.precompress = precompress
+        self.cache_bytes = max(0, cache_bytes)
+        self.cache_max_file_bytes = max(0, cache_max_file_bytes)
+        self.metrics = StaticAssetMetrics()
+
+        self._assets: Dict[str, StaticAsset] = {}
+        self._dir_digests: Optional[Dict[str, str]] = None
+        self._scanned = False
+        self._cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.RLock()
+
+    def scan(self) -> int:
+        """
+        Index (and precompress) every file under the root.
+
+        Returns:
+            int: Number of indexed files
+        """
+        with self._lock:
+            seen = set()
+            for rel_path in self._walk():
+                seen.add(rel_path)
+                self._index(rel_path)
+            for rel_path in set(self._assets) - seen:
+                del self._assets[rel_path]
+            self._dir_digests = None
+            self._scanned = True
+            count = len(self._assets)
+
+        logger.info(
+            f"Indexed {count} static assets "
+            f"({sum(len(a.encodings) for a in self._assets.values())} precompressed variants)"
+        )
+        return count
+
+    def resolve(self, url_path: str) -> Optional[Tuple[StaticAsset, bool]]:
+        """
+        Look up the asset for a path under /static/.
+
+        Args:
+            url_path: Path after /static/, optionally ``_v/<token>/...``
+
+        Returns:
+            Optional[Tuple[StaticAsset, bool]]: The asset and whether the
+            request names its current version (immutable caching), or None
+            if there is no such file under the root
+        """
+        token = None
+        parts = url_path.split("/", 2)
+        if len(parts) == 3 and parts[0] == VERSION_SEGMENT:
+            token, url_path = parts[1], parts[2]
+
+        file_path = os.path.realpath(os.path.join(self.root, url_path))
+        # Refuse paths that escape the static directory
+        if not file_path.startswith(self.root + os.sep) or not os.path.isfile(file_path):
+            return None
+        rel_path = os.path.relpath(file_path, self.root).replace(os.sep, "/")
+
+        with self._lock:
+            asset = self._index(rel_path)
+            if asset is None:
+                return None
+            immutable = token is not None and token in self._version_tokens(rel_path)
+        return asset, immutable
+
+    def asset_url(self, path: str) -> str:
+        """
+        Build the versioned URL of a static file.
+
+        Args:
+            path: Path relative to the static directory
+
+        Returns:
+            str: ``/static/_v/<token>/<path>``, or ``/static/<path>`` if the
+            file does not exist
+        """
+        path = path.lstrip("/")
+        if path.startswith(STATIC_URL_PREFIX.lstrip("/")):
+            path = path[len(STATIC_URL_PREFIX) - 1 :]
+        if self.resolve(path) is None:
+            return f"{STATIC_URL_PREFIX}{path}"
+
+        with self._lock:
+            # Pick up edits to siblings the token will vouch for
+            directory = os.path.dirname(path)
+            self._refresh(directory)
+            token = self._directory_digests()[directory]
+        return f"{STATIC_URL_PREFIX}{VERSION_SEGMENT}/{token}/{path}"
+
+    def select_encoding(
+        self, asset: StaticAsset, accept_encoding: Optional[str]
+    ) -> Optional[str]:
+        """
+        Pick the precompressed variant to send.
+
+        Args:
+            asset: Asset being served
+            accept_encoding: The request's Accept-Encoding header
+
+        Returns:
+            Optional[str]: ``"br"``, ``"gzip"`` or None for the plain file
+        """
+        return negotiate_encoding(asset.encodings, accept_encoding)
+
+    def response_headers(
+        self, asset: StaticAsset, immutable: bool, encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Build the caching and content headers for an asset response.
+
+        Args:
+            asset: Asset being served
+            immutable: Whether the URL names the asset's current version
+            encoding: Content-Encoding of the body (None = uncompressed)
+
+        Returns:
+            Dict[str, str]: Response headers
+        """
+        headers = {
+            "Content-Type": asset.content_type,
+            "ETag": asset.etag_for(encoding),
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "Accept-Ranges": "bytes",
+        }
+        if asset.encodings:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return headers
+
+    @staticmethod
+    def matches_etag(asset: StaticAsset, if_none_match: Optional[str]) -> bool:
+        """
+        Check an If-None-Match header against every representation of an asset.
+
+        Args:
+            asset: Asset being served
+            if_none_match: The request's If-None-Match header
+
+        Returns:
+            bool: True if the client's copy is current (send 304)
+        """
+        return etag_matches(
+            [asset.etag_for(encoding) for encoding in [None, *asset.encodings]],
+            if_none_match,
+        )
+
+    def cached_body(self, asset: StaticAsset) -> Optional[bytes]:
+        """Return the asset's bytes if they are in the LRU."""
+        key = (asset.path, asset.digest)
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                self.metrics.cache_hits += 1
+            return body
+
+    def read(self, asset: StaticAsset) -> Optional[bytes]:
+        """
+        Return the bytes of a small asset, through the LRU.
+
+        Args:
+            asset: Asset being served
+
+        Returns:
+            Optional[bytes]: File contents, or None if the asset is too large
+            to cache (stream it from disk instead)
+        """
+        if asset.size > self.cache_max_file_bytes or asset.size > self.cache_bytes:
+            return None
+        body = self.cached_body(asset)
+        if body is not None:
+            return body
+
+        try:
+            with open(asset.file_path, "rb") as f:
+                body = f.read()
+        except OSError as e:
+            logger.warning(f"Failed to read static asset {asset.path}: {e}")
+            return None
+        if hashlib.sha256(body).hexdigest()[:16] != asset.digest:
+            # Changed since it was indexed; let the caller stream the new file
+            return None
+
+        with self._lock:
+            self.metrics.cache_misses += 1
+            key = (asset.path, asset.digest)
+            if key not in self._cache:
+                self._cache[key] = body
+                self._cached_bytes += len(body)
+                while self._cached_bytes > self.cache_bytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cached_bytes -= len(evicted)
+                    self.metrics.evictions += 1
+        return body
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get index and cache statistics."""
+        with self._lock:
+            return {
+                "assets": len(self._assets),
+                "precompressed": sum(len(a.encodings) for a in self._assets.values()),
+                "cached_files": len(self._cache),
+                "cached_bytes": self._cached_bytes,
+                "cache_hits": self.metrics.cache_hits,
+                "cache_misses": self.metrics.cache_misses,
+                "evictions": self.metrics.evictions,
+                "compressed_bytes_saved": self.metrics.compressed_bytes_saved,
+            }
+
+    def _refresh(self, directory: str) -> None:
+        """Re-index every file under a directory (relative to the root)."""
+        prefix = f"{directory}/" if directory else ""
+        seen = set(self._walk(directory))
+        for rel_path in seen:
+            self._index(rel_path)
+        for rel_path in [p for p in self._assets if p.startswith(prefix)]:
+            if rel_path not in seen:
+                del self._assets[rel_path]
+                self._dir_digests = None
+
+    def _walk(self, directory: str = "") -> Iterable[str]:
+        """Yield the relative path of every file under a directory of the root."""
+        for dirpath, dirnames, filenames in os.walk(os.path.join(self.root, directory)):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                file_path = os.path.join(dirpath, filename)
+                yield os.path.relpath(file_path, self.root).replace(os.sep, "/")
+
+    def _index(self, rel_path: str) -> Optional[StaticAsset]:
+        """Index a file, reusing the existing entry if it is unchanged."""
+        file_path = os.path.join(self.root, rel_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            if self._assets.pop(rel_path, None) is not None:
+                self._dir_digests = None
+            return None
+
+        asset = self._assets.get(rel_path)
+        if asset and asset.size == stat.st_size and asset.mtime_ns == stat.st_mtime_ns:
+            return asset
+
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.warning(f"Failed to index static asset {rel_path}: {e}")
+            return None
+
+        content_type = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+        asset = StaticAsset(
+            path=rel_path,
+            file_path=file_path,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            digest=hashlib.sha256(data).hexdigest()[:16],
+            content_type=content_type,
+        )
+        if self.precompress and os.path.splitext(rel_path)[1].lower() in COMPRESSIBLE_SUFFIXES:
+            asset.encodings = compress_variants(data)
+            for variant in asset.encodings.values():
+                self.metrics.compressed_bytes_saved += len(data) - len(variant)
+
+        self._assets[rel_path] = asset
+        self._dir_digests = None
+        return asset
+
+    def _version_tokens(self, rel_path: str) -> List[str]:
+        """Version tokens accepted for a file: the digests of its directories."""
+        digests = self._directory_digests()
+        tokens = []
+        directory = os.path.dirname(rel_path)
+        while True:
+            if directory in digests:
+                tokens.append(digests[directory])
+            if not directory:
+                return tokens
+            directory = os.path.dirname(directory)
+
+    def _directory_digests(self) -> Dict[str, str]:
+        """Digest of every directory over the files beneath it."""
+        if self._dir_digests is not None:
+            return self._dir_digests
+        if not self._scanned:
+            # Tokens must cover every file, not just the ones served so far
+            for rel_path in self._walk():
+                self._index(rel_path)
+            self._scanned = True
+
+        hashers: Dict[str, "hashlib._Hash"] = {}
+        for rel_path in sorted(self._assets):
+            entry = f"{rel_path}\0{self._assets[rel_path].digest}\n".encode("utf-8")
+            directory = os.path.dirname(rel_path)
+            while True:
+                hashers.setdefault(directory, hashlib.sha256()).update(entry)
+                if not directory:
+                    break
+                directory = os.path.dirname(directory)
+
+        self._dir_digests = {d: h.hexdigest()[:16] for d, h in hashers.items()}
+        return self._dir_digests
+
+
+# Global static asset store instance
+_static_assets: Optional[StaticAssetStore] = None
+
+
+def get_static_assets() -> StaticAssetStore:
+    """
+    Get the global static asset store.
+
+    Returns:
+        StaticAssetStore: Store configured from the environment
+    """
+    global _static_assets
+    if _static_assets is None:
+        _static_assets = StaticAssetStore(
+            precompress=os.getenv("STATIC_PRECOMPRESS", "true").lower() == "true",
+            cache_bytes=int(os.getenv("STATIC_CACHE_BYTES", str(8 * 1024 * 1024))),
+            cache_max_file_bytes=int(
+                os.getenv("STATIC_CACHE_MAX_FILE_BYTES", str(256 * 1024))
+            ),
+        )
+    return _static_assets
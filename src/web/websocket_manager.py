@@ -122,13 +122,7 @@ class WebSocketAnimationManager:
                 extensions=[],  # No extensions for better compatibility
             )
 
-            self.is_running = True
-
-            # Start background tasks
-            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
-            self._queue_processor_task = asyncio.create_task(
-                self._process_animation_queue()
-            )
+            await self.start_background_tasks()
 
             self.logger.info("WebSocket server started successfully")
 
@@ -136,6 +130,29 @@ class WebSocketAnimationManager:
             self.logger.error(f"Failed to start WebSocket server: {e}")
             raise
 
+    async def start_background_tasks(self) -> None:
+        """
+        Start the heartbeat and animation queue tasks without a listener.
+
+        Used when client connections are accepted by another server on the
+        same event loop (see ``serve_client``).
+        """
+        self.is_running = True
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        self._queue_processor_task = asyncio.create_task(
+            self._process_animation_queue()
+        )
+
+    async def serve_client(self, websocket: Any) -> None:
+        """
+        Serve a client connection accepted by another server.
+
+        Args:
+            websocket: Connection with ``remote_address``, ``send``, ``close``
+                and async iteration over incoming text messages
+        """
+        await self._handle_client_connection(websocket)
+
     async def stop_server(self) -> None:
         """Stop the WebSocket server."""
         try:
@@ -344,18 +361,64 @@ class WebSocketAnimationManager:
         # Add event to queue
         self.animation_queue.append(event)
 
-        # Sort by priority and timestamp
-        self.animation_queue.sort(key=lambda x: (x.priority, x.timestamp), reverse=True)
+        # Sort by priority, then play time (earliest first)
+        self.animation_queue.sort(key=lambda x: (-x.priority, x.timestamp))
 
         self.logger.debug(f"Queued animation event: {event.event_type.value}")
 
+    async def queue_animations(self, events: List[AnimationEvent]) -> None:
+        """
+        Add several animation events to the queue at once.
+
+        The events are inserted together with a single sort, so the queue
+        processor never sees a partial batch. Existing lowest-priority events
+        are evicted to make room; the batch itself is never trimmed.
+
+        Args:
+            events: Animation events to queue
+
+        Raises:
+            ValueError: If the batch is larger than the queue
+        """
+        if len(events) > self.max_queue_size:
+            raise ValueError(
+                f"Cannot queue {len(events)} events (queue holds {self.max_queue_size})"
+            )
+
+        overflow = len(self.animation_queue) + len(events) - self.max_queue_size
+        if overflow > 0:
+            self.animation_queue.sort(key=lambda x: (-x.priority, x.timestamp))
+            del self.animation_queue[-overflow:]
+            self.logger.warning(
+                f"Animation queue full, removed {overflow} lowest priority events"
+            )
+
+        self.animation_queue.extend(events)
+        self.animation_queue.sort(key=lambda x: (-x.priority, x.timestamp))
+
+        self.logger.debug(f"Queued {len(events)} animation events")
+
     async def _process_animation_queue(self) -> None:
         """Process animation queue in background."""
         while self.is_running:
             try:
+                due_index = None
                 if self.animation_queue and not self.current_animation:
+                    # Highest-priority event that is already due; a future
+                    # event at the head must not hold back due ones behind it
+                    now = time.time()
+                    due_index = next(
+                        (
+                            i
+                            for i, e in enumerate(self.animation_queue)
+                            if e.timestamp <= now
+                        ),
+                        None,
+                    )
+
+                if due_index is not None:
                     # Get next animation from queue
-                    next_event = self.animation_queue.pop(0)
+                    next_event = self.animation_queue.pop(due_index)
 
                     # Set as current animation
                     self.current_animation = next_event
@@ -390,11 +453,9 @@ class WebSocketAnimationManager:
 
         await asyncio.sleep(event.duration)
 
-        # Clear current animation if it's still this event
-        if (
-            self.current_animation
-            and self.current_animation.sequence_id == event.sequence_id
-        ):
+        # Clear current animation if it's still this event; steps of one
+        # sequence can share a sequence_id, so compare the event itself
+        if self.current_animation is event:
             self.current_animation = None
 
     async def _handle_animation_complete(self, sequence_id: Optional[str]) -> None:
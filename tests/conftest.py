@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    """Clock starting at 0 that only moves when a test sets ``now``."""
+    return FakeClock()
+
+
+@pytest.fixture
+def gemini_config():
+    """Gemini provider configuration with three keys."""
+    return {"api_keys": ["key1", "key2", "key3"], "model": "gemini-pro"}
@@ -5,7 +5,7 @@ Tests the base provider interface, Ollama provider, Gemini provider, and factory
 
 import pytest
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
 
 # Import the AI provider classes
@@ -96,6 +96,41 @@ class TestOllamaProvider:
         with pytest.raises(RuntimeError, match="Failed to generate response"):
             await provider.generate_response(messages, "")
 
+    @patch("src.ai.ollama_provider.ollama")
+    @pytest.mark.asyncio
+    async def test_stream_response_yields_chunks(self, mock_ollama):
+        """Test streaming yields each content chunk in order."""
+        mock_ollama.chat.return_value = iter(
+            [
+                {"message": {"content": "Hello"}},
+                {"message": {"content": " there"}},
+                {"message": {"content": "!"}, "done": True},
+            ]
+        )
+
+        provider = OllamaProvider(self.config)
+        messages = [Message(role="user", content="Hello")]
+
+        chunks = [chunk async for chunk in provider.stream_response(messages, "")]
+
+        assert chunks == ["Hello", " there", "!"]
+        assert mock_ollama.chat.call_args[1]["stream"] is True
+
+    @patch("src.ai.ollama_provider.ollama")
+    @pytest.mark.asyncio
+    async def test_stream_response_falls_back_before_first_chunk(self, mock_ollama):
+        """Test streaming falls back to a full response when the stream fails early."""
+        provider = OllamaProvider(self.config)
+        provider.client = Mock()
+        provider.client.chat.side_effect = Exception("stream unsupported")
+        provider.generate_response = AsyncMock(return_value="Fallback reply")
+
+        messages = [Message(role="user", content="Hello")]
+        chunks = [chunk async for chunk in provider.stream_response(messages, "")]
+
+        assert chunks == ["Fallback reply"]
+        provider.generate_response.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_validate_content_always_true(self):
         """Test content validation always returns True."""
@@ -215,9 +250,10 @@ class TestGeminiProvider:
         assert result is False
         assert provider.current_key_index == 0  # Should stay the same
 
+    @patch("src.ai.gemini_provider.KeyBoundModel")
     @patch("src.ai.gemini_provider.genai")
     @pytest.mark.asyncio
-    async def test_generate_response_success(self, mock_genai):
+    async def test_generate_response_success(self, mock_genai, mock_key_model):
         """Test successful response generation."""
         mock_response = Mock()
         mock_response.text = "Hello! How can I help you?"
@@ -225,6 +261,7 @@ class TestGeminiProvider:
         mock_model = Mock()
         mock_model.generate_content.return_value = mock_response
         mock_genai.GenerativeModel.return_value = mock_model
+        mock_key_model.return_value = mock_model
 
         provider = GeminiProvider(self.config)
         messages = [Message(role="user", content="Hello")]
@@ -235,9 +272,10 @@ class TestGeminiProvider:
         assert response == "Hello! How can I help you?"
         mock_model.generate_content.assert_called_once()
 
+    @patch("src.ai.gemini_provider.KeyBoundModel")
     @patch("src.ai.gemini_provider.genai")
     @pytest.mark.asyncio
-    async def test_generate_response_blocked_content(self, mock_genai):
+    async def test_generate_response_blocked_content(self, mock_genai, mock_key_model):
         """Test response generation with blocked content."""
         mock_response = Mock()
         mock_response.text = None  # Content blocked
@@ -245,6 +283,7 @@ class TestGeminiProvider:
         mock_model = Mock()
         mock_model.generate_content.return_value = mock_response
         mock_genai.GenerativeModel.return_value = mock_model
+        mock_key_model.return_value = mock_model
 
         provider = GeminiProvider(self.config)
         messages = [Message(role="user", content="Inappropriate content")]
@@ -255,9 +294,10 @@ class TestGeminiProvider:
         rejection_keywords = ["baka", "embarrassing", "appropriate", "change", "mou"]
         assert any(keyword in response.lower() for keyword in rejection_keywords)
 
+    @patch("src.ai.gemini_provider.KeyBoundModel")
     @patch("src.ai.gemini_provider.genai")
     @pytest.mark.asyncio
-    async def test_generate_response_rate_limit_rotation(self, mock_genai):
+    async def test_generate_response_rate_limit_rotation(self, mock_genai, mock_key_model):
         """Test response generation with rate limit and key rotation."""
         mock_model = Mock()
 
@@ -270,6 +310,7 @@ class TestGeminiProvider:
             mock_response,
         ]
         mock_genai.GenerativeModel.return_value = mock_model
+        mock_key_model.return_value = mock_model
 
         provider = GeminiProvider(self.config)
         messages = [Message(role="user", content="Hello")]
@@ -680,9 +721,10 @@ class TestProviderWithPersonalityProcessor:
         assert hasattr(processed_response, "animation_trigger")
         assert hasattr(processed_response, "confidence")
 
+    @patch("src.ai.gemini_provider.KeyBoundModel")
     @patch("src.ai.gemini_provider.genai")
     @pytest.mark.asyncio
-    async def test_gemini_with_personality_processor(self, mock_genai):
+    async def test_gemini_with_personality_processor(self, mock_genai, mock_key_model):
         """Test Gemini provider with personality processor."""
         from src.ai.gemini_provider import GeminiProvider
         from src.ai.base_provider import Message
@@ -694,6 +736,7 @@ class TestProviderWithPersonalityProcessor:
         mock_model = Mock()
         mock_model.generate_content.return_value = mock_response
         mock_genai.GenerativeModel.return_value = mock_model
+        mock_key_model.return_value = mock_model
 
         config = {"api_keys": ["key1"], "model": "gemini-pro", "current_key_index": 0}
         provider = GeminiProvider(config)
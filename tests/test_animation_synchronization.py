@@ -134,6 +134,122 @@ class TestWebSocketAnimationManager:
         priorities = [event.priority for event in manager.animation_queue]
         assert max(priorities) == 4  # Highest priority should be kept
 
+    @pytest.mark.asyncio
+    async def test_queue_animations_batch(self):
+        """Test that a batch is queued whole, in play order, evicting older events."""
+        manager = WebSocketAnimationManager()
+        manager.max_queue_size = 4
+        now = time.time()
+        for i in range(3):
+            await manager.queue_animation(
+                AnimationEvent(
+                    event_type=AnimationEventType.EXPRESSION_CHANGE,
+                    timestamp=now,
+                    data={"expression": f"old{i}"},
+                    priority=i,
+                )
+            )
+
+        batch = [
+            AnimationEvent(
+                event_type=AnimationEventType.EXPRESSION_CHANGE,
+                timestamp=now + offset,
+                data={"expression": expression},
+                sequence_id="batch",
+                priority=5,
+            )
+            for offset, expression in ((1.0, "sad"), (0.0, "happy"), (2.0, "neutral"))
+        ]
+        await manager.queue_animations(batch)
+
+        assert [e.data["expression"] for e in manager.animation_queue] == [
+            "happy",
+            "sad",
+            "neutral",
+            "old2",
+        ]
+        with pytest.raises(ValueError):
+            await manager.queue_animations(batch * 2)
+
+    @pytest.mark.asyncio
+    async def test_future_events_wait_until_due(self):
+        """Test that the queue processor holds events until their timestamp."""
+        manager = WebSocketAnimationManager()
+        await manager.start_background_tasks()
+        event = AnimationEvent(
+            event_type=AnimationEventType.EXPRESSION_CHANGE,
+            timestamp=time.time() + 0.3,
+            data={"expression": "happy"},
+            duration=0.1,
+            priority=5,
+        )
+        await manager.queue_animation(event)
+
+        await asyncio.sleep(0.15)
+        assert manager.animation_queue == [event]
+        await asyncio.sleep(0.35)
+        assert manager.animation_queue == []
+        await manager.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_stale_completion_does_not_end_next_step(self):
+        """Test that a finished step's timer cannot cut off the step after it."""
+        manager = WebSocketAnimationManager()
+        await manager.start_background_tasks()
+        now = time.time()
+        steps = [
+            AnimationEvent(
+                event_type=AnimationEventType.EXPRESSION_CHANGE,
+                timestamp=now + offset,
+                data={"expression": expression},
+                sequence_id="sequence",
+                duration=duration,
+                priority=5,
+            )
+            for expression, offset, duration in [
+                ("happy", 0.0, 0.3),
+                ("surprised", 0.01, 0.6),
+                ("neutral", 0.02, 0.3),
+            ]
+        ]
+        await manager.queue_animations(steps)
+
+        await asyncio.sleep(0.15)
+        assert manager.current_animation is steps[0]
+        # The client reports the first step done before its timer fires
+        await manager._handle_animation_complete("sequence")
+
+        await asyncio.sleep(0.35)
+        assert manager.current_animation is steps[1]
+        assert manager.animation_queue == [steps[2]]
+        await manager.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_future_event_does_not_block_due_events(self):
+        """Test that a scheduled high-priority event lets due ones play first."""
+        manager = WebSocketAnimationManager()
+        now = time.time()
+        future = AnimationEvent(
+            event_type=AnimationEventType.MOUTH_SYNC_START,
+            timestamp=now + 3.0,
+            data={},
+            priority=AnimationPriority.CRITICAL.value,
+        )
+        due = AnimationEvent(
+            event_type=AnimationEventType.EXPRESSION_CHANGE,
+            timestamp=now,
+            data={"expression": "happy"},
+            priority=AnimationPriority.NORMAL.value,
+        )
+        await manager.queue_animations([future, due])
+        assert manager.animation_queue[0] is future
+
+        await manager.start_background_tasks()
+        await asyncio.sleep(0.25)
+        assert manager.current_animation is due
+        assert manager.animation_queue == [future]
+        await manager.stop_server()
+
     @pytest.mark.asyncio
     async def test_timing_sync_creation(self, manager):
         """Test timing synchronization data creation."""
@@ -197,6 +313,7 @@ class TestAnimationSynchronizer:
         """Create mock WebSocket manager."""
         manager = Mock()
         manager.queue_animation = AsyncMock()
+        manager.queue_animations = AsyncMock()
         manager.create_timing_sync = Mock()
         manager.get_average_latency = Mock(return_value=50.0)
         return manager
@@ -277,6 +394,35 @@ class TestAnimationSynchronizer:
         assert synchronizer.target_expression == expression
         assert synchronizer.is_transitioning
 
+    @pytest.mark.asyncio
+    async def test_expression_sequence(self, synchronizer, mock_websocket_manager):
+        """Test queueing a scripted expression sequence in one call."""
+        steps = [
+            {"expression": "sad", "intensity": 0.5, "duration": 1.0,
+             "priority": AnimationPriority.NORMAL, "offset": 1.5},
+            {"expression": "happy", "intensity": 0.8, "duration": 1.5,
+             "priority": AnimationPriority.HIGH, "offset": 0.0},
+        ]
+
+        sequence_id = await synchronizer.queue_expression_sequence(steps)
+
+        mock_websocket_manager.queue_animations.assert_called_once()
+        mock_websocket_manager.queue_animation.assert_not_called()
+        events = mock_websocket_manager.queue_animations.call_args[0][0]
+        assert [e.data["expression"] for e in events] == ["happy", "sad"]
+        # Steps keep their request index even when queued in offset order
+        assert [e.sequence_id for e in events] == [
+            f"{sequence_id}:1",
+            f"{sequence_id}:0",
+        ]
+        assert events[1].timestamp - events[0].timestamp == pytest.approx(1.5)
+        assert events[1].data["transition"]["from_expression"] == "happy"
+
+        sequence = synchronizer.active_sequences[sequence_id]
+        assert sequence.total_duration == 2.5
+        assert sequence.priority == AnimationPriority.HIGH
+        assert synchronizer.target_expression == "sad"
+
     @pytest.mark.asyncio
     async def test_mouth_sync_control(self, synchronizer, mock_websocket_manager):
         """Test mouth synchronization control."""
@@ -324,6 +470,98 @@ class TestAnimationSynchronizer:
         assert "mouth_form" in update_call.data
         assert update_call.data["audio_level"] == audio_level
 
+    @pytest.mark.asyncio
+    async def test_segment_synchronization_timeline(
+        self, synchronizer, mock_websocket_manager
+    ):
+        """Test that streamed segments get back-to-back mouth sync windows."""
+        first_id = await synchronizer.synchronize_segment_with_tts(
+            text="B-baka!",
+            expression="angry",
+            segment_index=0,
+            audio_duration=1.0,
+            tts_processing_delay=0.2,
+        )
+        second_id = await synchronizer.synchronize_segment_with_tts(
+            text="It's not like I missed you.",
+            expression="embarrassed",
+            segment_index=1,
+            is_final=True,
+            audio_duration=2.0,
+            tts_processing_delay=0.0,
+            sequence_id=first_id,
+        )
+
+        assert first_id == second_id
+        assert first_id in synchronizer.active_sequences
+
+        events = [c[0][0] for c in mock_websocket_manager.queue_animation.call_args_list]
+        starts = [e for e in events if e.event_type == AnimationEventType.MOUTH_SYNC_START]
+        stops = [e for e in events if e.event_type == AnimationEventType.MOUTH_SYNC_STOP]
+
+        assert [e.duration for e in starts] == [1.0, 2.0]
+        # Second segment starts when the first one stops speaking
+        assert starts[1].timestamp == pytest.approx(stops[0].timestamp)
+        assert stops[1].timestamp == pytest.approx(starts[1].timestamp + 2.0)
+        assert stops[1].data["is_final"] is True
+        assert stops[1].data["return_to_expression"] == "neutral"
+
+        expressions = [
+            e.data["expression"]
+            for e in events
+            if e.event_type == AnimationEventType.EXPRESSION_CHANGE
+        ]
+        assert expressions == ["angry", "embarrassed", "neutral"]
+        assert first_id not in synchronizer.segment_timelines
+
+    @pytest.mark.asyncio
+    async def test_concurrent_segment_timelines_are_independent(
+        self, synchronizer, mock_websocket_manager
+    ):
+        """Test that replies streaming in parallel keep their own timelines."""
+        first_id = await synchronizer.synchronize_segment_with_tts(
+            text="Ohayo!", segment_index=0, audio_duration=3.0, tts_processing_delay=0.0
+        )
+        other_id = await synchronizer.synchronize_segment_with_tts(
+            text="Hmph.", segment_index=0, audio_duration=1.0, tts_processing_delay=0.0
+        )
+        await synchronizer.synchronize_segment_with_tts(
+            text="Again?",
+            segment_index=1,
+            audio_duration=1.0,
+            tts_processing_delay=0.0,
+            sequence_id=other_id,
+        )
+
+        assert first_id != other_id
+        assert set(synchronizer.segment_timelines) == {first_id, other_id}
+
+        events = [c[0][0] for c in mock_websocket_manager.queue_animation.call_args_list]
+        starts = [e for e in events if e.event_type == AnimationEventType.MOUTH_SYNC_START]
+        # The other reply continues after its own first segment, not after
+        # the longer segment of the first reply
+        assert starts[2].sequence_id == other_id
+        assert starts[2].timestamp == pytest.approx(starts[1].timestamp + 1.0)
+
+        assert await synchronizer.finish_segment_sequence(other_id) == other_id
+        assert set(synchronizer.segment_timelines) == {first_id}
+
+    @pytest.mark.asyncio
+    async def test_finish_segment_sequence(self, synchronizer, mock_websocket_manager):
+        """Test closing a segmented reply after its last segment was sent."""
+        assert await synchronizer.finish_segment_sequence() is None
+
+        sequence_id = await synchronizer.synchronize_segment_with_tts(
+            text="Yay, you came back!", expression="happy", segment_index=0
+        )
+        assert await synchronizer.finish_segment_sequence("unknown") is None
+        assert await synchronizer.finish_segment_sequence(sequence_id) == sequence_id
+
+        last_event = mock_websocket_manager.queue_animation.call_args[0][0]
+        assert last_event.event_type == AnimationEventType.EXPRESSION_CHANGE
+        assert last_event.data["expression"] == "neutral"
+        assert synchronizer.segment_timelines == {}
+
     def test_audio_duration_estimation(self, synchronizer):
         """Test audio duration estimation from text."""
         # Test short text
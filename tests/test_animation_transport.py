@@ -0,0 +1,325 @@
+"""
+Unit tests for the animation command transports.
+"""
+
+import asyncio
+import gc
+import threading
+import warnings
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.error_handling.exceptions import Live2DError, NetworkError, ValidationError
+from src.web.animation_transport import (
+    AnimationCommand,
+    AnimationIPCServer,
+    AutoAnimationTransport,
+    DirectAnimationTransport,
+    HTTPAnimationTransport,
+    UnixSocketAnimationTransport,
+    register_local_animation_server,
+    unregister_local_animation_server,
+)
+
+
+class RecordingDispatcher:
+    """Dispatcher that records commands and the loop they ran on."""
+
+    def __init__(self):
+        self.commands = []
+        self.loops = []
+
+    async def __call__(self, command):
+        self.commands.append(command)
+        self.loops.append(asyncio.get_running_loop())
+        return {"success": True, "sequence_id": f"seq-{len(self.commands)}"}
+
+
+@pytest.fixture(autouse=True)
+def no_local_server():
+    """Make sure no in-process server leaks between tests."""
+    unregister_local_animation_server()
+    yield
+    unregister_local_animation_server()
+
+
+@pytest_asyncio.fixture
+async def animate_server():
+    """Start a fake /animate endpoint and yield (base_url, payloads, peers)."""
+    payloads, peers = [], set()
+
+    async def animate(request):
+        payload = await request.json()
+        payloads.append(payload)
+        peers.add(request.transport.get_extra_info("peername"))
+        if payload["expression"] == "bogus":
+            return web.json_response({"error": "bad expression"}, status=400)
+        return web.json_response({"success": True})
+
+    app = web.Application()
+    app.router.add_post("/animate", animate)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("")).rstrip("/"), payloads, peers
+    await server.close()
+
+
+@pytest.fixture
+def server_loop():
+    """Run an event loop on a background thread and yield it."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def run_on(loop, coro):
+    """Run a coroutine on another thread's loop and wait for the result."""
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout=5)
+
+
+def start_threaded_animate_server(loop):
+    """Start a bare /animate endpoint on ``loop`` and return its base URL."""
+
+    async def animate(request):
+        await request.json()
+        return web.json_response({"success": True})
+
+    async def start():
+        app = web.Application()
+        app.router.add_post("/animate", animate)
+        server = TestServer(app)
+        await server.start_server()
+        return server
+
+    server = run_on(loop, start())
+    return server, str(server.make_url("")).rstrip("/")
+
+
+def resource_warnings(caught):
+    """ResourceWarnings among recorded warnings."""
+    return [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+
+class TestHTTPAnimationTransport:
+    """Test the pooled HTTP transport."""
+
+    @pytest.mark.asyncio
+    async def test_commands_share_one_connection(self, animate_server):
+        """Test that consecutive commands reuse the pooled connection."""
+        url, payloads, peers = animate_server
+        transport = HTTPAnimationTransport(url)
+
+        for expression in ("happy", "sad", "neutral"):
+            assert await transport.send(AnimationCommand(expression, 0.5, 1.0))
+
+        assert [p["expression"] for p in payloads] == ["happy", "sad", "neutral"]
+        assert payloads[0]["priority"] == "normal"
+        assert len(peers) == 1
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_bad_request_is_not_retried(self, animate_server):
+        """Test that a 400 response raises ValidationError immediately."""
+        url, payloads, _ = animate_server
+        transport = HTTPAnimationTransport(url)
+
+        with pytest.raises(ValidationError):
+            await transport.send(AnimationCommand("bogus"))
+
+        assert len(payloads) == 1
+        await transport.close()
+
+    def test_loop_switch_closes_session_of_closed_loop(self, server_loop):
+        """Test that a session left on a finished loop is closed, not leaked."""
+        server, url = start_threaded_animate_server(server_loop)
+        transport = HTTPAnimationTransport(url)
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                assert asyncio.run(transport.send(AnimationCommand("happy")))
+                old_session = transport._session
+
+                assert asyncio.run(transport.send(AnimationCommand("sad")))
+                assert transport._session is not old_session
+                assert old_session.closed
+
+                del old_session
+                asyncio.run(transport.close())
+                gc.collect()
+
+            assert resource_warnings(caught) == []
+        finally:
+            run_on(server_loop, server.close())
+
+    @pytest.mark.asyncio
+    async def test_loop_switch_closes_session_on_its_loop(self, animate_server):
+        """Test that a session on another running loop is closed on that loop."""
+        url, payloads, _ = animate_server
+        client_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=client_loop.run_forever, daemon=True)
+        thread.start()
+        transport = HTTPAnimationTransport(url)
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                transport.send(AnimationCommand("happy")), client_loop
+            )
+            assert await asyncio.wrap_future(future)
+            old_session = transport._session
+
+            assert await transport.send(AnimationCommand("sad"))
+            # Let the client loop run the scheduled close
+            for _ in range(50):
+                if old_session.closed:
+                    break
+                await asyncio.sleep(0.01)
+            assert old_session.closed
+            assert len(payloads) == 2
+        finally:
+            await transport.close()
+            client_loop.call_soon_threadsafe(client_loop.stop)
+            thread.join(timeout=5)
+            client_loop.close()
+
+
+class TestDirectAnimationTransport:
+    """Test in-process dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_same_loop_dispatch(self):
+        """Test that commands are handed straight to the registered server."""
+        dispatch = RecordingDispatcher()
+        register_local_animation_server(dispatch, asyncio.get_running_loop())
+
+        assert await DirectAnimationTransport().send(AnimationCommand("happy", 0.8))
+        assert dispatch.commands[0].intensity == 0.8
+
+    @pytest.mark.asyncio
+    async def test_dispatch_runs_on_server_loop(self):
+        """Test that a server on another thread's loop handles the command there."""
+        server_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=server_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            dispatch = RecordingDispatcher()
+            register_local_animation_server(dispatch, server_loop)
+
+            assert await DirectAnimationTransport().send(AnimationCommand("surprised"))
+            assert dispatch.loops == [server_loop]
+        finally:
+            server_loop.call_soon_threadsafe(server_loop.stop)
+            thread.join(timeout=5)
+            server_loop.close()
+
+    @pytest.mark.asyncio
+    async def test_no_local_server(self):
+        """Test that the direct transport fails when nothing is registered."""
+        with pytest.raises(Live2DError):
+            await DirectAnimationTransport().send(AnimationCommand("happy"))
+
+
+class TestUnixSocketAnimationTransport:
+    """Test the Unix socket transport against the IPC server."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path):
+        """Test that commands reach the dispatcher over one connection."""
+        path = str(tmp_path / "animate.sock")
+        dispatch = RecordingDispatcher()
+        server = AnimationIPCServer(path, dispatch)
+        await server.start()
+        transport = UnixSocketAnimationTransport(path)
+        try:
+            results = await asyncio.gather(
+                *(transport.send(AnimationCommand(e)) for e in ("happy", "sad"))
+            )
+            assert results == [True, True]
+            assert sorted(c.expression for c in dispatch.commands) == ["happy", "sad"]
+
+            with pytest.raises(ValidationError):
+                await transport.send(AnimationCommand(""))
+        finally:
+            await transport.close()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_reopens_closed_connection(self, tmp_path):
+        """Test that a closed connection is reopened."""
+        path = str(tmp_path / "animate.sock")
+        dispatch = RecordingDispatcher()
+        server = AnimationIPCServer(path, dispatch)
+        await server.start()
+        transport = UnixSocketAnimationTransport(path)
+        try:
+            assert await transport.send(AnimationCommand("happy"))
+            # Close the connection as a server shutdown would
+            transport._writer.close()
+
+            assert await transport.send(AnimationCommand("sad"))
+            assert len(dispatch.commands) == 2
+        finally:
+            await transport.close()
+            await server.stop()
+
+    def test_loop_switch_releases_old_connection(self, tmp_path, server_loop):
+        """Test that a connection left on a finished loop is closed, not leaked."""
+        path = str(tmp_path / "animate.sock")
+        dispatch = RecordingDispatcher()
+        server = AnimationIPCServer(path, dispatch)
+        run_on(server_loop, server.start())
+        transport = UnixSocketAnimationTransport(path)
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                assert asyncio.run(transport.send(AnimationCommand("happy")))
+                old_writer = transport._writer
+                old_socket = old_writer.get_extra_info("socket")
+
+                assert asyncio.run(transport.send(AnimationCommand("sad")))
+                assert transport._writer is not old_writer
+                assert old_socket.fileno() == -1
+
+                del old_writer, old_socket
+                asyncio.run(transport.close())
+                gc.collect()
+
+            assert resource_warnings(caught) == []
+            assert len(dispatch.commands) == 2
+        finally:
+            run_on(server_loop, server.stop())
+
+    @pytest.mark.asyncio
+    async def test_no_server(self, tmp_path):
+        """Test that a missing socket raises NetworkError."""
+        transport = UnixSocketAnimationTransport(str(tmp_path / "missing.sock"))
+
+        with pytest.raises(NetworkError):
+            await transport.send(AnimationCommand("happy"))
+
+
+class TestAutoAnimationTransport:
+    """Test transport selection."""
+
+    @pytest.mark.asyncio
+    async def test_prefers_in_process_server(self, animate_server):
+        """Test that HTTP is only used while no in-process server is registered."""
+        url, payloads, _ = animate_server
+        remote = HTTPAnimationTransport(url)
+        transport = AutoAnimationTransport(DirectAnimationTransport(), remote)
+
+        assert await transport.send(AnimationCommand("happy"))
+        assert len(payloads) == 1
+
+        dispatch = RecordingDispatcher()
+        register_local_animation_server(dispatch, asyncio.get_running_loop())
+        assert await transport.send(AnimationCommand("sad"))
+
+        assert len(payloads) == 1
+        assert [c.expression for c in dispatch.commands] == ["sad"]
+        await transport.close()
@@ -0,0 +1,458 @@
+"""
+Tests for the aiohttp web server.
+
+This module tests:
+- The Flask-compatible HTTP routes
+- Animation requests handled on the server's own event loop
+- Batched animation commands
+- Cached, precompressed static assets
+- Live2D model bundles
+- The animation WebSocket served on the HTTP port
+"""
+
+import asyncio
+import json
+import re
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.config.settings import AppConfig, FlaskConfig, Live2DConfig, LiveKitConfig
+from src.web.animation_sync import AnimationSynchronizer
+from src.web.animation_transport import has_local_animation_server
+from src.web.async_app import WEBSOCKET_PATH, Live2DWebApp
+from src.web.model_bundle import unpack_bundle
+from src.web.websocket_manager import WebSocketAnimationManager
+
+
+@pytest.fixture
+def mock_settings():
+    """Create settings for testing."""
+    return AppConfig(
+        livekit=LiveKitConfig(
+            url="wss://test.livekit.cloud",
+            api_key="test_api_key",
+            api_secret="test_api_secret",
+            room_name="test_room",
+        ),
+        ai=MagicMock(),
+        content_filter=MagicMock(),
+        personality=MagicMock(),
+        memory=MagicMock(),
+        live2d=Live2DConfig(model_url="/static/models/test.moc3"),
+        agents=MagicMock(),
+        flask=FlaskConfig(host="127.0.0.1", port=5001),
+    )
+
+
+@pytest_asyncio.fixture
+async def web_app(mock_settings):
+    """Create the aiohttp app and yield (Live2DWebApp, client)."""
+    # Fresh animation state so queued events don't leak between tests
+    manager = WebSocketAnimationManager()
+    with patch("src.web.app.get_settings", return_value=mock_settings), patch(
+        "src.web.app.get_websocket_manager", return_value=manager
+    ), patch(
+        "src.web.app.get_animation_synchronizer",
+        return_value=AnimationSynchronizer(manager),
+    ):
+        live2d_app = Live2DWebApp()
+    client = TestClient(TestServer(live2d_app.get_app()))
+    await client.start_server()
+    yield live2d_app, client
+    await client.close()
+
+
+class TestLive2DWebApp:
+    """Test the HTTP routes."""
+
+    @pytest.mark.asyncio
+    async def test_index_route(self, web_app):
+        """Test that the page points the client at the shared WebSocket path."""
+        _, client = web_app
+
+        response = await client.get("/")
+        html = await response.text()
+
+        assert response.status == 200
+        assert "wss://test.livekit.cloud" in html
+        assert f'window.ANIMATION_WS_PATH = "{WEBSOCKET_PATH}"' in html
+
+    @pytest.mark.asyncio
+    async def test_animate_runs_on_server_loop(self, web_app):
+        """Test that /animate is handled on the loop running the WebSocket manager."""
+        live2d_app, client = web_app
+        assert live2d_app.websocket_loop is asyncio.get_running_loop()
+        assert has_local_animation_server()
+        threads_before = threading.active_count()
+
+        response = await client.post(
+            "/animate",
+            json={"expression": "happy", "intensity": 0.8, "duration": 0.1},
+        )
+        data = await response.json()
+
+        assert response.status == 200
+        assert data["success"] is True
+        assert data["sequence_id"]
+        assert data["animation"]["expression"] == "happy"
+        assert threading.active_count() == threads_before
+
+    @pytest.mark.asyncio
+    async def test_animate_validation(self, web_app):
+        """Test that invalid animation requests return 400."""
+        _, client = web_app
+
+        missing = await client.post("/animate", json={"expression": "happy"})
+        no_json = await client.post("/animate", data=b"not json")
+
+        assert missing.status == 400
+        assert (await missing.json())["error_type"] == "validation"
+        assert no_json.status == 400
+
+    @pytest.mark.asyncio
+    async def test_concurrent_animate_requests(self, web_app):
+        """Test a burst of concurrent /animate requests."""
+        _, client = web_app
+
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/animate",
+                    json={"expression": "neutral", "intensity": 0.5, "duration": 0.1},
+                )
+                for _ in range(50)
+            )
+        )
+
+        assert [r.status for r in responses] == [200] * 50
+
+    @pytest.mark.asyncio
+    async def test_animation_status(self, web_app):
+        """Test the animation status endpoint."""
+        _, client = web_app
+
+        response = await client.get("/animate/status")
+        data = await response.json()
+
+        assert response.status == 200
+        assert data["websocket_active"] is True
+        assert data["current_animation"]["expression"] == "neutral"
+
+    @pytest.mark.asyncio
+    async def test_mouth_sync(self, web_app):
+        """Test mouth sync control."""
+        _, client = web_app
+
+        start = await client.post("/animate/sync/mouth", json={"action": "start"})
+        unknown = await client.post("/animate/sync/mouth", json={"action": "jump"})
+
+        assert start.status == 200
+        assert (await start.json())["is_speaking"] is True
+        assert unknown.status == 400
+
+    @pytest.mark.asyncio
+    async def test_token_generation(self, web_app):
+        """Test LiveKit token generation."""
+        _, client = web_app
+
+        with patch("src.web.app.api") as mock_api:
+            mock_api.AccessToken.return_value.to_jwt.return_value = "jwt"
+            response = await client.post(
+                "/token", json={"room": "room1", "participant": "alice"}
+            )
+        data = await response.json()
+
+        assert response.status == 200
+        assert data == {
+            "token": "jwt",
+            "room": "room1",
+            "participant": "alice",
+            "url": "wss://test.livekit.cloud",
+            "expires_in": 300,
+        }
+        assert (await client.post("/token")).status == 400
+
+    @pytest.mark.asyncio
+    async def test_static_files(self, web_app):
+        """Test static file serving and path containment."""
+        _, client = web_app
+
+        found = await client.get("/static/js/websocket-animation-client.js")
+        missing = await client.get("/static/nonexistent.txt")
+        escaped = await client.get("/static/js/..%2F..%2Fapp.py")
+
+        assert found.status == 200
+        assert "ANIMATION_WS_PATH" in await found.text()
+        assert missing.status == 404
+        assert (await missing.json())["error"] == "File not found"
+        assert escaped.status == 404
+
+    @pytest.mark.asyncio
+    async def test_not_found(self, web_app):
+        """Test that unknown routes return a JSON 404."""
+        _, client = web_app
+
+        response = await client.get("/nonexistent-route")
+
+        assert response.status == 404
+        assert (await response.json())["error"] == "Not found"
+
+    @pytest.mark.asyncio
+    async def test_health_check(self, web_app):
+        """Test the health check endpoint."""
+        _, client = web_app
+
+        response = await client.get("/health")
+        data = await response.json()
+
+        assert response.status in (200, 503)
+        assert data["components"]["websocket"]["active"] is True
+
+
+class TestAnimationBatch:
+    """Test the /animate/batch endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_json_array_batch(self, web_app):
+        """Test that a JSON array is queued as one sequence."""
+        live2d_app, client = web_app
+        commands = [
+            {"expression": f"expr{i}", "intensity": 0.5, "duration": 0.5}
+            for i in range(30)
+        ]
+        commands[5]["offset"] = 10.0
+
+        response = await client.post("/animate/batch", json=commands)
+        data = await response.json()
+
+        assert response.status == 200
+        assert data["success"] is True
+        assert data["count"] == 30
+        assert data["total_duration"] == pytest.approx(22.5)
+        assert [r["offset"] for r in data["results"][4:7]] == [2.0, 10.0, 10.5]
+
+        queue = live2d_app.websocket_manager.animation_queue
+        # Each step carries its own "<sequence>:<index>" id
+        prefix = f"{data['sequence_id']}:"
+        batch_events = [e for e in queue if e.sequence_id.startswith(prefix)]
+        assert len(batch_events) >= 29  # the first one may already be playing
+        assert batch_events[-1].data["expression"] == "expr29"
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_batch_ids_follow_results(self, web_app):
+        """Test that step ids match result indexes when offsets are unsorted."""
+        live2d_app, client = web_app
+        commands = [
+            {"expression": "sad", "intensity": 0.5, "duration": 0.5, "offset": 8.0},
+            {"expression": "happy", "intensity": 0.5, "duration": 0.5, "offset": 4.0},
+            {"expression": "angry", "intensity": 0.5, "duration": 0.5, "offset": 6.0},
+        ]
+
+        response = await client.post("/animate/batch", json=commands)
+        data = await response.json()
+        assert response.status == 200
+
+        queue = live2d_app.websocket_manager.animation_queue
+        by_id = {e.sequence_id: e for e in queue}
+        for result in data["results"]:
+            event = by_id[f"{data['sequence_id']}:{result['index']}"]
+            assert event.data["expression"] == result["expression"]
+        # Still played in offset order
+        assert [e.data["expression"] for e in queue] == ["happy", "angry", "sad"]
+
+    @pytest.mark.asyncio
+    async def test_ndjson_batch(self, web_app):
+        """Test that an NDJSON stream is accepted."""
+        _, client = web_app
+        body = "\n".join(
+            json.dumps({"expression": e, "intensity": 0.7, "duration": 1.0})
+            for e in ("happy", "sad", "neutral")
+        )
+
+        response = await client.post(
+            "/animate/batch",
+            data=body.encode() + b"\n\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        data = await response.json()
+
+        assert response.status == 200
+        assert [r["expression"] for r in data["results"]] == ["happy", "sad", "neutral"]
+
+        bad = await client.post(
+            "/animate/batch",
+            data=b'{"expression": "happy"\n',
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert bad.status == 400
+        assert "line 1" in (await bad.json())["error"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_item_rejects_whole_batch(self, web_app):
+        """Test that one invalid command queues nothing and is reported per item."""
+        live2d_app, client = web_app
+        queued_before = len(live2d_app.websocket_manager.animation_queue)
+        commands = [
+            {"expression": "happy", "intensity": 0.5, "duration": 1.0},
+            {"expression": "sad", "intensity": 0.5},
+            {"expression": "neutral", "intensity": 0.5, "duration": 1.0, "offset": -1},
+        ]
+
+        response = await client.post("/animate/batch", json=commands)
+        data = await response.json()
+
+        assert response.status == 400
+        assert data["error_type"] == "validation"
+        assert [r["success"] for r in data["results"]] == [True, False, False]
+        assert len(live2d_app.websocket_manager.animation_queue) == queued_before
+
+    @pytest.mark.asyncio
+    async def test_batch_limits(self, web_app):
+        """Test empty, non-array and oversized batches."""
+        live2d_app, client = web_app
+        too_many = live2d_app.websocket_manager.max_queue_size + 1
+        command = {"expression": "happy", "intensity": 0.5, "duration": 1.0}
+
+        empty = await client.post("/animate/batch", json=[])
+        not_array = await client.post("/animate/batch", json=command)
+        oversized = await client.post("/animate/batch", json=[command] * too_many)
+
+        assert [empty.status, not_array.status, oversized.status] == [400, 400, 400]
+
+
+class TestStaticAssets:
+    """Test static asset caching headers, compression and ranges."""
+
+    MOC_PATH = "models/miara_pro_en/runtime/miara_pro_t03.moc3"
+
+    @pytest.mark.asyncio
+    async def test_versioned_script_urls_are_immutable(self, web_app):
+        """Test that the page links versioned scripts served as immutable."""
+        _, client = web_app
+
+        html = await (await client.get("/")).text()
+        url = re.search(r'src="(/static/_v/[^"]+/websocket-animation-client\.js)"', html)
+        assert url
+
+        response = await client.get(url.group(1), headers={"Accept-Encoding": "gzip"})
+        plain = await client.get(
+            "/static/js/websocket-animation-client.js",
+            headers={"Accept-Encoding": "identity"},
+        )
+
+        assert response.status == 200
+        assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "ANIMATION_WS_PATH" in await response.text()
+        assert plain.headers["Cache-Control"] == "no-cache"
+        assert "Content-Encoding" not in plain.headers
+        assert plain.headers["ETag"] != response.headers["ETag"]
+
+    @pytest.mark.asyncio
+    async def test_conditional_request(self, web_app):
+        """Test that a matching If-None-Match gets 304."""
+        _, client = web_app
+        path = "/static/js/live2d-integration.js"
+
+        first = await client.get(path)
+        second = await client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+
+        assert first.status == 200
+        assert second.status == 304
+
+    @pytest.mark.asyncio
+    async def test_range_request_on_large_file(self, web_app):
+        """Test that large files support Range with the content-hash ETag."""
+        live2d_app, client = web_app
+        asset, _ = live2d_app.static_assets.resolve(self.MOC_PATH)
+
+        response = await client.get(
+            f"/static/{self.MOC_PATH}", headers={"Range": "bytes=0-99"}
+        )
+        stale = await client.get(
+            f"/static/{self.MOC_PATH}",
+            headers={"Range": "bytes=0-99", "If-Range": '"stale"'},
+        )
+
+        assert response.status == 206
+        assert len(await response.read()) == 100
+        assert response.headers["ETag"] == asset.etag
+        assert stale.status == 200
+        assert len(await stale.read()) == asset.size
+
+
+class TestWebSocketEndpoint:
+    """Test the animation WebSocket on the HTTP port."""
+
+    @pytest.mark.asyncio
+    async def test_client_receives_animation_events(self, web_app):
+        """Test that WebSocket clients get the welcome message and animations."""
+        live2d_app, client = web_app
+
+        ws = await client.ws_connect(WEBSOCKET_PATH)
+        welcome = await ws.receive_json(timeout=2)
+        assert welcome["type"] == "connection_established"
+        assert live2d_app.websocket_manager.get_connection_count() == 1
+
+        await ws.send_json({"type": "ping", "timestamp": 1})
+        pong = await ws.receive_json(timeout=2)
+        assert pong["type"] == "pong"
+
+        await client.post(
+            "/animate", json={"expression": "happy", "intensity": 0.7, "duration": 0.1}
+        )
+        while True:
+            message = await ws.receive_json(timeout=2)
+            if message["type"] == "animation_event":
+                break
+        assert message["event"]["data"]["expression"] == "happy"
+
+        await ws.close()
+
+class TestModelBundle:
+    """Test the single-request Live2D model bundle endpoint."""
+
+    MODEL_PATH = "models/miara_pro_en/runtime/miara_pro_t03.model3.json"
+
+    @pytest.mark.asyncio
+    async def test_bundle_contains_model_files(self, web_app):
+        """Test that a versioned bundle is immutable and holds the model files."""
+        live2d_app, client = web_app
+        url = live2d_app.model_bundler.bundle_url(self.MODEL_PATH)
+
+        response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+        index, files = unpack_bundle(await response.read())
+        cached = await client.get(
+            url,
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": response.headers["ETag"],
+            },
+        )
+
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "application/vnd.live2d-bundle"
+        assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert "miara_pro_t03.moc3" in files
+        assert index["model"] == "miara_pro_t03.model3.json"
+        assert cached.status == 304
+
+    @pytest.mark.asyncio
+    async def test_bundle_errors(self, web_app):
+        """Test unknown models and bad options."""
+        _, client = web_app
+
+        missing = await client.get("/live2d/bundle/models/none/none.model3.json")
+        bad_quantize = await client.get(
+            f"/live2d/bundle/{self.MODEL_PATH}", params={"quantize": "many"}
+        )
+        unversioned = await client.get(f"/live2d/bundle/{self.MODEL_PATH}")
+
+        assert missing.status == 404
+        assert bad_quantize.status == 400
+        assert unversioned.status == 200
+        assert unversioned.headers["Cache-Control"] == "no-cache"
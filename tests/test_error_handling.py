@@ -512,11 +512,14 @@ class TestIntegratedErrorHandling:
         # Mock configuration
         config = {"api_keys": ["key1", "key2"], "model": "gemini-pro"}
 
-        with patch("src.ai.gemini_provider.genai") as mock_genai:
+        with patch("src.ai.gemini_provider.genai") as mock_genai, patch(
+            "src.ai.gemini_provider.KeyBoundModel"
+        ) as mock_key_model:
             # Mock rate limit error
             mock_model = Mock()
             mock_model.generate_content.side_effect = Exception("Rate limit exceeded")
             mock_genai.GenerativeModel.return_value = mock_model
+            mock_key_model.return_value = mock_model
 
             provider = GeminiProvider(config)
 
@@ -569,7 +572,10 @@ class TestIntegratedErrorHandling:
         from src.web.app import _trigger_animation_internal
 
         # Mock settings
-        with patch("src.web.app.get_settings") as mock_settings:
+        with patch("src.web.animation_transport.get_settings") as mock_settings, patch(
+            "src.web.animation_transport._animation_transport", None
+        ):
+            mock_settings.return_value.flask.animation_transport = "http"
             mock_settings.return_value.flask.host = "localhost"
             mock_settings.return_value.flask.port = 5000
 
@@ -577,7 +583,7 @@ class TestIntegratedErrorHandling:
             with patch("aiohttp.ClientSession") as mock_session:
                 mock_response = Mock()
                 mock_response.status = 500
-                mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__.return_value = (
+                mock_session.return_value.post.return_value.__aenter__.return_value = (
                     mock_response
                 )
 
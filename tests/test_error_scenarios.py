@@ -280,12 +280,8 @@ class TestMemoryManagerErrorScenarios:
             memory_manager._mem0_client = Mock()
 
             # Add some session data
-            memory_manager._session_memory["user1"] = [
-                {"content": "test", "timestamp": datetime.now()}
-            ]
-            memory_manager._session_memory["user2"] = [
-                {"content": "test2", "timestamp": datetime.now()}
-            ]
+            memory_manager._store_in_session_memory("user1", "test")
+            memory_manager._store_in_session_memory("user2", "test2")
 
             # Mock successful connection test
             with patch.object(memory_manager, "_test_connection", return_value=True):
@@ -457,7 +453,10 @@ class TestWebServerErrorScenarios:
         """Test animation trigger retry on network errors."""
         from src.web.app import _trigger_animation_internal
 
-        with patch("src.web.app.get_settings") as mock_settings:
+        with patch("src.web.animation_transport.get_settings") as mock_settings, patch(
+            "src.web.animation_transport._animation_transport", None
+        ):
+            mock_settings.return_value.flask.animation_transport = "http"
             mock_settings.return_value.flask.host = "localhost"
             mock_settings.return_value.flask.port = 5000
 
@@ -476,7 +475,7 @@ class TestWebServerErrorScenarios:
                 return mock_response
 
             with patch("aiohttp.ClientSession") as mock_session:
-                mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__ = (
+                mock_session.return_value.post.return_value.__aenter__ = (
                     mock_post
                 )
 
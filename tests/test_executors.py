@@ -0,0 +1,112 @@
+"""
+Unit tests for the named executor pools.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.config import executors
+from src.config.executors import (
+    InstrumentedExecutor,
+    configure_executors,
+    get_executor,
+    get_executor_stats,
+    run_blocking,
+    shutdown_executors,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """Give every test fresh pools with default sizes."""
+    shutdown_executors()
+    executors._pool_sizes.clear()
+    executors._pool_sizes.update(executors.DEFAULT_POOL_SIZES)
+    yield
+    shutdown_executors()
+
+
+class TestInstrumentedExecutor:
+    """Test a single instrumented pool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_on_named_threads(self):
+        """Test that calls run on the pool's own threads."""
+        pool = InstrumentedExecutor("memory", 2)
+
+        name = await pool.run(lambda: threading.current_thread().name)
+
+        assert name.startswith("miko-memory")
+        stats = pool.get_stats()
+        assert stats["submitted"] == stats["completed"] == 1
+        assert stats["queue_depth"] == 0
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_and_wait_time(self):
+        """Test that calls beyond max_workers queue and record their wait."""
+        pool = InstrumentedExecutor("llm", 1)
+        release = threading.Event()
+
+        blocker = pool.submit(release.wait)
+        queued = pool.submit(lambda: "done")
+        await asyncio.sleep(0.05)
+
+        assert pool.get_stats()["queue_depth"] == 1
+        assert pool.get_stats()["active"] == 1
+
+        release.set()
+        assert await queued == "done"
+        await blocker
+
+        stats = pool.get_stats()
+        assert stats["peak_queue_depth"] >= 1
+        assert stats["max_wait_ms"] >= 40
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_and_raised(self):
+        """Test that exceptions propagate and count as failures."""
+        pool = InstrumentedExecutor("health", 1)
+
+        def boom():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await pool.run(boom)
+
+        assert pool.get_stats()["failed"] == 1
+        pool.shutdown()
+
+
+class TestPoolRegistry:
+    """Test the global pool registry."""
+
+    @pytest.mark.asyncio
+    async def test_pools_are_isolated(self):
+        """Test that a saturated memory pool does not block the LLM pool."""
+        configure_executors(memory=1, llm=1)
+        release = threading.Event()
+
+        memory_call = asyncio.ensure_future(run_blocking("memory", release.wait))
+        await asyncio.sleep(0.01)
+        result = await asyncio.wait_for(run_blocking("llm", lambda: 42), timeout=1.0)
+
+        assert result == 42
+        release.set()
+        await memory_call
+
+    def test_configure_from_app_config(self):
+        """Test that ExecutorConfig sizes are applied and stale pools replaced."""
+        old = get_executor("memory")
+        configure_executors(
+            SimpleNamespace(memory_workers=3, llm_workers=5, health_workers=1)
+        )
+
+        assert get_executor("memory") is not old
+        assert get_executor("memory").max_workers == 3
+        assert get_executor("llm").max_workers == 5
+        assert set(get_executor_stats()) == {"memory", "llm"}
@@ -0,0 +1,154 @@
+"""
+Unit tests for hedged requests and the Gemini generate_response flow.
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.ai.base_provider import Message
+from src.ai.hedging import LatencyTracker, hedged
+
+
+async def reply(value, delay=0.0, error=None):
+    """Return ``value`` (or raise ``error``) after ``delay`` seconds."""
+    await asyncio.sleep(delay)
+    if error is not None:
+        raise error
+    return value
+
+
+class TestLatencyTracker:
+    """Test hedge delay selection."""
+
+    def test_initial_delay_until_enough_samples(self):
+        """Test that the p95 is only used once there are enough samples."""
+        tracker = LatencyTracker(min_samples=5, initial_delay=2.0)
+        for _ in range(4):
+            tracker.record(0.1)
+        assert tracker.hedge_delay() == 2.0
+
+        tracker.record(0.1)
+        assert tracker.hedge_delay() == pytest.approx(0.2)  # min_delay floor
+
+    def test_p95(self):
+        """Test nearest-rank percentiles."""
+        tracker = LatencyTracker(min_samples=1, min_delay=0.0)
+        for ms in range(1, 101):
+            tracker.record(ms / 1000)
+
+        assert tracker.quantile(0.5) == pytest.approx(0.050)
+        assert tracker.hedge_delay() == pytest.approx(0.095)
+        assert tracker.get_stats()["samples"] == 100
+
+
+class TestHedged:
+    """Test racing a request against its hedge."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """Test that no hedge starts when the primary answers in time."""
+        start_hedge = Mock()
+
+        result, hedge_won = await hedged(reply("primary"), start_hedge, delay=0.5)
+
+        assert (result, hedge_won) == ("primary", False)
+        start_hedge.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_hedge(self):
+        """Test that the faster hedge wins and the primary is cancelled."""
+        primary = asyncio.ensure_future(reply("primary", delay=1.0))
+
+        started = time.monotonic()
+        result, hedge_won = await hedged(
+            primary, lambda: reply("hedge", delay=0.01), delay=0.05
+        )
+
+        assert (result, hedge_won) == ("hedge", True)
+        assert time.monotonic() - started < 0.5
+        await asyncio.sleep(0)
+        assert primary.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_waits_for_primary(self):
+        """Test that a failing hedge does not fail the request."""
+        result, hedge_won = await hedged(
+            reply("primary", delay=0.1),
+            lambda: reply(None, error=RuntimeError("no key")),
+            delay=0.01,
+        )
+
+        assert (result, hedge_won) == ("primary", False)
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises_primary_error(self):
+        """Test that the primary's error surfaces when both fail."""
+        with pytest.raises(ValueError):
+            await hedged(
+                reply(None, delay=0.05, error=ValueError("primary")),
+                lambda: reply(None, error=RuntimeError("hedge")),
+                delay=0.01,
+            )
+
+
+class TestGeminiGenerateResponse:
+    """Test the Gemini generate_response flow."""
+
+    @pytest.mark.asyncio
+    @patch("src.ai.gemini_provider.KeyBoundModel")
+    @patch("src.ai.gemini_provider.genai")
+    async def test_generate_response_returns_text(
+        self, mock_genai, mock_key_model, gemini_config
+    ):
+        """Test that a successful request returns its text, not a fallback."""
+        from src.ai.gemini_provider import GeminiProvider
+
+        model = Mock()
+        model.generate_content.return_value = Mock(text="Konnichiwa!")
+        mock_key_model.return_value = model
+        provider = GeminiProvider(gemini_config)
+
+        response = await provider.generate_response([Message(role="user", content="Hi")])
+
+        assert response == "Konnichiwa!"
+        model.generate_content.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("src.ai.gemini_provider.KeyBoundModel")
+    @patch("src.ai.gemini_provider.genai")
+    async def test_slow_key_is_hedged_on_another_key(
+        self, mock_genai, mock_key_model, gemini_config
+    ):
+        """Test that a request stuck on one key is answered by another."""
+        from src.ai.gemini_provider import GeminiProvider
+
+        # Models are created for key1, then key2
+        delays = [0.5, 0.01]
+
+        def make_model(name, api_key):
+            model = Mock()
+            delay = delays.pop(0)
+
+            def generate(*args, **kwargs):
+                time.sleep(delay)
+                return Mock(text=f"reply after {delay}s")
+
+            model.generate_content.side_effect = generate
+            return model
+
+        mock_key_model.side_effect = make_model
+
+        provider = GeminiProvider({**gemini_config, "hedge_requests": True})
+        provider.latency.initial_delay = 0.05
+
+        started = time.monotonic()
+        response = await provider._make_api_request("Hello")
+
+        assert response.text == "reply after 0.01s"
+        assert time.monotonic() - started < 0.4
+        stats = provider.get_latency_stats()
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
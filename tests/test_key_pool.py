@@ -0,0 +1,210 @@
+"""
+Unit tests for the API key pool and Gemini multi-key dispatch.
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.ai.base_provider import Message
+from src.ai.key_pool import KeyPool, TokenBucket
+from src.error_handling.exceptions import AIProviderError
+
+
+class TestTokenBucket:
+    """Test token bucket refill."""
+
+    def test_acquire_and_refill(self, fake_clock):
+        """Test that tokens are spent and refilled over time."""
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=fake_clock)
+
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        assert bucket.time_until() == pytest.approx(1.0)
+
+        fake_clock.now += 1.5
+        assert bucket.try_acquire()
+        assert bucket.tokens == pytest.approx(0.5)
+
+        fake_clock.now += 100
+        assert bucket.tokens == 2
+
+
+class TestKeyPool:
+    """Test key selection."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_leases_spread_across_keys(self):
+        """Test that requests in flight land on different keys."""
+        pool = KeyPool(["a", "b", "c"], client_factory=lambda key: key)
+
+        async with pool.lease() as first, pool.lease() as second, pool.lease() as third:
+            assert {first.index, second.index, third.index} == {0, 1, 2}
+            assert pool.client_for(second) == second.api_key
+
+        assert pool.get_stats()["leases"] == 3
+
+    @pytest.mark.asyncio
+    async def test_prefers_key_with_most_capacity(self):
+        """Test that a key with spent quota is used last."""
+        pool = KeyPool(["a", "b"], client_factory=lambda key: key, requests_per_minute=10)
+        for _ in range(5):
+            pool.slots[0].bucket.try_acquire()
+
+        async with pool.lease() as slot:
+            assert slot.index == 1
+
+    @pytest.mark.asyncio
+    async def test_cooling_down_key_is_skipped(self, fake_clock):
+        """Test that rate-limited keys are not leased until the cooldown ends."""
+        pool = KeyPool(
+            ["a", "b"], client_factory=lambda key: key, wall_clock=fake_clock
+        )
+        pool.cool_down(0, 60)
+
+        for _ in range(3):
+            async with pool.lease() as slot:
+                assert slot.index == 1
+
+        pool.cool_down(1, 60)
+        with pytest.raises(AIProviderError) as exc_info:
+            async with pool.lease():
+                pass
+        assert exc_info.value.is_rate_limit
+
+        fake_clock.now += 61
+        assert pool.available_keys() == 2
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self):
+        """Test that a lease waits for the next token within max_wait."""
+        pool = KeyPool(
+            ["a"], client_factory=lambda key: key, requests_per_minute=1200, burst=1
+        )
+
+        async with pool.lease():
+            pass
+        started = time.monotonic()
+        async with pool.lease():
+            pass
+
+        assert time.monotonic() - started >= 0.04
+        assert pool.get_stats()["waits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_quota_exhausted_beyond_max_wait(self):
+        """Test that a lease fails instead of waiting past max_wait."""
+        pool = KeyPool(
+            ["a"], client_factory=lambda key: key, requests_per_minute=1, max_wait=0.1
+        )
+        pool.slots[0].bucket.try_acquire()
+
+        with pytest.raises(AIProviderError, match="quota exhausted"):
+            async with pool.lease():
+                pass
+        assert pool.get_stats()["exhausted"] == 1
+
+
+class TestGeminiKeyDispatch:
+    """Test GeminiProvider request dispatch over the key pool."""
+
+    @pytest.mark.asyncio
+    @patch("src.ai.gemini_provider.KeyBoundModel")
+    @patch("src.ai.gemini_provider.genai")
+    async def test_each_key_gets_its_own_client(
+        self, mock_genai, mock_key_model, gemini_config
+    ):
+        """Test that concurrent requests are sent with different keys."""
+        from src.ai.gemini_provider import GeminiProvider
+
+        models = []
+
+        def make_model(name, api_key):
+            model = Mock()
+
+            def generate(*args, **kwargs):
+                time.sleep(0.05)
+                return Mock(text="Hai!")
+
+            model.generate_content.side_effect = generate
+            models.append(model)
+            return model
+
+        mock_key_model.side_effect = make_model
+        provider = GeminiProvider(gemini_config)
+
+        await asyncio.gather(
+            *(provider._make_api_request(f"prompt {i}") for i in range(3))
+        )
+
+        keys = [call.args[1] for call in mock_key_model.call_args_list]
+        assert sorted(keys) == ["key1", "key2", "key3"]
+        # Every per-key model served exactly one of the concurrent requests
+        served = [m.generate_content.call_count for m in models if m.generate_content.called]
+        assert served == [1, 1, 1]
+
+    @pytest.mark.asyncio
+    @patch("src.ai.gemini_provider.KeyBoundModel")
+    @patch("src.ai.gemini_provider.genai")
+    async def test_rate_limited_key_is_rested(
+        self, mock_genai, mock_key_model, gemini_config
+    ):
+        """Test that a rate limit moves the retry to another key."""
+        from src.ai.gemini_provider import GeminiProvider
+
+        model = Mock()
+        model.generate_content.side_effect = [
+            Exception("429 Resource has been exhausted (e.g. check quota)."),
+            Mock(text="Success on another key"),
+        ]
+        mock_key_model.return_value = model
+        provider = GeminiProvider(gemini_config)
+
+        response = await provider._generate_response_internal(
+            [Message(role="user", content="Hello")]
+        )
+
+        assert response == "Success on another key"
+        assert provider._is_key_rate_limited(0)
+        assert provider.get_current_key_index() == 1
+        assert provider.get_key_pool_stats()["available_keys"] == 2
+
+    def test_key_bound_model_uses_public_sdk_api(self):
+        """Test the per-key model against the installed SDK, without mocks.
+
+        Fails if the SDK drops the client, request or response types that
+        pooled keys rely on.
+        """
+        from google.ai import generativelanguage as glm
+
+        from src.ai.gemini_provider import (
+            HarmBlockThreshold,
+            HarmCategory,
+            KeyBoundModel,
+        )
+
+        model = KeyBoundModel("gemini-pro", "key2")
+        content = glm.Content(parts=[glm.Part(text="Hai!")])
+        reply = glm.GenerateContentResponse(candidates=[glm.Candidate(content=content)])
+
+        assert isinstance(model.client, glm.GenerativeServiceClient)
+        with patch.object(model.client, "generate_content", return_value=reply) as send:
+            response = model.generate_content(
+                "Hello",
+                safety_settings={
+                    HarmCategory.HARM_CATEGORY_HARASSMENT: (
+                        HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
+                    )
+                },
+            )
+
+        assert response.text == "Hai!"
+        request = send.call_args.args[0]
+        assert request.model == "models/gemini-pro"
+        assert request.contents[0].parts[0].text == "Hello"
+        assert request.safety_settings[0].threshold == (
+            glm.SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
+        )
@@ -130,7 +130,7 @@ class TestLive2DAnimation:
             # Mock successful response
             mock_response = AsyncMock()
             mock_response.status = 200
-            mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__.return_value = (
+            mock_session.return_value.post.return_value.__aenter__.return_value = (
                 mock_response
             )
 
@@ -144,7 +144,7 @@ class TestLive2DAnimation:
             # Mock failed response
             mock_response = AsyncMock()
             mock_response.status = 500
-            mock_session.return_value.__aenter__.return_value.post.return_value.__aenter__.return_value = (
+            mock_session.return_value.post.return_value.__aenter__.return_value = (
                 mock_response
             )
 
@@ -156,7 +156,7 @@ class TestLive2DAnimation:
         """Test the async trigger_animation function with timeout."""
         with patch("aiohttp.ClientSession") as mock_session:
             # Mock timeout
-            mock_session.return_value.__aenter__.return_value.post.side_effect = (
+            mock_session.return_value.post.side_effect = (
                 asyncio.TimeoutError()
             )
 
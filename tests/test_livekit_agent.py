@@ -97,6 +97,32 @@ class TestAnimeAILLMStream:
         with pytest.raises(StopAsyncIteration):
             await stream.__anext__()
 
+    @pytest.mark.asyncio
+    async def test_stream_forwards_chunks(self):
+        """Test that a chunk-backed stream yields each piece and accumulates content."""
+
+        async def chunks():
+            for piece in ["Hel", "lo ", "there!"]:
+                yield piece
+
+        stream = AnimeAILLMStream(chunks=chunks())
+
+        received = [chunk async for chunk in stream]
+        assert received == ["Hel", "lo ", "there!"]
+        assert stream.content == "Hello there!"
+        assert stream._sent
+
+    @pytest.mark.asyncio
+    async def test_stream_collect(self):
+        """Test collecting a stream into the full reply text."""
+
+        async def chunks():
+            yield "B-baka! "
+            yield "(*blush*)"
+
+        assert await AnimeAILLMStream(chunks=chunks()).collect() == "B-baka! (*blush*)"
+        assert await AnimeAILLMStream("whole reply").collect() == "whole reply"
+
 
 class TestAnimeAILLM:
     """Test the custom LLM implementation."""
@@ -120,6 +146,7 @@ class TestAnimeAILLM:
         self, mock_config, mock_memory_manager, mock_ai_provider
     ):
         """Test chat message processing."""
+        mock_config.ai.stream_responses = False
         with patch(
             "src.agent.livekit_agent.ProviderFactory.create_provider"
         ) as mock_create:
@@ -162,6 +189,218 @@ class TestAnimeAILLM:
                 # Verify AI provider call
                 mock_ai_provider.generate_response.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_memory_context_excludes_current_utterance(self, mock_config):
+        """Test that the turn's own utterance never appears in its context."""
+        memory_manager = MemoryManager(mock_config.memory)
+        with patch("src.agent.livekit_agent.ProviderFactory.create_provider"):
+            llm = AnimeAILLM(mock_config, memory_manager)
+
+        earlier = ConversationMessage(
+            role="user", content="Hi!", timestamp=datetime.now(), user_id="u1"
+        )
+        current = ConversationMessage(
+            role="user", content="Hi!", timestamp=datetime.now(), user_id="u1"
+        )
+        await memory_manager.store_conversation(earlier)
+
+        # Whether the background store lands before or after the lookup
+        before = await llm._fetch_memory_context("u1", current)
+        await llm._store_user_message(current)
+        after = await llm._fetch_memory_context("u1", current)
+
+        assert before.conversation_history == [earlier]
+        assert after.conversation_history == [earlier]
+
+    @pytest.mark.asyncio
+    async def test_chat_history_fits_prompt_budget(
+        self, mock_config, mock_memory_manager, mock_ai_provider
+    ):
+        """Test that long sessions send a bounded prompt and report its size."""
+        mock_config.ai.stream_responses = False
+        mock_config.ai.prompt_max_tokens = 500
+        mock_config.ai.prompt_reserve_tokens = 100
+        with patch(
+            "src.agent.livekit_agent.ProviderFactory.create_provider"
+        ) as mock_create, patch("src.agent.livekit_agent.trigger_animation"):
+            mock_create.return_value = mock_ai_provider
+            mock_memory_manager.get_user_context.return_value = None
+
+            llm = AnimeAILLM(mock_config, mock_memory_manager)
+            llm.animation_sync = Mock()
+            llm.animation_sync.synchronize_with_tts = AsyncMock(return_value="seq")
+
+            chat_ctx = Mock()
+            chat_ctx.user_id = "test_user"
+            chat_ctx.messages = []
+            for i in range(60):
+                message = Mock()
+                message.role = "user" if i % 2 == 0 else "assistant"
+                message.content = f"Message number {i} " + "blah " * 20
+                chat_ctx.messages.append(message)
+
+            await llm.chat(chat_ctx=chat_ctx)
+
+            sent = mock_ai_provider.generate_response.call_args.args[0]
+            assert len(sent) < 60
+            assert sent[-1].content.startswith("Message number 59")
+
+            stats = llm.get_prompt_stats()
+            assert stats["turns"] == 1
+            assert stats["trimmed_turns"] == 1
+            assert stats["last"]["total_tokens"] <= 400
+
+    @pytest.mark.asyncio
+    async def test_chat_processing_streaming(
+        self, mock_config, mock_memory_manager, mock_ai_provider
+    ):
+        """Test that streamed replies are cut into segments and animated per segment."""
+
+        async def stream_response(messages, personality=None, memory_context=None):
+            for piece in ["B-baka! I wasn't ", "waiting for you. ", "Hmph, whatever"]:
+                yield piece
+
+        mock_ai_provider.stream_response = stream_response
+        mock_ai_provider.get_provider_name.return_value = "mock"
+
+        with patch(
+            "src.agent.livekit_agent.ProviderFactory.create_provider"
+        ) as mock_create:
+            mock_create.return_value = mock_ai_provider
+            mock_memory_manager.get_user_context.return_value = None
+
+            llm = AnimeAILLM(mock_config, mock_memory_manager)
+            llm.animation_sync = Mock()
+            llm.animation_sync.synchronize_segment_with_tts = AsyncMock(
+                return_value="seq"
+            )
+            llm.animation_sync.finish_segment_sequence = AsyncMock()
+
+            chat_ctx = Mock()
+            chat_ctx.user_id = "test_user"
+            mock_message = Mock()
+            mock_message.role = "user"
+            mock_message.content = "Hello!"
+            chat_ctx.messages = [mock_message]
+
+            result = await llm.chat(chat_ctx=chat_ctx)
+            assert isinstance(result, AnimeAILLMStream)
+
+            # Only the user message is stored before the reply is consumed
+            assert mock_memory_manager.store_conversation.call_count == 1
+
+            segments = [segment async for segment in result]
+            assert segments == [
+                "B-baka! I wasn't waiting for you.",
+                " Hmph, whatever",
+            ]
+            assert result.content == "B-baka! I wasn't waiting for you. Hmph, whatever"
+            mock_ai_provider.generate_response.assert_not_called()
+
+            await asyncio.gather(*llm._segment_animators)
+
+            stored = mock_memory_manager.store_conversation.call_args[0][0]
+            assert stored.role == "assistant"
+            assert stored.content == "B-baka! I wasn't waiting for you. Hmph, whatever"
+
+            calls = llm.animation_sync.synchronize_segment_with_tts.await_args_list
+            assert [c.kwargs["segment_index"] for c in calls] == [0, 1]
+            assert [c.kwargs["is_final"] for c in calls] == [False, True]
+            assert calls[0].kwargs["expression"] == "angry"
+            # Later segments continue the timeline of the first one
+            assert [c.kwargs["sequence_id"] for c in calls] == [None, "seq"]
+            llm.animation_sync.finish_segment_sequence.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_interrupted_stream_is_not_stored(
+        self, mock_config, mock_memory_manager, mock_ai_provider
+    ):
+        """Test that a reply cut short by a provider error is not stored."""
+
+        async def stream_response(messages, personality=None, memory_context=None):
+            yield "Ohayo! "
+            yield "I was just"
+            raise RuntimeError("connection reset")
+
+        mock_ai_provider.stream_response = stream_response
+        mock_ai_provider.get_provider_name.return_value = "mock"
+
+        with patch(
+            "src.agent.livekit_agent.ProviderFactory.create_provider"
+        ) as mock_create:
+            mock_create.return_value = mock_ai_provider
+            mock_memory_manager.get_user_context.return_value = None
+
+            llm = AnimeAILLM(mock_config, mock_memory_manager)
+            llm.animation_sync = Mock()
+            llm.animation_sync.synchronize_segment_with_tts = AsyncMock(
+                return_value="seq"
+            )
+            llm.animation_sync.finish_segment_sequence = AsyncMock()
+
+            chat_ctx = Mock()
+            chat_ctx.user_id = "test_user"
+            mock_message = Mock()
+            mock_message.role = "user"
+            mock_message.content = "Hello!"
+            chat_ctx.messages = [mock_message]
+
+            result = await llm.chat(chat_ctx=chat_ctx)
+            # What arrived is still spoken
+            assert await result.collect() == "Ohayo! I was just"
+            await asyncio.gather(*llm._segment_animators)
+
+            # Only the user message was stored
+            assert mock_memory_manager.store_conversation.call_count == 1
+            stored = mock_memory_manager.store_conversation.call_args[0][0]
+            assert stored.role == "user"
+
+    @pytest.mark.asyncio
+    async def test_early_close_stops_provider_stream(
+        self, mock_config, mock_memory_manager, mock_ai_provider
+    ):
+        """Test that closing the reply early closes the provider stream."""
+        closed = asyncio.Event()
+
+        async def stream_response(messages, personality=None, memory_context=None):
+            try:
+                for i in range(100):
+                    yield f"Sentence {i}. "
+            finally:
+                closed.set()
+
+        mock_ai_provider.stream_response = stream_response
+        mock_ai_provider.get_provider_name.return_value = "mock"
+
+        with patch(
+            "src.agent.livekit_agent.ProviderFactory.create_provider"
+        ) as mock_create:
+            mock_create.return_value = mock_ai_provider
+            mock_memory_manager.get_user_context.return_value = None
+
+            llm = AnimeAILLM(mock_config, mock_memory_manager)
+            llm.animation_sync = Mock()
+            llm.animation_sync.synchronize_segment_with_tts = AsyncMock(
+                return_value="seq"
+            )
+            llm.animation_sync.finish_segment_sequence = AsyncMock()
+
+            chat_ctx = Mock()
+            chat_ctx.user_id = "test_user"
+            mock_message = Mock()
+            mock_message.role = "user"
+            mock_message.content = "Count for me"
+            chat_ctx.messages = [mock_message]
+
+            result = await llm.chat(chat_ctx=chat_ctx)
+            assert (await result.__anext__()).startswith("Sentence 0.")
+            await result.aclose()
+
+            assert closed.is_set()
+            await asyncio.gather(*llm._segment_animators)
+            # The partial reply is not stored as a full one
+            assert mock_memory_manager.store_conversation.call_count == 1
+
     @pytest.mark.asyncio
     async def test_animation_trigger_logic(self, mock_config, mock_memory_manager):
         """Test animation triggering based on response content."""
@@ -0,0 +1,118 @@
+"""
+Unit tests for the local vector-similarity memory backend.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.config.settings import MemoryConfig
+from src.memory.local_vector_store import HashedNGramEmbedder, LocalVectorMemory
+from src.memory.memory_manager import MemoryManager
+
+
+class TestHashedNGramEmbedder:
+    """Test the hashed n-gram embedding function."""
+
+    def test_unit_length_and_deterministic(self):
+        """Test embeddings are normalised and stable."""
+        embedder = HashedNGramEmbedder(dimensions=128)
+        first = embedder.embed("I love strawberry cake")
+        second = embedder.embed("I love strawberry cake")
+
+        assert first.shape == (128,)
+        assert np.isclose(np.linalg.norm(first), 1.0)
+        assert np.array_equal(first, second)
+
+    def test_similar_text_scores_higher(self):
+        """Test that related texts are closer than unrelated ones."""
+        embedder = HashedNGramEmbedder()
+        query = embedder.embed("favourite cakes")
+        related = embedder.embed("my favourite cake is strawberry")
+        unrelated = embedder.embed("the train leaves at noon")
+
+        assert float(query @ related) > float(query @ unrelated)
+
+    def test_empty_text(self):
+        """Test that text without features embeds to zeros."""
+        assert not HashedNGramEmbedder(dimensions=16).embed("!!!").any()
+
+
+class TestLocalVectorMemory:
+    """Test the Mem0-compatible client surface."""
+
+    def test_add_and_search(self):
+        """Test that search returns the most similar memory first."""
+        memory = LocalVectorMemory()
+        memory.add(messages=[{"role": "user", "content": "user: my cat is named Mochi"}], user_id="u1")
+        memory.add(messages=[{"role": "user", "content": "user: I work as a nurse"}], user_id="u1")
+
+        results = memory.search(query="what is my cat's name", user_id="u1", limit=1)
+
+        assert len(results) == 1
+        assert results[0]["memory"] == "user: my cat is named Mochi"
+        assert 0.0 < results[0]["score"] <= 1.0
+
+    def test_user_isolation(self):
+        """Test that users only see their own memories."""
+        memory = LocalVectorMemory()
+        memory.add(messages="likes ramen", user_id="u1")
+
+        assert memory.search(query="ramen", user_id="u2") == []
+        assert memory.get_all(user_id="u2") == []
+
+    def test_matrix_grows(self):
+        """Test that the per-user matrix grows past its initial capacity."""
+        memory = LocalVectorMemory(dimensions=32, initial_capacity=2)
+        for i in range(5):
+            memory.add(messages=f"memory number {i}", user_id="u1")
+
+        assert memory.count("u1") == 5
+        assert len(memory.get_all(user_id="u1")) == 5
+        assert memory.search(query="number 4", user_id="u1", limit=1)
+
+    def test_delete_keeps_remaining_rows_searchable(self):
+        """Test that deleting swaps rows without corrupting the index."""
+        memory = LocalVectorMemory()
+        first = memory.add(messages="apples are red", user_id="u1")["results"][0]["id"]
+        memory.add(messages="bananas are yellow", user_id="u1")
+        memory.add(messages="grapes are purple", user_id="u1")
+
+        assert memory.delete(memory_id=first) is True
+        assert memory.delete(memory_id=first) is False
+
+        contents = [m["memory"] for m in memory.get_all(user_id="u1")]
+        assert "apples are red" not in contents
+        assert memory.search(query="grapes", user_id="u1", limit=1)[0]["memory"] == "grapes are purple"
+
+    def test_delete_all(self):
+        """Test deleting all memories for a user."""
+        memory = LocalVectorMemory()
+        memory.add(messages="hello", user_id="u1")
+
+        assert memory.delete_all(user_id="u1") is True
+        assert memory.count() == 0
+        assert memory.delete_all(user_id="u1") is False
+
+
+class TestMemoryManagerLocalBackend:
+    """Test MemoryManager running on the local backend."""
+
+    @pytest.mark.asyncio
+    async def test_semantic_path_offline(self):
+        """Test the Mem0 code path end to end without network access."""
+        manager = MemoryManager(
+            MemoryConfig(mem0_api_key="", memory_history_limit=10, memory_backend="local")
+        )
+
+        assert await manager.initialize() is True
+        assert isinstance(manager._mem0_client, LocalVectorMemory)
+
+        await manager.add_memory("test_user", "user: my favourite colour is teal")
+        await manager.add_memory("test_user", "user: I have two brothers")
+
+        memories = await manager.search_memories("test_user", "favourite colours", limit=1)
+        assert memories == ["user: my favourite colour is teal"]
+
+        assert await manager.delete_user_memories("test_user") is True
+        assert manager._mem0_client.count("test_user") == 0
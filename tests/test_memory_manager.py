@@ -253,7 +253,46 @@ class TestMemoryManager:
             result = await manager.add_memory("test_user", "Test memory content")
 
             assert result is True
+            # Write-behind: nothing is sent until the queue flushes
+            mock_client.add.assert_not_called()
+
+            assert await manager.flush_pending_writes() is True
             mock_client.add.assert_called_once()
+            assert mock_client.add.call_args.kwargs["messages"] == [
+                {"role": "user", "content": "Test memory content"}
+            ]
+
+    @pytest.mark.asyncio
+    async def test_store_conversation_batches_mem0_writes(self, memory_config):
+        """Test that a chat turn is written to Mem0 as one batched call."""
+        with patch("src.memory.memory_manager.Memory") as mock_memory_class:
+            mock_client = Mock()
+            mock_memory_class.return_value = mock_client
+            mock_client.search.return_value = []
+            mock_client.add.return_value = {"results": []}
+
+            manager = MemoryManager(memory_config)
+            await manager.initialize()
+
+            base_time = datetime.now()
+            for role, content in [("user", "Hi!"), ("assistant", "Hello there!")]:
+                await manager.store_conversation(
+                    ConversationMessage(
+                        role=role,
+                        content=content,
+                        timestamp=base_time,
+                        user_id="test_user",
+                    )
+                )
+
+            assert manager.get_write_queue_stats()["depth"] == 2
+            await manager.close()
+
+            mock_client.add.assert_called_once()
+            kwargs = mock_client.add.call_args.kwargs
+            assert [m["role"] for m in kwargs["messages"]] == ["user", "assistant"]
+            assert kwargs["metadata"]["batch_size"] == 2
+            assert "role" not in kwargs["metadata"]
 
     @pytest.mark.asyncio
     async def test_add_memory_without_mem0(self, memory_config_no_key):
@@ -298,6 +337,25 @@ class TestMemoryManager:
 
         assert memories == []
 
+    @pytest.mark.asyncio
+    async def test_search_session_memories_ranked(self, memory_config_no_key):
+        """Test session search returns ranked hits and forgets pruned entries."""
+        manager = MemoryManager(memory_config_no_key)
+        await manager.initialize()
+
+        await manager.add_memory("test_user", "user: my cat is called Mochi")
+        await manager.add_memory("test_user", "user: the weather is nice")
+        await manager.add_memory("test_user", "user: cat food is expensive")
+
+        memories = await manager.search_memories("test_user", "cat called", limit=5)
+        assert memories[0] == "user: my cat is called Mochi"
+        assert "user: the weather is nice" not in memories
+
+        # Entries trimmed from session memory are dropped from the index too
+        for i in range(memory_config_no_key.memory_history_limit * 2):
+            await manager.add_memory("test_user", f"filler {i}")
+        assert await manager.search_memories("test_user", "Mochi") == []
+
     @pytest.mark.asyncio
     async def test_store_conversation(self, memory_config, sample_message):
         """Test storing conversation message."""
@@ -365,6 +423,71 @@ class TestMemoryManager:
             assert len(context.relevant_memories) == 1
             assert "Relevant memory" in context.relevant_memories
 
+    @pytest.mark.asyncio
+    async def test_get_user_context_history_is_a_snapshot(
+        self, memory_config_no_key, sample_messages
+    ):
+        """Test that messages stored after the context is built do not leak in."""
+        manager = MemoryManager(memory_config_no_key)
+        await manager.initialize()
+        for message in sample_messages:
+            await manager.store_conversation(message)
+
+        context = await manager.get_user_context("test_user")
+        formatted = context.format_for_ai()
+        await manager.store_conversation(
+            ConversationMessage(
+                role="user",
+                content="A later message",
+                timestamp=datetime.now(),
+                user_id="test_user",
+            )
+        )
+
+        assert len(context.conversation_history) == 3
+        assert context.format_for_ai() == formatted
+
+    @pytest.mark.asyncio
+    async def test_get_user_context_reports_sources(
+        self, memory_config_no_key, sample_messages
+    ):
+        """Test that the context lists the sources that contributed."""
+        manager = MemoryManager(memory_config_no_key)
+        await manager.initialize()
+
+        for message in sample_messages:
+            await manager.store_conversation(message)
+        await manager.update_personality_state("test_user", {"mood": "happy"})
+
+        context = await manager.get_user_context("test_user", "joke")
+
+        assert context.sources == [
+            "session_history",
+            "session_search",
+            "personality_state",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_user_context_latency_budget(self, memory_config):
+        """Test that a slow Mem0 search falls back to session memory."""
+        manager = MemoryManager(memory_config)
+        manager._initialized = True
+        manager.mem0_available = True
+        manager._mem0_client = Mock()
+        manager._store_in_session_memory("test_user", "User likes green tea")
+
+        async def slow_search(user_id, query, limit):
+            await asyncio.sleep(5)
+            return ["too late"]
+
+        with patch.object(manager, "_search_memories_in_mem0", slow_search):
+            context = await manager.get_user_context(
+                "test_user", "tea", latency_budget=0.05
+            )
+
+        assert context.relevant_memories == ["User likes green tea"]
+        assert context.sources == ["session_search"]
+
     @pytest.mark.asyncio
     async def test_update_personality_state(self, memory_config):
         """Test updating personality state."""
@@ -443,9 +566,7 @@ class TestMemoryManager:
 
         # Add some session data
         for message in sample_messages:
-            if message.user_id not in manager._session_memory:
-                manager._session_memory[message.user_id] = []
-            manager._session_memory[message.user_id].append(message)
+            manager._session_entries(message.user_id).add_message(message)
 
         stats = manager.get_session_stats()
 
@@ -456,6 +577,24 @@ class TestMemoryManager:
         assert "test_user" in stats["users"]
         assert stats["users"]["test_user"]["message_count"] == 3
 
+    @pytest.mark.asyncio
+    async def test_get_session_stats_with_snippets(
+        self, memory_config_no_key, sample_messages
+    ):
+        """Test session statistics with both messages and memory snippets."""
+        manager = MemoryManager(memory_config_no_key)
+        await manager.initialize()
+
+        for message in sample_messages:
+            await manager.store_conversation(message)
+
+        stats = manager.get_session_stats()
+
+        assert stats["total_messages"] == 3
+        assert stats["users"]["test_user"]["message_count"] == 3
+        assert stats["users"]["test_user"]["snippet_count"] == 3
+        assert stats["users"]["test_user"]["last_activity"] is not None
+
     @pytest.mark.asyncio
     async def test_health_check_healthy(self, memory_config):
         """Test health check when system is healthy."""
@@ -500,7 +639,10 @@ class TestMemoryManager:
 
             result = await manager.add_memory("test_user", "Test content")
 
-            assert result is False
+            # Acknowledged right away; the failure shows up when the queue flushes
+            assert result is True
+            assert await manager.flush_pending_writes() is False
+            assert manager.get_write_queue_stats()["failed_items"] == 1
 
     @pytest.mark.asyncio
     async def test_error_handling_in_search_memories(self, memory_config):
@@ -0,0 +1,163 @@
+"""
+Unit tests for Live2D model bundles.
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from src.error_handling.exceptions import Live2DError, ValidationError
+from src.web.model_bundle import (
+    BUNDLE_URL_PREFIX,
+    ModelBundler,
+    minify_json,
+    model_file_references,
+    pack_bundle,
+    unpack_bundle,
+)
+from src.web.static_assets import StaticAssetStore
+
+MODEL_PATH = "models/demo/runtime/demo.model3.json"
+
+
+@pytest.fixture
+def model_root(tmp_path):
+    """Create a static directory with a small Live2D model."""
+    runtime = tmp_path / "models" / "demo" / "runtime"
+    (runtime / "motion").mkdir(parents=True)
+    model = {
+        "Version": 3,
+        "FileReferences": {
+            "Moc": "demo.moc3",
+            "Textures": ["demo.2048/texture_00.png"],
+            "Physics": "demo.physics3.json",
+            "Motions": {
+                "Idle": [{"File": "motion/idle.motion3.json"}],
+                "Tap": [{"File": "motion/idle.motion3.json"}],
+            },
+        },
+    }
+    (runtime / "demo.model3.json").write_text(json.dumps(model, indent=4))
+    (runtime / "demo.moc3").write_bytes(os.urandom(2048))
+    (runtime / "demo.physics3.json").write_text(json.dumps({"Version": 3}, indent=4))
+    motion = {"Curves": [{"Segments": [0.0, 0.123456789, 1, 0.5, 2.0000001]}]}
+    (runtime / "motion" / "idle.motion3.json").write_text(json.dumps(motion, indent=2))
+    return tmp_path
+
+
+class TestBundleFormat:
+    """Test reference collection, minification and (un)packing."""
+
+    def test_model_file_references(self):
+        """Test that references are listed once in order."""
+        settings = {
+            "FileReferences": {
+                "Moc": "a.moc3",
+                "Textures": ["t0.png", "t1.png"],
+                "Expressions": [{"Name": "smile", "File": "e/smile.exp3.json"}],
+                "Motions": {
+                    "Idle": [{"File": "m/idle.motion3.json", "Sound": "s/idle.wav"}],
+                    "Tap": [{"File": "m/idle.motion3.json"}],
+                },
+            }
+        }
+
+        assert model_file_references(settings) == [
+            "a.moc3",
+            "t0.png",
+            "t1.png",
+            "e/smile.exp3.json",
+            "m/idle.motion3.json",
+            "s/idle.wav",
+        ]
+        assert model_file_references({}) == []
+
+    def test_minify_and_quantize(self):
+        """Test that whitespace is dropped and only motions are quantized."""
+        data = json.dumps({"Curves": [{"Segments": [1, 0.123456, 2.0001]}]}, indent=4)
+
+        lossless = minify_json("idle.motion3.json", data.encode())
+        quantized = minify_json("idle.motion3.json", data.encode(), quantize=2)
+        other = minify_json("demo.physics3.json", data.encode(), quantize=2)
+
+        assert lossless == b'{"Curves":[{"Segments":[1,0.123456,2.0001]}]}'
+        assert quantized == b'{"Curves":[{"Segments":[1,0.12,2]}]}'
+        assert other == lossless
+        with pytest.raises(ValidationError):
+            minify_json("broken.json", b"{")
+
+    def test_pack_round_trip(self):
+        """Test that packed files come back unchanged."""
+        files = [("a.json", "application/json", b"{}"), ("b.bin", "x/y", b"\x00\x01")]
+
+        data, index = pack_bundle({"model": "a.json"}, files)
+        unpacked_index, unpacked = unpack_bundle(data)
+
+        assert unpacked_index == index
+        assert unpacked == {"a.json": b"{}", "b.bin": b"\x00\x01"}
+        assert index["files"][1]["offset"] == 2
+        with pytest.raises(ValidationError):
+            unpack_bundle(b"PK\x03\x04" + data[4:])
+
+
+class TestModelBundler:
+    """Test building, versioning and caching bundles."""
+
+    def test_build_includes_referenced_files(self, model_root):
+        """Test that a bundle holds the model and each file it references once."""
+        bundler = ModelBundler(StaticAssetStore(str(model_root)))
+
+        bundle = bundler.build(MODEL_PATH)
+        index, files = unpack_bundle(bundle.data)
+        runtime = model_root / "models/demo/runtime"
+
+        assert list(files) == [
+            "demo.model3.json",
+            "demo.moc3",
+            "demo.physics3.json",
+            "motion/idle.motion3.json",
+        ]
+        assert files["demo.moc3"] == (runtime / "demo.moc3").read_bytes()
+        assert json.loads(files["demo.model3.json"]) == json.loads(
+            (runtime / "demo.model3.json").read_text()
+        )
+        assert index["missing"] == ["demo.2048/texture_00.png"]
+        assert index["original_size"] == sum(
+            (runtime / path).stat().st_size for path in files
+        )
+        assert gzip.decompress(bundle.encodings["gzip"]) == bundle.data
+
+    def test_version_tracks_files_and_options(self, model_root):
+        """Test that editing a referenced file or quantizing changes the version."""
+        bundler = ModelBundler(StaticAssetStore(str(model_root)))
+        first = bundler.build(MODEL_PATH)
+        url = bundler.bundle_url(MODEL_PATH)
+
+        assert bundler.build(MODEL_PATH) is first
+        assert url == f"{BUNDLE_URL_PREFIX}{MODEL_PATH}?v={first.version}"
+
+        quantized = bundler.build(MODEL_PATH, quantize=3)
+        assert quantized.version != first.version
+        assert unpack_bundle(quantized.data)[1]["motion/idle.motion3.json"] == (
+            b'{"Curves":[{"Segments":[0,0.123,1,0.5,2]}]}'
+        )
+
+        motion = model_root / "models/demo/runtime/motion/idle.motion3.json"
+        motion.write_text("{}")
+        os.utime(motion, ns=(1, 1))
+        assert bundler.build(MODEL_PATH).version != first.version
+        assert bundler.bundle_url(MODEL_PATH) != url
+
+    def test_invalid_requests(self, model_root):
+        """Test bad paths and options."""
+        bundler = ModelBundler(StaticAssetStore(str(model_root)))
+
+        with pytest.raises(ValidationError):
+            bundler.build("models/demo/runtime/demo.moc3")
+        with pytest.raises(ValidationError):
+            bundler.build(MODEL_PATH, quantize=12)
+        with pytest.raises(Live2DError):
+            bundler.build("models/missing/missing.model3.json")
+        assert bundler.bundle_url("../demo.model3.json") is None
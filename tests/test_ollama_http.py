@@ -0,0 +1,148 @@
+"""
+Unit tests for the asyncio-native Ollama HTTP transport.
+"""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.ai.base_provider import Message
+from src.ai.ollama_http import OllamaHTTPClient
+from src.ai.ollama_provider import OllamaProvider
+from src.error_handling.exceptions import AIProviderError, NetworkError
+
+
+def _make_app(requests_seen):
+    """Fake Ollama server recording the payloads it receives."""
+
+    async def chat(request):
+        payload = await request.json()
+        requests_seen.append(payload)
+        if payload["model"] == "missing":
+            return web.json_response({"error": "model 'missing' not found"}, status=404)
+
+        if not payload.get("stream"):
+            return web.json_response(
+                {"message": {"role": "assistant", "content": "Hello there!"}, "done": True}
+            )
+
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for token in ["Hel", "lo ", "there!"]:
+            line = json.dumps({"message": {"content": token}, "done": False}) + "\n"
+            # Split lines across writes to exercise buffering
+            await response.write(line[:5].encode())
+            await response.write(line[5:].encode())
+        await response.write(json.dumps({"done": True}).encode())
+        await response.write_eof()
+        return response
+
+    async def tags(request):
+        return web.json_response({"models": [{"name": "llama3"}]})
+
+    app = web.Application()
+    app.router.add_post("/api/chat", chat)
+    app.router.add_get("/api/tags", tags)
+    return app
+
+
+@pytest_asyncio.fixture
+async def ollama_server():
+    """Start a fake Ollama server and yield (base_url, received payloads)."""
+    seen = []
+    server = TestServer(_make_app(seen))
+    await server.start_server()
+    yield str(server.make_url("")).rstrip("/"), seen
+    await server.close()
+
+
+class TestOllamaHTTPClient:
+    """Test the HTTP transport against a fake server."""
+
+    @pytest.mark.asyncio
+    async def test_chat(self, ollama_server):
+        """Test a non-streaming chat request."""
+        url, seen = ollama_server
+        client = OllamaHTTPClient(host=url)
+
+        response = await client.chat(
+            "llama3", [{"role": "user", "content": "hi"}], keep_alive="10m"
+        )
+
+        assert response["message"]["content"] == "Hello there!"
+        assert seen[0]["stream"] is False
+        assert seen[0]["keep_alive"] == "10m"
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_chat_parses_ndjson(self, ollama_server):
+        """Test that streamed NDJSON lines are reassembled and parsed."""
+        url, _ = ollama_server
+        client = OllamaHTTPClient(host=url)
+
+        parts = [
+            part async for part in client.stream_chat("llama3", [{"role": "user", "content": "hi"}])
+        ]
+
+        assert "".join(p.get("message", {}).get("content", "") for p in parts) == "Hello there!"
+        assert parts[-1]["done"] is True
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_session(self, ollama_server):
+        """Test that concurrent requests reuse one pooled session."""
+        url, seen = ollama_server
+        client = OllamaHTTPClient(host=url, max_connections=4)
+
+        await asyncio.gather(
+            *(client.chat("llama3", [{"role": "user", "content": str(i)}]) for i in range(10))
+        )
+        session = client._session
+
+        await client.list()
+
+        assert len(seen) == 10
+        assert client._session is session
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_http_error_keeps_ollama_message(self, ollama_server):
+        """Test that error responses raise AIProviderError with the status."""
+        url, _ = ollama_server
+        client = OllamaHTTPClient(host=url)
+
+        with pytest.raises(AIProviderError, match="404.*not found"):
+            await client.chat("missing", [])
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_error(self):
+        """Test that unreachable hosts raise NetworkError."""
+        client = OllamaHTTPClient(host="http://127.0.0.1:9")
+
+        with pytest.raises(NetworkError, match="connection"):
+            await client.list()
+        await client.close()
+
+
+class TestOllamaProviderHTTPTransport:
+    """Test OllamaProvider with transport='http'."""
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_and_health_check(self, ollama_server):
+        """Test that the provider routes all calls through the HTTP client."""
+        url, _ = ollama_server
+        provider = OllamaProvider({"model": "llama3", "host": url, "transport": "http"})
+        messages = [Message(role="user", content="hi")]
+
+        assert provider.client is None
+        assert await provider.generate_response(messages) == "Hello there!"
+        chunks = [chunk async for chunk in provider.stream_response(messages)]
+        assert "".join(chunks) == "Hello there!"
+        assert await provider.check_connection()
+
+        await provider.close()
@@ -0,0 +1,126 @@
+"""
+Unit tests for the persistent (SQLite WAL) session memory store.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.config.settings import MemoryConfig
+from src.memory.memory_manager import ConversationMessage, MemoryManager
+from src.memory.persistent_store import PersistentSessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a store in a temporary directory."""
+    store = PersistentSessionStore(str(tmp_path / "session.db"))
+    yield store
+    store.close()
+
+
+class TestPersistentSessionStore:
+    """Test append, load, compaction and deletion."""
+
+    def test_append_and_load(self, store):
+        """Test entries load back oldest first."""
+        store.append("u1", "message", {"content": "first"})
+        store.append("u1", "snippet", {"content": "second"})
+        store.append("u2", "message", {"content": "other user"})
+
+        rows = store.load("u1", limit=10)
+
+        assert [row["payload"]["content"] for row in rows] == ["first", "second"]
+        assert [row["kind"] for row in rows] == ["message", "snippet"]
+        assert store.load("u1", limit=10, kind="snippet")[0]["payload"] == {
+            "content": "second"
+        }
+
+    def test_load_limit_keeps_most_recent(self, store):
+        """Test that limited loads return the newest entries."""
+        for i in range(5):
+            store.append("u1", "message", {"i": i})
+
+        assert [row["payload"]["i"] for row in store.load("u1", limit=2)] == [3, 4]
+
+    def test_compact(self, store):
+        """Test compaction keeps the newest entries per stream."""
+        for i in range(5):
+            store.append("u1", "message", {"i": i})
+        store.append("u1", "snippet", {"i": "s"})
+
+        assert store.compact("u1", keep=2) == 3
+        rows = store.load("u1", limit=10)
+        assert [row["payload"]["i"] for row in rows] == [3, 4, "s"]
+
+    def test_delete_user_and_stats(self, store):
+        """Test deleting a user and reading store statistics."""
+        store.append("u1", "message", {"content": "x"})
+        store.append("u2", "message", {"content": "y"})
+
+        assert store.has_user("u1")
+        assert store.delete_user("u1") == 1
+        assert not store.has_user("u1")
+        assert store.get_stats()["users"] == 1
+
+
+class TestMemoryManagerPersistence:
+    """Test MemoryManager session memory surviving restarts."""
+
+    @pytest.mark.asyncio
+    async def test_session_memory_survives_restart(self, tmp_path):
+        """Test that a new manager sees the previous manager's session memory."""
+        config = MemoryConfig(
+            mem0_api_key="",
+            memory_history_limit=10,
+            session_store_path=str(tmp_path / "session.db"),
+        )
+
+        first = MemoryManager(config)
+        await first.initialize()
+        await first.store_conversation(
+            ConversationMessage(
+                role="user",
+                content="My cat is called Mochi",
+                timestamp=datetime.now(),
+                user_id="test_user",
+            )
+        )
+        await first.close()
+
+        second = MemoryManager(config)
+        await second.initialize()
+
+        context = await second.get_user_context("test_user", "cat")
+        messages = [
+            entry for entry in context.conversation_history
+            if isinstance(entry, ConversationMessage)
+        ]
+        assert messages[0].content == "My cat is called Mochi"
+        assert context.relevant_memories == ["user: My cat is called Mochi"]
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_cold_users_evicted_and_reloaded(self, tmp_path):
+        """Test that only hot users stay in RAM and cold ones reload lazily."""
+        config = MemoryConfig(
+            mem0_api_key="",
+            memory_history_limit=10,
+            session_store_path=str(tmp_path / "session.db"),
+            session_hot_users=1,
+        )
+        manager = MemoryManager(config)
+        await manager.initialize()
+
+        await manager.add_memory("alice", "alice likes tea")
+        await manager.add_memory("bob", "bob likes coffee")
+
+        assert list(manager._session_memory) == ["bob"]
+
+        # Searching a cold user loads and re-indexes it from disk
+        assert await manager.search_memories("alice", "tea") == ["alice likes tea"]
+        assert list(manager._session_memory) == ["alice"]
+
+        context = await manager.get_user_context("bob", "coffee")
+        assert context.relevant_memories == ["bob likes coffee"]
+        await manager.close()
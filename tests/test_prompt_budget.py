@@ -0,0 +1,197 @@
+"""
+Unit tests for prompt size budgeting.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.ai.base_provider import Message
+from src.ai.personality_processor import PersonalityProcessor
+from src.ai.prompt_budget import (
+    PromptAssembler,
+    SUMMARY_HEADER,
+    arrange_prompt,
+    estimate_tokens,
+)
+from src.memory.memory_manager import MemoryContext
+
+
+def turns(count, size=40):
+    """Build alternating user/assistant messages of roughly ``size`` tokens."""
+    return [
+        Message(
+            role="user" if i % 2 == 0 else "assistant",
+            content=f"turn {i} " + "x" * (size * 4),
+        )
+        for i in range(count)
+    ]
+
+
+class TestEstimateTokens:
+    """Test the approximate tokenizer."""
+
+    def test_estimate(self):
+        """Test the ~4 characters per token estimate."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+
+class TestPromptAssembler:
+    """Test history windowing and memory trimming."""
+
+    def test_short_prompt_unchanged(self):
+        """Test that prompts within budget are passed through."""
+        assembler = PromptAssembler(max_tokens=4096)
+        messages = turns(4)
+
+        prompt = assembler.assemble(messages, "You are Miko.")
+
+        assert prompt.messages == messages
+        assert prompt.stats.dropped_messages == 0
+        assert not prompt.stats.over_budget
+
+    def test_old_turns_windowed_into_summary(self):
+        """Test that the oldest turns are dropped and summarised."""
+        assembler = PromptAssembler(max_tokens=600, reserve_tokens=100, summary_tokens=100)
+        messages = [Message(role="system", content="Stay in character.")] + turns(30)
+
+        prompt = assembler.assemble(messages, "You are Miko.")
+        stats = prompt.stats
+
+        assert stats.dropped_messages > 0
+        assert stats.total_tokens <= stats.budget
+        # Stable prefix first, then the summary, then the newest turns
+        assert prompt.messages[0].content == "Stay in character."
+        assert prompt.messages[1].content.startswith(SUMMARY_HEADER)
+        assert prompt.messages[-1] is messages[-1]
+        assert stats.kept_messages + stats.dropped_messages == 30
+
+    def test_recent_messages_always_kept(self):
+        """Test that the newest messages survive even when over budget."""
+        assembler = PromptAssembler(
+            max_tokens=50, reserve_tokens=0, min_recent_messages=2, summary_tokens=0
+        )
+        messages = turns(6, size=100)
+
+        prompt = assembler.assemble(messages)
+
+        assert prompt.messages == messages[-2:]
+        assert prompt.stats.over_budget
+
+    def test_memories_trimmed_to_share(self):
+        """Test that low-ranked memories are dropped first."""
+        assembler = PromptAssembler(max_tokens=400, reserve_tokens=0, memory_share=0.25)
+        context = MemoryContext(
+            user_id="u1",
+            relevant_memories=[f"memory {i} " + "m" * 120 for i in range(10)],
+            conversation_history=[],
+            personality_state={},
+        )
+
+        prompt = assembler.assemble(turns(2), memory_context=context)
+
+        kept = prompt.memory_context.relevant_memories
+        assert 0 < len(kept) < 10
+        assert kept == context.relevant_memories[: len(kept)]
+        assert prompt.stats.memory_tokens <= 100
+        assert prompt.stats.dropped_memories == 10 - len(kept)
+
+    def test_window_start_moves_in_steps(self):
+        """Test that the dropped block only changes every few turns."""
+        assembler = PromptAssembler(
+            max_tokens=600, reserve_tokens=100, summary_tokens=0, window_step=8
+        )
+        history = turns(40)
+
+        starts = []
+        for length in range(20, 40, 2):
+            prompt = assembler.assemble(history[:length])
+            starts.append(prompt.stats.dropped_messages)
+            assert prompt.stats.total_tokens <= prompt.stats.budget
+
+        assert all(start % 8 == 0 for start in starts)
+        # Consecutive turns usually share the same window start
+        assert len(set(starts)) < len(starts) / 2
+
+    def test_unlimited_budget(self):
+        """Test that max_tokens=0 disables budgeting."""
+        messages = turns(200)
+        prompt = PromptAssembler(max_tokens=0).assemble(messages)
+
+        assert prompt.messages == messages
+        assert prompt.stats.to_dict()["over_budget"] is False
+
+
+def memory(text="User likes ramen"):
+    """Build a memory context with one memory."""
+    return MemoryContext(
+        user_id="u1",
+        relevant_memories=[text],
+        conversation_history=[],
+        personality_state={},
+    )
+
+
+class TestPromptLayout:
+    """Test stable-prefix prompt ordering."""
+
+    def test_stable_layout_puts_context_before_last_user_message(self):
+        """Test that per-turn context follows the history."""
+        history = [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+            {"role": "user", "content": "again"},
+        ]
+        system = [{"role": "system", "content": "persona"}]
+        context = {"role": "system", "content": "memories"}
+
+        stable = arrange_prompt(system, history, context, "stable")
+        legacy = arrange_prompt(system, history, context, "legacy")
+
+        assert [m["content"] for m in stable] == ["persona", "hi", "hello", "memories", "again"]
+        assert [m["content"] for m in legacy] == ["memories", "persona", "hi", "hello", "again"]
+
+    def test_consecutive_turns_share_prefix(self):
+        """Test that the next turn's prompt starts with the previous history."""
+        processor = PersonalityProcessor("You are Miko.")
+        first_turn = [Message(role="user", content="Hi")]
+        second_turn = first_turn + [
+            Message(role="assistant", content="B-baka!"),
+            Message(role="user", content="What do I like?"),
+        ]
+
+        first = processor.inject_personality(first_turn, memory("likes tea"))
+        second = processor.inject_personality(second_turn, memory("likes ramen"))
+
+        assert first[0].content == "You are Miko."
+        assert first[-1].content == "Hi"
+        assert [m.content for m in second[:1]] == [m.content for m in first[:1]]
+        assert second[1].content == "Hi"
+        assert "likes ramen" in second[-2].content
+
+    @pytest.mark.asyncio
+    @patch("src.ai.ollama_provider.ollama")
+    async def test_ollama_pins_num_ctx_and_records_prompt_eval(self, mock_ollama):
+        """Test that num_ctx is sent and prompt evaluation is reported."""
+        from src.ai.ollama_provider import OllamaProvider
+
+        mock_ollama.chat.return_value = {
+            "message": {"content": "Konnichiwa!"},
+            "prompt_eval_count": 12,
+            "prompt_eval_duration": 500_000_000,
+        }
+        provider = OllamaProvider({"model": "llama3", "num_ctx": 4096})
+
+        await provider.generate_response(
+            [Message(role="user", content="Hello")], "You are Miko.", memory()
+        )
+
+        call = mock_ollama.chat.call_args
+        assert call.kwargs["options"] == {"num_ctx": 4096}
+        assert [m["role"] for m in call.kwargs["messages"]] == ["system", "system", "user"]
+        assert call.kwargs["messages"][0]["content"] == "You are Miko."
+        stats = provider.get_prompt_eval_stats()
+        assert stats["prompt_tokens"] == 12
+        assert stats["prompt_seconds"] == pytest.approx(0.5)
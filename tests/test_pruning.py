@@ -0,0 +1,158 @@
+"""
+Unit tests for the memory pruning engine.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from src.memory.pruning import MemoryPruner, created_at_epoch, find_expired
+
+
+def _iso(days_ago: int, suffix: str = "Z") -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago)).strftime(
+        "%Y-%m-%dT%H:%M:%S"
+    ) + suffix
+
+
+class BatchClient:
+    """Memory client exposing a batch delete API."""
+
+    def __init__(self, memories):
+        self.memories = memories
+        self.batches = []
+
+    def get_all(self, user_id):
+        return {"results": self.memories}
+
+    def batch_delete(self, memories):
+        self.batches.append([m["memory_id"] for m in memories])
+        return {"message": "ok"}
+
+
+async def _run_inline(func):
+    return func()
+
+
+class TestExpiry:
+    """Test timestamp parsing and expiry selection."""
+
+    def test_created_at_formats(self):
+        """Test Z-suffixed, offset, naive and numeric timestamps."""
+        assert created_at_epoch("1970-01-01T00:00:10Z") == 10.0
+        assert created_at_epoch("1970-01-01T01:00:10+01:00") == 10.0
+        assert created_at_epoch(42) == 42.0
+        assert created_at_epoch(datetime(2024, 1, 1)) == datetime(2024, 1, 1).timestamp()
+        assert created_at_epoch("not a date") is None
+        assert created_at_epoch(None) is None
+
+    def test_find_expired(self):
+        """Test that only old, parseable records with IDs are selected."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).timestamp()
+        memories = [
+            {"id": "old", "created_at": _iso(40)},
+            {"id": "new", "created_at": _iso(2)},
+            {"id": "bad", "created_at": "yesterday"},
+            {"created_at": _iso(40)},
+            "not a record",
+        ]
+
+        assert find_expired(memories, cutoff) == (["old"], 1)
+
+
+class TestMemoryPruner:
+    """Test concurrent and batched deletion."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_with_bounded_concurrency(self):
+        """Test that per-item deletes never exceed the concurrency limit."""
+        in_flight = 0
+        peak = 0
+
+        async def run_blocking(func):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return func()
+
+        client = Mock()
+        client.get_all.return_value = [
+            {"id": f"m{i}", "created_at": _iso(40)} for i in range(20)
+        ] + [{"id": "keep", "created_at": _iso(1)}]
+
+        pruner = MemoryPruner(lambda: client, max_concurrency=3, run_blocking=run_blocking)
+        result = await pruner.prune_user("u1", days_old=30)
+
+        assert result.scanned == 21
+        assert result.deleted == 20
+        assert result.failed == 0
+        assert client.delete.call_count == 20
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_batch_delete_when_supported(self):
+        """Test that clients with batch_delete get batched calls."""
+        client = BatchClient([{"id": f"m{i}", "created_at": _iso(40)} for i in range(5)])
+        pruner = MemoryPruner(lambda: client, batch_size=2, run_blocking=_run_inline)
+
+        result = await pruner.prune_user("u1", days_old=30)
+
+        assert result.deleted == 5
+        assert sorted(len(batch) for batch in client.batches) == [1, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_failed_deletes_are_counted(self):
+        """Test that failing deletes are reported, not raised."""
+        client = Mock()
+        client.get_all.return_value = [
+            {"id": "a", "created_at": _iso(40)},
+            {"id": "b", "created_at": _iso(40)},
+        ]
+        client.delete.side_effect = [None, Exception("boom")]
+        pruner = MemoryPruner(lambda: client, max_concurrency=1, run_blocking=_run_inline)
+
+        result = await pruner.prune_user("u1", days_old=30)
+
+        assert (result.deleted, result.failed) == (1, 1)
+        assert pruner.get_stats()["delete_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_prune_all_progress_and_callback(self):
+        """Test multi-user runs report progress and per-user results."""
+        client = Mock()
+        client.get_all.side_effect = lambda user_id: (
+            [{"id": f"{user_id}-1", "created_at": _iso(40)}]
+            if user_id != "broken"
+            else (_ for _ in ()).throw(RuntimeError("unavailable"))
+        )
+        seen = []
+        pruner = MemoryPruner(
+            lambda: client, run_blocking=_run_inline, on_result=seen.append
+        )
+
+        results = await pruner.prune_all(["u1", "broken", "u2"], days_old=30)
+
+        assert [r.user_id for r in results] == ["u1", "u2"]
+        assert [r.user_id for r in seen] == ["u1", "u2"]
+        stats = pruner.get_stats()
+        assert stats["progress"] == "3/3"
+        assert stats["memories_deleted"] == 2
+        assert stats["runs"] == 1
+        assert not stats["run_in_progress"]
+
+    @pytest.mark.asyncio
+    async def test_scheduled_job(self):
+        """Test that the periodic job runs and stops cleanly."""
+        client = Mock()
+        client.get_all.return_value = []
+        pruner = MemoryPruner(lambda: client, run_blocking=_run_inline)
+
+        pruner.start(lambda: ["u1"], interval=1.0)
+        assert pruner.get_stats()["job_running"]
+        await pruner.stop()
+
+        assert not pruner.get_stats()["job_running"]
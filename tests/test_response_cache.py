@@ -0,0 +1,232 @@
+"""
+Unit tests for the AI provider response cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.ai.base_provider import Message
+from src.ai.response_cache import ResponseCache, normalize_text
+from src.error_handling.fallback_manager import FallbackManager, FallbackStrategy
+
+
+def prompt(*user_messages, system=None):
+    """Build a prompt ending with the given user messages."""
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.extend({"role": "user", "content": m} for m in user_messages)
+    return messages
+
+
+class TestResponseCache:
+    """Test keys, lookups and eviction."""
+
+    def test_normalize_text(self):
+        """Test that case, punctuation and spacing are ignored."""
+        assert normalize_text("  Hello,   WORLD!! ") == "hello world"
+
+    def test_exact_hit_after_normalisation(self):
+        """Test that equivalent prompts share a cached reply."""
+        cache = ResponseCache()
+        cache.put("ollama:llama3", "kawaii", prompt("Hello there!"), "Konnichiwa!")
+
+        assert cache.get("ollama:llama3", "kawaii", prompt("hello   THERE")) == "Konnichiwa!"
+        assert cache.get("ollama:llama3", "tsundere", prompt("Hello there!")) is None
+        assert cache.get("gemini:pro", "kawaii", prompt("Hello there!")) is None
+        assert cache.get_stats()["hits"] == 1
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResponseCache(max_entries=2)
+        cache.put("m", None, prompt("a"), "A")
+        cache.put("m", None, prompt("b"), "B")
+        cache.get("m", None, prompt("a"))
+        cache.put("m", None, prompt("c"), "C")
+
+        assert cache.get("m", None, prompt("a")) == "A"
+        assert cache.get("m", None, prompt("b")) is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_eviction_by_bytes(self):
+        """Test that the byte budget bounds the cache."""
+        cache = ResponseCache(max_bytes=10)
+        cache.put("m", None, prompt("a"), "x" * 6)
+        cache.put("m", None, prompt("b"), "y" * 6)
+        cache.put("m", None, prompt("c"), "z" * 11)
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 1
+        assert stats["bytes"] == 6
+        assert cache.get("m", None, prompt("b")) == "y" * 6
+
+    def test_ttl_expiry(self, fake_clock):
+        """Test that entries expire after the TTL."""
+        cache = ResponseCache(ttl=60, clock=fake_clock)
+        cache.put("m", None, prompt("a"), "A")
+
+        fake_clock.now += 59
+        assert cache.get("m", None, prompt("a")) == "A"
+        fake_clock.now += 2
+        assert cache.get("m", None, prompt("a")) is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_similar_final_message_in_same_context(self):
+        """Test near-duplicate matching of the last user message."""
+        cache = ResponseCache(similarity=0.6)
+        cache.put("m", None, prompt("what is your favourite anime", system="ctx"), "Naruto!")
+
+        assert (
+            cache.get("m", None, prompt("what is your favourite anime show", system="ctx"))
+            == "Naruto!"
+        )
+        # Different context never matches
+        assert cache.get("m", None, prompt("what is your favourite anime show")) is None
+        # Callers can require an exact match
+        assert (
+            cache.get(
+                "m",
+                None,
+                prompt("what is your favourite anime show", system="ctx"),
+                allow_similar=False,
+            )
+            is None
+        )
+        assert cache.get_stats()["similar_hits"] == 1
+
+    def test_context_window_and_user_scope(self):
+        """Test that only recent turns and the user are part of the key."""
+        cache = ResponseCache(context_turns=1)
+        history = [
+            {"role": "user", "content": "I'm hungry"},
+            {"role": "assistant", "content": "Want ramen?"},
+        ]
+        cache.put("m", None, history + prompt("Yes"), "Ramen it is!", user_id="u1")
+
+        older = [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hey"},
+        ]
+        assert cache.get("m", None, older + history + prompt("yes"), user_id="u1") == (
+            "Ramen it is!"
+        )
+        assert cache.get("m", None, prompt("Yes"), user_id="u1") is None
+        assert cache.get("m", None, history + prompt("Yes"), user_id="u2") is None
+
+    def test_persistent_store_survives_restart(self, tmp_path):
+        """Test that cached replies are loaded from SQLite by a new instance."""
+        path = str(tmp_path / "cache" / "responses.db")
+        first = ResponseCache(store_path=path)
+        first.put("m", None, prompt("hello"), "Konnichiwa!")
+        first.close()
+
+        second = ResponseCache(store_path=path)
+        assert second.get("m", None, prompt("hello")) == "Konnichiwa!"
+        assert second.get("m", None, prompt("hello")) == "Konnichiwa!"
+
+        stats = second.get_stats()
+        assert stats["persistent"]
+        assert stats["store_hits"] == 1
+        assert stats["hits"] == 1
+        second.close()
+
+
+class TestFallbackIntegration:
+    """Test the cached-response fallback."""
+
+    @pytest.mark.asyncio
+    async def test_cached_response_context_is_used(self):
+        """Test that a failing operation falls back to the lookup callable."""
+        manager = FallbackManager()
+        manager.register_fallback_chain(
+            "ollama_provider", [FallbackStrategy.CACHED_RESPONSE]
+        )
+
+        async def fail():
+            raise ConnectionError("down")
+
+        result = await manager.execute_with_fallback(
+            component="ollama_provider",
+            primary_operation=fail,
+            context={"cached_response": lambda: "From cache"},
+        )
+
+        assert result.success
+        assert result.result == "From cache"
+
+    @pytest.mark.asyncio
+    async def test_fallback_cache_is_lru(self):
+        """Test that reading an entry protects it from eviction."""
+        manager = FallbackManager()
+        manager._max_cache_size = 2
+        manager.cache_response("a", "A")
+        manager.cache_response("b", "B")
+        await manager._cached_response_handler(
+            component="x",
+            error=ConnectionError(),
+            context={"cache_key": "a"},
+            operation_args=(),
+            operation_kwargs={},
+        )
+        manager.cache_response("c", "C")
+
+        assert list(manager._cached_responses) == ["a", "c"]
+
+
+class TestProviderCache:
+    """Test response caching in OllamaProvider."""
+
+    @pytest.mark.asyncio
+    @patch("src.ai.ollama_provider.ollama")
+    async def test_fast_path_skips_generation(self, mock_ollama):
+        """Test that a repeated prompt is answered from the cache."""
+        from src.ai.ollama_provider import OllamaProvider
+
+        mock_ollama.chat.return_value = {"message": {"content": "Konnichiwa!"}}
+        provider = OllamaProvider({"model": "llama3"})
+        provider.set_response_cache(ResponseCache(fast_path=True))
+        messages = [Message(role="user", content="Hello")]
+
+        assert await provider.generate_response(messages) == "Konnichiwa!"
+        assert await provider.generate_response(messages) == "Konnichiwa!"
+        assert mock_ollama.chat.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("src.ai.ollama_provider.ollama")
+    async def test_cache_only_used_on_failure_without_fast_path(self, mock_ollama):
+        """Test that the cache is a fallback when the fast path is off."""
+        from src.ai.ollama_provider import OllamaProvider
+
+        mock_ollama.chat.return_value = {"message": {"content": "Konnichiwa!"}}
+        provider = OllamaProvider({"model": "llama3"})
+        provider.set_response_cache(ResponseCache())
+        messages = [Message(role="user", content="Hello")]
+
+        await provider.generate_response(messages)
+        await provider.generate_response(messages)
+
+        assert mock_ollama.chat.call_count == 2
+        assert provider.get_cached_response(messages) == "Konnichiwa!"
+
+    @pytest.mark.asyncio
+    @patch("src.ai.ollama_provider.ollama")
+    async def test_repeated_utterance_hits_as_history_grows(self, mock_ollama):
+        """Test that a repeated utterance hits although every turn adds history."""
+        from src.ai.base_provider import MemoryContext
+        from src.ai.ollama_provider import OllamaProvider
+
+        mock_ollama.chat.return_value = {"message": {"content": "Konnichiwa!"}}
+        provider = OllamaProvider({"model": "llama3"})
+        cache = ResponseCache(fast_path=True)
+        provider.set_response_cache(cache)
+
+        messages = []
+        for _ in range(5):
+            messages.append(Message(role="user", content="Hello?"))
+            memory = MemoryContext("u1", [], list(messages), {})
+            reply = await provider.generate_response(messages, None, memory)
+            messages.append(Message(role="assistant", content=reply))
+
+        assert mock_ollama.chat.call_count == 1
+        stats = cache.get_stats()
+        assert stats["hits"] == 4
+        assert stats["hit_rate"] == pytest.approx(0.8)
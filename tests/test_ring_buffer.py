@@ -0,0 +1,90 @@
+"""
+Unit tests for session memory ring buffers.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.memory.ring_buffer import MemorySnippet, RingBuffer, UserSessionMemory
+
+
+class TestRingBuffer:
+    """Test append, eviction, indexing and views."""
+
+    def test_append_evicts_oldest(self):
+        """Test that a full buffer returns the evicted item."""
+        buffer = RingBuffer(3)
+
+        assert [buffer.append(i) for i in range(5)] == [None, None, None, 0, 1]
+        assert list(buffer) == [2, 3, 4]
+        assert len(buffer) == 3
+        assert buffer.total_appended == 5
+
+    def test_indexing(self):
+        """Test positive and negative indices after wrap-around."""
+        buffer = RingBuffer(3, items=range(5))
+
+        assert buffer[0] == 2
+        assert buffer[-1] == 4
+        with pytest.raises(IndexError):
+            buffer[3]
+
+    def test_last_and_slices_are_views(self):
+        """Test that last(n) and slices read the buffer without copying."""
+        buffer = RingBuffer(4, items=range(6))
+
+        view = buffer.last(2)
+        assert list(view) == [4, 5]
+        assert list(buffer[-3:]) == [3, 4, 5]
+        assert list(buffer.last(10)) == [2, 3, 4, 5]
+        assert view[-1] == 5
+
+        # A view keeps its items until they are overwritten
+        buffer.append(6)
+        assert list(view) == [4, 5]
+        buffer.append(7)
+        buffer.append(8)
+        with pytest.raises(IndexError):
+            list(view)
+
+    def test_empty_and_clear(self):
+        """Test empty buffer behaviour."""
+        buffer = RingBuffer(2, items=[1, 2])
+        buffer.clear()
+
+        assert not buffer
+        assert list(buffer.last(5)) == []
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+
+class TestUserSessionMemory:
+    """Test separate message and snippet streams."""
+
+    def test_streams_are_separate(self):
+        """Test that snippets don't count against or mix with messages."""
+        session = UserSessionMemory(message_capacity=2, snippet_capacity=3)
+
+        session.add_message("m1")
+        session.add_snippet(MemorySnippet(1, "s1", datetime.now()))
+        session.add_message("m2")
+        evicted = session.add_message("m3")
+
+        assert evicted == "m1"
+        assert list(session) == ["m2", "m3"]
+        assert len(session) == 2
+        assert session[-1] == "m3"
+        assert session.entry_count == 3
+        assert session.snippets[0].content == "s1"
+
+    def test_snippet_slots(self):
+        """Test that snippets are slotted and serialise for storage."""
+        snippet = MemorySnippet(7, "likes tea", datetime(2024, 1, 1), {"type": "fact"})
+
+        assert not hasattr(snippet, "__dict__")
+        assert snippet.to_dict() == {
+            "content": "likes tea",
+            "timestamp": "2024-01-01T00:00:00",
+            "metadata": {"type": "fact"},
+        }
@@ -0,0 +1,134 @@
+"""
+Unit tests for the memory search result cache.
+"""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.config.settings import MemoryConfig
+from src.memory.memory_manager import ConversationMessage, MemoryManager
+from src.memory.search_cache import MemorySearchCache
+
+
+class TestMemorySearchCache:
+    """Test normalisation, expiry, eviction and invalidation."""
+
+    def test_normalized_queries_share_entries(self):
+        """Test that case and punctuation differences hit the same entry."""
+        cache = MemorySearchCache()
+        cache.put("u1", "What's my cat's name?", 5, ["cat is Mochi"], cost=0.4)
+
+        assert cache.get("u1", "what's my CAT'S name", 5) == ["cat is Mochi"]
+        assert cache.get("u1", "what's my cat's name", 3) is None
+        assert cache.get("u2", "what's my cat's name", 5) is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["saved_latency"] == pytest.approx(0.4)
+
+    def test_ttl_expiry(self, fake_clock):
+        """Test that entries expire after the TTL."""
+        cache = MemorySearchCache(ttl=10, clock=fake_clock)
+        cache.put("u1", "tea", 5, ["likes tea"])
+
+        fake_clock.now = 11
+        assert cache.get("u1", "tea", 5) is None
+        assert cache.get_stats()["expirations"] == 1
+        assert cache.get_stats()["entries"] == 0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = MemorySearchCache(max_entries=2)
+        cache.put("u1", "a", 5, ["a"])
+        cache.put("u1", "b", 5, ["b"])
+        cache.get("u1", "a", 5)
+        cache.put("u1", "c", 5, ["c"])
+
+        assert cache.get("u1", "b", 5) is None
+        assert cache.get("u1", "a", 5) == ["a"]
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_invalidation_is_per_user_and_drops_stale_puts(self):
+        """Test selective invalidation and generation checks."""
+        cache = MemorySearchCache()
+        cache.put("u1", "tea", 5, ["likes tea"])
+        cache.put("u2", "tea", 5, ["hates tea"])
+
+        generation = cache.generation("u1")
+        assert cache.invalidate_user("u1") == 1
+        assert cache.get("u1", "tea", 5) is None
+        assert cache.get("u2", "tea", 5) == ["hates tea"]
+
+        # A search that started before the invalidation must not be cached
+        assert not cache.put("u1", "tea", 5, ["old"], generation=generation)
+        assert cache.get_stats()["stale_puts"] == 1
+
+
+class TestMemoryManagerSearchCache:
+    """Test MemoryManager search caching and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_served_from_cache(self):
+        """Test that a repeated query skips Mem0 until the user adds a memory."""
+        config = MemoryConfig(mem0_api_key="test_key", write_behind_enabled=False)
+        with patch("src.memory.memory_manager.Memory") as mock_memory_class:
+            mock_client = Mock()
+            mock_memory_class.return_value = mock_client
+            mock_client.search.return_value = [{"memory": "Likes tea"}]
+            mock_client.add.return_value = {"id": "m1"}
+
+            manager = MemoryManager(config)
+            await manager.initialize()
+            calls_after_init = mock_client.search.call_count
+
+            assert await manager.search_memories("u1", "Tea?") == ["Likes tea"]
+            assert await manager.search_memories("u1", "tea") == ["Likes tea"]
+            assert mock_client.search.call_count == calls_after_init + 1
+
+            await manager.add_memory("u1", "Also likes coffee")
+            await manager.search_memories("u1", "tea")
+            assert mock_client.search.call_count == calls_after_init + 2
+
+            health = await manager.health_check()
+            assert health["search_cache"]["enabled"] is True
+            assert health["search_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_behind_turns_reuse_cached_search(self):
+        """Test that queued chat turns keep the cache until they are flushed."""
+        config = MemoryConfig(mem0_api_key="test_key", write_behind_flush_interval=60.0)
+        with patch("src.memory.memory_manager.Memory") as mock_memory_class:
+            mock_client = Mock()
+            mock_memory_class.return_value = mock_client
+            mock_client.search.return_value = [{"memory": "Likes tea"}]
+            mock_client.add.return_value = {"results": []}
+
+            manager = MemoryManager(config)
+            await manager.initialize()
+            calls_after_init = mock_client.search.call_count
+
+            for _ in range(2):
+                await manager.store_conversation(
+                    ConversationMessage(
+                        role="user",
+                        content="Do I like tea?",
+                        timestamp=datetime.now(),
+                        user_id="u1",
+                    )
+                )
+                context = await manager.get_user_context("u1", "Do I like tea?")
+                assert context.relevant_memories == ["Likes tea"]
+
+            assert mock_client.search.call_count == calls_after_init + 1
+            stats = manager.get_search_cache_stats()
+            assert stats["hits"] == 1
+            assert stats["invalidations"] == 0
+
+            # Flushing writes to Mem0, so the next search must go back to it
+            await manager.flush_pending_writes()
+            await manager.get_user_context("u1", "Do I like tea?")
+            assert mock_client.search.call_count == calls_after_init + 2
+            await manager.close()
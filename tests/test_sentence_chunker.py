@@ -0,0 +1,69 @@
+"""
+Unit tests for the incremental sentence chunker used for streamed replies.
+"""
+
+from src.ai.sentence_chunker import SentenceChunker
+
+
+def feed_in_pieces(chunker, text, size=3):
+    """Feed text a few characters at a time, like a token stream."""
+    segments = []
+    for i in range(0, len(text), size):
+        segments.extend(chunker.feed(text[i : i + size]))
+    tail = chunker.flush()
+    if tail:
+        segments.append(tail)
+    return segments
+
+
+class TestSentenceChunker:
+    """Test sentence and clause segmentation."""
+
+    def test_splits_at_sentence_boundaries(self):
+        """Test that complete sentences are emitted as soon as they end."""
+        chunker = SentenceChunker(min_chars=10)
+        segments = feed_in_pieces(
+            chunker, "Hello there, traveler! How was your day? I missed you."
+        )
+        assert segments == [
+            "Hello there, traveler!",
+            "How was your day?",
+            "I missed you.",
+        ]
+        assert chunker.segments_emitted == 3
+
+    def test_waits_for_whitespace_after_terminator(self):
+        """Test that decimals and unfinished text are not cut."""
+        chunker = SentenceChunker(min_chars=5)
+        assert chunker.feed("Pi is about 3.") == []
+        assert chunker.feed("14, you know") == []
+        assert chunker.flush() == "Pi is about 3.14, you know"
+
+    def test_short_sentences_merge_forward(self):
+        """Test that sentences shorter than min_chars join the next one."""
+        chunker = SentenceChunker(min_chars=20)
+        segments = feed_in_pieces(chunker, "B-baka! I wasn't waiting for you. Hmph.")
+        assert segments == ["B-baka! I wasn't waiting for you.", "Hmph."]
+
+    def test_skips_abbreviations(self):
+        """Test that common abbreviations don't end a segment."""
+        chunker = SentenceChunker(min_chars=1)
+        segments = feed_in_pieces(chunker, "Ask Dr. Tanaka tomorrow. Okay?")
+        assert segments == ["Ask Dr. Tanaka tomorrow.", "Okay?"]
+
+    def test_run_on_text_cut_at_clause(self):
+        """Test that overly long text is cut at a clause boundary."""
+        chunker = SentenceChunker(min_chars=5, max_chars=40)
+        segments = chunker.feed(
+            "this keeps going and going, and it never ends at all really "
+        )
+        assert segments[0] == "this keeps going and going,"
+
+    def test_flush_and_reset(self):
+        """Test flushing an empty buffer and resetting state."""
+        chunker = SentenceChunker()
+        assert chunker.flush() is None
+        chunker.feed("partial")
+        chunker.reset()
+        assert chunker.flush() is None
+        assert chunker.segments_emitted == 0
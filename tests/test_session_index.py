@@ -0,0 +1,75 @@
+"""
+Unit tests for the session-memory inverted index.
+"""
+
+from src.memory.session_index import SessionMemoryIndex, tokenize
+
+
+class TestSessionMemoryIndex:
+    """Test indexing, BM25 ranking and removal."""
+
+    def test_tokenize(self):
+        """Test tokenization lowercases and strips punctuation."""
+        assert tokenize("User: I LOVE cats!") == ["user", "i", "love", "cats"]
+
+    def test_ranks_by_relevance(self):
+        """Test that entries matching more rare terms rank first."""
+        index = SessionMemoryIndex()
+        index.add("u1", "user: my cat is called Mochi")
+        index.add("u1", "user: I like the weather today")
+        index.add("u1", "user: my favourite food is ramen")
+
+        results = index.search("u1", "what is my cat called", limit=3)
+
+        assert results[0] == "user: my cat is called Mochi"
+        assert "user: I like the weather today" not in results
+
+    def test_recency_breaks_ties(self):
+        """Test that equally scored entries are returned most recent first."""
+        index = SessionMemoryIndex()
+        index.add("u1", "ramen night")
+        index.add("u1", "night ramen")
+
+        scored = index.search_with_scores("u1", "ramen", limit=2)
+
+        assert scored[0][0] == scored[1][0]
+        assert [content for _, content in scored] == ["night ramen", "ramen night"]
+
+    def test_user_isolation(self):
+        """Test that users never see each other's entries."""
+        index = SessionMemoryIndex()
+        index.add("u1", "secret password is hunter2")
+
+        assert index.search("u2", "password") == []
+        assert index.search("u1", "password") == ["secret password is hunter2"]
+
+    def test_remove_entry(self):
+        """Test removing entries cleans up postings."""
+        index = SessionMemoryIndex()
+        first = index.add("u1", "apples and pears")
+        index.add("u1", "bananas")
+
+        assert index.remove("u1", first) is True
+        assert index.remove("u1", first) is False
+        assert index.search("u1", "apples") == []
+        assert index.entry_count("u1") == 1
+        assert index.term_count("u1") == 1
+
+    def test_remove_user(self):
+        """Test dropping all of a user's entries."""
+        index = SessionMemoryIndex()
+        index.add("u1", "hello")
+        index.add("u2", "hello")
+
+        index.remove_user("u1")
+
+        assert index.entry_count() == 1
+        assert index.search("u1", "hello") == []
+
+    def test_empty_query_and_limit(self):
+        """Test queries without terms and non-positive limits."""
+        index = SessionMemoryIndex()
+        index.add("u1", "hello world")
+
+        assert index.search("u1", "!!!") == []
+        assert index.search("u1", "hello", limit=0) == []
@@ -0,0 +1,120 @@
+"""
+Unit tests for provider request coalescing.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.ai.single_flight import SingleFlight, request_key
+
+
+class TestRequestKey:
+    """Test request key construction."""
+
+    def test_stable_and_order_insensitive_for_dicts(self):
+        """Test that equal requests produce equal keys."""
+        a = request_key("ollama", "llama3", [{"role": "user", "content": "hi"}], {"x": 1, "y": 2})
+        b = request_key("ollama", "llama3", [{"content": "hi", "role": "user"}], {"y": 2, "x": 1})
+        c = request_key("ollama", "llama3", [{"role": "user", "content": "hello"}], {})
+
+        assert a == b
+        assert a != c
+
+
+class TestSingleFlight:
+    """Test single-flight execution."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        """Test that duplicate callers attach to the in-flight request."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def generate():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "reply"
+
+        results = await asyncio.gather(*(flight.run("k", generate) for _ in range(5)))
+
+        assert results == ["reply"] * 5
+        assert calls == 1
+        assert flight.get_stats()["coalesced"] == 4
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests_are_not_cached(self):
+        """Test that a finished request is not reused."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def generate():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.run("k", generate) == 1
+        assert await flight.run("k", generate) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self):
+        """Test that every waiter sees the shared failure."""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("down")
+
+        results = await asyncio.gather(
+            flight.run("k", fail), flight.run("k", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_timed_out_caller_does_not_cancel_shared_request(self):
+        """Test that a retry after a timeout attaches to the pending request."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def slow():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "late reply"
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(flight.run("k", slow), timeout=0.01)
+
+        assert await flight.run("k", slow) == "late reply"
+        assert calls == 1
+
+
+class TestProviderCoalescing:
+    """Test coalescing in OllamaProvider."""
+
+    @pytest.mark.asyncio
+    @patch("src.ai.ollama_provider.ollama")
+    async def test_identical_prompts_hit_ollama_once(self, mock_ollama):
+        """Test that concurrent identical prompts make one Ollama call."""
+        from src.ai.ollama_provider import OllamaProvider
+
+        def chat(**kwargs):
+            time.sleep(0.05)
+            return {"message": {"content": "Konnichiwa!"}}
+
+        mock_ollama.chat.side_effect = chat
+        provider = OllamaProvider({"model": "llama3"})
+        messages = [{"role": "user", "content": "Hello"}]
+
+        results = await asyncio.gather(
+            *(provider._make_ollama_request(messages) for _ in range(3))
+        )
+
+        assert [r["message"]["content"] for r in results] == ["Konnichiwa!"] * 3
+        assert mock_ollama.chat.call_count == 1
+        assert provider.get_coalescing_stats()["coalesced"] == 2
@@ -0,0 +1,129 @@
+"""
+Unit tests for the static asset store.
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from src.web.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    StaticAssetStore,
+)
+
+
+@pytest.fixture
+def static_root(tmp_path):
+    """Create a static directory with a small Live2D model."""
+    runtime = tmp_path / "models" / "demo" / "runtime"
+    (runtime / "motion").mkdir(parents=True)
+    model = {"Version": 3, "FileReferences": {"Moc": "demo.moc3"}}
+    (runtime / "demo.model3.json").write_text(json.dumps(model, indent=4))
+    (runtime / "demo.moc3").write_bytes(os.urandom(4096))
+    (runtime / "motion" / "idle.motion3.json").write_text(
+        json.dumps({"Curves": [{"Segments": [0.0] * 500}]}, indent=2)
+    )
+    (tmp_path / "js").mkdir()
+    (tmp_path / "js" / "app.js").write_text("console.log('hello');\n" * 50)
+    return tmp_path
+
+
+class TestStaticAssetStore:
+    """Test indexing, versioning and caching."""
+
+    def test_scan_precompresses_text_assets(self, static_root):
+        """Test that JSON and JS get gzip variants and binaries do not."""
+        store = StaticAssetStore(str(static_root))
+
+        assert store.scan() == 4
+
+        motion, _ = store.resolve("models/demo/runtime/motion/idle.motion3.json")
+        moc, _ = store.resolve("models/demo/runtime/demo.moc3")
+        assert gzip.decompress(motion.encodings["gzip"]) == (
+            static_root / "models/demo/runtime/motion/idle.motion3.json"
+        ).read_bytes()
+        assert moc.encodings == {}
+        assert motion.content_type == "application/json"
+
+    def test_versioned_urls_cover_the_model_directory(self, static_root):
+        """Test that relative references under a versioned URL are immutable."""
+        store = StaticAssetStore(str(static_root))
+
+        url = store.asset_url("/static/models/demo/runtime/demo.model3.json")
+        prefix = url[len("/static/"):].rsplit("/", 1)[0]
+
+        assert url.startswith("/static/_v/")
+        assert store.resolve(url[len("/static/"):])[1] is True
+        assert store.resolve(f"{prefix}/motion/idle.motion3.json")[1] is True
+        assert store.resolve("models/demo/runtime/demo.moc3")[1] is False
+        assert store.asset_url("missing.json") == "/static/missing.json"
+
+    def test_edit_changes_digest_and_token(self, static_root):
+        """Test that editing a file invalidates its ETag and version token."""
+        store = StaticAssetStore(str(static_root))
+        url = store.asset_url("models/demo/runtime/demo.model3.json")
+        asset, _ = store.resolve("models/demo/runtime/demo.model3.json")
+        old_etag = asset.etag
+
+        motion = static_root / "models/demo/runtime/motion/idle.motion3.json"
+        motion.write_text("{}")
+        os.utime(motion, ns=(1, 1))
+
+        assert store.asset_url("models/demo/runtime/demo.model3.json") != url
+        assert store.resolve(url[len("/static/"):])[1] is False
+        assert store.resolve("models/demo/runtime/demo.model3.json")[0].etag == old_etag
+
+    def test_rejects_paths_outside_root(self, static_root):
+        """Test path containment."""
+        store = StaticAssetStore(str(static_root / "js"))
+
+        assert store.resolve("../models/demo/runtime/demo.moc3") is None
+        assert store.resolve("_v/abc/../../models/demo/runtime/demo.moc3") is None
+        assert store.resolve("missing.js") is None
+
+    def test_encoding_selection_and_etags(self, static_root):
+        """Test Accept-Encoding negotiation and If-None-Match matching."""
+        store = StaticAssetStore(str(static_root))
+        asset, _ = store.resolve("js/app.js")
+
+        assert store.select_encoding(asset, "gzip, deflate") == "gzip"
+        assert store.select_encoding(asset, "gzip;q=0, deflate") is None
+        assert store.select_encoding(asset, None) is None
+
+        headers = store.response_headers(asset, True, "gzip")
+        assert headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Vary"] == "Accept-Encoding"
+        assert headers["ETag"] != asset.etag
+        assert store.response_headers(asset, False)["Cache-Control"] == (
+            REVALIDATE_CACHE_CONTROL
+        )
+
+        assert store.matches_etag(asset, headers["ETag"])
+        assert store.matches_etag(asset, f'"other", W/{asset.etag}')
+        assert not store.matches_etag(asset, '"other"')
+
+    def test_lru_keeps_small_files(self, static_root):
+        """Test that small files are cached and evicted by total size."""
+        store = StaticAssetStore(
+            str(static_root), cache_bytes=4150, cache_max_file_bytes=4500
+        )
+        moc, _ = store.resolve("models/demo/runtime/demo.moc3")
+        model, _ = store.resolve("models/demo/runtime/demo.model3.json")
+        motion, _ = store.resolve("models/demo/runtime/motion/idle.motion3.json")
+
+        assert store.read(moc) == (static_root / "models/demo/runtime/demo.moc3").read_bytes()
+        assert store.cached_body(moc) is not None
+        assert store.read(model) is not None
+
+        # Too large for the cache: read from disk by the caller instead
+        assert motion.size > 4500
+        assert store.read(motion) is None
+
+        stats = store.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["cached_files"] == 1
+        assert stats["cache_hits"] == 1
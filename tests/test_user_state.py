@@ -0,0 +1,154 @@
+"""
+Unit tests for bounded per-user state.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.config.settings import MemoryConfig
+from src.memory.memory_manager import ConversationMessage, MemoryManager
+from src.memory.user_state import BoundedUserState
+
+
+class TestBoundedUserState:
+    """Test capacity, idle expiry, loading and spilling."""
+
+    def test_lru_capacity_eviction(self):
+        """Test that the least recently used user is evicted first."""
+        evicted = []
+        state = BoundedUserState(
+            max_users=2, on_evict=lambda user, value, reason: evicted.append((user, reason))
+        )
+
+        state["a"] = 1
+        state["b"] = 2
+        assert state["a"] == 1  # refresh "a"
+        state["c"] = 3
+
+        assert list(state) == ["a", "c"]
+        assert evicted == [("b", "capacity")]
+        assert state.get_stats()["evictions"] == 1
+
+    def test_idle_expiry(self, fake_clock):
+        """Test that idle users expire and active ones are kept."""
+        evicted = []
+        state = BoundedUserState(
+            idle_ttl=10,
+            clock=fake_clock,
+            on_evict=lambda user, value, reason: evicted.append((user, reason)),
+        )
+
+        state["idle"] = "x"
+        fake_clock.now = 6
+        state["active"] = "y"
+        fake_clock.now = 12
+
+        assert "idle" not in state
+        assert "active" in state
+        assert state.expire_idle() == 1
+        assert evicted == [("idle", "idle")]
+        assert state.get_stats()["expirations"] == 1
+
+    def test_membership_and_stats_do_not_refresh(self):
+        """Test that `in`, items() and values() leave recency alone."""
+        state = BoundedUserState(max_users=2)
+        state["a"] = 1
+        state["b"] = 2
+
+        assert "a" in state
+        assert state.items() == [("a", 1), ("b", 2)]
+        assert state.values() == [1, 2]
+        state["c"] = 3
+
+        assert "a" not in state
+        assert state.get_stats()["hits"] == 0
+
+    def test_get_or_load_round_trip(self):
+        """Test that evicted values are spilled and loaded back on demand."""
+        disk = {}
+        state = BoundedUserState(
+            max_users=1,
+            loader=disk.get,
+            on_evict=lambda user, value, reason: disk.__setitem__(user, value),
+        )
+
+        state["a"] = {"mood": "happy"}
+        state["b"] = {"mood": "sad"}
+
+        assert "a" not in state
+        assert state.get_or_load("a") == {"mood": "happy"}
+        assert state.get_or_load("missing") is None
+
+        stats = state.get_stats()
+        assert stats["loads"] == 1
+        assert stats["misses"] == 2
+        assert disk["b"] == {"mood": "sad"}
+
+    def test_spill_errors_are_counted(self):
+        """Test that a failing spill doesn't break writes."""
+
+        def failing_spill(user, value, reason):
+            raise OSError("disk full")
+
+        state = BoundedUserState(max_users=1, on_evict=failing_spill)
+        state["a"] = 1
+        state["b"] = 2
+
+        assert list(state) == ["b"]
+        assert state.get_stats()["spill_errors"] == 1
+
+
+class TestMemoryManagerUserState:
+    """Test MemoryManager per-user maps staying bounded."""
+
+    @pytest.mark.asyncio
+    async def test_user_maps_are_bounded(self):
+        """Test that session and personality maps evict beyond capacity."""
+        config = MemoryConfig(mem0_api_key="", session_hot_users=2)
+        manager = MemoryManager(config)
+        await manager.initialize()
+
+        for user in ["u1", "u2", "u3"]:
+            await manager.add_memory(user, f"{user} likes tea")
+            await manager.update_personality_state(user, {"mood": "happy"})
+
+        assert list(manager._session_memory) == ["u2", "u3"]
+        assert manager._session_memory.get_stats()["evictions"] == 1
+        assert manager._personality_states.get_stats()["evictions"] == 1
+        assert manager._session_index.search("u1", "tea", 5) == []
+
+    def test_session_stats_include_state_counters(self):
+        """Test that get_session_stats exposes the bounded map counters."""
+        manager = MemoryManager(MemoryConfig(mem0_api_key="", session_hot_users=1))
+        for user in ["u1", "u2"]:
+            manager._session_entries(user).add_message(
+                ConversationMessage(
+                    role="user", content="hi", timestamp=datetime.now(), user_id=user
+                )
+            )
+
+        stats = manager.get_session_stats()
+
+        assert stats["total_users"] == 1
+        assert stats["session_state"]["evictions"] == 1
+        assert stats["session_state"]["max_users"] == 1
+        assert "expirations" in stats["personality_state"]
+
+    @pytest.mark.asyncio
+    async def test_personality_state_spills_to_store(self, tmp_path):
+        """Test that evicted personality state reloads from the store."""
+        config = MemoryConfig(
+            mem0_api_key="",
+            session_store_path=str(tmp_path / "session.db"),
+            session_hot_users=1,
+        )
+        manager = MemoryManager(config)
+        await manager.initialize()
+
+        await manager.update_personality_state("alice", {"mood": "happy"})
+        await manager.update_personality_state("bob", {"mood": "grumpy"})
+
+        context = await manager.get_user_context("alice")
+        assert context.personality_state == {"mood": "happy"}
+        await manager.close()
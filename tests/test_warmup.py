@@ -0,0 +1,105 @@
+"""
+Unit tests for worker warmup and startup metrics.
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.agent import warmup
+from src.agent.warmup import StartupMetrics, load_vad, warm_up_provider
+from src.ai.ollama_provider import OllamaProvider
+
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    """Clear per-process warmup state between tests."""
+    warmup._vad = None
+    warmup._llm_warm.clear()
+    warmup._metrics = StartupMetrics()
+    yield
+    warmup._vad = None
+    warmup._llm_warm.clear()
+
+
+class TestStartupMetrics:
+    """Test phase timing."""
+
+    def test_phase_records_duration_and_errors(self):
+        """Test that phases are timed and failures recorded."""
+        metrics = StartupMetrics()
+
+        with metrics.phase("ok"):
+            pass
+        with pytest.raises(RuntimeError):
+            with metrics.phase("broken"):
+                raise RuntimeError("boom")
+
+        stats = metrics.get_stats()
+        assert set(stats["phases"]) == {"ok", "broken"}
+        assert stats["errors"] == {"broken": "boom"}
+
+
+class TestWarmup:
+    """Test VAD preloading and provider warmup."""
+
+    def test_vad_loaded_once_per_process(self):
+        """Test that the VAD is loaded once and shared."""
+        with patch.object(warmup.silero, "VAD") as mock_vad:
+            first = load_vad()
+            second = load_vad()
+
+        assert first is second
+        mock_vad.load.assert_called_once()
+        assert "vad_load" in warmup.get_startup_metrics().get_stats()["phases"]
+
+    @pytest.mark.asyncio
+    async def test_warm_up_provider_records_phases(self):
+        """Test that provider phases are recorded and warmup runs once."""
+        provider = Mock()
+        provider.warmup = AsyncMock(return_value={"model_load": 1.5})
+
+        assert await warm_up_provider(provider)
+        assert await warm_up_provider(provider)
+
+        provider.warmup.assert_awaited_once()
+        phases = warmup.get_startup_metrics().get_stats()["phases"]
+        assert phases["llm_model_load"] == 1.5
+        assert "llm_warmup" in phases
+        assert warmup.is_llm_warm()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_provider_failure(self):
+        """Test that a failed warmup is reported, not raised."""
+        provider = Mock()
+        provider.warmup = AsyncMock(side_effect=ConnectionError("refused"))
+
+        assert not await warm_up_provider(provider)
+        assert not warmup.is_llm_warm()
+        assert "llm_warmup" in warmup.get_startup_metrics().get_stats()["errors"]
+
+
+class TestOllamaWarmup:
+    """Test OllamaProvider.warmup and keep_alive."""
+
+    @pytest.mark.asyncio
+    @patch("src.ai.ollama_provider.ollama")
+    async def test_warmup_preloads_with_keep_alive(self, mock_ollama):
+        """Test the model load and one-token generation requests."""
+        mock_ollama.chat.return_value = {"message": {"content": "Hi"}}
+        provider = OllamaProvider({"model": "llama3", "keep_alive": "30m"})
+
+        timings = await provider.warmup()
+
+        assert set(timings) == {"model_load", "first_generation"}
+        load_call, generate_call = mock_ollama.chat.call_args_list
+        assert load_call.kwargs["messages"] == []
+        assert load_call.kwargs["keep_alive"] == "30m"
+        assert generate_call.kwargs["options"] == {"num_predict": 1}
+
+    @pytest.mark.asyncio
+    @patch("src.ai.ollama_provider.ollama")
+    async def test_numeric_keep_alive(self, mock_ollama):
+        """Test that numeric keep_alive strings are sent as numbers."""
+        assert OllamaProvider({"keep_alive": "-1"}).keep_alive == -1
+        assert OllamaProvider({"keep_alive": ""}).keep_alive is None
@@ -0,0 +1,109 @@
+"""
+Unit tests for the write-behind memory queue.
+"""
+
+import asyncio
+
+import pytest
+
+from src.memory.write_behind import WriteBehindQueue
+
+
+class RecordingFlusher:
+    """Flush callback that records batches."""
+
+    def __init__(self, result=True):
+        self.batches = []
+        self.result = result
+
+    async def __call__(self, user_id, batch):
+        self.batches.append((user_id, [item.content for item in batch]))
+        return self.result
+
+
+class TestWriteBehindQueue:
+    """Test batching, flushing and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_per_user(self):
+        """Test that pending adds are grouped into one batch per user."""
+        flusher = RecordingFlusher()
+        queue = WriteBehindQueue(flusher, max_batch_size=10, flush_interval=60)
+
+        queue.enqueue("u1", "a")
+        queue.enqueue("u2", "b")
+        queue.enqueue("u1", "c")
+        assert queue.depth == 3
+
+        assert await queue.flush() is True
+        assert sorted(flusher.batches) == [("u1", ["a", "c"]), ("u2", ["b"])]
+        assert queue.depth == 0
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_triggers_flush(self):
+        """Test that a full batch is flushed without waiting for the timer."""
+        flusher = RecordingFlusher()
+        queue = WriteBehindQueue(flusher, max_batch_size=2, flush_interval=60)
+
+        queue.enqueue("u1", "a")
+        queue.enqueue("u1", "b")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert flusher.batches == [("u1", ["a", "b"])]
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_time_threshold_triggers_flush(self):
+        """Test that the background timer flushes partial batches."""
+        flusher = RecordingFlusher()
+        queue = WriteBehindQueue(flusher, max_batch_size=10, flush_interval=0.01)
+
+        queue.enqueue("u1", "a")
+        await asyncio.sleep(0.05)
+
+        assert flusher.batches == [("u1", ["a"])]
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_and_rejects_new_writes(self):
+        """Test that close drains the queue and stops accepting writes."""
+        flusher = RecordingFlusher()
+        queue = WriteBehindQueue(flusher, max_batch_size=10, flush_interval=60)
+        queue.enqueue("u1", "a")
+
+        assert await queue.close() is True
+        assert flusher.batches == [("u1", ["a"])]
+        with pytest.raises(RuntimeError):
+            queue.enqueue("u1", "b")
+
+    @pytest.mark.asyncio
+    async def test_metrics_and_failures(self):
+        """Test that failed flushes are counted and latency is recorded."""
+        queue = WriteBehindQueue(
+            RecordingFlusher(result=False), max_batch_size=10, flush_interval=60
+        )
+        queue.enqueue("u1", "a")
+        queue.enqueue("u1", "b")
+
+        assert await queue.flush() is False
+
+        stats = queue.get_stats()
+        assert stats["depth"] == 0
+        assert stats["max_depth"] == 2
+        assert stats["failed_batches"] == 1
+        assert stats["failed_items"] == 2
+        assert stats["last_flush_latency"] >= 0.0
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_discard(self):
+        """Test dropping a user's pending writes."""
+        flusher = RecordingFlusher()
+        queue = WriteBehindQueue(flusher, max_batch_size=10, flush_interval=60)
+        queue.enqueue("u1", "a")
+
+        assert queue.discard("u1") == 1
+        assert await queue.close() is True
+        assert flusher.batches == []